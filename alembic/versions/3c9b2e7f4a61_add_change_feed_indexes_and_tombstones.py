@@ -0,0 +1,47 @@
+"""Add change feed indexes and tombstones table
+
+Revision ID: 3c9b2e7f4a61
+Revises: e1f7a3c95d20
+Create Date: 2026-10-19 20:37:52.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9b2e7f4a61'
+down_revision: Union[str, None] = 'e1f7a3c95d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_updated_at_id', 'users', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_pto_requests_updated_at_id', 'pto_requests', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_pto_balances_updated_at_id', 'pto_balances', ['updated_at', 'id'], unique=False)
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=30), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_entity_created_id', 'tombstones', ['entity', 'created_at', 'id'], unique=False)
+
+    # Users deactivated before tombstones existed
+    op.execute(
+        "INSERT INTO tombstones (entity, entity_id, reason, created_at) "
+        "SELECT 'users', id, 'deactivated', updated_at FROM users WHERE is_active = false"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tombstones_entity_created_id', table_name='tombstones')
+    op.drop_table('tombstones')
+    op.drop_index('ix_pto_balances_updated_at_id', table_name='pto_balances')
+    op.drop_index('ix_pto_requests_updated_at_id', table_name='pto_requests')
+    op.drop_index('ix_users_updated_at_id', table_name='users')
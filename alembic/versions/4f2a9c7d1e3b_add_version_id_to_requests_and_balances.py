@@ -0,0 +1,28 @@
+"""Add version_id optimistic locking column to pto_requests and pto_balances
+
+Revision ID: 4f2a9c7d1e3b
+Revises: c8bc1c49c679
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2a9c7d1e3b'
+down_revision: Union[str, None] = 'c8bc1c49c679'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('pto_requests', sa.Column('version_id', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('pto_balances', sa.Column('version_id', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    op.drop_column('pto_balances', 'version_id')
+    op.drop_column('pto_requests', 'version_id')
@@ -0,0 +1,40 @@
+"""Add department rules table
+
+Revision ID: 5e2a9c7d1b38
+Revises: 3c9b2e7f4a61
+Create Date: 2026-10-19 21:12:40.305871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a9c7d1b38'
+down_revision: Union[str, None] = '3c9b2e7f4a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('department_rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('department_id', sa.Integer(), nullable=True),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=True),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('value', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_department_rules_department_id'), 'department_rules', ['department_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_department_rules_department_id'), table_name='department_rules')
+    op.drop_table('department_rules')
@@ -0,0 +1,37 @@
+"""Add remote_weeks bitmask table
+
+Revision ID: 5e8c1f4b7a29
+Revises: d3a7e5f18c62
+Create Date: 2026-10-19 14:21:37.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8c1f4b7a29'
+down_revision: Union[str, None] = 'd3a7e5f18c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('remote_weeks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('iso_year', sa.Integer(), nullable=False),
+    sa.Column('iso_week', sa.SmallInteger(), nullable=False),
+    sa.Column('day_mask', sa.SmallInteger(), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('version_id', sa.Integer(), nullable=False, server_default='1'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'iso_year', 'iso_week', name='uq_remote_week_user_week')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('remote_weeks')
@@ -0,0 +1,29 @@
+"""Add partial index on active PTO request dates
+
+Revision ID: 7a3d9e2b6f14
+Revises: 5e8c1f4b7a29
+Create Date: 2026-10-19 16:05:12.418730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3d9e2b6f14'
+down_revision: Union[str, None] = '5e8c1f4b7a29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_pto_requests_active_dates', 'pto_requests', ['start_date', 'end_date'],
+                    unique=False,
+                    postgresql_where=sa.text("status IN ('pending', 'approved')"),
+                    sqlite_where=sa.text("status IN ('pending', 'approved')"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pto_requests_active_dates', table_name='pto_requests')
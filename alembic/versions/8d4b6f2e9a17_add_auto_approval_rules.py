@@ -0,0 +1,47 @@
+"""Add auto-approval rules and record the approving rule on requests
+
+Revision ID: 8d4b6f2e9a17
+Revises: 5e2a9c7d1b38
+Create Date: 2026-10-19 21:58:03.471229
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4b6f2e9a17'
+down_revision: Union[str, None] = '5e2a9c7d1b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('auto_approval_rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('department_id', sa.Integer(), nullable=True),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('pto_type', sa.String(length=20), nullable=True),
+    sa.Column('max_duration_minutes', sa.Integer(), nullable=True),
+    sa.Column('min_headroom_minutes', sa.Integer(), nullable=True),
+    sa.Column('max_colleagues_out', sa.Integer(), nullable=True),
+    sa.Column('allow_blackout', sa.Boolean(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_auto_approval_rules_department_id'), 'auto_approval_rules', ['department_id'], unique=False)
+    op.add_column('pto_requests', sa.Column('auto_approval_rule_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_pto_requests_auto_approval_rule_id', 'pto_requests', 'auto_approval_rules',
+                          ['auto_approval_rule_id'], ['id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_pto_requests_auto_approval_rule_id', 'pto_requests', type_='foreignkey')
+    op.drop_column('pto_requests', 'auto_approval_rule_id')
+    op.drop_index(op.f('ix_auto_approval_rules_department_id'), table_name='auto_approval_rules')
+    op.drop_table('auto_approval_rules')
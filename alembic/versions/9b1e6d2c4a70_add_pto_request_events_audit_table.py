@@ -0,0 +1,58 @@
+"""Add pto_request_events append-only audit table
+
+Revision ID: 9b1e6d2c4a70
+Revises: 4f2a9c7d1e3b
+Create Date: 2026-10-19 10:02:11.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1e6d2c4a70'
+down_revision: Union[str, None] = '4f2a9c7d1e3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('pto_request_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('request_id', sa.Integer(), nullable=False),
+    sa.Column('actor_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(length=20), nullable=False),
+    sa.Column('from_status', sa.String(length=20), nullable=True),
+    sa.Column('to_status', sa.String(length=20), nullable=False),
+    sa.Column('note', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['request_id'], ['pto_requests.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_pto_request_events_request_created', 'pto_request_events', ['request_id', 'created_at'], unique=False)
+
+    # Backfill history for existing requests from their mutable columns,
+    # the last time it has to be reconstructed that way
+    op.execute(
+        "INSERT INTO pto_request_events (request_id, actor_id, action, from_status, to_status, created_at) "
+        "SELECT id, user_id, 'submit', NULL, 'pending', submitted_at FROM pto_requests"
+    )
+    op.execute(
+        "INSERT INTO pto_request_events (request_id, actor_id, action, from_status, to_status, note, created_at) "
+        "SELECT id, approved_by, CASE status WHEN 'approved' THEN 'approve' ELSE 'deny' END, "
+        "'pending', status, denial_reason, COALESCE(approved_at, updated_at) "
+        "FROM pto_requests WHERE status IN ('approved', 'denied')"
+    )
+    op.execute(
+        "INSERT INTO pto_request_events (request_id, actor_id, action, from_status, to_status, created_at) "
+        "SELECT id, user_id, 'cancel', 'pending', 'cancelled', updated_at "
+        "FROM pto_requests WHERE status = 'cancelled'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pto_request_events_request_created', table_name='pto_request_events')
+    op.drop_table('pto_request_events')
@@ -0,0 +1,70 @@
+"""Add approval chain steps, delegations and the chain position of requests
+
+Revision ID: a4c7e1d9b253
+Revises: 8d4b6f2e9a17
+Create Date: 2026-10-19 23:12:45.318904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e1d9b253'
+down_revision: Union[str, None] = '8d4b6f2e9a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('approval_steps',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('department_id', sa.Integer(), nullable=True),
+    sa.Column('level', sa.Integer(), nullable=False),
+    sa.Column('over_duration_minutes', sa.Integer(), nullable=False),
+    sa.Column('approver_id', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['approver_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_approval_steps_department_id'), 'approval_steps', ['department_id'], unique=False)
+    op.create_table('approval_delegations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('delegator_id', sa.Integer(), nullable=False),
+    sa.Column('delegate_id', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('note', sa.String(length=200), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['delegate_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['delegator_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_approval_delegations_delegate_dates', 'approval_delegations',
+                    ['delegate_id', 'start_date', 'end_date'], unique=False)
+    op.create_index('ix_approval_delegations_delegator_dates', 'approval_delegations',
+                    ['delegator_id', 'start_date', 'end_date'], unique=False)
+    op.add_column('pto_requests', sa.Column('approval_level', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('pto_requests', sa.Column('current_approver_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_pto_requests_current_approver_id', 'pto_requests', 'users',
+                          ['current_approver_id'], ['id'])
+    op.create_index(op.f('ix_pto_requests_current_approver_id'), 'pto_requests', ['current_approver_id'],
+                    unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_pto_requests_current_approver_id'), table_name='pto_requests')
+    op.drop_constraint('fk_pto_requests_current_approver_id', 'pto_requests', type_='foreignkey')
+    op.drop_column('pto_requests', 'current_approver_id')
+    op.drop_column('pto_requests', 'approval_level')
+    op.drop_index('ix_approval_delegations_delegator_dates', table_name='approval_delegations')
+    op.drop_index('ix_approval_delegations_delegate_dates', table_name='approval_delegations')
+    op.drop_table('approval_delegations')
+    op.drop_index(op.f('ix_approval_steps_department_id'), table_name='approval_steps')
+    op.drop_table('approval_steps')
@@ -0,0 +1,59 @@
+"""Store PTO request durations and balances as integer minutes
+
+Revision ID: d3a7e5f18c62
+Revises: 9b1e6d2c4a70
+Create Date: 2026-10-19 13:40:05.512907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a7e5f18c62'
+down_revision: Union[str, None] = '9b1e6d2c4a70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MINUTES_PER_DAY = 480
+
+BALANCE_FIELDS = (
+    'vacation_total',
+    'vacation_used',
+    'vacation_pending',
+    'sick_total',
+    'sick_used',
+    'personal_total',
+    'personal_used',
+)
+
+
+def upgrade() -> None:
+    # Requests: total_days -> duration_minutes + day_part
+    op.add_column('pto_requests', sa.Column('duration_minutes', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('pto_requests', sa.Column('day_part', sa.String(length=10), nullable=False, server_default='full'))
+    op.execute(f"UPDATE pto_requests SET duration_minutes = CAST(ROUND(total_days * {MINUTES_PER_DAY}) AS INTEGER)")
+    # Legacy half days were stored as fractional totals without AM/PM, so
+    # keep them as plain hour quantities
+    op.execute(f"UPDATE pto_requests SET day_part = 'hours' WHERE duration_minutes % {MINUTES_PER_DAY} <> 0")
+    op.drop_column('pto_requests', 'total_days')
+
+    # Balances: Numeric day columns -> *_minutes integer columns
+    for field in BALANCE_FIELDS:
+        op.add_column('pto_balances', sa.Column(f'{field}_minutes', sa.Integer(), nullable=False, server_default='0'))
+        op.execute(f"UPDATE pto_balances SET {field}_minutes = CAST(ROUND({field} * {MINUTES_PER_DAY}) AS INTEGER)")
+        op.drop_column('pto_balances', field)
+
+
+def downgrade() -> None:
+    for field in BALANCE_FIELDS:
+        op.add_column('pto_balances', sa.Column(field, sa.Numeric(precision=5, scale=2), nullable=False, server_default='0'))
+        op.execute(f"UPDATE pto_balances SET {field} = {field}_minutes / {MINUTES_PER_DAY}.0")
+        op.drop_column('pto_balances', f'{field}_minutes')
+
+    op.add_column('pto_requests', sa.Column('total_days', sa.Numeric(precision=4, scale=2), nullable=False, server_default='0'))
+    op.execute(f"UPDATE pto_requests SET total_days = duration_minutes / {MINUTES_PER_DAY}.0")
+    op.drop_column('pto_requests', 'day_part')
+    op.drop_column('pto_requests', 'duration_minutes')
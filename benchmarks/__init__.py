@@ -0,0 +1,7 @@
+"""
+Service-layer benchmarks for the PTO and Market Calendar System.
+
+Usage:
+    python -m benchmarks.run --users 500 --years 3 --output results.json
+    python -m benchmarks.compare baseline.json results.json
+"""
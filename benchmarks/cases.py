@@ -0,0 +1,171 @@
+"""
+Benchmark cases for the service layer.
+
+Each case receives a BenchContext, does its untimed setup and returns the
+zero-argument callable to time. Every timed call opens and closes its own
+session, as a page handler does, so identity-map caching between rounds
+does not flatter the results.
+"""
+import itertools
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy.orm import sessionmaker
+
+from src.schemas.pto_schemas import PTORequestCreate
+from src.services.balance_service import BalanceService
+from src.services.calendar_service import CalendarService
+from src.services.pto_service import PTOService
+from src.services.user_service import UserService
+
+from .generator import BENCH_PASSWORD, Workload
+
+
+@dataclass
+class BenchContext:
+    """What a case needs to set itself up."""
+    sessions: sessionmaker
+    workload: Workload
+    rounds: int
+    _slots: Optional[Iterator[PTORequestCreate]] = field(default=None, repr=False)
+
+    def next_request(self) -> PTORequestCreate:
+        """A valid new request that no earlier case has submitted."""
+        if self._slots is None:
+            self._slots = _request_slots(self.workload)
+        return next(self._slots)
+
+
+@dataclass(frozen=True)
+class Case:
+    """A registered benchmark case."""
+    name: str
+    setup: Callable[[BenchContext], Callable[[], object]]
+    rounds: int
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, rounds: int = 50):
+    """
+    Register a benchmark case.
+
+    Args:
+        name: Name used in results and on the command line
+        rounds: Default number of timed calls
+    """
+    def register(setup: Callable[[BenchContext], Callable[[], object]]):
+        CASES[name] = Case(name=name, setup=setup, rounds=rounds)
+        return setup
+    return register
+
+
+def _future_weekdays(start: date) -> Iterator[date]:
+    """Weekdays from a date onwards."""
+    day = start
+    while True:
+        if day.weekday() < 5:
+            yield day
+        day += timedelta(days=1)
+
+
+def _request_slots(workload: Workload) -> Iterator[PTORequestCreate]:
+    """
+    One-day vacation requests next year, spread over employees.
+
+    Next year's balances are untouched by the history, so every
+    submission passes the balance check.
+    """
+    employees = workload.user_ids[len(workload.manager_ids):]
+    days = _future_weekdays(date(workload.today.year + 1, 1, 2))
+    for day in days:
+        for user_id in employees:
+            yield PTORequestCreate(user_id=user_id, pto_type='vacation', start_date=day,
+                                   end_date=day, total_days=Decimal('1.00'))
+
+
+@case('create_request')
+def bench_create_request(ctx: BenchContext) -> Callable[[], object]:
+    def run():
+        request_data = ctx.next_request()
+        with ctx.sessions() as db:
+            return PTOService(db).create_request(request_data)
+    return run
+
+
+@case('approve_request')
+def bench_approve_request(ctx: BenchContext) -> Callable[[], object]:
+    pending: List[tuple] = []
+    with ctx.sessions() as db:
+        service = PTOService(db)
+        for _ in range(ctx.rounds + 1):
+            request = service.create_request(ctx.next_request())
+            department_index = (request.user_id - 1) % len(ctx.workload.manager_ids)
+            pending.append((request.id, ctx.workload.manager_ids[department_index]))
+    queue = iter(pending)
+
+    def run():
+        request_id, manager_id = next(queue)
+        with ctx.sessions() as db:
+            return PTOService(db).approve_request(request_id, manager_id)
+    return run
+
+
+@case('pending_queue')
+def bench_pending_queue(ctx: BenchContext) -> Callable[[], object]:
+    def run():
+        with ctx.sessions() as db:
+            return PTOService.get_pending_requests_with_employee_info(db)
+    return run
+
+
+@case('calendar_month')
+def bench_calendar_month(ctx: BenchContext) -> Callable[[], object]:
+    departments = itertools.cycle(ctx.workload.department_ids)
+    months = itertools.cycle(range(1, 13))
+    year = ctx.workload.today.year - 1
+
+    def run():
+        with ctx.sessions() as db:
+            return CalendarService(db).get_team_calendar(year, next(months), next(departments))
+    return run
+
+
+@case('dashboard_summary')
+def bench_dashboard_summary(ctx: BenchContext) -> Callable[[], object]:
+    users = itertools.cycle(ctx.workload.user_ids)
+    year = ctx.workload.today.year
+
+    def run():
+        user_id = next(users)
+        with ctx.sessions() as db:
+            balance = BalanceService(db).get_or_create_balance(user_id, year)
+            recent = PTOService(db).list_user_requests(user_id, limit=5)
+            return balance.vacation_available, [request.status for request in recent]
+    return run
+
+
+@case('request_history')
+def bench_request_history(ctx: BenchContext) -> Callable[[], object]:
+    users = itertools.cycle(ctx.workload.user_ids)
+
+    def run():
+        with ctx.sessions() as db:
+            return PTOService(db).list_user_requests(next(users))
+    return run
+
+
+@case('login', rounds=5)
+def bench_login(ctx: BenchContext) -> Callable[[], object]:
+    users = itertools.cycle(ctx.workload.user_ids)
+
+    def run():
+        with ctx.sessions() as db:
+            user = UserService(db).authenticate_user(f"user{next(users):05d}", BENCH_PASSWORD)
+        if user is None:
+            raise RuntimeError("Benchmark user failed to authenticate")
+        return user
+    return run
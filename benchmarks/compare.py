@@ -0,0 +1,67 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+Medians are compared case by case; a case regresses when the candidate's
+median exceeds the baseline's by more than the threshold. The exit status
+is 1 if any case regressed, so the script can gate CI.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 0.10]
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+
+def compare(baseline: Dict, candidate: Dict, threshold: float) -> List[Tuple[str, float, float, float, bool]]:
+    """
+    Compare the median timings of two results documents.
+
+    Args:
+        baseline: Results of the reference run
+        candidate: Results of the run under test
+        threshold: Allowed relative slowdown, e.g. 0.10 for 10%
+
+    Returns:
+        List[Tuple[str, float, float, float, bool]]: Case, baseline and
+        candidate medians in ms, ratio, and whether it regressed
+    """
+    rows = []
+    for name, result in candidate['results'].items():
+        if name not in baseline['results']:
+            continue
+        before = baseline['results'][name]['median_ms']
+        after = result['median_ms']
+        ratio = after / before if before else float('inf')
+        rows.append((name, before, after, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.10, help="allowed relative slowdown (default 0.10)")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    if baseline.get('workload') != candidate.get('workload'):
+        print("warning: the runs used different workloads", file=sys.stderr)
+
+    print(f"baseline  {baseline.get('git_revision')}   candidate  {candidate.get('git_revision')}")
+    print(f"{'case':<20} {'baseline ms':>12} {'candidate ms':>13} {'change':>8}")
+    rows = compare(baseline, candidate, args.threshold)
+    for name, before, after, ratio, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f"{name:<20} {before:>12.3f} {after:>13.3f} {ratio - 1:>+8.1%}{flag}")
+
+    sys.exit(1 if any(row[4] for row in rows) else 0)
+
+
+if __name__ == '__main__':
+    main()
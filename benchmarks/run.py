@@ -0,0 +1,156 @@
+"""
+Run the service-layer benchmarks and write the results as JSON.
+
+The workload is generated into a fresh database (a temporary WAL SQLite
+file unless --database-url names an empty database), then each case is
+warmed up once and timed for its number of rounds.
+
+Usage:
+    python -m benchmarks.run [case ...] [--users N] [--years N] [--rounds N]
+                             [--database-url URL] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from statistics import mean, median, pstdev
+from typing import Dict, List, Optional
+
+# Benchmarks run from the project root; the config must not require a .env
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+os.environ.setdefault('ENVIRONMENT', 'benchmark')
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.database import Base, create_db_engine  # noqa: E402
+
+from .cases import CASES, BenchContext  # noqa: E402
+from .generator import WorkloadSpec, generate  # noqa: E402
+
+RESULTS_VERSION = 1
+
+
+def summarize(samples_ns: List[int]) -> Dict[str, float]:
+    """
+    Summarize timing samples in milliseconds.
+
+    Args:
+        samples_ns: Durations of the timed calls in nanoseconds
+
+    Returns:
+        Dict[str, float]: min, median, mean, p95, max and stddev
+    """
+    ms = sorted(sample / 1e6 for sample in samples_ns)
+    p95 = ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))]
+    return {
+        'rounds': len(ms),
+        'min_ms': round(ms[0], 4),
+        'median_ms': round(median(ms), 4),
+        'mean_ms': round(mean(ms), 4),
+        'p95_ms': round(p95, 4),
+        'max_ms': round(ms[-1], 4),
+        'stddev_ms': round(pstdev(ms), 4),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    """Current commit and a dirty marker, if run inside a git checkout."""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{revision}-dirty" if dirty else revision
+
+
+def run(case_names: List[str], spec: WorkloadSpec, database_url: str,
+        rounds: Optional[int] = None) -> Dict[str, object]:
+    """
+    Generate the workload and time the selected cases.
+
+    Args:
+        case_names: Cases to run, in order
+        spec: Workload to generate
+        database_url: Empty database to generate into
+        rounds: Timed calls per case, defaults to each case's own
+
+    Returns:
+        Dict[str, object]: JSON-serializable results document
+    """
+    engine = create_db_engine(database_url, echo=False)
+    Base.metadata.create_all(engine)
+    sessions = sessionmaker(bind=engine, autoflush=False)
+
+    started = time.perf_counter()
+    with sessions() as db:
+        workload = generate(db, spec)
+    generate_seconds = time.perf_counter() - started
+
+    results = {}
+    for name in case_names:
+        bench_case = CASES[name]
+        case_rounds = rounds or bench_case.rounds
+        target = bench_case.setup(BenchContext(sessions=sessions, workload=workload, rounds=case_rounds))
+        target()  # warm-up: statement caches, lazy imports
+        samples = []
+        for _ in range(case_rounds):
+            start = time.perf_counter_ns()
+            target()
+            samples.append(time.perf_counter_ns() - start)
+        results[name] = summarize(samples)
+        print(f"{name:<20} median {results[name]['median_ms']:>9.3f} ms   "
+              f"p95 {results[name]['p95_ms']:>9.3f} ms   ({case_rounds} rounds)", file=sys.stderr)
+    engine.dispose()
+
+    return {
+        'version': RESULTS_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'database': engine.dialect.name,
+        'workload': spec.as_dict(),
+        'generate_seconds': round(generate_seconds, 3),
+        'results': results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the service-layer benchmarks.")
+    parser.add_argument('cases', nargs='*', default=list(CASES), help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument('--departments', type=int, default=WorkloadSpec.departments)
+    parser.add_argument('--users', type=int, default=WorkloadSpec.users)
+    parser.add_argument('--years', type=int, default=WorkloadSpec.years)
+    parser.add_argument('--seed', type=int, default=WorkloadSpec.seed)
+    parser.add_argument('--rounds', type=int, help="timed calls per case (default: per case)")
+    parser.add_argument('--database-url', help="empty database to use (default: temporary SQLite file)")
+    parser.add_argument('--output', help="write results JSON here (default: stdout)")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    spec = WorkloadSpec(departments=args.departments, users=args.users, years=args.years, seed=args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        document = run(args.cases, spec, database_url, args.rounds)
+
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+from typing import Iterable
+from nicegui import ui
+from src.services.event_bus import event_bus, EventHandler
+
+
+def subscribe_page(events: Iterable[str], handler: EventHandler) -> None:
+    """
+    Subscribe the current page to service events for as long as its client lives.
+
+    The handler receives the event name and payload and should patch only the
+    elements it owns (table rows, labels). The subscription is removed when the
+    client is deleted, so closed tabs do not leak handlers.
+
+    Args:
+        events: Event names to subscribe to
+        handler: Callable receiving (event, payload)
+    """
+    client = ui.context.client
+    unsubscribers = [event_bus.subscribe(event, handler) for event in events]
+
+    def unsubscribe_all():
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+
+    client.on_delete(unsubscribe_all)
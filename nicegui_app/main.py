@@ -4,12 +4,40 @@ import re
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.database import get_db
+from src.services.directory_cache import directory_cache
 from nicegui_app.pages.login import login_page
 from nicegui_app.pages.dashboard import dashboard_page
 from nicegui_app.pages.request_form import request_form_page
+from nicegui_app.pages.remote_work import remote_work_page
+from nicegui_app.pages.calendar import calendar_page
+from nicegui_app.pages.diagnostics import diagnostics_page
+from nicegui_app.routes.feeds import router as feeds_router
+from nicegui_app.routes.metrics import router as metrics_router
+from nicegui_app.routes.api import api
+from nicegui_app.components.live_updates import subscribe_page
+from src.models.pto_request import RequestStatus
+from src.schemas.read_models import table_rows
+from src.services.request_workflow import RequestAction, can_transition
+from src.utils.pto_units import DayPart
+from src.observability import MetricsMiddleware, QueryStatsMiddleware
+from src.scheduler import scheduler
+from src.services.event_bus import (
+    REQUEST_SUBMITTED,
+    REQUEST_APPROVED,
+    REQUEST_ESCALATED,
+    REQUEST_DENIED,
+    REQUEST_CANCELLED,
+)
 
 # Set up basic app configuration
 app.title = "TJM Time Calendar"
+app.include_router(feeds_router)
+app.include_router(metrics_router)
+app.mount('/api/v1', api)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.on_startup(scheduler.start)
+app.on_shutdown(scheduler.stop)
 
 @ui.page('/')
 def home():
@@ -26,11 +54,34 @@ def submit_request():
     """PTO Request submission page."""
     request_form_page()
 
+@ui.page('/remote')
+def remote_work():
+    """Remote work day booking page."""
+    remote_work_page()
+
 @ui.page('/calendar')
 def calendar():
-    """Calendar view page."""
-    ui.label('Calendar View - Coming in Session 5').classes('text-2xl')
-    ui.button('Back to Dashboard', on_click=lambda: ui.navigate.to('/dashboard'))
+    """Team calendar view page."""
+    calendar_page()
+
+def _status_display(req) -> str:
+    """Status label, with the reason for denied requests."""
+    if req.status == RequestStatus.DENIED and req.denial_reason:
+        return f'{req.status.title()} ({req.denial_reason})'
+    return req.status.title()
+
+
+# Row converter of the history table, built once
+_history_rows = table_rows(
+    id=lambda req: req.id,
+    type=lambda req: req.pto_type.title(),
+    start_date=lambda req: req.start_date.strftime('%Y-%m-%d'),
+    end_date=lambda req: req.end_date.strftime('%Y-%m-%d'),
+    days=lambda req: req.total_days,
+    status=_status_display,
+    submitted=lambda req: req.submitted_at.strftime('%Y-%m-%d %H:%M'),
+)
+
 
 @ui.page('/requests')
 def requests():
@@ -47,7 +98,7 @@ def requests():
         db = next(get_db())
         try:
             from src.services.pto_service import PTOService
-            user_requests = PTOService.get_user_requests(db, user['id'])
+            user_requests = PTOService(db).list_user_requests(user['id'])
             
             if not user_requests:
                 ui.label('No requests yet').classes('text-xl text-gray-500 text-center mt-8')
@@ -61,23 +112,7 @@ def requests():
                     {'name': 'submitted', 'label': 'Submitted', 'field': 'submitted', 'align': 'left'}
                 ]
                 
-                rows = []
-                for req in user_requests:
-                    status_display = req.status.title()
-                    if req.status == 'denied' and req.denial_reason:
-                        status_display += f' ({req.denial_reason})'
-                    
-                    rows.append({
-                        'id': req.id,
-                        'type': req.pto_type.title(),
-                        'start_date': req.start_date.strftime('%Y-%m-%d'),
-                        'end_date': req.end_date.strftime('%Y-%m-%d'),
-                        'days': req.total_days,
-                        'status': status_display,
-                        'submitted': req.submitted_at.strftime('%Y-%m-%d %H:%M')
-                    })
-                
-                ui.table(columns=columns, rows=rows, row_key='id').classes('w-full')
+                ui.table(columns=columns, rows=_history_rows(user_requests), row_key='id').classes('w-full')
         
         finally:
             db.close()
@@ -97,52 +132,144 @@ def manager():
     with ui.column().classes('w-full max-w-6xl mx-auto mt-8 p-6'):
         ui.label('Manager Dashboard - Pending PTO Requests').classes('text-3xl font-bold mb-6')
 
-        # Get pending requests
+        # Get the requests waiting for this manager, including as a delegate
+        manager_id = app.storage.general.get('user').get('id')
         db = next(get_db())
         try:
             from src.services.pto_service import PTOService
-            pending_requests = PTOService.get_pending_requests_with_employee_info(db)
+            pending_requests = PTOService.get_pending_requests_with_employee_info(db, manager_id)
+        finally:
+            db.close()
 
-            if not pending_requests:
-                ui.label('No pending requests').classes('text-xl text-gray-500 text-center mt-8')
-            else:
-                # Create table with pending requests
-                columns = [
-                    {'name': 'employee_name', 'label': 'Employee', 'field': 'employee_name', 'align': 'left'},
-                    {'name': 'pto_type', 'label': 'Type', 'field': 'pto_type', 'align': 'left'},
-                    {'name': 'start_date', 'label': 'Start Date', 'field': 'start_date', 'align': 'left'},
-                    {'name': 'end_date', 'label': 'End Date', 'field': 'end_date', 'align': 'left'},
-                    {'name': 'total_days', 'label': 'Days', 'field': 'total_days', 'align': 'center'},
-                    {'name': 'submitted_at', 'label': 'Submitted', 'field': 'submitted_at', 'align': 'left'}
-                ]
+        empty_label = ui.label('No pending requests').classes('text-xl text-gray-500 text-center mt-8')
+
+        # Create table with pending requests
+        columns = [
+            {'name': 'employee_name', 'label': 'Employee', 'field': 'employee_name', 'align': 'left'},
+            {'name': 'pto_type', 'label': 'Type', 'field': 'pto_type', 'align': 'left'},
+            {'name': 'start_date', 'label': 'Start Date', 'field': 'start_date', 'align': 'left'},
+            {'name': 'end_date', 'label': 'End Date', 'field': 'end_date', 'align': 'left'},
+            {'name': 'total_days', 'label': 'Days', 'field': 'total_days', 'align': 'center'},
+            {'name': 'submitted_at', 'label': 'Submitted', 'field': 'submitted_at', 'align': 'left'}
+        ]
+
+        table = ui.table(columns=columns, rows=[_pending_row(req) for req in pending_requests], row_key='request_id')
+        table.classes('w-full')
+
+        def refresh_visibility():
+            table.set_visibility(bool(table.rows))
+            empty_label.set_visibility(not table.rows)
+
+        refresh_visibility()
+
+        # Make rows clickable
+        def on_row_click(e):
+            request_id = e.args[1]['request_id']
+            ui.navigate.to(f'/manager/request/{request_id}')
+
+        table.on('rowClick', on_row_click)
+
+        # Patch rows as requests are submitted, escalated or decided elsewhere
+        def on_request_event(event, payload):
+            approver_ids = payload.get('approver_ids')
+            table.remove_row({'request_id': payload['request_id']})
+            mine_to_decide = payload['user_id'] != manager_id and (approver_ids is None or manager_id in approver_ids)
+            if payload['status'] == RequestStatus.PENDING and mine_to_decide:
+                table.rows.insert(0, _pending_row(payload))
+                table.update()
+            refresh_visibility()
+
+        subscribe_page(
+            [REQUEST_SUBMITTED, REQUEST_ESCALATED, REQUEST_APPROVED, REQUEST_DENIED, REQUEST_CANCELLED],
+            on_request_event
+        )
+
+        _delegation_card(manager_id)
+
+        ui.button('Back to Admin Panel', on_click=lambda: ui.navigate.to('/admin')).classes('mt-4')
+
+
+def _delegation_card(manager_id: int) -> None:
+    """Card listing a manager's approval delegations, with a form to delegate while away."""
+    from datetime import date, timedelta
+    from src.schemas.approval_schemas import ApprovalDelegationCreate
+    from src.services.approval_service import ApprovalService
+
+    with ui.card().classes('w-full p-4 mt-6'):
+        ui.label('Approval Delegation').classes('text-xl font-bold mb-2')
+        entries = ui.column().classes('w-full')
+
+        def load():
+            entries.clear()
+            db = next(get_db())
+            try:
+                directory = directory_cache.get(db)
+                service = ApprovalService(db)
+                with entries:
+                    for delegation in service.list_delegations(manager_id):
+                        if delegation.end_date < date.today():
+                            continue
+                        if delegation.delegator_id == manager_id:
+                            who = f"{directory.user_name(delegation.delegate_id)} decides your requests"
+                        else:
+                            who = f"You decide {directory.user_name(delegation.delegator_id)}'s requests"
+                        with ui.row().classes('items-center gap-4'):
+                            ui.label(f"{who} from {delegation.start_date} to {delegation.end_date}")
+                            if delegation.delegator_id == manager_id:
+                                ui.button('Revoke', on_click=lambda _, d=delegation.id: revoke(d)).props('flat')
+            finally:
+                db.close()
+
+        def revoke(delegation_id):
+            db = next(get_db())
+            try:
+                ApprovalService(db).revoke_delegation(delegation_id)
+            finally:
+                db.close()
+            load()
 
-                # Format dates for display
-                formatted_requests = []
-                for req in pending_requests:
-                    formatted_requests.append({
-                        'request_id': req['request_id'],
-                        'employee_name': req['employee_name'],
-                        'pto_type': req['pto_type'].title(),
-                        'start_date': req['start_date'].strftime('%Y-%m-%d'),
-                        'end_date': req['end_date'].strftime('%Y-%m-%d'),
-                        'total_days': req['total_days'],
-                        'submitted_at': req['submitted_at'].strftime('%Y-%m-%d %H:%M')
-                    })
-
-                table = ui.table(columns=columns, rows=formatted_requests, row_key='request_id')
-                table.classes('w-full')
-
-                # Make rows clickable
-                def on_row_click(e):
-                    request_id = e.args[1]['request_id']
-                    ui.navigate.to(f'/manager/request/{request_id}')
-
-                table.on('rowClick', on_row_click)
+        def delegate():
+            db = next(get_db())
+            try:
+                ApprovalService(db).create_delegation(ApprovalDelegationCreate(
+                    delegator_id=manager_id,
+                    delegate_id=delegate_select.value,
+                    start_date=date.fromisoformat(start_input.value),
+                    end_date=date.fromisoformat(end_input.value)
+                ))
+                ui.notify('Delegation saved', type='positive')
+            except (TypeError, ValueError) as e:
+                ui.notify(str(e), type='negative', multi_line=True)
+            finally:
+                db.close()
+            load()
 
+        load()
+        db = next(get_db())
+        try:
+            directory = directory_cache.get(db)
+            options = {**directory.users_with_role('manager'), **directory.users_with_role('admin')}
         finally:
             db.close()
+        options.pop(manager_id, None)
+        with ui.row().classes('w-full items-center gap-4'):
+            delegate_select = ui.select(options, label='Delegate').classes('flex-1')
+            start_input = ui.input('From', value=date.today().isoformat()).props('type=date')
+            end_input = ui.input('To', value=(date.today() + timedelta(days=7)).isoformat()).props('type=date')
+            ui.button('Delegate', on_click=delegate)
 
-        ui.button('Back to Admin Panel', on_click=lambda: ui.navigate.to('/admin')).classes('mt-4')
+
+def _pending_row(req) -> dict:
+    """Format a pending request mapping as a manager table row."""
+    return {
+        'request_id': req['request_id'],
+        'employee_name': req['employee_name'],
+        'pto_type': req['pto_type'].title(),
+        'start_date': req['start_date'].strftime('%Y-%m-%d'),
+        'end_date': req['end_date'].strftime('%Y-%m-%d'),
+        'total_days': req['total_days'],
+        'submitted_at': req['submitted_at'].strftime('%Y-%m-%d %H:%M')
+    }
 
 @ui.page('/manager/request/{request_id}')
 def manager_request_detail(request_id: int):
@@ -178,31 +305,49 @@ def manager_request_detail(request_id: int):
                 ui.label(f"Type: {request.pto_type.title()}")
                 ui.label(f"Start Date: {request.start_date.strftime('%Y-%m-%d')}")
                 ui.label(f"End Date: {request.end_date.strftime('%Y-%m-%d')}")
-                ui.label(f"Total Days: {request.total_days}")
+                ui.label(f"Total Days: {request.total_days} ({DayPart.LABELS.get(request.day_part, request.day_part)})")
                 ui.label(f"Status: {request.status.title()}")
+                if request.is_pending:
+                    from src.services.approval_service import ApprovalService
+                    approver = ApprovalService(db).current_approver(request)
+                    if approver is not None:
+                        ui.label(f"Waiting for: {directory_cache.get(db).user_name(approver)}")
                 ui.label(f"Submitted: {request.submitted_at.strftime('%Y-%m-%d %H:%M')}")
                 if request.notes:
                     ui.label(f"Notes: {request.notes}")
             
+            # History Card
+            with ui.card().classes('w-full p-4 mb-4'):
+                ui.label('History').classes('text-xl font-bold mb-2')
+                for entry in PTOService(db).get_request_history(request_id):
+                    line = f"{entry.created_at.strftime('%Y-%m-%d %H:%M')} - {entry.action.title()}: {entry.to_status.title()}"
+                    if entry.note:
+                        line += f" ({entry.note})"
+                    ui.label(line)
+            
             # Current Balance Card
             with ui.card().classes('w-full p-4 mb-4'):
                 ui.label('Current PTO Balance').classes('text-xl font-bold mb-2')
-                ui.label(f"Vacation: {balance.vacation_total - balance.vacation_used:.1f} available")
-                ui.label(f"Sick: {balance.sick_total - balance.sick_used:.1f} available")
-                ui.label(f"Personal: {balance.personal_total - balance.personal_used:.1f} available")
+                ui.label(f"Vacation: {balance.vacation_available:.2f} available")
+                ui.label(f"Sick: {balance.sick_available:.2f} available")
+                ui.label(f"Personal: {balance.personal_available:.2f} available")
             
             # Approval Actions
-            if request.status == 'pending':
+            if can_transition(request.status, RequestAction.APPROVE):
                 with ui.row().classes('gap-4 mt-6'):
                     def approve():
                         db = next(get_db())
                         try:
                             user_id = app.storage.general.get('user').get('id')
-                            if PTOService.approve_request(db, request_id, user_id):
-                                ui.notify('Request approved!', type='positive')
+                            decided = PTOService(db).approve_request(request_id, user_id)
+                            if decided:
+                                ui.notify('Passed to the next approver' if decided.is_pending else 'Request approved!',
+                                          type='positive')
                                 ui.navigate.to('/manager')
                             else:
                                 ui.notify('Error approving request', type='negative')
+                        except ValueError as e:
+                            ui.notify(str(e), type='negative')
                         finally:
                             db.close()
                     
@@ -211,11 +356,13 @@ def manager_request_detail(request_id: int):
                         try:
                             reason = denial_input.value or 'No reason provided'
                             user_id = app.storage.general.get('user').get('id')
-                            if PTOService.deny_request(db, request_id, user_id, reason):
+                            if PTOService(db).deny_request(request_id, user_id, reason):
                                 ui.notify('Request denied', type='warning')
                                 ui.navigate.to('/manager')
                             else:
                                 ui.notify('Error denying request', type='negative')
+                        except ValueError as e:
+                            ui.notify(str(e), type='negative')
                         finally:
                             db.close()
                     
@@ -264,7 +411,9 @@ def admin_panel():
                     ui.label('View PTO usage and analytics').classes('text-gray-400 text-center')
                     ui.label('Coming Soon').classes('text-gray-400 font-semibold')
         
-        ui.button('Back to Dashboard', on_click=lambda: ui.navigate.to('/dashboard')).classes('mt-8')
+        with ui.row().classes('gap-4 mt-8'):
+            ui.button('Diagnostics', icon='speed', on_click=lambda: ui.navigate.to('/admin/diagnostics'))
+            ui.button('Back to Dashboard', on_click=lambda: ui.navigate.to('/dashboard'))
 
 @ui.page('/admin/departments')
 def admin_departments():
@@ -283,15 +432,15 @@ def admin_departments():
                 name_input = ui.input('Department Name').classes('flex-1')
                 code_input = ui.input('Department Code').classes('flex-1')
             
+            db = next(get_db())
+            try:
+                directory = directory_cache.get(db)
+            finally:
+                db.close()
+            
             with ui.row().classes('w-full gap-4 mt-4'):
-                db = next(get_db())
-                try:
-                    from src.services.user_service import UserService
-                    managers = UserService.get_users_by_role(db, 'manager')
-                    manager_options = {0: 'No Manager'}
-                    manager_options.update({m.id: f'{m.first_name} {m.last_name}' for m in managers})
-                finally:
-                    db.close()
+                manager_options = {0: 'No Manager'}
+                manager_options.update(directory.users_with_role('manager'))
                 
                 manager_select = ui.select(manager_options, label='Manager', value=0).classes('flex-1')
                 
@@ -314,45 +463,35 @@ def admin_departments():
                 
                 ui.button('Create Department', on_click=create_dept, color='primary')
         
-        db = next(get_db())
-        try:
-            from src.services.department_service import DepartmentService
-            departments = DepartmentService.get_all_departments(db)
-            
-            if not departments:
-                ui.label('No departments yet').classes('text-xl text-gray-500 text-center mt-8')
-            else:
-                columns = [
-                    {'name': 'name', 'label': 'Name', 'field': 'name', 'align': 'left'},
-                    {'name': 'code', 'label': 'Code', 'field': 'code', 'align': 'left'},
-                    {'name': 'manager', 'label': 'Manager', 'field': 'manager', 'align': 'left'},
-                    {'name': 'active', 'label': 'Active', 'field': 'active', 'align': 'center'},
-                ]
-                
-                rows = []
-                for dept in departments:
-                    manager_name = 'No Manager'
-                    if dept.manager_id:
-                        from src.services.user_service import UserService
-                        manager = UserService(db).get_user_by_id(dept.manager_id)
-                        if manager:
-                            manager_name = f'{manager.first_name} {manager.last_name}'
-                    
-                    rows.append({
-                        'id': dept.id,
-                        'name': dept.name,
-                        'code': dept.code,
-                        'manager': manager_name,
-                        'active': 'Yes' if dept.is_active else 'No'
-                    })
-                
-                ui.table(columns=columns, rows=rows, row_key='id').classes('w-full')
+        departments = list(directory.departments.values())
         
-        finally:
-            db.close()
+        if not departments:
+            ui.label('No departments yet').classes('text-xl text-gray-500 text-center mt-8')
+        else:
+            columns = [
+                {'name': 'name', 'label': 'Name', 'field': 'name', 'align': 'left'},
+                {'name': 'code', 'label': 'Code', 'field': 'code', 'align': 'left'},
+                {'name': 'manager', 'label': 'Manager', 'field': 'manager', 'align': 'left'},
+                {'name': 'active', 'label': 'Active', 'field': 'active', 'align': 'center'},
+            ]
+            
+            rows = [{
+                'id': dept.id,
+                'name': dept.name,
+                'code': dept.code,
+                'manager': directory.user_name(dept.manager_id, 'No Manager'),
+                'active': 'Yes' if dept.is_active else 'No'
+            } for dept in departments]
+            
+            ui.table(columns=columns, rows=rows, row_key='id').classes('w-full')
         
         ui.button('Back to Admin Panel', on_click=lambda: ui.navigate.to('/admin')).classes('mt-4')
 
+@ui.page('/admin/diagnostics')
+def admin_diagnostics():
+    """Admin page with SQL query statistics."""
+    diagnostics_page()
+
 @ui.page('/admin/employees')
 def admin_employees():
     """Admin page for managing employees."""
@@ -369,14 +508,10 @@ def admin_employees():
         db = next(get_db())
         try:
             from src.services.user_service import UserService
-            from src.services.department_service import DepartmentService
-            
-            # Get all users and departments
-            users = UserService(db).get_all_users()
-            departments = DepartmentService.get_all_departments(db)
             
-            # Create department lookup
-            dept_lookup = {dept.id: dept.name for dept in departments}
+            # Get all users as plain rows; department names come from the cached directory
+            users = UserService(db).list_users()
+            directory = directory_cache.get(db)
             
             if not users:
                 ui.label('No employees yet').classes('text-xl text-gray-500 text-center mt-8')
@@ -417,7 +552,7 @@ def admin_employees():
                     for user in users:
                         department_name = 'No Department'
                         if user.department_id:
-                            department_name = dept_lookup.get(user.department_id, 'Unknown Department')
+                            department_name = directory.department_name(user.department_id, 'Unknown Department')
                         
                         with ui.row().classes('w-full p-3 border-b items-center'):
                             ui.label(f'{user.first_name} {user.last_name}').classes('w-1/6')
@@ -475,10 +610,8 @@ def admin_employees_add():
                 # Get departments for dropdown
                 db = next(get_db())
                 try:
-                    from src.services.department_service import DepartmentService
-                    departments = DepartmentService.get_all_departments(db)
                     dept_options = {None: 'No Department'}
-                    dept_options.update({dept.id: dept.name for dept in departments})
+                    dept_options.update(directory_cache.get(db).department_options())
                 finally:
                     db.close()
                 
@@ -643,10 +776,8 @@ def admin_employees_edit(user_id: int):
                 # Row 5: Department | Role
                 with ui.row().classes('w-full gap-4'):
                     # Get departments for dropdown
-                    from src.services.department_service import DepartmentService
-                    departments = DepartmentService.get_all_departments(db)
                     dept_options = {None: 'No Department'}
-                    dept_options.update({dept.id: dept.name for dept in departments})
+                    dept_options.update(directory_cache.get(db).department_options())
                     
                     department_select = ui.select(dept_options, label='Department', value=user.department_id).classes('flex-1')
                     
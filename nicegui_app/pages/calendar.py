@@ -0,0 +1,149 @@
+from nicegui import ui, app
+from src.services.calendar_service import CalendarService, DayStatus, TeamCalendar
+from src.services.directory_cache import directory_cache
+from src.services.ics_service import FEED_DEPARTMENT, FEED_MARKET, FEED_USER, feed_path
+from src.config import get_config
+from src.database import get_db
+from datetime import date
+from html import escape
+import calendar as pycalendar
+from src.utils import lazy
+
+# CSS class per DayStatus code, indexed by the matrix values
+_CELL_CLASSES = ('', 'pto-pending', 'pto-partial', 'pto-approved')
+
+_STYLES = '''
+<style>
+.team-cal { border-collapse: collapse; font-size: 12px; }
+.team-cal th, .team-cal td { border: 1px solid #e5e7eb; width: 26px; height: 22px; text-align: center; padding: 0; }
+.team-cal th.name, .team-cal td.name { width: auto; min-width: 160px; text-align: left; padding: 0 6px; white-space: nowrap; }
+.team-cal .closed { background: #f3f4f6; }
+.team-cal .holiday { background: #fde68a; }
+.team-cal .pto-pending { background: #fcd34d; }
+.team-cal .pto-partial { background: #93c5fd; }
+.team-cal .pto-approved { background: #22c55e; }
+.team-cal tfoot td { font-weight: 600; }
+</style>
+'''
+
+
+def render_team_calendar_html(cal: TeamCalendar) -> str:
+    """
+    Render a team calendar as a single HTML table.
+
+    One element for the whole grid keeps large departments cheap to send and
+    to update compared with one UI element per cell.
+    """
+    np = lazy.numpy()
+    holiday_cols = np.array([day in cal.holidays for day in cal.days])
+    column_classes = np.where(holiday_cols, 'holiday', np.where(cal.closed, 'closed', ''))
+
+    header = ''.join(
+        f'<th class="{css}" title="{escape(cal.holidays.get(day, ""))}">{day.day}<br>{day.strftime("%a")[0]}</th>'
+        for day, css in zip(cal.days, column_classes)
+    )
+
+    # Status colours win over the weekend/holiday shading of their column
+    cells = np.array(_CELL_CLASSES)[cal.matrix]
+    cells = np.where(cells == '', column_classes[None, :], cells)
+    body = ''.join(
+        f'<tr><td class="name">{escape(name)}</td>'
+        + ''.join(f'<td class="{css}"></td>' for css in row)
+        + '</tr>'
+        for (_, name), row in zip(cal.members, cells)
+    )
+
+    footer = ''.join(
+        f'<td class="{css}">{count or ""}</td>'
+        for count, css in zip(cal.out_counts().tolist(), column_classes)
+    )
+
+    return (
+        f'<table class="team-cal"><thead><tr><th class="name">Employee</th>{header}</tr></thead>'
+        f'<tbody>{body}</tbody>'
+        f'<tfoot><tr><td class="name">Out</td>{footer}</tr></tfoot></table>'
+    )
+
+
+def calendar_page():
+    """Team calendar page showing a department's PTO for one month."""
+
+    # Check if user is logged in
+    user = app.storage.general.get('user')
+    if not user:
+        ui.navigate.to('/')
+        return
+
+    can_pick_department = user.get('role') in ('manager', 'admin')
+    today = date.today()
+    state = {'year': today.year, 'month': today.month, 'department_id': user.get('department_id')}
+
+    db = next(get_db())
+    try:
+        departments = {d.id: d.name for d in directory_cache.get(db).departments.values() if d.is_active}
+    finally:
+        db.close()
+
+    ui.add_head_html(_STYLES)
+
+    @ui.refreshable
+    def grid():
+        db = next(get_db())
+        try:
+            cal = CalendarService(db).get_team_calendar(state['year'], state['month'], state['department_id'])
+        finally:
+            db.close()
+
+        ui.label(f"{pycalendar.month_name[cal.month]} {cal.year}").classes('text-xl font-semibold')
+        if not cal.members:
+            ui.label('No employees in this department').classes('text-gray-600')
+            return
+        ui.html(render_team_calendar_html(cal), sanitize=False).classes('overflow-x-auto w-full')
+        if cal.holidays:
+            ui.label('Market holidays: ' + ', '.join(
+                f"{day.strftime('%b %d')} {name}" for day, name in sorted(cal.holidays.items())
+            )).classes('text-sm text-gray-600')
+
+    def shift_month(delta):
+        month_index = state['year'] * 12 + state['month'] - 1 + delta
+        state['year'], state['month'] = divmod(month_index, 12)
+        state['month'] += 1
+        grid.refresh()
+
+    def pick_department(e):
+        state['department_id'] = e.value
+        grid.refresh()
+
+    with ui.column().classes('w-full max-w-7xl mx-auto mt-8 p-6'):
+        ui.label('Team Calendar').classes('text-3xl font-bold mb-4')
+
+        with ui.row().classes('items-center gap-4 mb-4'):
+            ui.button('◀', on_click=lambda: shift_month(-1))
+            ui.button('Today', on_click=lambda: (state.update(year=today.year, month=today.month), grid.refresh()))
+            ui.button('▶', on_click=lambda: shift_month(1))
+            if can_pick_department:
+                ui.select(departments, value=state['department_id'], label='Department',
+                          on_change=pick_department).classes('w-64')
+            with ui.row().classes('gap-3 text-sm'):
+                for css, label in (('pto-approved', DayStatus.LABELS[DayStatus.APPROVED]),
+                                   ('pto-partial', DayStatus.LABELS[DayStatus.PARTIAL]),
+                                   ('pto-pending', DayStatus.LABELS[DayStatus.PENDING]),
+                                   ('holiday', 'Market holiday')):
+                    ui.html(f'<span class="team-cal"><span class="{css}" style="padding:0 8px"></span> {label}</span>',
+                            sanitize=False)
+
+        grid()
+
+        with ui.expansion('Subscribe in Outlook / Google Calendar', icon='event').classes('w-full mt-4'):
+            request = ui.context.client.request
+            base_url = str(request.base_url).rstrip('/') if request else ''
+            feeds = [('My approved PTO', FEED_USER, user['id'])]
+            if user.get('department_id'):
+                feeds.append(('My department', FEED_DEPARTMENT, user['department_id']))
+            market = get_config().PRIMARY_MARKET
+            feeds.append((f'{market} market holidays', FEED_MARKET, market))
+            for label, kind, key in feeds:
+                ui.label(label).classes('font-medium')
+                ui.input(value=base_url + feed_path(kind, key)).props('readonly dense').classes('w-full mb-2')
+
+        ui.button('Back to Dashboard', on_click=lambda: ui.navigate.to('/dashboard')).classes('mt-4')
@@ -1,10 +1,40 @@
 from nicegui import ui, app
 from src.services.balance_service import BalanceService
 from src.services.pto_service import PTOService
+from src.services.forecast_service import ForecastService
+from src.services.directory_cache import directory_cache
+from src.services.event_bus import (
+    BALANCE_CHANGED,
+    REQUEST_APPROVED,
+    REQUEST_DENIED,
+    REQUEST_CANCELLED,
+)
 from src.database import get_db
+from nicegui_app.components.live_updates import subscribe_page
 from datetime import datetime
 
 
+def _balance_column(title, available, total):
+    """Render one balance column and return its label and progress bar."""
+    with ui.column().classes('flex-1'):
+        ui.label(title).classes('font-medium')
+        label = ui.label()
+        progress = ui.linear_progress(0).classes('w-full')
+    _set_balance(label, progress, available, total)
+    return label, progress
+
+
+def _set_balance(label, progress, available, total):
+    """Update a balance label and progress bar in place."""
+    available = float(available)
+    total = float(total)
+    pct = available / total if total > 0 else 0
+    
+    label.text = f'{available} available of {total} total'
+    progress.value = pct
+    progress.props(f"color={'positive' if pct > 0.5 else 'warning' if pct > 0.25 else 'negative'}")
+
+
 def dashboard_page():
     """Employee dashboard page with PTO balances, quick actions, and recent requests."""
     
@@ -30,7 +60,7 @@ def dashboard_page():
         balance = balance_service.get_or_create_balance(user_id, 2025)
         
         # Get user's recent requests (last 5)
-        recent_requests = PTOService.get_user_requests(db, user_id)[:5]
+        recent_requests = pto_service.list_user_requests(user_id, limit=5)
         
         ui.label(f'Welcome, {user_first_name}!').classes('text-3xl font-bold mb-6')
         
@@ -40,51 +70,58 @@ def dashboard_page():
             
             if balance:
                 with ui.row().classes('w-full gap-4'):
-                    # Vacation balance
-                    with ui.column().classes('flex-1'):
-                        ui.label('Vacation').classes('font-medium')
-                        vacation_available = float(balance.vacation_available)
-                        vacation_total = float(balance.vacation_total)
-                        vacation_pct = vacation_available / vacation_total if vacation_total > 0 else 0
-                        
-                        ui.label(f'{vacation_available} available of {vacation_total} total')
-                        
-                        color = 'positive' if vacation_pct > 0.5 else 'warning' if vacation_pct > 0.25 else 'negative'
-                        ui.linear_progress(vacation_pct, color=color).classes('w-full')
-                    
-                    # Sick balance
-                    with ui.column().classes('flex-1'):
-                        ui.label('Sick').classes('font-medium')
-                        sick_available = float(balance.sick_available)
-                        sick_total = float(balance.sick_total)
-                        sick_pct = sick_available / sick_total if sick_total > 0 else 0
-                        
-                        ui.label(f'{sick_available} available of {sick_total} total')
-                        
-                        color = 'positive' if sick_pct > 0.5 else 'warning' if sick_pct > 0.25 else 'negative'
-                        ui.linear_progress(sick_pct, color=color).classes('w-full')
-                    
-                    # Personal balance
-                    with ui.column().classes('flex-1'):
-                        ui.label('Personal').classes('font-medium')
-                        personal_available = float(balance.personal_available)
-                        personal_total = float(balance.personal_total)
-                        personal_pct = personal_available / personal_total if personal_total > 0 else 0
-                        
-                        ui.label(f'{personal_available} available of {personal_total} total')
-                        
-                        color = 'positive' if personal_pct > 0.5 else 'warning' if personal_pct > 0.25 else 'negative'
-                        ui.linear_progress(personal_pct, color=color).classes('w-full')
+                    balance_widgets = {
+                        'vacation': _balance_column('Vacation', balance.vacation_available, balance.vacation_total),
+                        'sick': _balance_column('Sick', balance.sick_available, balance.sick_total),
+                        'personal': _balance_column('Personal', balance.personal_available, balance.personal_total),
+                    }
+                
+                balance_year = balance.year
+                
+                def on_balance_changed(event, payload):
+                    if payload['user_id'] != user_id or payload['year'] != balance_year:
+                        return
+                    for key, (label, progress) in balance_widgets.items():
+                        _set_balance(label, progress, payload[f'{key}_available'], payload[f'{key}_total'])
+                
+                subscribe_page([BALANCE_CHANGED], on_balance_changed)
             else:
                 ui.label('No balance data for 2025').classes('text-gray-600')
         
-        # Section B: Quick Actions
+        # Section B: Vacation outlook; managers see their department, in one forecast
+        with ui.card().classes('w-full mb-6'):
+            ui.label('Vacation Outlook (next 12 months)').classes('text-xl font-semibold mb-4')
+            
+            names = {user_id: 'You'}
+            department_id = user_data.get('department_id')
+            if user_role == 'manager' and department_id:
+                directory = directory_cache.get(db)
+                names.update({
+                    member.id: member.name for member in directory.users.values()
+                    if member.department_id == department_id and member.is_active and member.id != user_id
+                })
+            
+            forecast = ForecastService(db).forecast(list(names))
+            days = forecast.available_days()
+            ui.echart({
+                'tooltip': {'trigger': 'axis'},
+                'legend': {'type': 'scroll'},
+                'xAxis': {'type': 'category', 'data': [month.strftime('%b %Y') for month in forecast.months]},
+                'yAxis': {'type': 'value', 'name': 'Days available'},
+                'series': [
+                    {'type': 'line', 'step': 'end', 'name': names[member_id], 'data': days[i].tolist()}
+                    for i, member_id in enumerate(forecast.user_ids)
+                ],
+            }).classes('w-full h-64')
+        
+        # Section C: Quick Actions
         with ui.card().classes('w-full mb-6'):
             ui.label('Quick Actions').classes('text-xl font-semibold mb-4')
             
             with ui.row().classes('w-full gap-4'):
                 ui.button('Submit PTO Request', on_click=lambda: ui.navigate.to('/submit-request'), color='primary').classes('flex-1')
                 ui.button('View Calendar', on_click=lambda: ui.navigate.to('/calendar'), color='secondary').classes('flex-1')
+                ui.button('Remote Days', on_click=lambda: ui.navigate.to('/remote'), color='secondary').classes('flex-1')
                 ui.button('Request History', on_click=lambda: ui.navigate.to('/requests'), color='secondary').classes('flex-1')
                 
                 # Add manager button if user has manager role
@@ -95,7 +132,7 @@ def dashboard_page():
                 if user_role == 'admin':
                     ui.button('Admin Panel', on_click=lambda: ui.navigate.to('/admin'), color='red').classes('flex-1')
         
-        # Section C: Recent Requests
+        # Section D: Recent Requests
         with ui.card().classes('w-full mb-6'):
             ui.label('Recent Requests').classes('text-xl font-semibold mb-4')
             
@@ -110,13 +147,25 @@ def dashboard_page():
                 rows = []
                 for request in recent_requests:
                     rows.append({
+                        'id': request.id,
                         'start_date': request.start_date.strftime('%m/%d/%Y'),
                         'pto_type': request.pto_type.title(),
                         'duration_days': request.duration_days,
                         'status': request.status.title()
                     })
                 
-                ui.table(columns=columns, rows=rows).classes('w-full')
+                recent_table = ui.table(columns=columns, rows=rows, row_key='id').classes('w-full')
+                
+                def on_request_decided(event, payload):
+                    if payload['user_id'] != user_id:
+                        return
+                    for row in recent_table.rows:
+                        if row['id'] == payload['request_id']:
+                            row['status'] = payload['status'].title()
+                            recent_table.update()
+                            break
+                
+                subscribe_page([REQUEST_APPROVED, REQUEST_DENIED, REQUEST_CANCELLED], on_request_decided)
             else:
                 ui.label('No recent requests').classes('text-gray-600')
         
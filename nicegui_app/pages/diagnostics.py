@@ -0,0 +1,117 @@
+from nicegui import ui, app
+from src.observability import query_registry
+from src.scheduler import scheduler
+from datetime import datetime
+
+
+def _run_summary(run) -> str:
+    """A job run's summary, or the last line of its traceback if it failed."""
+    if run.error:
+        return run.error.strip().splitlines()[-1]
+    return run.summary or ''
+
+
+def diagnostics_page():
+    """Admin-only page showing per-page SQL statistics and slow queries."""
+
+    user = app.storage.general.get('user')
+    if not user or user.get('role') != 'admin':
+        ui.navigate.to('/')
+        return
+
+    @ui.refreshable
+    def tables():
+        pages = query_registry.labels()
+        ui.label('Queries per page').classes('text-xl font-semibold mt-4')
+        if not pages:
+            ui.label('No instrumented requests yet').classes('text-gray-600')
+        else:
+            ui.table(
+                columns=[
+                    {'name': 'label', 'label': 'Page', 'field': 'label', 'align': 'left'},
+                    {'name': 'scopes', 'label': 'Requests', 'field': 'scopes'},
+                    {'name': 'avg_queries', 'label': 'Avg queries', 'field': 'avg_queries'},
+                    {'name': 'max_queries', 'label': 'Max queries', 'field': 'max_queries'},
+                    {'name': 'avg_ms', 'label': 'Avg DB ms', 'field': 'avg_ms'},
+                    {'name': 'max_ms', 'label': 'Max DB ms', 'field': 'max_ms'},
+                    {'name': 'repeated', 'label': 'N+1 suspects', 'field': 'repeated', 'align': 'left'},
+                ],
+                rows=[{
+                    'label': page.label,
+                    'scopes': page.scopes,
+                    'avg_queries': round(page.avg_queries, 1),
+                    'max_queries': page.max_queries,
+                    'avg_ms': round(page.avg_ms, 2),
+                    'max_ms': round(page.max_ms, 2),
+                    'repeated': '; '.join(f'{n}x {fp[:80]}' for fp, n in page.repeated.items()),
+                } for page in pages],
+                row_key='label'
+            ).classes('w-full')
+
+        ui.label('Statements by total DB time').classes('text-xl font-semibold mt-6')
+        ui.table(
+            columns=[
+                {'name': 'fingerprint', 'label': 'Statement', 'field': 'fingerprint', 'align': 'left',
+                 'style': 'white-space: normal; font-family: monospace; font-size: 11px'},
+                {'name': 'calls', 'label': 'Calls', 'field': 'calls'},
+                {'name': 'total_ms', 'label': 'Total ms', 'field': 'total_ms'},
+                {'name': 'avg_ms', 'label': 'Avg ms', 'field': 'avg_ms'},
+                {'name': 'max_ms', 'label': 'Max ms', 'field': 'max_ms'},
+            ],
+            rows=[{
+                'fingerprint': stmt.fingerprint,
+                'calls': stmt.calls,
+                'total_ms': round(stmt.total_ms, 2),
+                'avg_ms': round(stmt.total_ms / stmt.calls, 3),
+                'max_ms': round(stmt.max_ms, 2),
+            } for stmt in query_registry.top_fingerprints()],
+            row_key='fingerprint'
+        ).classes('w-full')
+
+        ui.label('Recent slow queries').classes('text-xl font-semibold mt-6')
+        slow = query_registry.slow_queries()
+        if not slow:
+            ui.label('None above the threshold').classes('text-gray-600')
+        for entry in slow:
+            with ui.card().classes('w-full'):
+                ui.label(
+                    f"{datetime.fromtimestamp(entry['at']).strftime('%H:%M:%S')}  "
+                    f"{entry['elapsed_ms']} ms  {entry['scope'] or '(background)'}"
+                ).classes('font-medium')
+                ui.label(entry['fingerprint']).classes('font-mono text-xs')
+
+        ui.label('Background job runs').classes('text-xl font-semibold mt-6')
+        ui.label(f"Scheduler {'running' if scheduler.running else 'stopped'} on {scheduler.node}").classes('text-gray-600')
+        ui.table(
+            columns=[
+                {'name': 'job', 'label': 'Job', 'field': 'job', 'align': 'left'},
+                {'name': 'scheduled', 'label': 'Scheduled for', 'field': 'scheduled', 'align': 'left'},
+                {'name': 'node', 'label': 'Node', 'field': 'node', 'align': 'left'},
+                {'name': 'status', 'label': 'Status', 'field': 'status', 'align': 'left'},
+                {'name': 'seconds', 'label': 'Seconds', 'field': 'seconds'},
+                {'name': 'summary', 'label': 'Summary', 'field': 'summary', 'align': 'left',
+                 'style': 'white-space: normal'},
+            ],
+            rows=[{
+                'id': run.id,
+                'job': run.job_name,
+                'scheduled': run.scheduled_for.strftime('%Y-%m-%d %H:%M'),
+                'node': run.node,
+                'status': run.status,
+                'seconds': round((run.finished_at - run.started_at).total_seconds(), 1) if run.finished_at else '',
+                'summary': _run_summary(run),
+            } for run in scheduler.recent_runs()],
+            row_key='id'
+        ).classes('w-full')
+
+    def reset():
+        query_registry.reset()
+        tables.refresh()
+
+    with ui.column().classes('w-full max-w-7xl mx-auto mt-8 p-6'):
+        ui.label('Diagnostics').classes('text-3xl font-bold')
+        with ui.row().classes('gap-4'):
+            ui.button('Refresh', on_click=tables.refresh)
+            ui.button('Reset statistics', on_click=reset, color='warning')
+        tables()
+        ui.button('Back to Admin Panel', on_click=lambda: ui.navigate.to('/admin')).classes('mt-4')
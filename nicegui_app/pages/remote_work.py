@@ -0,0 +1,94 @@
+from nicegui import ui, app
+from src.services.remote_work_service import RemoteWorkService
+from src.services.event_bus import REMOTE_DAYS_CHANGED
+from src.database import get_db
+from src.models.user import User
+from nicegui_app.components.live_updates import subscribe_page
+from datetime import date, timedelta
+
+WEEKS_AHEAD = 4
+
+
+def _style_day(button, is_remote):
+    """Colour a day button as remote (filled) or in office (outlined)."""
+    if is_remote:
+        button.props('color=primary', remove='outline')
+    else:
+        button.props('color=grey-7 outline')
+
+
+def remote_work_page():
+    """Remote day booking page showing the next few ISO weeks."""
+
+    # Check if user is logged in
+    user = app.storage.general.get('user')
+    if not user:
+        ui.navigate.to('/')
+        return
+    user_id = user['id']
+
+    today = date.today()
+    first_monday = today - timedelta(days=today.weekday())
+    last_friday = first_monday + timedelta(weeks=WEEKS_AHEAD - 1, days=4)
+
+    db = None
+    try:
+        db = next(get_db())
+        service = RemoteWorkService(db)
+        remote_days = set(service.get_remote_days(user_id, first_monday, last_friday))
+        open_days = set(service.market_open_days(first_monday, last_friday))
+        cap = service.weekly_cap(db.get(User, user_id))
+    finally:
+        if db:
+            db.close()
+
+    buttons = {}
+
+    def toggle(day):
+        db = None
+        try:
+            db = next(get_db())
+            service = RemoteWorkService(db)
+            if day in remote_days:
+                service.cancel_remote_day(user_id, day)
+            else:
+                service.request_remote_day(user_id, day)
+        except ValueError as e:
+            ui.notify(str(e), type='negative')
+        finally:
+            if db:
+                db.close()
+
+    def on_remote_changed(event, payload):
+        if payload['user_id'] != user_id or payload['day'] not in buttons:
+            return
+        if payload['remote']:
+            remote_days.add(payload['day'])
+        else:
+            remote_days.discard(payload['day'])
+        _style_day(buttons[payload['day']], payload['remote'])
+
+    with ui.column().classes('w-full max-w-2xl mx-auto mt-8 p-6'):
+        ui.label('Remote Work Days').classes('text-2xl font-bold mb-2')
+        ui.label(f'You can work remotely up to {cap} day(s) per week. Click a day to toggle it.').classes('text-gray-600 mb-4')
+
+        for week in range(WEEKS_AHEAD):
+            monday = first_monday + timedelta(weeks=week)
+            iso_week = monday.isocalendar()[1]
+            with ui.card().classes('w-full mb-2'):
+                ui.label(f'Week {iso_week} ({monday.strftime("%b %d")})').classes('font-medium')
+                with ui.row().classes('gap-2'):
+                    for offset in range(5):
+                        day = monday + timedelta(days=offset)
+                        button = ui.button(
+                            day.strftime('%a %d'),
+                            on_click=lambda day=day: toggle(day)
+                        )
+                        _style_day(button, day in remote_days)
+                        if day < today or day not in open_days:
+                            button.disable()
+                        buttons[day] = button
+
+        subscribe_page([REMOTE_DAYS_CHANGED], on_remote_changed)
+
+        ui.button('Back to Dashboard', on_click=lambda: ui.navigate.to('/dashboard')).classes('mt-4')
@@ -1,6 +1,9 @@
 from nicegui import ui, app
 from src.services.pto_service import PTOService
+from src.services.rule_service import RuleService
+from src.services.vacation_optimizer import VacationOptimizer
 from src.database import get_db
+from src.utils.pto_units import DayPart
 from datetime import date
 
 
@@ -29,16 +32,75 @@ def request_form_page():
         ui.label('End Date').classes('text-sm font-medium mb-1')
         end_date = ui.date(value=date.today()).classes('w-full mb-4')
 
-        half_day = ui.switch(
-            'Half Day',
-            value=False
-        ).classes('mb-4')
+        day_part = ui.select(
+            DayPart.LABELS,
+            label='Duration',
+            value=DayPart.FULL
+        ).classes('w-full mb-4')
+
+        # Blackout periods and coverage rules the chosen dates would break
+        rule_warnings = ui.column().classes('w-full mb-4 gap-1')
+
+        def show_rule_warnings():
+            rule_warnings.clear()
+            with rule_warnings:
+                for message in load_rule_violations(user, pto_type.value, start_date.value, end_date.value):
+                    ui.label(message).classes('text-sm text-red-600')
+
+        for field in (pto_type, start_date, end_date):
+            field.on('update:model-value', show_rule_warnings)
+
+        hours = ui.number(
+            label='Hours',
+            value=1,
+            min=0.25,
+            max=8,
+            step=0.25
+        ).classes('w-full mb-4')
+        hours.bind_visibility_from(day_part, 'value', backward=lambda v: v == DayPart.HOURS)
 
         description = ui.textarea(
             label='Description (required for "other" type)',
             placeholder='Enter description...'
         ).classes('w-full mb-6')
 
+        # Suggested windows fill in the dates; a suggestion's day count
+        # leaves out market holidays inside its range
+        applied = {}
+
+        def use_window(window):
+            start_date.value = window.pto_start.isoformat()
+            end_date.value = window.pto_end.isoformat()
+            pto_type.value = 'vacation'
+            applied.clear()
+            applied[(start_date.value, end_date.value)] = window.pto_days
+
+        with ui.expansion('Suggested vacation windows', icon='lightbulb').classes('w-full mb-4'):
+            suggestion_year = ui.select(
+                [date.today().year, date.today().year + 1],
+                label='Year',
+                value=date.today().year
+            ).classes('w-full')
+            suggestion_list = ui.column().classes('w-full gap-1')
+
+        def show_suggestions():
+            suggestion_list.clear()
+            with suggestion_list:
+                windows = load_suggestions(user['id'], suggestion_year.value)
+                if not windows:
+                    ui.label('No windows fit your remaining vacation balance').classes('text-sm text-gray-500')
+                for window in windows:
+                    with ui.row().classes('w-full items-center justify-between'):
+                        ui.label(
+                            f"{window.start:%a %b %d} – {window.end:%a %b %d}: "
+                            f"{window.days_off} days off for {window.pto_days} vacation day"
+                            f"{'s' if window.pto_days != 1 else ''}"
+                        ).classes('text-sm')
+                        ui.button('Use', on_click=lambda w=window: use_window(w)).props('flat dense')
+
+        suggestion_year.on('update:model-value', show_suggestions)
+        show_suggestions()
+
         # Show/hide description based on PTO type
         def toggle_description():
             if pto_type.value == 'other':
@@ -59,8 +121,10 @@ def request_form_page():
                     pto_type.value,
                     start_date.value,
                     end_date.value,
-                    half_day.value,
-                    description.value
+                    day_part.value,
+                    hours.value,
+                    description.value,
+                    applied.get((start_date.value, end_date.value))
                 )
             ).classes('flex-1')
 
@@ -70,7 +134,41 @@ def request_form_page():
             ).classes('flex-1')
 
 
-def submit_request(user_id, pto_type, start_date, end_date, half_day, description):
+def load_suggestions(user_id, year):
+    """Load the user's suggested vacation windows for a year."""
+    db = None
+    try:
+        db = next(get_db())
+        return VacationOptimizer(db).suggest(user_id, year, min_days_off=4)
+    except Exception as e:
+        ui.notify(f'Error loading suggestions: {str(e)}', type='negative')
+        return []
+    finally:
+        if db:
+            db.close()
+
+
+def load_rule_violations(user, pto_type, start_date, end_date):
+    """Check the chosen dates against the department rules; returns violation messages."""
+    if not start_date or not end_date:
+        return []
+    if isinstance(start_date, str):
+        start_date = date.fromisoformat(start_date)
+    if isinstance(end_date, str):
+        end_date = date.fromisoformat(end_date)
+    db = None
+    try:
+        db = next(get_db())
+        violations = RuleService(db).check_request(
+            user['id'], user.get('department_id'), pto_type, start_date, end_date
+        )
+        return [violation.message for violation in violations]
+    finally:
+        if db:
+            db.close()
+
+
+def submit_request(user_id, pto_type, start_date, end_date, day_part, hours, description, total_days=None):
     """Submit PTO request with validation and database operations."""
 
     # Validate required fields
@@ -78,6 +176,12 @@ def submit_request(user_id, pto_type, start_date, end_date, half_day, descriptio
         ui.notify('Start date and end date are required', type='negative')
         return
 
+    # ui.date reports ISO strings
+    if isinstance(start_date, str):
+        start_date = date.fromisoformat(start_date)
+    if isinstance(end_date, str):
+        end_date = date.fromisoformat(end_date)
+
     if pto_type == 'other' and not description.strip():
         ui.notify('Description is required for "other" PTO type', type='negative')
         return
@@ -94,21 +198,17 @@ def submit_request(user_id, pto_type, start_date, end_date, half_day, descriptio
         # Create PTO service and submit request
         pto_service = PTOService(db)
 
-        # Calculate total days
-        total_days = (end_date - start_date).days + 1
-        if half_day:
-            total_days = 0.5
-
-        # Create request data
+        # Create request data; the duration is derived from the day part
         from src.schemas.pto_schemas import PTORequestCreate
         request_data = PTORequestCreate(
             user_id=user_id,
             pto_type=pto_type,
             start_date=start_date,
             end_date=end_date,
-            total_days=total_days,
-            half_day=half_day,
-            description=description if pto_type == 'other' else None
+            day_part=day_part,
+            hours=hours if day_part == DayPart.HOURS else None,
+            total_days=total_days if day_part == DayPart.FULL else None,
+            notes=description if pto_type == 'other' else None
         )
 
         # Submit the request
@@ -119,7 +219,7 @@ def submit_request(user_id, pto_type, start_date, end_date, half_day, descriptio
         ui.navigate.to('/dashboard')
 
     except Exception as e:
-        ui.notify(f'Error submitting request: {str(e)}', type='negative')
+        ui.notify(f'Error submitting request: {str(e)}', type='negative', multi_line=True)
 
     finally:
         if db:
@@ -0,0 +1,312 @@
+"""
+Versioned JSON API for integrations (HRIS, payroll).
+
+Mounted at /api/v1 as its own FastAPI application, so its bearer-token
+check, gzip compression and orjson serialization apply to API responses
+only and never to the NiceGUI pages. Endpoints return their responses
+directly, so payloads skip FastAPI's jsonable_encoder pass. Reads come from the services'
+column-only queries; list endpoints use keyset pagination over IDs with an
+opaque cursor, and ``fields`` selects a subset of each row's fields.
+Batch endpoints process every item independently and report per-item
+results. Change feeds page by an (updated_at, id) watermark instead, so a
+client can resume from its last cursor and receive only what changed.
+"""
+import base64
+import binascii
+import hmac
+from datetime import date, datetime
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
+from fastapi.responses import JSONResponse
+import orjson
+from sqlalchemy.orm import Session
+from starlette.middleware.gzip import GZipMiddleware
+
+from src.config import get_config
+from src.database import get_db
+from src.models.pto_request import RequestStatus
+from src.schemas.api_schemas import RequestBatchApprove, RequestBatchCreate, RequestBatchDeny
+from src.schemas.read_models import (
+    BalanceListItem,
+    EmployeeListItem,
+    HolidayListItem,
+    RequestListItem,
+    table_rows,
+)
+from src.services.approval_service import APPROVER_ROLES
+from src.services.balance_service import BalanceService
+from src.services.calendar_service import CalendarService
+from src.services.change_feed_service import FEEDS, ChangeFeedService, ChangePage, Watermark
+from src.services.directory_cache import directory_cache
+from src.services.pto_service import PTOService
+from src.services.user_service import UserService
+
+MAX_PAGE = 1000
+MAX_BALANCE_USERS = 1000
+
+
+class OrjsonResponse(JSONResponse):
+    """JSON response serialized by orjson, which encodes dates and datetimes natively."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def require_token(authorization: Optional[str] = Header(None)) -> None:
+    """Accept only bearer tokens listed in config.API_TOKENS."""
+    scheme, _, token = (authorization or '').partition(' ')
+    valid = scheme.lower() == 'bearer' and any(
+        hmac.compare_digest(token.encode(), accepted.encode()) for accepted in get_config().API_TOKENS
+    )
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid or missing API token",
+                            headers={'WWW-Authenticate': 'Bearer'})
+
+
+api = FastAPI(
+    title="TJM Time Calendar API",
+    version="1",
+    default_response_class=OrjsonResponse,
+    dependencies=[Depends(require_token)],
+)
+api.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+# Output fields of each resource: name -> getter on its row model
+def _getters(names: Sequence[str], **computed: Callable[[Any], Any]) -> Dict[str, Callable[[Any], Any]]:
+    getters = {name: attrgetter(name) for name in names}
+    getters.update(computed)
+    return getters
+
+
+RESOURCE_FIELDS = {
+    'users': _getters(EmployeeListItem._fields),
+    'requests': _getters(RequestListItem._fields, total_days=lambda row: float(row.total_days)),
+    'balances': _getters(BalanceListItem._fields + (
+        'vacation_available_minutes', 'sick_available_minutes', 'personal_available_minutes')),
+    'holidays': _getters(HolidayListItem._fields),
+}
+
+
+@lru_cache(maxsize=256)
+def _converter(resource: str, fields: Optional[str]) -> Callable[[Any], List[dict]]:
+    """Build (once per field selection) the row converter of a resource."""
+    getters = RESOURCE_FIELDS[resource]
+    if not fields:
+        return table_rows(**getters)
+    names = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = [name for name in names if name not in getters]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields for {resource}: {', '.join(unknown)}")
+    return table_rows(**{name: getters[name] for name in names})
+
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque cursor continuing after a row ID."""
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Row ID a cursor continues after; 400 for a malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        prefix, _, value = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode().partition(':')
+        if prefix == 'id':
+            return int(value)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        pass
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_watermark(watermark: Watermark) -> str:
+    """Opaque cursor continuing a change feed after a watermark."""
+    return base64.urlsafe_b64encode(f"at:{watermark.at.isoformat()}/{watermark.id}".encode()).decode().rstrip('=')
+
+
+def decode_watermark(cursor: Optional[str]) -> Optional[Watermark]:
+    """Watermark a change feed cursor continues after; 400 for a malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        prefix, _, value = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode().partition(':')
+        at, _, last_id = value.rpartition('/')
+        if prefix == 'at':
+            return Watermark(datetime.fromisoformat(at), int(last_id))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        pass
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _feed_entity(entity: str) -> str:
+    if entity not in FEEDS:
+        raise HTTPException(status_code=404, detail=f"Unknown change feed '{entity}'")
+    return entity
+
+
+def _changes_page(rows: List[dict], page: ChangePage, stamp: str) -> OrjsonResponse:
+    """Feed response; the cursor is returned even for an empty page so clients keep their position."""
+    for row, watermark in zip(rows, page.watermarks):
+        row[stamp] = watermark.at
+    next_cursor = encode_watermark(page.next_watermark) if page.next_watermark else None
+    return OrjsonResponse({'data': rows, 'next_cursor': next_cursor, 'has_more': page.has_more})
+
+
+def _page(resource: str, rows: list, limit: int, fields: Optional[str]) -> OrjsonResponse:
+    next_cursor = encode_cursor(rows[-1].id) if len(rows) == limit else None
+    return OrjsonResponse({'data': _converter(resource, fields)(rows), 'next_cursor': next_cursor})
+
+
+def _run_batch(db: Session, items: Sequence[Any], operation: Callable[[Any], Any]) -> OrjsonResponse:
+    """Apply an operation to each item, collecting per-item results; one failure does not stop the rest."""
+    results = []
+    for index, item in enumerate(items):
+        try:
+            results.append({'index': index, 'ok': True, 'data': operation(item)})
+        except ValueError as exc:
+            db.rollback()
+            results.append({'index': index, 'ok': False, 'error': str(exc)})
+    return OrjsonResponse({'results': results})
+
+
+def _request_row(request) -> dict:
+    row = RequestListItem._make(getattr(request, name) for name in RequestListItem._fields)
+    return _converter('requests', None)([row])[0]
+
+
+def _require_approver(db: Session, user_id: int) -> None:
+    """Reject the batch unless the user is an active approver; same rule and message as ApprovalService."""
+    user = directory_cache.get(db).users.get(user_id)
+    if user is None or not user.is_active or user.role not in APPROVER_ROLES:
+        raise HTTPException(status_code=400, detail=f"User {user_id} cannot approve requests")
+
+
+@api.get('/users')
+def list_users(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE),
+    active_only: bool = False,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """List employees in ID order."""
+    rows = UserService(db).page_users(decode_cursor(cursor), limit, active_only)
+    return _page('users', rows, limit, fields)
+
+
+@api.get('/balances')
+def list_balances(
+    user_ids: str = Query(..., description="Comma-separated user IDs"),
+    year: Optional[int] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get the balances of many users for a year (default: the current year)."""
+    try:
+        ids = sorted({int(user_id) for user_id in user_ids.split(',') if user_id.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="user_ids must be comma-separated integers")
+    if not 0 < len(ids) <= MAX_BALANCE_USERS:
+        raise HTTPException(status_code=400, detail=f"Provide between 1 and {MAX_BALANCE_USERS} user IDs")
+    rows = BalanceService(db).list_balances(ids, year or date.today().year)
+    return OrjsonResponse({'data': _converter('balances', fields)(rows)})
+
+
+@api.get('/requests')
+def list_requests(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE),
+    user_id: Optional[int] = None,
+    status: Optional[str] = None,
+    start_from: Optional[date] = None,
+    start_to: Optional[date] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """List PTO requests in ID order."""
+    if status is not None and status not in RequestStatus.ALL:
+        raise HTTPException(status_code=400, detail=f"Unknown status '{status}'")
+    rows = PTOService(db).page_requests(decode_cursor(cursor), limit, user_id, status, start_from, start_to)
+    return _page('requests', rows, limit, fields)
+
+
+@api.get('/requests/{request_id}/approvers')
+def list_request_approvers(request_id: int, on: Optional[date] = None, db: Session = Depends(get_db)):
+    """Who may decide a pending request on a day (default today); null when any approver may."""
+    service = PTOService(db)
+    request = service.get_request_by_id(request_id)
+    if request is None:
+        raise HTTPException(status_code=404, detail=f"Request {request_id} not found")
+    if not request.is_pending:
+        raise HTTPException(status_code=400, detail=f"Request {request_id} is {request.status}")
+    return OrjsonResponse({
+        'request_id': request.id,
+        'approval_level': request.approval_level + 1,
+        'approver_ids': service.approval_service.approvers_for(request, on),
+    })
+
+
+@api.post('/requests/batch')
+def submit_requests(body: RequestBatchCreate, db: Session = Depends(get_db)):
+    """Submit several requests; each is validated and committed on its own."""
+    service = PTOService(db)
+    return _run_batch(db, body.requests, lambda item: _request_row(service.create_request(item)))
+
+
+@api.post('/requests/approve')
+def approve_requests(body: RequestBatchApprove, db: Session = Depends(get_db)):
+    """Approve several pending requests."""
+    _require_approver(db, body.approved_by)
+    service = PTOService(db)
+    return _run_batch(db, body.request_ids,
+                      lambda request_id: _request_row(service.approve_request(request_id, body.approved_by)))
+
+
+@api.post('/requests/deny')
+def deny_requests(body: RequestBatchDeny, db: Session = Depends(get_db)):
+    """Deny several pending requests with one reason."""
+    _require_approver(db, body.approved_by)
+    service = PTOService(db)
+    return _run_batch(db, body.request_ids, lambda request_id: _request_row(
+        service.deny_request(request_id, body.approved_by, body.denial_reason)))
+
+
+@api.get('/holidays')
+def list_holidays(
+    year: Optional[int] = None,
+    market: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """List a year's observed market holidays (default: this year, primary market)."""
+    rows = CalendarService(db).list_holidays(year or date.today().year, market)
+    return OrjsonResponse({'data': _converter('holidays', fields)(rows)})
+
+
+@api.get('/changes/{entity}')
+def list_changes(
+    entity: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=MAX_PAGE),
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """List users, requests or balances created or updated after a cursor, oldest change first."""
+    page = ChangeFeedService(db).changes(_feed_entity(entity), decode_watermark(cursor), limit)
+    return _changes_page(_converter(entity, fields)(page.items), page, 'updated_at')
+
+
+@api.get('/changes/{entity}/tombstones')
+def list_tombstones(
+    entity: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=MAX_PAGE),
+    db: Session = Depends(get_db)
+):
+    """List users deactivated, or requests and balances deleted, after a cursor."""
+    page = ChangeFeedService(db).tombstones(_feed_entity(entity), decode_watermark(cursor), limit)
+    rows = [{'id': item.entity_id, 'reason': item.reason} for item in page.items]
+    return _changes_page(rows, page, 'removed_at')
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from typing import Optional
+from src.database import get_db
+from src.services.ics_service import FEED_KINDS, FEED_MARKET, IcsService, verify_token
+
+router = APIRouter()
+
+# Calendar clients poll about every 15 minutes
+FEED_MAX_AGE = 900
+
+
+@router.get('/feeds/{kind}/{key}.ics')
+def ics_feed(
+    kind: str,
+    key: str,
+    token: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Serve an iCalendar feed, answering 304 when the client's copy is current."""
+    if kind not in FEED_KINDS or (kind != FEED_MARKET and not key.isdigit()):
+        raise HTTPException(status_code=404)
+    if not verify_token(kind, key, token):
+        raise HTTPException(status_code=403)
+
+    db = next(get_db())
+    try:
+        body, etag = IcsService(db).get_feed(kind, key, if_none_match)
+    finally:
+        db.close()
+
+    headers = {'ETag': etag, 'Cache-Control': f'private, max-age={FEED_MAX_AGE}'}
+    if body is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type='text/calendar; charset=utf-8', headers=headers)
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Response
+from nicegui import Client
+from src.database import get_engine
+from src.observability.metrics import CONTENT_TYPE, gauge, metrics_registry, register_cache, register_pool, track_request_events
+from src.services.directory_cache import directory_cache
+from src.services.ics_service import feed_cache
+
+router = APIRouter()
+
+register_pool(get_engine)
+register_cache('ics_feed', feed_cache)
+register_cache('directory', directory_cache)
+track_request_events()
+gauge('timecalendar_websocket_clients', 'NiceGUI clients with an open websocket.',
+      lambda: {(): float(sum(1 for client in list(Client.instances.values()) if client.has_socket_connection))})
+
+
+@router.get('/metrics')
+def metrics():
+    """Expose process metrics in the Prometheus text format."""
+    return Response(content=metrics_registry.render(), media_type=CONTENT_TYPE)
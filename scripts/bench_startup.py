@@ -0,0 +1,97 @@
+"""
+Measure import-time cost of the application's entry points.
+
+Each module is imported in a fresh interpreter with ``-X importtime`` so
+results are not skewed by modules already loaded in this process. The
+report shows the cumulative import time of each entry point and the
+slowest top-level packages it pulled in.
+
+Usage:
+    python scripts/bench_startup.py [module ...] [--top N] [--runs N]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from statistics import median
+from typing import Dict, List, Tuple
+
+# Project root, put on the PYTHONPATH of each child interpreter
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+DEFAULT_MODULES = [
+    'src.config',
+    'src.database',
+    'src.models',
+    'src.services',
+    'nicegui_app.pages.calendar',
+    'nicegui_app.pages.remote_work',
+]
+
+_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)')
+
+
+def measure(module: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Import a module in a subprocess and parse the importtime report.
+
+    Args:
+        module: Dotted module name
+
+    Returns:
+        Tuple[int, Dict[str, int]]: Total microseconds for the module, and
+        self microseconds summed per top-level third-party package
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=PROJECT_ROOT, env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.splitlines()[-1]}")
+
+    total = 0
+    packages: Dict[str, int] = defaultdict(int)
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative, name = int(match.group(1)), int(match.group(2)), match.group(3)
+        if name == module:
+            total = cumulative
+        top = name.split('.')[0]
+        if top not in ('src', 'nicegui_app', 'streamlit_app'):
+            packages[top] += self_us
+    return total, dict(packages)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--top', type=int, default=5, help='slowest third-party packages to list')
+    parser.add_argument('--runs', type=int, default=3, help='runs per module; the median is reported')
+    args = parser.parse_args()
+
+    print(f"{'module':<36} {'import ms':>10}  slowest dependencies")
+    print('-' * 100)
+    for module in args.modules:
+        try:
+            runs: List[Tuple[int, Dict[str, int]]] = [measure(module) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{module:<36} {'error':>10}  {e}")
+            continue
+        total = median(run[0] for run in runs)
+        packages = runs[-1][1]
+        slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        detail = ', '.join(f"{name} {us / 1000:.0f}" for name, us in slowest)
+        print(f"{module:<36} {total / 1000:>10.1f}  {detail}")
+
+
+if __name__ == '__main__':
+    main()
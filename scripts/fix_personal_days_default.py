@@ -20,6 +20,7 @@ sys.path.insert(0, str(project_root))
 from decimal import Decimal
 from src.database import get_db
 from src.models.pto_balance import PTOBalance
+from src.utils.pto_units import days_to_minutes
 
 
 def main():
@@ -33,7 +34,7 @@ def main():
         # Query all balances where personal_total = 3.00
         print("\nQuerying balances with personal_total = 3.00...")
         balances_with_3_days = db.query(PTOBalance).filter(
-            PTOBalance.personal_total == Decimal('3.00')
+            PTOBalance.personal_total_minutes == days_to_minutes(Decimal('3.00'))
         ).all()
         
         print(f"Found {len(balances_with_3_days)} balance records with personal_total = 3.00")
@@ -57,7 +58,7 @@ def main():
             print(f"  Before: personal_total = {balance.personal_total}")
             
             # Update to 2.00
-            balance.personal_total = Decimal('2.00')
+            balance.personal_total_minutes = days_to_minutes(Decimal('2.00'))
             
             print(f"  After:  personal_total = {balance.personal_total}")
         
@@ -17,6 +17,7 @@ from passlib.hash import bcrypt
 
 from src.database import get_db, SessionLocal
 from src.models import User, Department, MarketHoliday, PTOBalance
+from src.utils.pto_units import days_to_minutes
 
 
 def seed_departments(session):
@@ -126,13 +127,13 @@ def seed_admin_pto_balance(session, admin_user):
     pto_balance = PTOBalance(
         user_id=admin_user.id,
         year=2025,
-        vacation_total=Decimal("20.00"),
-        vacation_used=Decimal("0.00"),
-        sick_total=Decimal("10.00"),
-        sick_used=Decimal("0.00"),
-        personal_total=Decimal("3.00"),
-        personal_used=Decimal("0.00"),
-        remote_weekly_used=Decimal("0.00")
+        vacation_total_minutes=days_to_minutes(Decimal("20.00")),
+        vacation_used_minutes=0,
+        sick_total_minutes=days_to_minutes(Decimal("10.00")),
+        sick_used_minutes=0,
+        personal_total_minutes=days_to_minutes(Decimal("3.00")),
+        personal_used_minutes=0,
+        remote_weekly_used=0
     )
     
     session.add(pto_balance)
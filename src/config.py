@@ -2,6 +2,8 @@
 Configuration module for the PTO and Market Calendar System.
 """
 import os
+import threading
+from typing import Optional
 from dotenv import load_dotenv
 
 
@@ -20,6 +22,54 @@ class Config:
         self.SECRET_KEY = os.getenv('SECRET_KEY')
         self.ENVIRONMENT = os.getenv('ENVIRONMENT', 'development')
         
+        # Remote work policy
+        self.REMOTE_WEEKLY_CAP = int(os.getenv('REMOTE_WEEKLY_CAP', '2'))
+        self.PRIMARY_MARKET = os.getenv('PRIMARY_MARKET', 'NYSE')
+        
+        # Vacation accrual: 'annual' grants the year's total on January 1st,
+        # 'monthly' in twelve equal installments; unused days carried into
+        # the next year are capped at VACATION_CARRYOVER_DAYS
+        self.VACATION_ACCRUAL = os.getenv('VACATION_ACCRUAL', 'annual').lower()
+        self.VACATION_CARRYOVER_DAYS = float(os.getenv('VACATION_CARRYOVER_DAYS', '0'))
+        
+        # SQL diagnostics: statement echo is opt-in, slow queries are always logged
+        self.SQL_ECHO = os.getenv('SQL_ECHO', 'false').lower() in ('1', 'true', 'yes')
+        self.SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '200'))
+        
+        # Optional read replica for read-only service methods, and how long a
+        # user's reads stay on the primary after they change something
+        self.DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL') or None
+        self.READ_YOUR_WRITES_SECONDS = float(os.getenv('READ_YOUR_WRITES_SECONDS', '5'))
+        
+        # Background jobs: the scheduler runs in the web process (the leader
+        # among several runs the shared jobs); pending requests older than
+        # STALE_PENDING_DAYS are included in the approvers' reminders
+        self.SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+        self.SCHEDULER_WORKERS = int(os.getenv('SCHEDULER_WORKERS', '2'))
+        self.STALE_PENDING_DAYS = int(os.getenv('STALE_PENDING_DAYS', '3'))
+        
+        # Notifications: emailed through SMTP_HOST and/or posted as JSON to
+        # NOTIFY_WEBHOOK_URL; neither is sent unless configured
+        self.SMTP_HOST = os.getenv('SMTP_HOST') or None
+        self.SMTP_PORT = int(os.getenv('SMTP_PORT', '25'))
+        self.SMTP_USERNAME = os.getenv('SMTP_USERNAME') or None
+        self.SMTP_PASSWORD = os.getenv('SMTP_PASSWORD') or None
+        self.SMTP_STARTTLS = os.getenv('SMTP_STARTTLS', 'false').lower() in ('1', 'true', 'yes')
+        self.NOTIFY_FROM = os.getenv('NOTIFY_FROM', 'timecalendar@localhost')
+        self.NOTIFY_WEBHOOK_URL = os.getenv('NOTIFY_WEBHOOK_URL') or None
+        self.OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '8'))
+        
+        # Bearer tokens accepted by the /api/v1 JSON API (comma-separated);
+        # the API refuses every call while none are configured
+        self.API_TOKENS = [token.strip() for token in os.getenv('API_TOKENS', '').split(',') if token.strip()]
+        
+        # Change feeds stop this many seconds short of the database clock so
+        # in-flight transactions cannot commit behind a client's watermark
+        self.CHANGE_FEED_LAG_SECONDS = float(os.getenv('CHANGE_FEED_LAG_SECONDS', '30'))
+        
+        # Auto-approval rules apply only while enabled
+        self.AUTO_APPROVAL_ENABLED = os.getenv('AUTO_APPROVAL_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+        
         # Validate required variables are set
         self._validate_config()
     
@@ -41,7 +91,60 @@ class Config:
         
         if not self.SECRET_KEY.strip():
             raise ValueError("SECRET_KEY cannot be empty")
+        
+        if not 0 <= self.REMOTE_WEEKLY_CAP <= 5:
+            raise ValueError("REMOTE_WEEKLY_CAP must be between 0 and 5")
+        
+        if self.VACATION_ACCRUAL not in ('annual', 'monthly'):
+            raise ValueError("VACATION_ACCRUAL must be 'annual' or 'monthly'")
+        
+        if self.VACATION_CARRYOVER_DAYS < 0:
+            raise ValueError("VACATION_CARRYOVER_DAYS cannot be negative")
+        
+        if self.SLOW_QUERY_MS < 0:
+            raise ValueError("SLOW_QUERY_MS cannot be negative")
+        
+        if self.READ_YOUR_WRITES_SECONDS < 0:
+            raise ValueError("READ_YOUR_WRITES_SECONDS cannot be negative")
+        
+        if self.SCHEDULER_WORKERS < 1:
+            raise ValueError("SCHEDULER_WORKERS must be at least 1")
+        
+        if self.STALE_PENDING_DAYS < 1:
+            raise ValueError("STALE_PENDING_DAYS must be at least 1")
+        
+        if self.OUTBOX_MAX_ATTEMPTS < 1:
+            raise ValueError("OUTBOX_MAX_ATTEMPTS must be at least 1")
+        
+        if self.CHANGE_FEED_LAG_SECONDS < 0:
+            raise ValueError("CHANGE_FEED_LAG_SECONDS cannot be negative")
+
+
+_config: Optional[Config] = None
+_config_lock = threading.Lock()
+
+
+def get_config() -> Config:
+    """
+    Get the global configuration, building it on first use.
+    
+    Deferring construction keeps ``import src.config`` free of .env parsing
+    and validation, so tools and tests that never touch settings do not pay
+    for (or fail on) them.
+    
+    Returns:
+        Config: The shared configuration instance
+    """
+    global _config
+    if _config is None:
+        with _config_lock:
+            if _config is None:
+                _config = Config()
+    return _config
 
 
-# Create a global config instance
-config = Config()
+def __getattr__(name: str):
+    """Resolve the legacy ``config`` global lazily."""
+    if name == 'config':
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
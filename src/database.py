@@ -1,31 +1,312 @@
 """
 Database configuration and session management for the PTO and Market Calendar System.
+
+The engine is created on first use rather than at import time, so importing
+models (for example during test collection or Alembic autogenerate) does not
+read configuration or open a connection pool. ``engine`` and ``SessionLocal``
+remain importable names for existing callers and resolve lazily.
+
+SQLite URLs get a profile of their own (see ``create_db_engine``) so the
+services can be tested and benchmarked without a PostgreSQL server.
+
+When DATABASE_REPLICA_URL is set, sessions route service methods marked
+``@read_only`` to the replica engine and everything else to the primary
+(see ``RoutingSession``). A user who just changed something reads from the
+primary for READ_YOUR_WRITES_SECONDS, so they never see their own change
+missing because of replication lag.
 """
-from sqlalchemy import create_engine
+import functools
+import inspect
+import threading
+import time
+from typing import Any, Callable, Dict, Generator, Hashable, List, Optional
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.engine.url import URL
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.orm.session import Session
-from typing import Generator
+from sqlalchemy.sql.base import Executable
+
 
-from src.config import config
+# Create declarative base for model definitions
+Base = declarative_base()
 
+# Session.info keys used by replica routing
+_READ_ONLY_DEPTH = 'read_only_depth'
+_WROTE = 'wrote_to_primary'
 
-# Create database engine using SQLAlchemy 2.0 syntax
-engine = create_engine(
-    config.DATABASE_URL,
-    echo=config.ENVIRONMENT == 'development',  # Enable SQL logging in development
-    future=True  # Use SQLAlchemy 2.0 style
-)
 
-# Create SessionLocal class for database sessions
-SessionLocal = sessionmaker(
-    bind=engine,
+class RoutingSession(Session):
+    """
+    Session that sends read-only work to a replica engine when one is set.
+    
+    Reads go to the replica while a ``@read_only`` service method runs, or
+    for statements carrying ``execution_options(replica=True)``. Flushes and
+    INSERT/UPDATE/DELETE statements always go to the primary, and once a
+    session has written every later read does too, so a unit of work never
+    reads back older data than it wrote. Without a replica this behaves
+    exactly like Session.
+    """
+    
+    def __init__(self, *args: Any, replica: Optional[Engine] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+    
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replica is not None and not self.info.get(_WROTE):
+            if self._flushing or getattr(clause, 'is_dml', False):
+                self.info[_WROTE] = True
+            elif self.info.get(_READ_ONLY_DEPTH) or (
+                isinstance(clause, Executable) and clause.get_execution_options().get('replica')
+            ):
+                return self.replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+class ReadYourWrites:
+    """
+    Keys (user ids) whose reads stay on the primary for a while after a write.
+    
+    Args:
+        window_seconds: How long a key stays pinned, defaults to
+            config.READ_YOUR_WRITES_SECONDS
+    """
+    
+    def __init__(self, window_seconds: Optional[float] = None) -> None:
+        self._window_seconds = window_seconds
+        self._pinned_until: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def window_seconds(self) -> float:
+        if self._window_seconds is None:
+            from src.config import get_config
+            self._window_seconds = get_config().READ_YOUR_WRITES_SECONDS
+        return self._window_seconds
+    
+    def mark(self, key: Hashable) -> None:
+        """Pin a key to the primary for the next window_seconds."""
+        deadline = time.monotonic() + self.window_seconds
+        with self._lock:
+            self._pinned_until[key] = deadline
+    
+    def is_pinned(self, key: Hashable) -> bool:
+        """Check whether a key wrote recently enough to need the primary."""
+        deadline = self._pinned_until.get(key)
+        if deadline is None:
+            return False
+        if time.monotonic() < deadline:
+            return True
+        with self._lock:
+            if self._pinned_until.get(key) == deadline:
+                del self._pinned_until[key]
+        return False
+
+
+# Users pinned to the primary after their own mutations
+read_your_writes = ReadYourWrites()
+
+
+def read_only(pin: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Mark a service method whose queries may be served by the replica.
+    
+    The session is the method's ``db`` argument, or ``self.db`` for service
+    instances. Only mark methods that are never part of a read-modify-write:
+    a stale read there would fail the version check on update.
+    
+    Args:
+        pin: Name of the argument holding the user id the data belongs to;
+            while that user is inside the read-your-writes window the call
+            reads from the primary
+        
+    Returns:
+        Callable: Decorator applying the marking
+    """
+    def decorate(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            arguments = signature.bind(*args, **kwargs).arguments
+            db = arguments.get('db')
+            if db is None and 'self' in arguments:
+                db = getattr(arguments['self'], 'db', None)
+            if db is None or (pin is not None and read_your_writes.is_pinned(arguments.get(pin))):
+                return func(*args, **kwargs)
+            depth = db.info.get(_READ_ONLY_DEPTH, 0)
+            db.info[_READ_ONLY_DEPTH] = depth + 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                db.info[_READ_ONLY_DEPTH] = depth
+        
+        return wrapper
+    
+    return decorate
+
+
+_writes_tracked = False
+
+
+def track_writes() -> None:
+    """Pin users to the primary when the event bus reports a change of theirs (idempotent)."""
+    global _writes_tracked
+    if _writes_tracked:
+        return
+    from src.services.event_bus import (
+        event_bus, REQUEST_SUBMITTED, REQUEST_APPROVED, REQUEST_ESCALATED, REQUEST_DENIED, REQUEST_CANCELLED,
+        BALANCE_CHANGED, REMOTE_DAYS_CHANGED
+    )
+    for name in (REQUEST_SUBMITTED, REQUEST_APPROVED, REQUEST_ESCALATED, REQUEST_DENIED, REQUEST_CANCELLED,
+                 BALANCE_CHANGED, REMOTE_DAYS_CHANGED):
+        event_bus.subscribe(name, lambda event, payload: read_your_writes.mark(payload.get('user_id')))
+    _writes_tracked = True
+
+
+# Session factory; bound to the engine when the engine is first created
+_session_factory = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
     future=True  # Use SQLAlchemy 2.0 style
 )
 
-# Create declarative base for model definitions
-Base = declarative_base()
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+# Pragmas applied to every file-based SQLite connection. WAL lets readers
+# run alongside the single writer, NORMAL sync is durable in WAL mode except
+# against power loss, and the busy timeout makes writers queue instead of
+# failing immediately with "database is locked".
+SQLITE_FILE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'foreign_keys': 'ON',
+    'busy_timeout': '30000',
+    'temp_store': 'MEMORY',
+    'cache_size': '-65536',  # 64 MiB
+}
+
+
+def is_sqlite_memory(url: URL) -> bool:
+    """Check whether a SQLite URL names an in-memory database."""
+    return url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+
+
+def _configure_sqlite_memory(engine: Engine) -> None:
+    """
+    Make SAVEPOINT-based rollback work on an in-memory SQLite engine.
+    
+    pysqlite defers BEGIN until the first DML statement, so a SAVEPOINT
+    issued first opens the transaction itself and releasing it commits.
+    Taking over transaction control restores real nested transactions,
+    which the test fixtures rely on to undo each test.
+    """
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        dbapi_connection.execute('PRAGMA foreign_keys=ON')
+
+    @event.listens_for(engine, 'begin')
+    def _on_begin(connection):
+        connection.exec_driver_sql('BEGIN')
+
+
+def _configure_sqlite_file(engine: Engine, pragmas: Dict[str, str]) -> None:
+    """Apply pragmas to every new connection of a file-based SQLite engine."""
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+
+def create_db_engine(url: Optional[str] = None, **kwargs: Any) -> Engine:
+    """
+    Create a database engine from a URL or the application configuration.
+    
+    SQLite URLs use one of two profiles. In-memory databases share a single
+    connection through StaticPool (every pooled connection would otherwise
+    see its own empty database) and support SAVEPOINT rollback. File-based
+    databases run in WAL mode with the pragmas in SQLITE_FILE_PRAGMAS.
+    
+    Args:
+        url: Database URL, defaults to config.DATABASE_URL
+        **kwargs: Extra arguments passed to create_engine
+        
+    Returns:
+        Engine: A new SQLAlchemy engine
+    """
+    from src.config import get_config
+    config = get_config()
+    
+    database_url = make_url(url or config.DATABASE_URL)
+    options: Dict[str, Any] = {
+        'echo': config.SQL_ECHO,  # Statement logging is opt-in, see src.observability for metrics
+        'future': True,  # Use SQLAlchemy 2.0 style
+    }
+    
+    is_sqlite = database_url.get_backend_name() == 'sqlite'
+    memory = is_sqlite and is_sqlite_memory(database_url)
+    if is_sqlite:
+        # Sessions may be used from worker threads (NiceGUI handlers, tests)
+        options['connect_args'] = {'check_same_thread': False, **kwargs.pop('connect_args', {})}
+        if memory:
+            options['poolclass'] = StaticPool
+    options.update(kwargs)
+    
+    engine = create_engine(database_url, **options)
+    if memory:
+        _configure_sqlite_memory(engine)
+    elif is_sqlite:
+        _configure_sqlite_file(engine, SQLITE_FILE_PRAGMAS)
+    return engine
+
+
+def get_engine() -> Engine:
+    """
+    Get the application engine, creating it on first use.
+    
+    The application engine is instrumented for per-page query statistics
+    and slow-query logging (see src.observability.query_stats). When a
+    replica is configured its engine is created alongside and handed to
+    every session for ``@read_only`` methods.
+    
+    Returns:
+        Engine: The shared (primary) engine
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                from src.config import get_config
+                from src.observability.query_stats import instrument_engine
+                engine = create_db_engine()
+                instrument_engine(engine)
+                replica = None
+                if get_config().DATABASE_REPLICA_URL:
+                    replica = create_db_engine(get_config().DATABASE_REPLICA_URL)
+                    instrument_engine(replica)
+                    track_writes()
+                _session_factory.configure(bind=engine, replica=replica)
+                _engine = engine
+    return _engine
+
+
+def get_sessionmaker() -> sessionmaker:
+    """
+    Get the session factory bound to the application engine.
+    
+    Returns:
+        sessionmaker: Factory producing application sessions
+    """
+    get_engine()
+    return _session_factory
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -38,7 +319,7 @@ def get_db() -> Generator[Session, None, None]:
     Yields:
         Session: SQLAlchemy database session
     """
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
@@ -54,4 +335,43 @@ def init_db() -> None:
     this function to ensure they are registered with Base.
     """
     # Create all tables
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
+
+
+def insert_ignore(db: Session, model: type, values: Dict[str, Any], index_elements: List[str]) -> None:
+    """
+    Insert a row unless one with the same unique key already exists.
+    
+    Uses INSERT ... ON CONFLICT DO NOTHING on PostgreSQL and SQLite, so
+    concurrent callers cannot fail on the unique constraint. Other backends
+    fall back to an INSERT inside a savepoint that absorbs the duplicate.
+    Column defaults of the model apply as for an ORM insert.
+    
+    Args:
+        db: Session to execute in; the caller commits
+        model: Mapped class to insert into
+        values: Column values of the new row
+        index_elements: Columns of the unique constraint to check
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        try:
+            with db.begin_nested():
+                db.execute(insert(model).values(**values))
+        except IntegrityError:
+            pass
+        return
+    db.execute(dialect_insert(model).values(**values).on_conflict_do_nothing(index_elements=index_elements))
+
+
+def __getattr__(name: str):
+    """Resolve the legacy ``engine`` and ``SessionLocal`` globals lazily."""
+    if name == 'engine':
+        return get_engine()
+    if name == 'SessionLocal':
+        return get_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
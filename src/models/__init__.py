@@ -5,8 +5,18 @@ from src.database import Base
 from .user import User
 from .department import Department
 from .pto_balance import PTOBalance
-from .pto_request import PTORequest
+from .pto_request import PTORequest, RequestStatus
+from .pto_request_event import PTORequestEvent
 from .market_holiday import MarketHoliday
+from .remote_week import RemoteWeek
+from .job_run import JobRun
+from .scheduler_lease import SchedulerLease
+from .outbox_message import OutboxMessage, OutboxStatus
+from .tombstone import Tombstone
+from .department_rule import DepartmentRule, RuleKind
+from .auto_approval_rule import AutoApprovalRule
+from .approval_step import ApprovalStep
+from .approval_delegation import ApprovalDelegation
 
 # Make all models available when importing from this module
 __all__ = [
@@ -15,5 +25,18 @@ __all__ = [
     'Department', 
     'PTOBalance',
     'PTORequest',
-    'MarketHoliday'
+    'PTORequestEvent',
+    'RequestStatus',
+    'MarketHoliday',
+    'RemoteWeek',
+    'JobRun',
+    'SchedulerLease',
+    'OutboxMessage',
+    'OutboxStatus',
+    'Tombstone',
+    'DepartmentRule',
+    'RuleKind',
+    'AutoApprovalRule',
+    'ApprovalStep',
+    'ApprovalDelegation'
 ]
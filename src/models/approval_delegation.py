@@ -0,0 +1,62 @@
+"""
+Approval Delegation model for the PTO and Market Calendar System.
+"""
+from datetime import date, datetime
+from typing import Optional
+from sqlalchemy import String, Integer, Boolean, Date, DateTime, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class ApprovalDelegation(Base):
+    """
+    Approval Delegation model letting another user decide an approver's requests.
+
+    From ``start_date`` through ``end_date`` the delegate may approve and
+    deny every request waiting for the delegator, and those requests show
+    up in the delegate's queue. See ApprovalService.
+    """
+    __tablename__ = "approval_delegations"
+
+    # Primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    # Foreign keys
+    delegator_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id"),
+        nullable=False
+    )
+    delegate_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id"),
+        nullable=False
+    )
+
+    # Validity
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[date] = mapped_column(Date, nullable=False)
+    note: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+
+    # Status
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=func.now(),
+        nullable=False
+    )
+
+    # "Whom is this delegate acting for today" is a range scan on the
+    # delegate's entries; the delegator index serves listings and revocation
+    __table_args__ = (
+        Index('ix_approval_delegations_delegate_dates', 'delegate_id', 'start_date', 'end_date'),
+        Index('ix_approval_delegations_delegator_dates', 'delegator_id', 'start_date', 'end_date'),
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the ApprovalDelegation model."""
+        return (f"<ApprovalDelegation(id={self.id}, delegator_id={self.delegator_id}, "
+                f"delegate_id={self.delegate_id}, {self.start_date}..{self.end_date})>")
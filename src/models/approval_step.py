@@ -0,0 +1,57 @@
+"""
+Approval Step model for the PTO and Market Calendar System.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Integer, Boolean, DateTime, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class ApprovalStep(Base):
+    """
+    Approval Step model adding a level to the approval chain of long requests.
+
+    Every request is first decided by its department's manager. A request
+    from ``department_id`` (any department when NULL) longer than
+    ``over_duration_minutes`` then also needs ``approver_id``, such as the
+    head of the department. Steps apply in ``level`` order. See ApprovalService.
+    """
+    __tablename__ = "approval_steps"
+
+    # Primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    # Scope
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    department_id: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        ForeignKey("departments.id"),
+        nullable=True,
+        index=True
+    )
+    level: Mapped[int] = mapped_column(Integer, default=2, nullable=False)
+    # Requests longer than this need the step, in workday minutes
+    over_duration_minutes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Approver of the level
+    approver_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id"),
+        nullable=False
+    )
+
+    # Status
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=func.now(),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the ApprovalStep model."""
+        return f"<ApprovalStep(id={self.id}, name='{self.name}', level={self.level})>"
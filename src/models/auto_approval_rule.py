@@ -0,0 +1,59 @@
+"""
+Auto-Approval Rule model for the PTO and Market Calendar System.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Integer, Boolean, DateTime, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class AutoApprovalRule(Base):
+    """
+    Auto-Approval Rule model describing requests approved without a manager.
+    
+    A request submitted by a member of ``department_id`` (any department
+    when NULL) is approved in its submit transaction by the first active
+    rule, in ``priority`` order, whose conditions it meets. NULL conditions
+    are not checked. See AutoApprovalService.
+    """
+    __tablename__ = "auto_approval_rules"
+    
+    # Primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    
+    # Scope
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    department_id: Mapped[Optional[int]] = mapped_column(
+        Integer, 
+        ForeignKey("departments.id"), 
+        nullable=True,
+        index=True
+    )
+    priority: Mapped[int] = mapped_column(Integer, default=100, nullable=False)
+    
+    # Conditions
+    pto_type: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    # Longest request approved, in workday minutes
+    max_duration_minutes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Balance of the request's type that must remain afterwards, in minutes
+    min_headroom_minutes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Colleagues with pending or approved time off allowed on any day of the request
+    max_colleagues_out: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Whether requests overlapping a blackout (sick leave may) are approved
+    allow_blackout: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    
+    # Status
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, 
+        default=func.now(), 
+        nullable=False
+    )
+    
+    def __repr__(self) -> str:
+        """String representation of the AutoApprovalRule model."""
+        return f"<AutoApprovalRule(id={self.id}, name='{self.name}', priority={self.priority})>"
@@ -0,0 +1,64 @@
+"""
+Department Rule model for the PTO and Market Calendar System.
+"""
+from datetime import date, datetime
+from typing import Optional
+from sqlalchemy import String, Integer, Boolean, Date, DateTime, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class RuleKind:
+    """Allowed values of DepartmentRule.kind."""
+    BLACKOUT = "blackout"              # no time off between start_date and end_date
+    MIN_HEADCOUNT = "min_headcount"    # at least ``value`` members in on market-open days
+    MAX_ABSENT = "max_absent"          # at most ``value`` members out on the same day
+    
+    ALL = (BLACKOUT, MIN_HEADCOUNT, MAX_ABSENT)
+    COUNTS = (MIN_HEADCOUNT, MAX_ABSENT)
+
+
+class DepartmentRule(Base):
+    """
+    Department Rule model holding one declarative time-off rule.
+    
+    A rule applies to one department, or to every department when
+    ``department_id`` is NULL, between ``start_date`` and ``end_date``
+    (either may be NULL for an open-ended range). Rules are checked when a
+    request is submitted; see RuleService.
+    """
+    __tablename__ = "department_rules"
+    
+    # Primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    
+    # Scope
+    department_id: Mapped[Optional[int]] = mapped_column(
+        Integer, 
+        ForeignKey("departments.id"), 
+        nullable=True,
+        index=True
+    )
+    
+    # Rule definition
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    start_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    end_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    value: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    
+    # Status
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, 
+        default=func.now(), 
+        nullable=False
+    )
+    
+    def __repr__(self) -> str:
+        """String representation of the DepartmentRule model."""
+        return (f"<DepartmentRule(id={self.id}, kind='{self.kind}', "
+                f"department_id={self.department_id}, name='{self.name}')>")
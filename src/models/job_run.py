@@ -0,0 +1,56 @@
+"""
+Job Run model for the PTO and Market Calendar System.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Integer, DateTime, Text, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class JobRun(Base):
+    """
+    Job Run model recording one scheduled run of a background job.
+    
+    A run is claimed by inserting its row before the job starts; the unique
+    (job_name, scheduled_for) key makes sure each scheduled occurrence runs
+    at most once, however many application processes are running.
+    """
+    __tablename__ = "job_runs"
+    
+    # Status values
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    
+    # Primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    
+    # Run identity
+    job_name: Mapped[str] = mapped_column(String(50), nullable=False)
+    scheduled_for: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    node: Mapped[str] = mapped_column(String(100), nullable=False)
+    
+    # Outcome
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=RUNNING)
+    summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    # Timestamps
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime, 
+        default=func.now(), 
+        nullable=False
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint('job_name', 'scheduled_for', name='uq_job_runs_job_scheduled'),
+    )
+    
+    def __repr__(self) -> str:
+        """String representation of the JobRun model."""
+        return (f"<JobRun(id={self.id}, job_name='{self.job_name}', "
+                f"scheduled_for={self.scheduled_for}, status='{self.status}')>")
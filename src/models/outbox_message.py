@@ -0,0 +1,68 @@
+"""
+Outbox Message model for the PTO and Market Calendar System.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import String, Integer, DateTime, Text, JSON, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class OutboxStatus:
+    """Allowed values of OutboxMessage.status."""
+    PENDING = "pending"
+    SENT = "sent"
+    DEAD = "dead"  # gave up after the maximum number of attempts
+
+
+class OutboxMessage(Base):
+    """
+    Outbox Message model holding one notification awaiting delivery.
+    
+    Rows are written in the same transaction as the change they announce,
+    so a notification exists if and only if the change was committed. The
+    dispatcher delivers them later and marks them sent, retrying failures
+    after ``available_at``.
+    """
+    __tablename__ = "outbox"
+    
+    # Primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    
+    # Delivery target: a user for email, an endpoint URL for webhooks
+    channel: Mapped[str] = mapped_column(String(20), nullable=False)
+    recipient_id: Mapped[Optional[int]] = mapped_column(
+        Integer, 
+        ForeignKey("users.id"), 
+        nullable=True
+    )
+    endpoint: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    
+    # Content
+    kind: Mapped[str] = mapped_column(String(30), nullable=False)
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    
+    # Delivery state
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=OutboxStatus.PENDING)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    available_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, 
+        default=func.now(), 
+        nullable=False
+    )
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    
+    # Indexes
+    __table_args__ = (
+        Index('ix_outbox_status_available', 'status', 'available_at'),
+    )
+    
+    def __repr__(self) -> str:
+        """String representation of the OutboxMessage model."""
+        return (f"<OutboxMessage(id={self.id}, channel='{self.channel}', kind='{self.kind}', "
+                f"status='{self.status}')>")
@@ -4,10 +4,11 @@ PTO Balance model for the PTO and Market Calendar System.
 from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
-from sqlalchemy import Integer, Numeric, DateTime, ForeignKey, UniqueConstraint, func
+from sqlalchemy import Integer, DateTime, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
+from src.utils.pto_units import minutes_to_days
 
 if TYPE_CHECKING:
     from .user import User
@@ -34,48 +35,22 @@ class PTOBalance(Base):
     )
     year: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
     
+    # Balances are stored as integer workday minutes (480 per day)
     # Vacation balances
-    vacation_total: Mapped[Decimal] = mapped_column(
-        Numeric(5, 2), 
-        default=Decimal('0.00'), 
-        nullable=False
-    )
-    vacation_used: Mapped[Decimal] = mapped_column(
-        Numeric(5, 2), 
-        default=Decimal('0.00'), 
-        nullable=False
-    )
-    vacation_pending: Mapped[Decimal] = mapped_column(
-        Numeric(5, 2), 
-        default=Decimal('0.00'), 
-        nullable=False
-    )
+    vacation_total_minutes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    vacation_used_minutes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    vacation_pending_minutes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     
     # Sick leave balances
-    sick_total: Mapped[Decimal] = mapped_column(
-        Numeric(5, 2), 
-        default=Decimal('0.00'), 
-        nullable=False
-    )
-    sick_used: Mapped[Decimal] = mapped_column(
-        Numeric(5, 2), 
-        default=Decimal('0.00'), 
-        nullable=False
-    )
+    sick_total_minutes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    sick_used_minutes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     
     # Personal day balances
-    personal_total: Mapped[Decimal] = mapped_column(
-        Numeric(5, 2), 
-        default=Decimal('0.00'), 
-        nullable=False
-    )
-    personal_used: Mapped[Decimal] = mapped_column(
-        Numeric(5, 2), 
-        default=Decimal('0.00'), 
-        nullable=False
-    )
+    personal_total_minutes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    personal_used_minutes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     
-    # Remote work tracking
+    # Remote work tracking; superseded by RemoteWorkService.weekly_used(),
+    # which reads the week's mask, so this column is no longer maintained
     remote_weekly_used: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     
     # Timestamps
@@ -91,9 +66,15 @@ class PTOBalance(Base):
         nullable=False
     )
     
+    # Optimistic concurrency: every UPDATE is qualified by the version it read
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": version_id}
+    
     # Constraints
     __table_args__ = (
         UniqueConstraint('user_id', 'year', name='uq_user_year'),
+        # Change feed order: (updated_at, id) keyset scans
+        Index('ix_pto_balances_updated_at_id', 'updated_at', 'id'),
     )
     
     # Relationships
@@ -103,17 +84,67 @@ class PTOBalance(Base):
         """String representation of the PTOBalance model."""
         return f"<PTOBalance(id={self.id}, user_id={self.user_id}, year={self.year})>"
     
+    @property
+    def vacation_available_minutes(self) -> int:
+        """Available vacation in minutes."""
+        return self.vacation_total_minutes - self.vacation_used_minutes - self.vacation_pending_minutes
+    
+    @property
+    def sick_available_minutes(self) -> int:
+        """Available sick leave in minutes."""
+        return self.sick_total_minutes - self.sick_used_minutes
+    
+    @property
+    def personal_available_minutes(self) -> int:
+        """Available personal time in minutes."""
+        return self.personal_total_minutes - self.personal_used_minutes
+    
+    @property
+    def vacation_total(self) -> Decimal:
+        """Vacation total days, for display."""
+        return minutes_to_days(self.vacation_total_minutes)
+    
+    @property
+    def vacation_used(self) -> Decimal:
+        """Vacation used days, for display."""
+        return minutes_to_days(self.vacation_used_minutes)
+    
+    @property
+    def vacation_pending(self) -> Decimal:
+        """Vacation pending days, for display."""
+        return minutes_to_days(self.vacation_pending_minutes)
+    
+    @property
+    def sick_total(self) -> Decimal:
+        """Sick total days, for display."""
+        return minutes_to_days(self.sick_total_minutes)
+    
+    @property
+    def sick_used(self) -> Decimal:
+        """Sick used days, for display."""
+        return minutes_to_days(self.sick_used_minutes)
+    
+    @property
+    def personal_total(self) -> Decimal:
+        """Personal total days, for display."""
+        return minutes_to_days(self.personal_total_minutes)
+    
+    @property
+    def personal_used(self) -> Decimal:
+        """Personal used days, for display."""
+        return minutes_to_days(self.personal_used_minutes)
+    
     @property
     def vacation_available(self) -> Decimal:
         """Calculate available vacation days."""
-        return self.vacation_total - self.vacation_used - self.vacation_pending
+        return minutes_to_days(self.vacation_available_minutes)
     
     @property
     def sick_available(self) -> Decimal:
         """Calculate available sick days."""
-        return self.sick_total - self.sick_used
+        return minutes_to_days(self.sick_available_minutes)
     
     @property
     def personal_available(self) -> Decimal:
         """Calculate available personal days."""
-        return self.personal_total - self.personal_used
+        return minutes_to_days(self.personal_available_minutes)
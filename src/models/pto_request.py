@@ -4,15 +4,27 @@ PTO Request model for the PTO and Market Calendar System.
 from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional, TYPE_CHECKING
-from sqlalchemy import String, Integer, Boolean, Date, DateTime, Numeric, Text, ForeignKey, func
+from sqlalchemy import String, Integer, Boolean, Date, DateTime, Text, ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
+from src.utils.pto_units import DayPart, minutes_to_days
 
 if TYPE_CHECKING:
     from .user import User
 
 
+class RequestStatus:
+    """Allowed values of PTORequest.status."""
+    PENDING = "pending"
+    APPROVED = "approved"
+    DENIED = "denied"
+    CANCELLED = "cancelled"
+    
+    ALL = (PENDING, APPROVED, DENIED, CANCELLED)
+    ACTIVE = (PENDING, APPROVED)
+
+
 class PTORequest(Base):
     """
     PTO Request model representing employee time-off requests.
@@ -37,18 +49,37 @@ class PTORequest(Base):
         ForeignKey("users.id"), 
         nullable=True
     )
+    # Set when the request was approved by an AutoApprovalRule rather than a person
+    auto_approval_rule_id: Mapped[Optional[int]] = mapped_column(
+        Integer, 
+        ForeignKey("auto_approval_rules.id"), 
+        nullable=True
+    )
+    
+    # Approval chain (see ApprovalService): levels approved so far, and the
+    # approver of the current level once past the department's manager (from
+    # submission when the requester is that manager)
+    approval_level: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    current_approver_id: Mapped[Optional[int]] = mapped_column(
+        Integer, 
+        ForeignKey("users.id"), 
+        nullable=True,
+        index=True
+    )
     
     # Request details
     pto_type: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
     start_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     end_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
-    total_days: Mapped[Decimal] = mapped_column(Numeric(4, 2), nullable=False)
+    # Duration in workday minutes (480 per day); days are derived for display
+    duration_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    day_part: Mapped[str] = mapped_column(String(10), default=DayPart.FULL, nullable=False)
     is_paid: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     
     # Status and approval
     status: Mapped[str] = mapped_column(
         String(20), 
-        default="pending", 
+        default=RequestStatus.PENDING, 
         nullable=False,
         index=True
     )
@@ -74,6 +105,23 @@ class PTORequest(Base):
         nullable=False
     )
     
+    # Optimistic concurrency: every UPDATE is qualified by the version it read
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": version_id}
+    
+    # Calendar and overlap queries only look at active requests. PostgreSQL
+    # and SQLite build this as a partial index; other backends ignore the
+    # WHERE clause and fall back to a full index.
+    __table_args__ = (
+        Index(
+            'ix_pto_requests_active_dates', 'start_date', 'end_date',
+            postgresql_where=text("status IN ('pending', 'approved')"),
+            sqlite_where=text("status IN ('pending', 'approved')")
+        ),
+        # Change feed order: (updated_at, id) keyset scans
+        Index('ix_pto_requests_updated_at_id', 'updated_at', 'id'),
+    )
+    
     # Relationships
     user: Mapped["User"] = relationship(
         "User", 
@@ -96,17 +144,22 @@ class PTORequest(Base):
         """Calculate the number of calendar days for this request."""
         return (self.end_date - self.start_date).days + 1
     
+    @property
+    def total_days(self) -> Decimal:
+        """Requested duration in days, for display."""
+        return minutes_to_days(self.duration_minutes or 0)
+    
     @property
     def is_pending(self) -> bool:
         """Check if the request is pending approval."""
-        return self.status == "pending"
+        return self.status == RequestStatus.PENDING
     
     @property
     def is_approved(self) -> bool:
         """Check if the request is approved."""
-        return self.status == "approved"
+        return self.status == RequestStatus.APPROVED
     
     @property
     def is_denied(self) -> bool:
         """Check if the request is denied."""
-        return self.status == "denied"
+        return self.status == RequestStatus.DENIED
@@ -0,0 +1,66 @@
+"""
+PTO Request Event model for the PTO and Market Calendar System.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Integer, DateTime, Text, ForeignKey, Index, event, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class PTORequestEvent(Base):
+    """
+    PTO Request Event model representing one state transition of a request.
+    
+    Rows are append-only: each is written in the same transaction as the
+    transition it records, so a request's history is a single indexed range
+    scan on (request_id, created_at) rather than a reconstruction from the
+    request's mutable columns.
+    """
+    __tablename__ = "pto_request_events"
+    
+    # Primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    
+    # Foreign keys
+    request_id: Mapped[int] = mapped_column(
+        Integer, 
+        ForeignKey("pto_requests.id"), 
+        nullable=False
+    )
+    actor_id: Mapped[Optional[int]] = mapped_column(
+        Integer, 
+        ForeignKey("users.id"), 
+        nullable=True
+    )
+    
+    # Transition details
+    action: Mapped[str] = mapped_column(String(20), nullable=False)
+    from_status: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    to_status: Mapped[str] = mapped_column(String(20), nullable=False)
+    note: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, 
+        default=func.now(), 
+        nullable=False
+    )
+    
+    # Indexes
+    __table_args__ = (
+        Index('ix_pto_request_events_request_created', 'request_id', 'created_at'),
+    )
+    
+    def __repr__(self) -> str:
+        """String representation of the PTORequestEvent model."""
+        return (f"<PTORequestEvent(id={self.id}, request_id={self.request_id}, "
+                f"action='{self.action}', to_status='{self.to_status}')>")
+
+
+@event.listens_for(PTORequestEvent, "before_update")
+@event.listens_for(PTORequestEvent, "before_delete")
+def _reject_mutation(mapper, connection, target) -> None:
+    """Keep the audit trail append-only at the ORM level."""
+    raise ValueError("PTO request events are append-only")
@@ -0,0 +1,71 @@
+"""
+Remote Week model for the PTO and Market Calendar System.
+"""
+from datetime import datetime
+from typing import TYPE_CHECKING
+from sqlalchemy import Integer, SmallInteger, DateTime, ForeignKey, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.database import Base
+
+if TYPE_CHECKING:
+    from .user import User
+
+
+class RemoteWeek(Base):
+    """
+    Remote Week model holding one employee's remote days for one ISO week.
+
+    Days are stored as a bitmask (bit 0 = Monday ... bit 4 = Friday), so the
+    weekly usage check is a popcount of a single row and company-wide
+    occupancy can be computed from a handful of small integers per person.
+    A week without a row falls back to the user's recurring remote_schedule.
+    """
+    __tablename__ = "remote_weeks"
+
+    # Primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    # Foreign keys
+    user_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id"),
+        nullable=False
+    )
+
+    # ISO week identity
+    iso_year: Mapped[int] = mapped_column(Integer, nullable=False)
+    iso_week: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+    # Remote days bitmask, Monday = bit 0
+    day_mask: Mapped[int] = mapped_column(SmallInteger, default=0, nullable=False)
+
+    # Timestamps
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
+    # Optimistic concurrency: two submissions for the same week cannot both pass the cap
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": version_id}
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint('user_id', 'iso_year', 'iso_week', name='uq_remote_week_user_week'),
+    )
+
+    # Relationships
+    user: Mapped["User"] = relationship("User")
+
+    def __repr__(self) -> str:
+        """String representation of the RemoteWeek model."""
+        return (f"<RemoteWeek(user_id={self.user_id}, week={self.iso_year}-W{self.iso_week:02d}, "
+                f"mask={self.day_mask:05b})>")
+
+    @property
+    def days_used(self) -> int:
+        """Number of remote days booked in the week."""
+        return bin(self.day_mask).count("1")
@@ -0,0 +1,30 @@
+"""
+Scheduler Lease model for the PTO and Market Calendar System.
+"""
+from datetime import datetime
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class SchedulerLease(Base):
+    """
+    Scheduler Lease model holding a named, expiring leadership lease.
+    
+    Used for leader election on databases without advisory locks: the
+    holder renews the lease while it runs, and another process may take it
+    over once it has expired.
+    """
+    __tablename__ = "scheduler_leases"
+    
+    # Primary key
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    
+    # Current holder and the time its lease runs out
+    holder: Mapped[str] = mapped_column(String(100), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    
+    def __repr__(self) -> str:
+        """String representation of the SchedulerLease model."""
+        return f"<SchedulerLease(name='{self.name}', holder='{self.holder}', expires_at={self.expires_at})>"
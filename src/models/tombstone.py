@@ -0,0 +1,81 @@
+"""
+Tombstone model for the PTO and Market Calendar System.
+"""
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime, Index, event, func, insert, inspect
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+from .pto_balance import PTOBalance
+from .pto_request import PTORequest
+from .user import User
+
+
+class Tombstone(Base):
+    """
+    Tombstone model recording that a row left an entity's change feed.
+    
+    Deleted rows cannot show up in an ``updated_at`` feed, so the mapper
+    events below write a tombstone in the same flush as every ORM delete
+    (and every user deactivation, which is how users are removed).
+    Bulk DELETE statements bypass the events and must write their own.
+    """
+    __tablename__ = "tombstones"
+    
+    # Reasons
+    DELETED = "deleted"
+    DEACTIVATED = "deactivated"
+    
+    # Primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    
+    # Removed row: change feed entity name and the row's primary key
+    entity: Mapped[str] = mapped_column(String(30), nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    reason: Mapped[str] = mapped_column(String(20), nullable=False)
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, 
+        default=func.now(), 
+        nullable=False
+    )
+    
+    # Indexes
+    __table_args__ = (
+        Index('ix_tombstones_entity_created_id', 'entity', 'created_at', 'id'),
+    )
+    
+    def __repr__(self) -> str:
+        """String representation of the Tombstone model."""
+        return f"<Tombstone(id={self.id}, entity='{self.entity}', entity_id={self.entity_id}, reason='{self.reason}')>"
+
+
+# Change feed entity name of each tracked model
+ENTITIES = {
+    User: 'users',
+    PTORequest: 'requests',
+    PTOBalance: 'balances',
+}
+
+
+def _bury(connection, entity: str, entity_id: int, reason: str) -> None:
+    connection.execute(insert(Tombstone).values(
+        entity=entity, entity_id=entity_id, reason=reason, created_at=func.now()
+    ))
+
+
+def _on_delete(mapper, connection, target) -> None:
+    _bury(connection, ENTITIES[mapper.class_], target.id, Tombstone.DELETED)
+
+
+for _model in ENTITIES:
+    event.listen(_model, "after_delete", _on_delete)
+
+
+@event.listens_for(User, "after_update")
+def _on_user_update(mapper, connection, target) -> None:
+    """Record deactivations; reactivated users reappear through their updated_at."""
+    history = inspect(target).attrs.is_active.history
+    if history.has_changes() and not target.is_active:
+        _bury(connection, 'users', target.id, Tombstone.DEACTIVATED)
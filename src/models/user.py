@@ -3,7 +3,7 @@ User model for the PTO and Market Calendar System.
 """
 from datetime import date, datetime
 from typing import List, Optional, TYPE_CHECKING
-from sqlalchemy import String, Integer, Boolean, Date, DateTime, ForeignKey, JSON, func
+from sqlalchemy import String, Integer, Boolean, Date, DateTime, ForeignKey, Index, JSON, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
@@ -62,6 +62,11 @@ class User(Base):
         nullable=False
     )
     
+    # Change feed order: (updated_at, id) keyset scans
+    __table_args__ = (
+        Index('ix_users_updated_at_id', 'updated_at', 'id'),
+    )
+    
     # Relationships
     department: Mapped[Optional["Department"]] = relationship(
         "Department", 
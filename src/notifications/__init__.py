@@ -0,0 +1,8 @@
+"""
+Request notifications for the PTO and Market Calendar System.
+"""
+from .dispatcher import DispatchResult, OutboxDispatcher, outbox_dispatcher, retry_delay
+from .transports import Digest, Notification, SmtpTransport, WebhookTransport, render_email
+
+__all__ = ['DispatchResult', 'OutboxDispatcher', 'outbox_dispatcher', 'retry_delay', 'Digest', 'Notification',
+           'SmtpTransport', 'WebhookTransport', 'render_email']
@@ -0,0 +1,227 @@
+"""
+Batched delivery of outbox messages.
+
+Each dispatch claims a batch of due messages by pushing their
+``available_at`` past the claim window and committing, then groups them
+into one digest per recipient, delivers the digests and records the
+outcome. Delivery is at least once: a process dying mid-batch leaves its
+messages claimed until the window expires, when the next dispatch picks
+them up again. Failed digests are retried with exponential backoff until
+config.OUTBOX_MAX_ATTEMPTS, after which their messages are marked dead.
+"""
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from ..config import get_config
+from ..models.outbox_message import OutboxMessage, OutboxStatus
+from ..models.user import User
+from ..services.outbox import EMAIL, WEBHOOK
+from .transports import Digest, Notification, SmtpTransport, WebhookTransport
+
+logger = logging.getLogger(__name__)
+
+# Retry delays double from one minute up to six hours
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 6 * 60 * 60
+# How long claimed messages are hidden from other dispatches
+CLAIM_SECONDS = 5 * 60
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next attempt after ``attempts`` failed ones."""
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+class _Claimed(NamedTuple):
+    channel: str
+    target: object  # recipient user ID for email, endpoint URL for webhooks
+    attempts: int
+    notification: Notification
+
+
+class DispatchResult(NamedTuple):
+    """Message counts of one dispatch."""
+    sent: int = 0
+    retried: int = 0
+    dead: int = 0
+
+    def __str__(self) -> str:
+        return f"sent {self.sent}, retrying {self.retried}, dead {self.dead}"
+
+
+class OutboxDispatcher:
+    """
+    Drains the outbox in batches.
+
+    Transports are created from the configuration on first use unless
+    given; a channel without a transport keeps its messages for later.
+    """
+
+    def __init__(self, transports: Optional[Dict[str, object]] = None, batch_size: int = 500) -> None:
+        """
+        Initialize the dispatcher.
+
+        Args:
+            transports: Channel -> object with ``send(digest)`` and ``close()``
+            batch_size: Maximum number of messages claimed per dispatch
+        """
+        self._transports = transports
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+
+    def dispatch(self, db: Session, now: Optional[datetime] = None) -> DispatchResult:
+        """
+        Deliver one batch of due messages.
+
+        A dispatch still running in this process makes the call return
+        without doing anything.
+
+        Args:
+            db: Database session
+            now: Current time, defaults to now
+
+        Returns:
+            DispatchResult: Counts of sent, rescheduled and dead messages
+        """
+        if not self._lock.acquire(blocking=False):
+            return DispatchResult()
+        try:
+            now = now or datetime.now()
+            claimed = self._claim(db, now)
+            if not claimed:
+                return DispatchResult()
+            digests = self._digests(db, claimed)
+            failures = self._deliver(digests)
+            return self._record(db, claimed, failures, now)
+        finally:
+            self._lock.release()
+
+    def purge(self, db: Session, older_than: timedelta = timedelta(days=30)) -> int:
+        """
+        Delete sent messages older than a retention period.
+
+        Args:
+            db: Database session
+            older_than: Retention period of sent messages
+
+        Returns:
+            int: Number of deleted messages
+        """
+        result = db.execute(delete(OutboxMessage).where(
+            OutboxMessage.status == OutboxStatus.SENT,
+            OutboxMessage.sent_at < datetime.now() - older_than
+        ))
+        db.commit()
+        return result.rowcount
+
+    def _transport(self, channel: str) -> Optional[object]:
+        if self._transports is None:
+            config = get_config()
+            self._transports = {WEBHOOK: WebhookTransport()}
+            if config.SMTP_HOST:
+                self._transports[EMAIL] = SmtpTransport.from_config()
+        return self._transports.get(channel)
+
+    def _claim(self, db: Session, now: datetime) -> List[_Claimed]:
+        """Hide a batch of due messages from other dispatches until the claim expires."""
+        stmt = select(
+            OutboxMessage.id, OutboxMessage.channel, OutboxMessage.recipient_id, OutboxMessage.endpoint,
+            OutboxMessage.attempts, OutboxMessage.kind, OutboxMessage.payload, OutboxMessage.created_at
+        ).where(
+            OutboxMessage.status == OutboxStatus.PENDING,
+            OutboxMessage.available_at <= now
+        ).order_by(OutboxMessage.id).limit(self.batch_size).with_for_update(skip_locked=True)
+        claimed = [
+            _Claimed(channel, recipient_id if channel == EMAIL else endpoint, attempts,
+                     Notification(message_id, kind, payload, created_at))
+            for message_id, channel, recipient_id, endpoint, attempts, kind, payload, created_at
+            in db.execute(stmt)
+        ]
+        if claimed:
+            db.execute(update(OutboxMessage).where(
+                OutboxMessage.id.in_([item.notification.id for item in claimed])
+            ).values(available_at=now + timedelta(seconds=CLAIM_SECONDS)),
+                execution_options={'synchronize_session': False})
+        db.commit()
+        return claimed
+
+    def _digests(self, db: Session, claimed: List[_Claimed]) -> List[Digest]:
+        """Group claimed messages into one digest per channel and recipient."""
+        groups: Dict[Tuple[str, object], List[Notification]] = defaultdict(list)
+        for item in claimed:
+            groups[(item.channel, item.target)].append(item.notification)
+        recipient_ids = [target for channel, target in groups if channel == EMAIL]
+        users = {}
+        if recipient_ids:
+            stmt = select(User.id, User.email, User.first_name).where(User.id.in_(recipient_ids))
+            users = {user_id: (email, first_name) for user_id, email, first_name in db.execute(stmt)}
+
+        digests = []
+        for (channel, target), notifications in groups.items():
+            if channel == EMAIL:
+                address, name = users.get(target, ('', ''))
+            else:
+                address, name = target or '', ''
+            digests.append(Digest(channel, address, name, notifications))
+        return digests
+
+    def _deliver(self, digests: List[Digest]) -> Dict[int, str]:
+        """Send every digest; message id -> error for the failed ones."""
+        failures: Dict[int, str] = {}
+        used = set()
+        for digest in digests:
+            ids = [item.id for item in digest.notifications]
+            transport = self._transport(digest.channel)
+            if transport is None:
+                error = f"No transport configured for channel '{digest.channel}'"
+            elif not digest.address:
+                error = "Recipient has no address"
+            else:
+                used.add(digest.channel)
+                try:
+                    transport.send(digest)
+                    continue
+                except Exception as exc:
+                    error = f"{type(exc).__name__}: {exc}"
+                    logger.warning("Delivering %d %s notifications to %s failed: %s",
+                                   len(ids), digest.channel, digest.address, error)
+            failures.update(dict.fromkeys(ids, error))
+        for channel in used:
+            self._transport(channel).close()
+        return failures
+
+    def _record(self, db: Session, claimed: List[_Claimed], failures: Dict[int, str],
+                now: datetime) -> DispatchResult:
+        max_attempts = get_config().OUTBOX_MAX_ATTEMPTS
+        attempts_before = {item.notification.id: item.attempts for item in claimed}
+        sent = [message_id for message_id in attempts_before if message_id not in failures]
+        if sent:
+            db.execute(update(OutboxMessage).where(OutboxMessage.id.in_(sent)).values(
+                status=OutboxStatus.SENT, attempts=OutboxMessage.attempts + 1, sent_at=datetime.now()
+            ), execution_options={'synchronize_session': False})
+        retried = dead = 0
+        rows = []
+        for message_id, error in failures.items():
+            attempts = attempts_before[message_id] + 1
+            if attempts >= max_attempts:
+                status, available_at = OutboxStatus.DEAD, now
+                dead += 1
+            else:
+                status, available_at = OutboxStatus.PENDING, now + retry_delay(attempts)
+                retried += 1
+            rows.append({'id': message_id, 'status': status, 'attempts': attempts,
+                         'available_at': available_at, 'last_error': error})
+        if rows:
+            db.execute(update(OutboxMessage), rows)
+        db.commit()
+        return DispatchResult(len(sent), retried, dead)
+
+
+# Global dispatcher, run by the background scheduler
+outbox_dispatcher = OutboxDispatcher()
@@ -0,0 +1,200 @@
+"""
+Notification digests and the transports delivering them.
+
+A digest bundles every due outbox message of one recipient. Email digests
+are rendered as one plain-text message; webhook digests are posted as one
+JSON document. Transports raise on failure and the dispatcher retries.
+"""
+import json
+import smtplib
+import urllib.request
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ..config import get_config
+from ..services.event_bus import (
+    REQUEST_SUBMITTED, REQUEST_APPROVED, REQUEST_ESCALATED, REQUEST_DENIED, PENDING_REMINDER
+)
+
+
+class Notification(NamedTuple):
+    """One outbox message as handed to a transport."""
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    created_at: datetime
+
+
+class Digest(NamedTuple):
+    """All due notifications of one recipient."""
+    channel: str
+    address: str  # email address or webhook URL
+    name: str
+    notifications: List[Notification]
+
+
+def describe(notification: Notification) -> str:
+    """One sentence describing a notification to its recipient."""
+    data = notification.payload
+    if notification.kind == PENDING_REMINDER:
+        count = data['request_count']
+        return (f"{count} PTO request{'s' if count != 1 else ''} submitted since {data['oldest_submitted_at'][:10]} "
+                f"{'are' if count != 1 else 'is'} still awaiting approval.")
+    what = f"{data['pto_type']} request for {data['start_date']} to {data['end_date']} ({data['total_days']} days)"
+    if notification.kind == REQUEST_SUBMITTED:
+        return f"{data['employee_name']} submitted a {what}; it is awaiting your approval."
+    if notification.kind == REQUEST_ESCALATED:
+        return (f"{data['employee_name']}'s {what} was approved by {data['actor_name'] or 'their manager'}; "
+                f"it is awaiting your approval.")
+    if notification.kind == REQUEST_APPROVED:
+        if not data['actor_name'] and data.get('actor_id') is None:
+            return f"Your {what} was approved automatically."
+        return f"Your {what} was approved by {data['actor_name'] or 'your manager'}."
+    if notification.kind == REQUEST_DENIED:
+        reason = f": {data['note']}" if data.get('note') else "."
+        return f"Your {what} was denied by {data['actor_name'] or 'your manager'}{reason}"
+    return f"{notification.kind}: {what}"
+
+
+def render_email(digest: Digest) -> Tuple[str, str]:
+    """
+    Render an email digest.
+
+    Args:
+        digest: Digest to render
+
+    Returns:
+        Tuple[str, str]: Subject and plain-text body
+    """
+    items = digest.notifications
+    if len(items) == 1 and items[0].kind == PENDING_REMINDER:
+        subject = "PTO requests awaiting your approval"
+    elif len(items) == 1:
+        subject = f"PTO request {items[0].payload['status']}"
+    else:
+        subject = f"{len(items)} PTO request updates"
+    lines = [f"Hello {digest.name},", ""]
+    lines.extend(f"- {describe(item)}" for item in items)
+    lines.extend(["", "TJM Time Calendar"])
+    return subject, "\n".join(lines)
+
+
+class SmtpTransport:
+    """Sends email digests, reusing one SMTP connection per dispatch batch."""
+
+    def __init__(self, host: str, port: int = 25, sender: str = 'timecalendar@localhost',
+                 username: Optional[str] = None, password: Optional[str] = None,
+                 starttls: bool = False, timeout: float = 30.0) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            host: SMTP server host
+            port: SMTP server port
+            sender: From address
+            username: Optional login user
+            password: Optional login password
+            starttls: Upgrade the connection with STARTTLS
+            timeout: Socket timeout in seconds
+        """
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    @classmethod
+    def from_config(cls) -> "SmtpTransport":
+        """Create a transport from the SMTP_* settings."""
+        config = get_config()
+        return cls(config.SMTP_HOST, config.SMTP_PORT, config.NOTIFY_FROM, config.SMTP_USERNAME,
+                   config.SMTP_PASSWORD, config.SMTP_STARTTLS)
+
+    def send(self, digest: Digest) -> None:
+        """
+        Send one digest as an email.
+
+        Args:
+            digest: Digest addressed to an email address
+
+        Raises:
+            smtplib.SMTPException: If the server rejects the message
+            OSError: If the server cannot be reached
+        """
+        subject, body = render_email(digest)
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = digest.address
+        message['Subject'] = subject
+        message.set_content(body)
+        try:
+            self._connection().send_message(message)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Close the connection, if open."""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self._smtp.close()
+            self._smtp = None
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.starttls:
+                    smtp.starttls()
+                if self.username:
+                    smtp.login(self.username, self.password or '')
+            except (smtplib.SMTPException, OSError):
+                smtp.close()
+                raise
+            self._smtp = smtp
+        return self._smtp
+
+
+class WebhookTransport:
+    """Posts digests as JSON to their endpoint."""
+
+    def __init__(self, timeout: float = 10.0) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            timeout: Request timeout in seconds
+        """
+        self.timeout = timeout
+
+    def send(self, digest: Digest) -> None:
+        """
+        Post one digest.
+
+        The body is ``{"events": [...]}``, each event carrying its outbox ID
+        (for de-duplication by the receiver), kind, creation time and payload.
+
+        Args:
+            digest: Digest addressed to a webhook URL
+
+        Raises:
+            OSError: If the request fails or the endpoint answers with an error
+        """
+        body = json.dumps({'events': [
+            {'id': item.id, 'kind': item.kind, 'created_at': item.created_at.isoformat(), **item.payload}
+            for item in digest.notifications
+        ]}).encode()
+        request = urllib.request.Request(digest.address, data=body, method='POST',
+                                         headers={'Content-Type': 'application/json'})
+        # urlopen raises HTTPError (an OSError) for error statuses
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+    def close(self) -> None:
+        """Nothing to release; connections are not kept between requests."""
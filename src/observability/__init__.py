@@ -0,0 +1,8 @@
+"""Runtime diagnostics for the PTO and Market Calendar System."""
+from .asgi import MetricsMiddleware, QueryStatsMiddleware, route_label
+from .metrics import metrics_registry, register_cache, register_pool, track_request_events
+from .query_stats import current_stats, fingerprint, instrument_engine, query_registry, track
+
+__all__ = ['MetricsMiddleware', 'QueryStatsMiddleware', 'route_label', 'metrics_registry', 'register_cache',
+           'register_pool', 'track_request_events', 'current_stats', 'fingerprint', 'instrument_engine',
+           'query_registry', 'track']
@@ -0,0 +1,87 @@
+"""
+ASGI middleware for per-request SQL statistics and latency metrics.
+"""
+import time
+from typing import Any, Dict, Tuple
+
+from starlette.routing import Match, Mount
+
+from .metrics import PAGE_SECONDS
+from .query_stats import track
+
+# Label of requests no route matches (404s)
+UNMATCHED = 'unmatched'
+
+
+def route_label(scope: Dict[str, Any]) -> str:
+    """
+    Label a request by the template of the route it matches.
+
+    The app's routes are matched the way Starlette's router matches them,
+    descending into mounted apps, so /manager/request/7 is labelled
+    /manager/request/{request_id} before the handler runs and the number of
+    labels stays bounded by the number of routes.
+
+    Args:
+        scope: ASGI scope of an HTTP request to a Starlette (or FastAPI) app
+
+    Returns:
+        str: Route template, or UNMATCHED
+    """
+    routes = getattr(scope.get('app'), 'routes', ())
+    prefix = ''
+    while True:
+        matched = None
+        for route in routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                matched = route, child_scope
+                break
+            if match == Match.PARTIAL and matched is None:
+                matched = route, child_scope
+        if matched is None:
+            return UNMATCHED
+        route, child_scope = matched
+        routes = route.routes if isinstance(route, Mount) else ()
+        if not routes:
+            return prefix + route.path
+        prefix += route.path
+        scope = {**scope, **child_scope}
+
+
+class QueryStatsMiddleware:
+    """
+    Track the queries of each HTTP request under its route label.
+
+    Websocket traffic (NiceGUI event handlers) and static asset paths are
+    passed through untracked.
+    """
+
+    def __init__(self, app, skip_prefixes: Tuple[str, ...] = ('/_nicegui',)) -> None:
+        self.app = app
+        self.skip_prefixes = skip_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'].startswith(self.skip_prefixes):
+            await self.app(scope, receive, send)
+            return
+        with track(route_label(scope)):
+            await self.app(scope, receive, send)
+
+
+class MetricsMiddleware:
+    """Observe the latency of each HTTP request per route label."""
+
+    def __init__(self, app, skip_prefixes: Tuple[str, ...] = ('/_nicegui', '/metrics')) -> None:
+        self.app = app
+        self.skip_prefixes = skip_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'].startswith(self.skip_prefixes):
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            PAGE_SECONDS.observe(time.perf_counter() - start, (route_label(scope),))
@@ -0,0 +1,316 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Counters and histograms write to per-thread shards: the hot path is a
+thread-local lookup and a dict update under the shard's own lock, which
+only a scrape copying the shard ever contends for, and the copies are only
+merged when /metrics is scraped. Values that already live elsewhere (pool
+usage, cache hit counts, connected clients) are exposed through callback
+metrics evaluated at scrape time, so they cost nothing between scrapes.
+"""
+import bisect
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Shard:
+    """One thread's label values -> state, and the lock its writes and copies share."""
+    __slots__ = ('values', 'lock')
+
+    def __init__(self) -> None:
+        self.values: dict = {}
+        self.lock = threading.Lock()
+
+    def snapshot(self) -> dict:
+        """Copy the values (and histogram states) so they can be merged without the lock."""
+        with self.lock:
+            return {labels: list(state) if isinstance(state, list) else state
+                    for labels, state in self.values.items()}
+
+
+class _Shards:
+    """Per-thread shards of label values -> state, merged on read."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._lock = threading.Lock()
+
+    def mine(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def snapshots(self) -> List[dict]:
+        with self._lock:
+            shards = list(self._shards)
+        return [shard.snapshot() for shard in shards]
+
+
+class Metric:
+    """Base class for exposed metrics."""
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, LabelValues, float, Sequence[str]]]:
+        """Yield (suffix, label values, value, label names) for each sample."""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for suffix, values, value, names in self.samples():
+            lines.append(f'{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}')
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._shards = _Shards()
+
+    def inc(self, amount: float = 1.0, labels: LabelValues = ()) -> None:
+        shard = self._shards.mine()
+        with shard.lock:
+            shard.values[labels] = shard.values.get(labels, 0.0) + amount
+
+    def value(self, labels: LabelValues = ()) -> float:
+        return sum(shard.get(labels, 0.0) for shard in self._shards.snapshots())
+
+    def samples(self):
+        totals: Dict[LabelValues, float] = {}
+        for shard in self._shards.snapshots():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0.0) + value
+        if not totals and not self.labelnames:
+            totals[()] = 0.0
+        for labels in sorted(totals):
+            yield '', labels, totals[labels], self.labelnames
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._shards = _Shards()
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        bucket = bisect.bisect_left(self.buckets, value)
+        shard = self._shards.mine()
+        with shard.lock:
+            state = shard.values.get(labels)
+            if state is None:
+                # Per-bucket counts (last slot is +Inf), then sum
+                state = shard.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[bucket] += 1
+            state[-1] += value
+
+    def count(self, labels: LabelValues = ()) -> int:
+        return sum(sum(shard[labels][:-1]) for shard in self._shards.snapshots() if labels in shard)
+
+    def samples(self):
+        totals: Dict[LabelValues, list] = {}
+        for shard in self._shards.snapshots():
+            for labels, state in shard.items():
+                merged = totals.setdefault(labels, [0] * len(state))
+                for i, value in enumerate(state):
+                    merged[i] += value
+        names = self.labelnames + ('le',)
+        for labels in sorted(totals):
+            state = totals[labels]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state[:-1]):
+                cumulative += count
+                yield '_bucket', labels + (_format_value(bound),), cumulative, names
+            yield '_sum', labels, state[-1], self.labelnames
+            yield '_count', labels, cumulative, self.labelnames
+
+
+class CallbackMetric(Metric):
+    """Metric whose values are read from a callback at scrape time."""
+
+    def __init__(self, name: str, documentation: str, kind: str,
+                 callback: Callable[[], Dict[LabelValues, float]], labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.callback = callback
+
+    def samples(self):
+        for labels, value in sorted(self.callback().items()):
+            yield '', labels, value, self.labelnames
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add a metric, replacing any earlier one of the same name.
+
+        Args:
+            metric: Metric to expose
+
+        Returns:
+            Metric: The registered metric
+        """
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every metric in the text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                # One broken callback must not take the whole endpoint down
+                lines.append(f'# {metric.name} unavailable: {type(e).__name__}')
+        return '\n'.join(lines) + '\n'
+
+
+# Global registry exposed at /metrics
+metrics_registry = MetricsRegistry()
+
+PAGE_SECONDS = metrics_registry.register(Histogram(
+    'timecalendar_page_render_seconds', 'Time to serve an HTTP page or API request.', ('route',)
+))
+LOGIN_ATTEMPTS = metrics_registry.register(Counter(
+    'timecalendar_login_attempts_total', 'Login attempts.'
+))
+LOGIN_SUCCESSES = metrics_registry.register(Counter(
+    'timecalendar_login_success_total', 'Successful logins.'
+))
+BCRYPT_SECONDS = metrics_registry.register(Histogram(
+    'timecalendar_bcrypt_verify_seconds', 'Time spent verifying password hashes.',
+    buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0)
+))
+REQUEST_EVENTS = metrics_registry.register(Counter(
+    'timecalendar_pto_request_events_total', 'PTO request workflow events by type.', ('event',)
+))
+
+
+def gauge(name: str, documentation: str, callback: Callable[[], Dict[LabelValues, float]],
+          labelnames: Sequence[str] = ()) -> Metric:
+    """Register a gauge read from a callback at scrape time."""
+    return metrics_registry.register(CallbackMetric(name, documentation, 'gauge', callback, labelnames))
+
+
+_caches: Dict[str, object] = {}
+
+
+def _cache_values(attribute: str) -> Dict[LabelValues, float]:
+    return {(name,): float(getattr(cache, attribute)) for name, cache in list(_caches.items())}
+
+
+def _cache_ratios() -> Dict[LabelValues, float]:
+    ratios = {}
+    for name, cache in list(_caches.items()):
+        lookups = cache.hits + cache.misses
+        ratios[(name,)] = cache.hits / lookups if lookups else 0.0
+    return ratios
+
+
+metrics_registry.register(CallbackMetric(
+    'timecalendar_cache_hits_total', 'Cache hits.', 'counter', lambda: _cache_values('hits'), ('cache',)
+))
+metrics_registry.register(CallbackMetric(
+    'timecalendar_cache_misses_total', 'Cache misses.', 'counter', lambda: _cache_values('misses'), ('cache',)
+))
+gauge('timecalendar_cache_hit_ratio', 'Cache hits over lookups since start.', _cache_ratios, ('cache',))
+
+
+def register_cache(name: str, cache: object) -> None:
+    """
+    Expose a cache's hit and miss counters.
+
+    Args:
+        name: Label value identifying the cache
+        cache: Object with integer ``hits`` and ``misses`` attributes
+    """
+    _caches[name] = cache
+
+
+def register_pool(get_engine: Callable[[], object]) -> None:
+    """
+    Expose connection pool usage of the application engine.
+
+    Pools without size accounting (such as SQLite's StaticPool) report
+    only what they support.
+
+    Args:
+        get_engine: Callable returning the engine, evaluated at scrape time
+    """
+    def read(method: str) -> Dict[LabelValues, float]:
+        reader = getattr(get_engine().pool, method, None)
+        return {(): float(reader())} if callable(reader) else {}
+
+    gauge('timecalendar_db_pool_size', 'Configured pool size.', lambda: read('size'))
+    gauge('timecalendar_db_pool_checked_out', 'Connections currently checked out.', lambda: read('checkedout'))
+    gauge('timecalendar_db_pool_overflow', 'Connections beyond the pool size.', lambda: read('overflow'))
+
+
+_events_tracked = False
+
+
+def track_request_events() -> None:
+    """Count PTO workflow events published on the event bus (idempotent)."""
+    global _events_tracked
+    if _events_tracked:
+        return
+    from src.services.event_bus import (
+        event_bus, REQUEST_SUBMITTED, REQUEST_APPROVED, REQUEST_ESCALATED, REQUEST_DENIED, REQUEST_CANCELLED
+    )
+    for name in (REQUEST_SUBMITTED, REQUEST_APPROVED, REQUEST_ESCALATED, REQUEST_DENIED, REQUEST_CANCELLED):
+        event_bus.subscribe(name, lambda event, payload: REQUEST_EVENTS.inc(labels=(event,)))
+    _events_tracked = True
@@ -0,0 +1,254 @@
+"""
+SQL query instrumentation for the PTO and Market Calendar System.
+
+Cursor events on the engine time every statement. Each statement is
+attributed to the scope active in the current context (normally one page
+request, see ``track``), and scopes are aggregated per label so the admin
+diagnostics page can show query counts, DB time and repeated statements
+per page. Statements slower than SLOW_QUERY_MS are logged as structured
+records on the ``timecalendar.slow_query`` logger.
+
+SQL is reduced to a fingerprint (literals and IN lists replaced by
+placeholders) so that the same statement with different parameters is
+counted together; a fingerprint repeated many times within one scope is
+the signature of an N+1 query pattern.
+"""
+import json
+import logging
+import re
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger('timecalendar.slow_query')
+
+# A fingerprint executed this many times in one scope is flagged as N+1
+REPEAT_THRESHOLD = 10
+# Slowest statements kept per scope and in the recent slow-query list
+SLOWEST_PER_SCOPE = 5
+RECENT_SLOW_QUERIES = 50
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\(\w+\)s|:\w+|\$\d+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_POSTCOMPILE = re.compile(r"\(?__\[POSTCOMPILE_\w+\]\)?")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a SQL statement so that executions differing only in values match.
+
+    Args:
+        statement: SQL text as sent to the driver
+
+    Returns:
+        str: Statement with literals and parameters as ``?`` and IN lists as ``IN (...)``
+    """
+    text = _POSTCOMPILE.sub('(?)', statement)
+    text = _STRING.sub('?', text)
+    text = _PARAM.sub('?', text)
+    text = _NUMBER.sub('?', text)
+    text = _IN_LIST.sub('IN (...)', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+@dataclass
+class QueryStats:
+    """Statements executed within one scope, such as a page request."""
+    label: str
+    count: int = 0
+    total_ms: float = 0.0
+    by_fingerprint: Dict[str, int] = field(default_factory=dict)
+    slowest: List[Tuple[float, str]] = field(default_factory=list)
+
+    def record(self, statement_fingerprint: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.by_fingerprint[statement_fingerprint] = self.by_fingerprint.get(statement_fingerprint, 0) + 1
+        if len(self.slowest) < SLOWEST_PER_SCOPE or elapsed_ms > self.slowest[-1][0]:
+            self.slowest.append((elapsed_ms, statement_fingerprint))
+            self.slowest.sort(reverse=True)
+            del self.slowest[SLOWEST_PER_SCOPE:]
+
+    def repeated(self, threshold: int = REPEAT_THRESHOLD) -> Dict[str, int]:
+        """Fingerprints executed at least ``threshold`` times (N+1 suspects)."""
+        return {fp: n for fp, n in self.by_fingerprint.items() if n >= threshold}
+
+
+@dataclass
+class LabelSummary:
+    """Aggregate of every scope recorded under one label."""
+    label: str
+    scopes: int = 0
+    queries: int = 0
+    max_queries: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    repeated: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def avg_queries(self) -> float:
+        return self.queries / self.scopes if self.scopes else 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.scopes if self.scopes else 0.0
+
+
+@dataclass
+class FingerprintSummary:
+    """Process-wide totals of one statement fingerprint."""
+    fingerprint: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class QueryStatsRegistry:
+    """Thread-safe process-wide aggregates of instrumented queries."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard everything recorded so far."""
+        with self._lock:
+            self._labels: Dict[str, LabelSummary] = {}
+            self._fingerprints: Dict[str, FingerprintSummary] = {}
+            self._slow: Deque[Dict[str, object]] = deque(maxlen=RECENT_SLOW_QUERIES)
+
+    def record_query(self, statement_fingerprint: str, elapsed_ms: float) -> None:
+        with self._lock:
+            summary = self._fingerprints.get(statement_fingerprint)
+            if summary is None:
+                summary = self._fingerprints[statement_fingerprint] = FingerprintSummary(statement_fingerprint)
+            summary.calls += 1
+            summary.total_ms += elapsed_ms
+            summary.max_ms = max(summary.max_ms, elapsed_ms)
+
+    def record_slow(self, entry: Dict[str, object]) -> None:
+        with self._lock:
+            self._slow.appendleft(entry)
+
+    def record_scope(self, stats: QueryStats) -> None:
+        with self._lock:
+            summary = self._labels.get(stats.label)
+            if summary is None:
+                summary = self._labels[stats.label] = LabelSummary(stats.label)
+            summary.scopes += 1
+            summary.queries += stats.count
+            summary.max_queries = max(summary.max_queries, stats.count)
+            summary.total_ms += stats.total_ms
+            summary.max_ms = max(summary.max_ms, stats.total_ms)
+            for fp, n in stats.repeated().items():
+                summary.repeated[fp] = max(summary.repeated.get(fp, 0), n)
+
+    def labels(self) -> List[LabelSummary]:
+        """Per-label summaries, most queries per scope first."""
+        with self._lock:
+            return sorted(self._labels.values(), key=lambda s: s.avg_queries, reverse=True)
+
+    def top_fingerprints(self, limit: int = 20) -> List[FingerprintSummary]:
+        """Statements with the most total DB time."""
+        with self._lock:
+            return sorted(self._fingerprints.values(), key=lambda s: s.total_ms, reverse=True)[:limit]
+
+    def slow_queries(self) -> List[Dict[str, object]]:
+        """Most recent slow queries, newest first."""
+        with self._lock:
+            return list(self._slow)
+
+
+# Global registry shared by all instrumented engines
+query_registry = QueryStatsRegistry()
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar('query_stats', default=None)
+_instrumented: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Get the stats of the active scope, if any."""
+    return _current.get()
+
+
+@contextmanager
+def track(label: str) -> Iterator[QueryStats]:
+    """
+    Attribute the statements executed inside the block to one scope.
+
+    Args:
+        label: Name the scope is aggregated under, e.g. a route path
+
+    Yields:
+        QueryStats: The scope's stats, complete when the block exits
+    """
+    stats = QueryStats(label)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        query_registry.record_scope(stats)
+        for statement_fingerprint, n in stats.repeated().items():
+            logger.warning("Possible N+1 in %s: %d executions of %s", label, n, statement_fingerprint)
+
+
+def instrument_engine(engine: Engine, slow_query_ms: Optional[float] = None) -> None:
+    """
+    Install the timing listeners on an engine (idempotent).
+
+    Args:
+        engine: Engine to instrument
+        slow_query_ms: Slow-query threshold, defaults to config.SLOW_QUERY_MS
+    """
+    if engine in _instrumented:
+        return
+    if slow_query_ms is None:
+        from src.config import get_config
+        slow_query_ms = get_config().SLOW_QUERY_MS
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info['query_start'].pop()) * 1000
+        statement_fingerprint = fingerprint(statement)
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement_fingerprint, elapsed_ms)
+        query_registry.record_query(statement_fingerprint, elapsed_ms)
+        if elapsed_ms >= slow_query_ms:
+            entry = {
+                'event': 'slow_query',
+                'elapsed_ms': round(elapsed_ms, 2),
+                'scope': stats.label if stats is not None else None,
+                'fingerprint': statement_fingerprint,
+                'executemany': executemany,
+            }
+            query_registry.record_slow(dict(entry, at=time.time()))
+            slow_query_logger.warning(json.dumps(entry), extra={'query': entry})
+
+    @event.listens_for(engine, 'handle_error')
+    def _on_error(exception_context):
+        # A failed statement never reaches after_cursor_execute
+        starts = exception_context.connection.info.get('query_start') if exception_context.connection else None
+        if starts:
+            starts.pop()
+
+    _instrumented.add(engine)
@@ -0,0 +1,13 @@
+"""
+Background job scheduling for the PTO and Market Calendar System.
+"""
+from .cron import CronSchedule
+from .jobs import register_default_jobs
+from .leader import LeaderLock
+from .scheduler import Job, Scheduler
+
+# Global scheduler with the application's jobs, started by the web app
+scheduler = Scheduler()
+register_default_jobs(scheduler)
+
+__all__ = ['CronSchedule', 'Job', 'LeaderLock', 'Scheduler', 'register_default_jobs', 'scheduler']
@@ -0,0 +1,154 @@
+"""
+Cron-style schedules for background jobs.
+
+Supports the five standard fields (minute, hour, day of month, month, day
+of week with 0 or 7 for Sunday), each a ``*`` or a comma-separated list of
+values, ranges and ``/`` steps, plus the ``@hourly``, ``@daily``,
+``@weekly``, ``@monthly`` and ``@yearly`` shorthands. As in cron, when both
+day fields are restricted a day matches if either one does.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import FrozenSet, Iterator, Optional, Tuple
+
+ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+}
+
+# (name, lowest, highest) of each field
+_FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day of month', 1, 31),
+    ('month', 1, 12),
+    ('day of week', 0, 7),
+)
+
+# Far enough to reach any matching day, including February 29th
+_SEARCH_DAYS = 8 * 366
+
+
+def _parse_field(text: str, name: str, lowest: int, highest: int) -> FrozenSet[int]:
+    """Expand one cron field into the set of values it matches."""
+    values = set()
+    for part in text.split(','):
+        spec, _, step_text = part.partition('/')
+        try:
+            step = int(step_text) if step_text else 1
+            if spec == '*':
+                start, stop = lowest, highest
+            elif '-' in spec:
+                start, stop = (int(bound) for bound in spec.split('-', 1))
+            else:
+                start = int(spec)
+                stop = highest if step_text else start
+        except ValueError:
+            raise ValueError(f"Invalid {name} field '{text}'") from None
+        if step < 1 or not lowest <= start <= stop <= highest:
+            raise ValueError(f"Invalid {name} field '{text}'")
+        values.update(range(start, stop + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """
+    A parsed cron expression.
+
+    Times are naive local datetimes at minute resolution, like the rest of
+    the application's timestamps.
+    """
+
+    def __init__(self, expression: str) -> None:
+        """
+        Parse a cron expression.
+
+        Args:
+            expression: Five cron fields or one of the ``@`` shorthands
+
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        self.expression = expression
+        fields = ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' must have five fields")
+        parsed = [_parse_field(text, *spec) for text, spec in zip(fields, _FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def __repr__(self) -> str:
+        return f"CronSchedule('{self.expression}')"
+
+    def matches_day(self, day: date) -> bool:
+        """Check whether the schedule fires at some time on a day."""
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def matches(self, moment: datetime) -> bool:
+        """Check whether the schedule fires at a moment's minute."""
+        return moment.minute in self.minutes and moment.hour in self.hours and self.matches_day(moment.date())
+
+    def latest(self, moment: datetime) -> Optional[datetime]:
+        """
+        Get the most recent firing time at or before a moment.
+
+        Args:
+            moment: Reference time
+
+        Returns:
+            Optional[datetime]: Latest firing time, or None if there is none
+                within the search horizon (an impossible date like Feb 30)
+        """
+        for day, limit in self._days(moment, -1):
+            for hour in sorted(self.hours, reverse=True):
+                if (hour, 0) > limit:
+                    continue
+                minutes = [m for m in self.minutes if (hour, m) <= limit]
+                if minutes:
+                    return datetime.combine(day, time(hour, max(minutes)))
+        return None
+
+    def next_after(self, moment: datetime) -> Optional[datetime]:
+        """
+        Get the first firing time strictly after a moment.
+
+        Args:
+            moment: Reference time
+
+        Returns:
+            Optional[datetime]: Next firing time, or None if there is none
+                within the search horizon
+        """
+        start = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for day, limit in self._days(start, 1):
+            for hour in sorted(self.hours):
+                if (hour, 59) < limit:
+                    continue
+                minutes = [m for m in self.minutes if (hour, m) >= limit]
+                if minutes:
+                    return datetime.combine(day, time(hour, min(minutes)))
+        return None
+
+    def _days(self, moment: datetime, direction: int) -> Iterator[Tuple[date, Tuple[int, int]]]:
+        """
+        Matching days from a moment's day, each with its (hour, minute) bound.
+
+        Only the first day is bounded by the moment's time of day.
+        """
+        open_bound = (23, 59) if direction < 0 else (0, 0)
+        day = moment.date()
+        for offset in range(_SEARCH_DAYS):
+            if self.matches_day(day):
+                yield day, (moment.hour, moment.minute) if offset == 0 else open_bound
+            day += timedelta(days=direction)
@@ -0,0 +1,252 @@
+"""
+Background jobs of the PTO and Market Calendar System.
+
+Each job takes a session, does its work in as few statements as it can and
+returns a one-line summary that is stored on its ``job_runs`` row. Jobs are
+idempotent: running one twice (or late) leaves the same result as once.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, extract, func, or_, select
+from sqlalchemy.orm import Session
+
+from ..config import get_config
+from ..database import insert_ignore
+from ..models.department import Department
+from ..models.job_run import JobRun
+from ..models.pto_balance import PTOBalance
+from ..models.pto_request import PTORequest, RequestStatus
+from ..models.user import User
+from ..notifications.dispatcher import outbox_dispatcher
+from ..services.approval_service import ApprovalService
+from ..services.balance_service import BalanceService
+from ..services.directory_cache import directory_cache
+from ..services.ics_service import FEED_DEPARTMENT, FEED_MARKET, IcsService
+from ..services.outbox import enqueue_pending_reminder
+from ..utils.concurrency import retry_on_conflict
+from .scheduler import Scheduler
+
+_TOTAL_FIELDS = ('vacation_total_minutes', 'sick_total_minutes', 'personal_total_minutes')
+
+
+def year_rollover(db: Session, today: Optional[date] = None) -> str:
+    """
+    Open the current year's balances of active users.
+
+    Each user gets the previous year's totals (used days start at zero).
+    Rows created empty by a page view before the rollover ran are filled
+    in as well; rows with any total set are left alone. Carryover is not
+    materialized here: the forecast derives it from the previous year.
+
+    Args:
+        db: Database session
+        today: Current date, defaults to today
+
+    Returns:
+        str: Summary of the renewed balances
+    """
+    year = (today or date.today()).year
+    previous_stmt = select(PTOBalance.user_id, *(getattr(PTOBalance, f) for f in _TOTAL_FIELDS)).join(
+        User, User.id == PTOBalance.user_id
+    ).where(User.is_active == True, PTOBalance.year == year - 1)
+    previous = {user_id: totals for user_id, *totals in db.execute(previous_stmt)}
+    if not previous:
+        return f"no {year - 1} balances to renew"
+
+    def renew() -> List[PTOBalance]:
+        for user_id in previous:
+            insert_ignore(db, PTOBalance, {'user_id': user_id, 'year': year}, index_elements=['user_id', 'year'])
+        stmt = select(PTOBalance).where(PTOBalance.year == year, PTOBalance.user_id.in_(list(previous)))
+        renewed = []
+        for balance in db.execute(stmt).scalars():
+            if any(getattr(balance, field) for field in _TOTAL_FIELDS):
+                continue
+            for field, value in zip(_TOTAL_FIELDS, previous[balance.user_id]):
+                setattr(balance, field, value)
+            renewed.append(balance)
+        db.commit()
+        return renewed
+
+    renewed = retry_on_conflict(db, renew)
+    balance_service = BalanceService(db)
+    for balance in renewed:
+        balance_service.publish_balance_changed(balance)
+    return f"renewed {len(renewed)} of {len(previous)} balances for {year}"
+
+
+def reconcile_balances(db: Session) -> str:
+    """
+    Bring pending vacation counters back in line with pending requests.
+
+    Pending minutes are derived purely from pending vacation requests, so
+    drift (a crashed writer, a manual database edit) is corrected. Used
+    minutes may legitimately differ from approved requests through manual
+    adjustments, so differences are only counted in the summary.
+
+    Args:
+        db: Database session
+
+    Returns:
+        str: Summary of the corrections
+    """
+    year_of = extract('year', PTORequest.start_date)
+    is_pending_vacation = (PTORequest.pto_type == 'vacation', PTORequest.status == RequestStatus.PENDING)
+
+    def correct() -> List[PTOBalance]:
+        # Lock and load the balances before summing their requests: a
+        # submission committing in between has bumped a loaded balance's
+        # version, so the write below conflicts and is retried with a fresh
+        # sum instead of overwriting the new reservation with a stale one.
+        stmt = select(PTOBalance).where(or_(
+            PTOBalance.vacation_pending_minutes != 0,
+            PTOBalance.user_id.in_(select(PTORequest.user_id).where(*is_pending_vacation))
+        )).with_for_update()
+        balances = list(db.execute(stmt).scalars())
+        pending_stmt = select(PTORequest.user_id, year_of, func.sum(PTORequest.duration_minutes)).where(
+            *is_pending_vacation
+        ).group_by(PTORequest.user_id, year_of)
+        expected: Dict[Tuple[int, int], int] = {
+            (user_id, int(year)): minutes for user_id, year, minutes in db.execute(pending_stmt)
+        }
+        corrected = []
+        for balance in balances:
+            minutes = expected.get((balance.user_id, balance.year), 0)
+            if balance.vacation_pending_minutes != minutes:
+                balance.vacation_pending_minutes = minutes
+                corrected.append(balance)
+        db.commit()
+        return corrected
+
+    corrected = retry_on_conflict(db, correct)
+    balance_service = BalanceService(db)
+    for balance in corrected:
+        balance_service.publish_balance_changed(balance)
+
+    used_stmt = select(PTORequest.user_id, year_of, PTORequest.pto_type, func.sum(PTORequest.duration_minutes)).where(
+        PTORequest.status == RequestStatus.APPROVED
+    ).group_by(PTORequest.user_id, year_of, PTORequest.pto_type)
+    approved = {(user_id, int(year), pto_type): minutes for user_id, year, pto_type, minutes in db.execute(used_stmt)}
+    balances_stmt = select(PTOBalance.user_id, PTOBalance.year, PTOBalance.vacation_used_minutes,
+                           PTOBalance.sick_used_minutes, PTOBalance.personal_used_minutes)
+    adjusted = sum(
+        1 for user_id, year, *used in db.execute(balances_stmt)
+        if any(minutes != approved.get((user_id, year, pto_type), 0)
+               for pto_type, minutes in zip(('vacation', 'sick', 'personal'), used))
+    )
+    return (f"corrected pending minutes on {len(corrected)} balances; "
+            f"{adjusted} balances have manual used-day adjustments")
+
+
+def remind_stale_pending(db: Session, now: Optional[datetime] = None) -> str:
+    """
+    Remind approvers of requests pending longer than config.STALE_PENDING_DAYS.
+
+    Queues one pending_reminder notification per approver the requests
+    wait for (the department's manager at the first level, the chain's
+    approver above it) in the outbox, for them and their delegates of the
+    day; the dispatcher delivers them. Requests without a designated
+    approver are left to the admins.
+
+    Args:
+        db: Database session
+        now: Current time, defaults to now
+
+    Returns:
+        str: Summary of the reminders
+    """
+    now = now or datetime.now()
+    cutoff = now - timedelta(days=get_config().STALE_PENDING_DAYS)
+    approver = ApprovalService.approver_column()
+    stmt = select(PTORequest.id, PTORequest.submitted_at, approver).join(
+        User, User.id == PTORequest.user_id
+    ).outerjoin(
+        Department, User.department_id == Department.id
+    ).where(
+        PTORequest.status == RequestStatus.PENDING,
+        PTORequest.submitted_at < cutoff
+    ).order_by(PTORequest.submitted_at)
+    by_approver: Dict[Optional[int], List[Tuple[int, datetime]]] = defaultdict(list)
+    for request_id, submitted_at, approver_id in db.execute(stmt):
+        by_approver[approver_id].append((request_id, submitted_at))
+
+    queued = 0
+    for approver_id, requests in by_approver.items():
+        queued += len(enqueue_pending_reminder(
+            db, approver_id, [request_id for request_id, _ in requests], requests[0][1], now.date()
+        ))
+    db.commit()
+    count = sum(len(requests) for requests in by_approver.values())
+    return f"{count} stale requests for {len(by_approver)} approvers, {queued} notifications queued"
+
+
+def warm_caches(db: Session) -> str:
+    """
+    Refresh this process's directory and calendar feed caches.
+
+    Runs in every process, so the first page view or feed poll after a
+    change or restart does not pay for the rebuild.
+
+    Args:
+        db: Database session
+
+    Returns:
+        str: Summary of the warmed caches
+    """
+    directory = directory_cache.get(db)
+    ics_service = IcsService(db)
+    feeds = [(FEED_MARKET, get_config().PRIMARY_MARKET)]
+    feeds.extend((FEED_DEPARTMENT, str(department.id))
+                 for department in directory.departments.values() if department.is_active)
+    for kind, key in feeds:
+        ics_service.get_feed(kind, key)
+    return f"directory v{directory.version}, {len(feeds)} feeds"
+
+
+def dispatch_outbox(db: Session) -> str:
+    """
+    Deliver due notifications from the outbox.
+
+    Args:
+        db: Database session
+
+    Returns:
+        str: Counts of sent, rescheduled and dead messages
+    """
+    return str(outbox_dispatcher.dispatch(db))
+
+
+def purge_history(db: Session, now: Optional[datetime] = None) -> str:
+    """
+    Delete notifications sent more than 30 days ago and job runs older than 14 days.
+
+    Args:
+        db: Database session
+        now: Current time, defaults to now
+
+    Returns:
+        str: Numbers of deleted rows
+    """
+    messages = outbox_dispatcher.purge(db, timedelta(days=30))
+    result = db.execute(delete(JobRun).where(
+        JobRun.status != JobRun.RUNNING,
+        JobRun.scheduled_for < (now or datetime.now()) - timedelta(days=14)
+    ))
+    db.commit()
+    return f"deleted {messages} sent messages and {result.rowcount} job runs"
+
+
+def register_default_jobs(scheduler: Scheduler) -> None:
+    """
+    Register the application's jobs on a scheduler.
+
+    Args:
+        scheduler: Scheduler to register on
+    """
+    scheduler.register('year_rollover', '5 0 1 1 *', year_rollover)
+    scheduler.register('reconcile_balances', '30 2 * * *', reconcile_balances)
+    scheduler.register('remind_stale_pending', '0 8 * * 1-5', remind_stale_pending, catch_up=False)
+    scheduler.register('warm_caches', '*/15 * * * *', warm_caches, leader_only=False)
+    scheduler.register('dispatch_outbox', '* * * * *', dispatch_outbox)
+    scheduler.register('purge_history', '0 3 * * *', purge_history)
@@ -0,0 +1,147 @@
+"""
+Leader election for the background scheduler.
+
+Every application process runs a scheduler, but only the leader runs jobs
+that touch shared data. On PostgreSQL the leader holds a session-level
+advisory lock on a dedicated connection, which the server releases the
+moment that connection dies. Other databases (SQLite) use an expiring lease
+row in ``scheduler_leases`` instead, renewed on every scheduler tick and
+taken over by another process once its holder stops renewing it.
+"""
+import hashlib
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import or_, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from ..database import insert_ignore
+from ..models.scheduler_lease import SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+# How long a lease outlives its last renewal
+LEASE_SECONDS = 180
+
+
+def node_name() -> str:
+    """Identify this process as host:pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _utcnow() -> datetime:
+    # Lease times are compared across hosts, so they are naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class LeaderLock:
+    """
+    Named leadership lock, acquired or renewed by calling ``acquire``.
+
+    ``acquire`` never blocks: it returns whether this process is the leader
+    right now, so callers simply ask again on their next tick.
+    """
+
+    def __init__(self, engine: Engine, name: str = 'scheduler', holder: Optional[str] = None,
+                 lease_seconds: float = LEASE_SECONDS) -> None:
+        """
+        Initialize the lock.
+
+        Args:
+            engine: Engine of the shared (primary) database
+            name: Lock name; processes contending for the same name elect one leader
+            holder: Identity of this process, defaults to host:pid
+            lease_seconds: Lease duration for databases without advisory locks
+        """
+        self._engine = engine
+        self.name = name
+        self.holder = holder or node_name()
+        self._lease = timedelta(seconds=lease_seconds)
+        self._advisory = engine.dialect.name == 'postgresql'
+        # Advisory locks take a signed 64-bit key
+        self._key = int.from_bytes(hashlib.sha1(name.encode()).digest()[:8], 'big', signed=True)
+        self._connection: Optional[Connection] = None
+        self.is_leader = False
+
+    def acquire(self) -> bool:
+        """
+        Become or stay the leader if possible.
+
+        Returns:
+            bool: Whether this process holds the lock
+        """
+        was_leader = self.is_leader
+        self.is_leader = self._acquire_advisory() if self._advisory else self._acquire_lease()
+        if self.is_leader != was_leader:
+            logger.info("%s %s leadership of '%s'", self.holder,
+                        'acquired' if self.is_leader else 'lost', self.name)
+        return self.is_leader
+
+    def release(self) -> None:
+        """Give up leadership so another process can take over right away."""
+        if self._advisory:
+            self._close()
+        elif self.is_leader:
+            with Session(self._engine) as db:
+                db.execute(update(SchedulerLease).where(
+                    SchedulerLease.name == self.name,
+                    SchedulerLease.holder == self.holder
+                ).values(expires_at=_utcnow()))
+                db.commit()
+        self.is_leader = False
+
+    def _acquire_advisory(self) -> bool:
+        if self._connection is not None:
+            # The lock lives as long as its connection
+            try:
+                self._connection.execute(text("SELECT 1"))
+                self._connection.commit()
+                return True
+            except DBAPIError:
+                self._close()
+        connection = self._engine.connect()
+        try:
+            acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {'key': self._key}).scalar()
+            # Session-level locks survive the commit; the connection must not idle in a transaction
+            connection.commit()
+        except DBAPIError:
+            connection.close()
+            raise
+        if acquired:
+            self._connection = connection
+            return True
+        connection.close()
+        return False
+
+    def _acquire_lease(self) -> bool:
+        now = _utcnow()
+        with Session(self._engine) as db:
+            insert_ignore(db, SchedulerLease, {
+                'name': self.name,
+                'holder': self.holder,
+                'expires_at': now
+            }, index_elements=['name'])
+            result = db.execute(update(SchedulerLease).where(
+                SchedulerLease.name == self.name,
+                or_(SchedulerLease.holder == self.holder, SchedulerLease.expires_at <= now)
+            ).values(holder=self.holder, expires_at=now + self._lease))
+            db.commit()
+            return result.rowcount == 1
+
+    def _close(self) -> None:
+        if self._connection is None:
+            return
+        # Unlock before the connection goes back to the pool; a connection
+        # that cannot unlock is discarded, which ends its server session
+        try:
+            self._connection.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': self._key})
+            self._connection.commit()
+        except DBAPIError:
+            self._connection.invalidate()
+        self._connection.close()
+        self._connection = None
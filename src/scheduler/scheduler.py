@@ -0,0 +1,249 @@
+"""
+In-process background job scheduler.
+
+A daemon thread wakes at the start of every minute, makes sure this process
+is still (or becomes) the leader, and hands every job that has come due to a
+small thread pool, so a slow job never delays the tick or the UI's event
+loop. Before a leader job runs it is claimed by inserting its ``job_runs``
+row: the unique (job, scheduled time) key lets each occurrence run once even
+if leadership changes hands, and the same rows record the outcome.
+
+Jobs with ``catch_up`` run their latest missed occurrence after downtime
+(a year rollover due while every process was stopped still happens); the
+others only run on time. Jobs that are not ``leader_only`` (cache warmup)
+run in every process, without a ``job_runs`` row.
+"""
+import logging
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import get_config
+from ..database import get_engine, get_sessionmaker
+from ..models.job_run import JobRun
+from .cron import CronSchedule
+from .leader import LeaderLock, node_name
+
+logger = logging.getLogger(__name__)
+
+JobFunction = Callable[[Session], Optional[str]]
+
+
+@dataclass(frozen=True)
+class Job:
+    """A registered job: its function receives a session and may return a summary."""
+    name: str
+    schedule: CronSchedule
+    func: JobFunction
+    catch_up: bool = True
+    leader_only: bool = True
+
+
+class Scheduler:
+    """
+    Cron-style job scheduler with leader election and a worker pool.
+
+    Jobs are registered at import time and the scheduler is started and
+    stopped with the web application.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None,
+                 lock: Optional[LeaderLock] = None, workers: Optional[int] = None) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            session_factory: Factory for job sessions, defaults to the application's
+            lock: Leader lock, defaults to one on the application engine
+            workers: Worker threads, defaults to config.SCHEDULER_WORKERS
+        """
+        self._session_factory = session_factory
+        self._lock = lock
+        self._workers = workers
+        self._jobs: Dict[str, Job] = {}
+        self._last_due: Dict[str, datetime] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._tick_lock = threading.Lock()
+        self.node = lock.holder if lock is not None else node_name()
+
+    @property
+    def jobs(self) -> List[Job]:
+        return list(self._jobs.values())
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def register(self, name: str, cron: str, func: JobFunction, catch_up: bool = True,
+                 leader_only: bool = True) -> Job:
+        """
+        Register a job.
+
+        Args:
+            name: Unique job name, stored on its runs
+            cron: Cron expression of the job's schedule
+            func: Job function
+            catch_up: Run the latest missed occurrence after downtime
+            leader_only: Run only in the leader process
+
+        Returns:
+            Job: The registered job
+
+        Raises:
+            ValueError: If the name is taken or the cron expression is invalid
+        """
+        if name in self._jobs:
+            raise ValueError(f"Job '{name}' is already registered")
+        job = Job(name, CronSchedule(cron), func, catch_up, leader_only)
+        self._jobs[name] = job
+        return job
+
+    def start(self) -> None:
+        """Start the scheduler thread, unless disabled by config.SCHEDULER_ENABLED."""
+        if self.running or not get_config().SCHEDULER_ENABLED:
+            return
+        self._ensure_ready()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name='scheduler', daemon=True)
+        self._thread.start()
+        logger.info("Scheduler started on %s with %d jobs", self.node, len(self._jobs))
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """
+        Stop scheduling, let running jobs finish and give up leadership.
+
+        Args:
+            timeout: Seconds to wait for the scheduler thread
+        """
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._lock is not None:
+            self._lock.release()
+
+    def run_pending(self, now: Optional[datetime] = None) -> List[Future]:
+        """
+        Submit every job that has come due (one scheduler tick).
+
+        Args:
+            now: Current time, defaults to the clock
+
+        Returns:
+            List[Future]: Futures of the submitted runs
+        """
+        self._ensure_ready()
+        now = (now or datetime.now()).replace(second=0, microsecond=0)
+        with self._tick_lock:
+            is_leader = self._lock.acquire()
+            futures = []
+            for job in self._jobs.values():
+                if job.leader_only and not is_leader:
+                    continue
+                due = job.schedule.latest(now)
+                if due is None or (not job.catch_up and due != now):
+                    continue
+                if due <= self._last_due.get(job.name, datetime.min):
+                    continue
+                self._last_due[job.name] = due
+                run_id = self._claim(job, due) if job.leader_only else None
+                if job.leader_only and run_id is None:
+                    continue
+                futures.append(self._pool.submit(self._execute, job, run_id))
+            return futures
+
+    def run_now(self, name: str) -> Future:
+        """
+        Run a job immediately, outside its schedule.
+
+        Args:
+            name: Name of the job
+
+        Returns:
+            Future: Future of the run
+
+        Raises:
+            ValueError: If the job does not exist
+        """
+        job = self._jobs.get(name)
+        if job is None:
+            raise ValueError(f"Job '{name}' not found")
+        self._ensure_ready()
+        run_id = self._claim(job, datetime.now()) if job.leader_only else None
+        return self._pool.submit(self._execute, job, run_id)
+
+    def recent_runs(self, limit: int = 20) -> List[JobRun]:
+        """
+        Get the most recent job runs of all processes.
+
+        Args:
+            limit: Maximum number of runs
+
+        Returns:
+            List[JobRun]: Runs, most recently scheduled first
+        """
+        self._ensure_ready()
+        stmt = select(JobRun).order_by(JobRun.scheduled_for.desc(), JobRun.id.desc()).limit(limit)
+        with self._session_factory() as db:
+            return list(db.execute(stmt).scalars().all())
+
+    def _ensure_ready(self) -> None:
+        if self._session_factory is None:
+            self._session_factory = get_sessionmaker()
+        if self._lock is None:
+            self._lock = LeaderLock(get_engine(), holder=self.node)
+        if self._pool is None:
+            workers = self._workers or get_config().SCHEDULER_WORKERS
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.run_pending()
+            except Exception:
+                logger.exception("Scheduler tick failed")
+            # Sleep until just past the start of the next minute
+            now = datetime.now()
+            self._stopping.wait(60 - now.second - now.microsecond / 1e6 + 0.5)
+
+    def _claim(self, job: Job, scheduled_for: datetime) -> Optional[int]:
+        """Insert the run's row; None if another process already ran this occurrence."""
+        run = JobRun(job_name=job.name, scheduled_for=scheduled_for, node=self.node,
+                     status=JobRun.RUNNING, started_at=datetime.now())
+        with self._session_factory() as db:
+            db.add(run)
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                return None
+            return run.id
+
+    def _execute(self, job: Job, run_id: Optional[int]) -> Optional[str]:
+        status, summary, error = JobRun.SUCCEEDED, None, None
+        with self._session_factory() as db:
+            try:
+                summary = job.func(db)
+                logger.info("Job %s finished: %s", job.name, summary or 'ok')
+            except Exception:
+                db.rollback()
+                status, error = JobRun.FAILED, traceback.format_exc()
+                logger.exception("Job %s failed", job.name)
+            if run_id is not None:
+                db.execute(update(JobRun).where(JobRun.id == run_id).values(
+                    status=status, summary=summary, error=error, finished_at=datetime.now()
+                ))
+                db.commit()
+        return summary
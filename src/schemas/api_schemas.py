@@ -0,0 +1,27 @@
+"""
+Request bodies of the JSON API for the PTO and Market Calendar System.
+"""
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from src.schemas.pto_schemas import PTORequestCreate
+
+# Largest batch accepted by one call
+MAX_BATCH = 100
+
+
+class RequestBatchCreate(BaseModel):
+    """Schema for submitting several PTO requests in one call."""
+    requests: List[PTORequestCreate] = Field(..., min_length=1, max_length=MAX_BATCH)
+
+
+class RequestBatchApprove(BaseModel):
+    """Schema for approving several PTO requests in one call."""
+    request_ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH)
+    approved_by: int = Field(..., description="ID of the approving manager or admin")
+
+
+class RequestBatchDeny(RequestBatchApprove):
+    """Schema for denying several PTO requests in one call."""
+    denial_reason: str = Field(..., min_length=1, description="Reason given to every employee")
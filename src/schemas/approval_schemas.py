@@ -0,0 +1,35 @@
+"""
+Approval chain and delegation schemas for the PTO and Market Calendar System.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class ApprovalStepCreate(BaseModel):
+    """Schema for adding a level to the approval chain of long requests."""
+    name: str = Field(..., min_length=1, max_length=100, description="Name of the level, e.g. 'Department head'")
+    department_id: Optional[int] = Field(None, description="Department the step applies to; None for every department")
+    level: int = Field(2, ge=2, description="Position in the chain; level 1 is the department's manager")
+    over_days: Decimal = Field(Decimal('0'), ge=0, description="Requests longer than this need the step, in days")
+    approver_id: int = Field(..., description="User approving this level")
+
+
+class ApprovalDelegationCreate(BaseModel):
+    """Schema for delegating an approver's decisions over a date range."""
+    delegator_id: int = Field(..., description="Approver who is away")
+    delegate_id: int = Field(..., description="User deciding in their place")
+    start_date: date = Field(..., description="First day of the delegation")
+    end_date: date = Field(..., description="Last day of the delegation")
+    note: Optional[str] = Field(None, max_length=200, description="Optional note, e.g. the reason")
+
+    @model_validator(mode='after')
+    def validate_delegation(self) -> 'ApprovalDelegationCreate':
+        """Validate the date range and that nobody delegates to themselves."""
+        if self.start_date > self.end_date:
+            raise ValueError('End date must be after or equal to start date')
+        if self.delegator_id == self.delegate_id:
+            raise ValueError('Approvers cannot delegate to themselves')
+        return self
@@ -4,7 +4,9 @@ PTO-related Pydantic schemas for the PTO and Market Calendar System.
 from datetime import date
 from decimal import Decimal
 from typing import Optional
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from src.utils.pto_units import DayPart, request_minutes
 
 
 class PTORequestBase(BaseModel):
@@ -12,7 +14,9 @@ class PTORequestBase(BaseModel):
     pto_type: str = Field(..., description="Type of PTO (vacation, sick, personal)")
     start_date: date = Field(..., description="Start date of PTO")
     end_date: date = Field(..., description="End date of PTO")
-    total_days: Decimal = Field(..., ge=0, description="Total days requested")
+    day_part: str = Field(DayPart.FULL, description="Granularity (full, am, pm, hours)")
+    total_days: Optional[Decimal] = Field(None, ge=0, description="Working days requested; counted from the dates if omitted")
+    hours: Optional[Decimal] = Field(None, gt=0, description="Hours requested, for hourly requests")
     notes: Optional[str] = Field(None, description="Optional notes for the request")
     
     @field_validator('end_date')
@@ -22,6 +26,18 @@ class PTORequestBase(BaseModel):
         if 'start_date' in info.data and v < info.data['start_date']:
             raise ValueError('End date must be after or equal to start date')
         return v
+    
+    @model_validator(mode='after')
+    def validate_duration(self) -> 'PTORequestBase':
+        """Validate the day part against the date range and hours."""
+        if self.duration_minutes <= 0:
+            raise ValueError('Request must cover at least one working period')
+        return self
+    
+    @property
+    def duration_minutes(self) -> int:
+        """Requested duration in workday minutes."""
+        return request_minutes(self.start_date, self.end_date, self.day_part, self.hours, self.total_days)
 
 
 class PTORequestCreate(PTORequestBase):
@@ -0,0 +1,46 @@
+"""
+Department rule schemas for the PTO and Market Calendar System.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from src.models.department_rule import RuleKind
+
+
+class DepartmentRuleCreate(BaseModel):
+    """Schema for creating a department rule."""
+    department_id: Optional[int] = Field(None, description="Department the rule applies to; None for every department")
+    kind: str = Field(..., description="Rule kind (blackout, min_headcount, max_absent)")
+    name: str = Field(..., min_length=1, max_length=100, description="Name shown in violation messages")
+    start_date: Optional[date] = Field(None, description="First day the rule applies; None for no start")
+    end_date: Optional[date] = Field(None, description="Last day the rule applies; None for no end")
+    value: Optional[int] = Field(None, ge=0, description="Headcount limit of min_headcount and max_absent rules")
+    
+    @model_validator(mode='after')
+    def validate_rule(self) -> 'DepartmentRuleCreate':
+        """Validate the kind, date range and limit together."""
+        if self.kind not in RuleKind.ALL:
+            raise ValueError(f"Unknown rule kind '{self.kind}'")
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValueError('End date must be after or equal to start date')
+        if self.kind == RuleKind.BLACKOUT:
+            if self.start_date is None or self.end_date is None:
+                raise ValueError('Blackout rules need a start and end date')
+        elif self.value is None:
+            raise ValueError(f"{self.kind} rules need a value")
+        return self
+
+
+class AutoApprovalRuleCreate(BaseModel):
+    """Schema for creating an auto-approval rule; unset conditions are not checked."""
+    name: str = Field(..., min_length=1, max_length=100, description="Name recorded on approved requests")
+    department_id: Optional[int] = Field(None, description="Department the rule applies to; None for every department")
+    priority: int = Field(100, description="Rules are tried in increasing priority")
+    pto_type: Optional[str] = Field(None, description="PTO type approved; None for any type")
+    max_days: Optional[Decimal] = Field(None, gt=0, description="Longest request approved, in days")
+    min_headroom_days: Optional[Decimal] = Field(None, ge=0, description="Balance that must remain afterwards, in days")
+    max_colleagues_out: Optional[int] = Field(None, ge=0, description="Colleagues allowed out on any day of the request")
+    allow_blackout: bool = Field(False, description="Approve requests overlapping a blackout (sick leave may)")
@@ -3,10 +3,12 @@ Services package for the PTO and Market Calendar System.
 """
 from .balance_service import BalanceService
 from .pto_service import PTOService
+from .remote_work_service import RemoteWorkService
 from .user_service import UserService
 
 __all__ = [
     'BalanceService',
     'PTOService',
+    'RemoteWorkService',
     'UserService',
 ]
@@ -0,0 +1,353 @@
+"""
+Approval chains and delegation for the PTO and Market Calendar System.
+
+A request's approval chain starts with its department's manager, followed
+by the active ApprovalSteps its department and duration need, in level
+order (the same approver twice in a row counts once). Nobody decides
+their own request: the requester is left out of the chain, so a manager's
+own request starts at the next level, or is left to the admins when there
+is none. The chain is not stored: ``approval_level`` on the request counts
+the levels approved so far, and ``current_approver_id`` holds the approver
+of the current level once past the first (or from submission, for a
+manager's own request), so a change of department manager moves requests
+still waiting at the first level to the new manager.
+
+An ApprovalDelegation lets a delegate decide, over a date range, every
+request waiting for the delegator. Two questions are asked about it:
+
+- "Who can approve request R today" comes from the cached rule book (see
+  RuleService), which keeps an IntervalIndex of delegation ranges per
+  delegator; it decides who is notified and which pages show the request.
+- "May user U decide R" and "what is in U's queue" are answered by the
+  database so a revoked delegation stops at once: the queue is a single
+  query on the pending requests, with the delegators U acts for today read
+  by an index range scan on (delegate_id, start_date, end_date).
+
+Requests without a designated approver (no department or no manager) are
+open to every approver, as before chains existed, and admins may decide
+any request but their own.
+"""
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import Select, and_, case, false, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..models.approval_delegation import ApprovalDelegation
+from ..models.approval_step import ApprovalStep
+from ..models.department import Department
+from ..models.pto_request import PTORequest
+from ..models.user import User
+from ..schemas.approval_schemas import ApprovalDelegationCreate, ApprovalStepCreate
+from ..utils.pto_units import days_to_minutes
+from .directory_cache import directory_cache
+from .rule_service import rule_cache
+
+# Roles that may receive delegations, and the one that may decide any request
+APPROVER_ROLES = ('manager', 'admin')
+ADMIN_ROLE = 'admin'
+
+
+class ApprovalService:
+    """
+    Service class for approval chains, delegations and approver lookups.
+    """
+
+    def __init__(self, db: Session) -> None:
+        """
+        Initialize the ApprovalService with a database session.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+
+    def create_step(self, step_data: ApprovalStepCreate) -> ApprovalStep:
+        """
+        Add a level to the approval chain of long requests.
+
+        Args:
+            step_data: Step creation data
+
+        Returns:
+            ApprovalStep: The created step
+
+        Raises:
+            ValueError: If the department does not exist or the approver cannot approve
+        """
+        if step_data.department_id is not None and self.db.get(Department, step_data.department_id) is None:
+            raise ValueError(f"Department with ID {step_data.department_id} not found")
+        self._require_approver(step_data.approver_id)
+        step = ApprovalStep(
+            name=step_data.name,
+            department_id=step_data.department_id,
+            level=step_data.level,
+            over_duration_minutes=days_to_minutes(step_data.over_days),
+            approver_id=step_data.approver_id
+        )
+        self.db.add(step)
+        self.db.commit()
+        self.db.refresh(step)
+        rule_cache.invalidate()
+        return step
+
+    def deactivate_step(self, step_id: int) -> bool:
+        """
+        Remove a level from the approval chain.
+
+        Requests already waiting at the level keep their approver.
+
+        Args:
+            step_id: ID of the step
+
+        Returns:
+            bool: True if the step was found
+        """
+        step = self.db.get(ApprovalStep, step_id)
+        if step is None:
+            return False
+        step.is_active = False
+        self.db.commit()
+        rule_cache.invalidate()
+        return True
+
+    def create_delegation(self, delegation_data: ApprovalDelegationCreate) -> ApprovalDelegation:
+        """
+        Let another approver decide an approver's requests over a date range.
+
+        Args:
+            delegation_data: Delegation creation data
+
+        Returns:
+            ApprovalDelegation: The created delegation
+
+        Raises:
+            ValueError: If either user does not exist or the delegate cannot approve
+        """
+        if self.db.get(User, delegation_data.delegator_id) is None:
+            raise ValueError(f"User with ID {delegation_data.delegator_id} not found")
+        self._require_approver(delegation_data.delegate_id)
+        delegation = ApprovalDelegation(
+            delegator_id=delegation_data.delegator_id,
+            delegate_id=delegation_data.delegate_id,
+            start_date=delegation_data.start_date,
+            end_date=delegation_data.end_date,
+            note=delegation_data.note
+        )
+        self.db.add(delegation)
+        self.db.commit()
+        self.db.refresh(delegation)
+        rule_cache.invalidate()
+        return delegation
+
+    def revoke_delegation(self, delegation_id: int) -> bool:
+        """
+        End a delegation before its end date.
+
+        Args:
+            delegation_id: ID of the delegation
+
+        Returns:
+            bool: True if the delegation was found
+        """
+        result = self.db.execute(update(ApprovalDelegation).where(
+            ApprovalDelegation.id == delegation_id
+        ).values(is_active=False))
+        self.db.commit()
+        rule_cache.invalidate()
+        return result.rowcount > 0
+
+    def list_delegations(self, user_id: int, on: Optional[date] = None) -> List[ApprovalDelegation]:
+        """
+        Get the active delegations a user gave or received.
+
+        Args:
+            user_id: ID of the delegator or delegate
+            on: Optional day the delegations must cover
+
+        Returns:
+            List[ApprovalDelegation]: Delegations ordered by start date
+        """
+        stmt = select(ApprovalDelegation).where(
+            or_(ApprovalDelegation.delegator_id == user_id, ApprovalDelegation.delegate_id == user_id),
+            ApprovalDelegation.is_active == True
+        )
+        if on is not None:
+            stmt = stmt.where(ApprovalDelegation.start_date <= on, ApprovalDelegation.end_date >= on)
+        stmt = stmt.order_by(ApprovalDelegation.start_date, ApprovalDelegation.id)
+        return list(self.db.execute(stmt).scalars().all())
+
+    def chain(self, request: PTORequest) -> List[Optional[int]]:
+        """
+        Get the approver of each level of a request's chain.
+
+        Args:
+            request: The request
+
+        Returns:
+            List[Optional[int]]: Approver IDs from the first level up, without
+                the requester; ``[None]`` when nobody else is designated
+        """
+        directory = directory_cache.get(self.db)
+        employee = directory.users.get(request.user_id)
+        department_id = employee.department_id if employee is not None else None
+        department = directory.departments.get(department_id)
+        candidates = [department.manager_id if department is not None else None]
+        candidates.extend(step.approver_id for step in
+                          rule_cache.get(self.db).approval_steps_for(department_id, request.duration_minutes))
+        approvers: List[Optional[int]] = []
+        for approver in candidates:
+            if approver != request.user_id and (not approvers or approver != approvers[-1]):
+                approvers.append(approver)
+        return approvers or [None]
+
+    def assign_first_level(self, request: PTORequest) -> None:
+        """
+        Pin the first approver of a manager's own request at submission.
+
+        Other requests wait for whoever manages the department, so they are
+        left unassigned; a manager's own request waits for the next level.
+
+        Args:
+            request: The request being submitted
+        """
+        if self._manages_own_department(request):
+            request.current_approver_id = self.chain(request)[0]
+
+    def current_approver(self, request: PTORequest) -> Optional[int]:
+        """
+        Get the approver of the level a request is waiting at.
+
+        Args:
+            request: The request
+
+        Returns:
+            Optional[int]: Approver ID, or None if the request has no designated approver
+        """
+        if request.approval_level > 0:
+            return request.current_approver_id
+        return self.chain(request)[0]
+
+    def approvers_for(self, request: PTORequest, on: Optional[date] = None) -> Optional[List[int]]:
+        """
+        Get who may decide a request on a day: its current approver and their delegates.
+
+        Answered from the cached rule book without a query.
+
+        Args:
+            request: The request
+            on: Day of the decision, defaults to today
+
+        Returns:
+            Optional[List[int]]: User IDs, current approver first, or None if
+                every approver may decide the request
+        """
+        approver = self.current_approver(request)
+        if approver is None:
+            if self._manages_own_department(request):
+                return [user.id for user in directory_cache.get(self.db).users.values()
+                        if user.role == ADMIN_ROLE and user.is_active and user.id != request.user_id]
+            return None
+        delegates = rule_cache.get(self.db).delegates_of(approver, on or date.today())
+        return [approver] + [user_id for user_id in delegates if user_id != approver]
+
+    def can_approve(self, request: PTORequest, user_id: int, on: Optional[date] = None) -> bool:
+        """
+        Check whether a user may approve or deny a request at its current level.
+
+        Args:
+            request: The request
+            user_id: ID of the user deciding
+            on: Day of the decision, defaults to today
+
+        Returns:
+            bool: True for the current approver, their delegates of the day, and
+                admins; with no designated approver, for every approver (admins
+                only for a manager's own request); never for the requester
+        """
+        if user_id == request.user_id:
+            return False
+        approver = self.current_approver(request)
+        if approver == user_id:
+            return True
+        user = directory_cache.get(self.db).users.get(user_id)
+        role = user.role if user is not None and user.is_active else None
+        if role == ADMIN_ROLE:
+            return True
+        if approver is None:
+            return role in APPROVER_ROLES and not self._manages_own_department(request)
+        on = on or date.today()
+        stmt = select(ApprovalDelegation.id).where(
+            ApprovalDelegation.delegate_id == user_id,
+            ApprovalDelegation.start_date <= on,
+            ApprovalDelegation.end_date >= on,
+            ApprovalDelegation.delegator_id == approver,
+            ApprovalDelegation.is_active == True
+        ).limit(1)
+        return self.db.execute(stmt).first() is not None
+
+    def filter_queue(self, stmt: Select, user_id: int, on: Optional[date] = None) -> Select:
+        """
+        Restrict a query of pending requests to those a user may decide.
+
+        The statement must already join PTORequest to the requesting User.
+        The queue stays one query: the request must not be the user's own,
+        and its current approver (see ``approver_column``) must be the user,
+        someone the user is a delegate for on the day, or nobody; requests
+        of a department's manager without a further level go to admins only.
+
+        Args:
+            stmt: Query over pending requests joined to their users
+            user_id: ID of the approver whose queue is built
+            on: Day of the queue, defaults to today
+
+        Returns:
+            Select: The filtered query; for admins, only the user's own requests are left out
+        """
+        stmt = stmt.where(PTORequest.user_id != user_id)
+        user = directory_cache.get(self.db).users.get(user_id)
+        role = user.role if user is not None and user.is_active else None
+        if role == ADMIN_ROLE:
+            return stmt
+        if role not in APPROVER_ROLES:
+            return stmt.where(false())
+        on = on or date.today()
+        acting_for = select(ApprovalDelegation.delegator_id).where(
+            ApprovalDelegation.delegate_id == user_id,
+            ApprovalDelegation.start_date <= on,
+            ApprovalDelegation.end_date >= on,
+            ApprovalDelegation.is_active == True
+        )
+        approver = self.approver_column()
+        return stmt.outerjoin(Department, User.department_id == Department.id).where(
+            or_(approver == user_id, approver.in_(acting_for),
+                and_(approver.is_(None), Department.manager_id.is_(None)))
+        )
+
+    @staticmethod
+    def approver_column():
+        """
+        SQL expression of a pending request's current approver.
+
+        The current approver is the designated approver past the first level,
+        otherwise the department's manager unless they are the requester.
+        NULL means no designated approver. Queries must join PTORequest to the
+        requesting User and outer-join the User's Department.
+        """
+        return func.coalesce(
+            PTORequest.current_approver_id,
+            case((Department.manager_id != PTORequest.user_id, Department.manager_id))
+        )
+
+    def _manages_own_department(self, request: PTORequest) -> bool:
+        """Whether the requester is the manager of their own department."""
+        directory = directory_cache.get(self.db)
+        employee = directory.users.get(request.user_id)
+        department = directory.departments.get(employee.department_id) if employee is not None else None
+        return department is not None and department.manager_id == request.user_id
+
+    def _require_approver(self, user_id: int) -> None:
+        """Raise ValueError unless the user exists, is active and has an approver role."""
+        user = self.db.get(User, user_id)
+        if user is None or not user.is_active or user.role not in APPROVER_ROLES:
+            raise ValueError(f"User {user_id} cannot approve requests")
@@ -0,0 +1,169 @@
+"""
+Auto-approval of routine PTO requests for the PTO and Market Calendar System.
+
+Most sick days and single personal days would be approved anyway. Right
+after a request passes the submit checks, PTOService asks ``match`` for the
+first auto-approval rule the request meets; a matching request is approved
+in the same transaction as its submission, with the rule recorded on it,
+and never reaches a manager's queue.
+
+Rules come from the cached rule book (see RuleService), and their conditions
+are checked cheapest first: type and duration need no queries, balance
+headroom uses the balance row already loaded for the submission, and the
+blackout and colleague counts are only queried when a candidate rule
+checks them.
+"""
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..config import get_config
+from ..models.auto_approval_rule import AutoApprovalRule
+from ..models.department import Department
+from ..models.department_rule import RuleKind
+from ..models.pto_balance import PTOBalance
+from ..models.pto_request import PTORequest, RequestStatus
+from ..schemas.rule_schemas import AutoApprovalRuleCreate
+from ..utils.pto_units import days_to_minutes
+from .rule_service import CompiledAutoApproval, RuleService, rule_cache
+
+# Balance available for each PTO type, in minutes; other types have none
+_AVAILABLE = {
+    'vacation': lambda balance: balance.vacation_available_minutes,
+    'sick': lambda balance: balance.sick_available_minutes,
+    'personal': lambda balance: balance.personal_available_minutes,
+}
+
+
+class AutoApprovalService:
+    """
+    Service class for auto-approval rules and matching requests against them.
+    """
+
+    def __init__(self, db: Session) -> None:
+        """
+        Initialize the AutoApprovalService with a database session.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+        self.rule_service = RuleService(db)
+
+    def create_rule(self, rule_data: AutoApprovalRuleCreate) -> AutoApprovalRule:
+        """
+        Create an auto-approval rule.
+
+        Args:
+            rule_data: Rule creation data
+
+        Returns:
+            AutoApprovalRule: The created rule
+
+        Raises:
+            ValueError: If the department does not exist
+        """
+        if rule_data.department_id is not None and self.db.get(Department, rule_data.department_id) is None:
+            raise ValueError(f"Department with ID {rule_data.department_id} not found")
+        rule = AutoApprovalRule(
+            name=rule_data.name,
+            department_id=rule_data.department_id,
+            priority=rule_data.priority,
+            pto_type=rule_data.pto_type,
+            max_duration_minutes=days_to_minutes(rule_data.max_days) if rule_data.max_days is not None else None,
+            min_headroom_minutes=(days_to_minutes(rule_data.min_headroom_days)
+                                  if rule_data.min_headroom_days is not None else None),
+            max_colleagues_out=rule_data.max_colleagues_out,
+            allow_blackout=rule_data.allow_blackout
+        )
+        self.db.add(rule)
+        self.db.commit()
+        self.db.refresh(rule)
+        rule_cache.invalidate()
+        return rule
+
+    def deactivate_rule(self, rule_id: int) -> bool:
+        """
+        Stop applying an auto-approval rule.
+
+        Args:
+            rule_id: ID of the rule
+
+        Returns:
+            bool: True if the rule was found, False otherwise
+        """
+        rule = self.db.get(AutoApprovalRule, rule_id)
+        if rule is None:
+            return False
+        rule.is_active = False
+        self.db.commit()
+        rule_cache.invalidate()
+        return True
+
+    def match(
+        self,
+        request: PTORequest,
+        department_id: Optional[int],
+        balance: Optional[PTOBalance]
+    ) -> Optional[CompiledAutoApproval]:
+        """
+        Find the first auto-approval rule a new request meets.
+
+        Args:
+            request: The request being submitted, before its days are reserved
+            department_id: The requester's department
+            balance: The requester's balance for the request's year
+
+        Returns:
+            Optional[CompiledAutoApproval]: The matching rule, or None if a manager must decide
+        """
+        if not get_config().AUTO_APPROVAL_ENABLED:
+            return None
+        candidates = [
+            rule for rule in rule_cache.get(self.db).auto_approvals_for(department_id)
+            if (rule.pto_type is None or rule.pto_type == request.pto_type)
+            and (rule.max_duration_minutes is None or request.duration_minutes <= rule.max_duration_minutes)
+        ]
+        if not candidates:
+            return None
+
+        headroom = None
+        if balance is not None and request.pto_type in _AVAILABLE:
+            headroom = _AVAILABLE[request.pto_type](balance) - request.duration_minutes
+        open_days: Optional[List[date]] = None
+        in_blackout = colleagues_out = None
+        for rule in candidates:
+            if rule.min_headroom_minutes is not None and (headroom is None or headroom < rule.min_headroom_minutes):
+                continue
+            if open_days is None and (not rule.allow_blackout or rule.max_colleagues_out is not None):
+                open_days = self.rule_service.market_open_days(request.start_date, request.end_date)
+            if not rule.allow_blackout:
+                if in_blackout is None:
+                    in_blackout = self._in_blackout(department_id, open_days)
+                if in_blackout:
+                    continue
+            if rule.max_colleagues_out is not None:
+                if colleagues_out is None:
+                    colleagues_out = self._colleagues_out(request, department_id, open_days)
+                if colleagues_out > rule.max_colleagues_out:
+                    continue
+            return rule
+        return None
+
+    def _in_blackout(self, department_id: Optional[int], open_days: List[date]) -> bool:
+        if not open_days:
+            return False
+        rules = rule_cache.get(self.db).rules_for(department_id, open_days[0], open_days[-1])
+        return any(rule.kind == RuleKind.BLACKOUT and rule.start_date <= day <= rule.end_date
+                   for rule in rules for day in open_days)
+
+    def _colleagues_out(self, request: PTORequest, department_id: Optional[int], open_days: List[date]) -> int:
+        """Most colleagues with pending or approved time off on any market-open day of the request."""
+        if not open_days or department_id is None:
+            return 0
+        absent = self.rule_service.department_absences(
+            department_id, request.start_date, (request.end_date - request.start_date).days + 1,
+            request.user_id, statuses=RequestStatus.ACTIVE
+        )
+        return int(max(absent[(day - request.start_date).days] for day in open_days))
@@ -7,8 +7,14 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 
+from ..database import insert_ignore, read_only
 from ..models.pto_balance import PTOBalance
 from ..schemas.pto_schemas import PTOBalanceUpdate
+from ..schemas.read_models import BALANCE_LIST_COLUMNS, BalanceListItem
+from ..utils.pto_units import days_to_minutes
+from .event_bus import event_bus, BALANCE_CHANGED
+
+_DAY_TOTAL_FIELDS = ('vacation_total', 'sick_total', 'personal_total')
 
 
 class BalanceService:
@@ -47,22 +53,21 @@ class BalanceService:
         balance = self.db.execute(stmt).scalar_one_or_none()
         
         if balance is None:
-            # Create new balance with zeros
-            balance = PTOBalance(
-                user_id=user_id,
-                year=year,
-                vacation_total=Decimal('0.00'),
-                vacation_used=Decimal('0.00'),
-                vacation_pending=Decimal('0.00'),
-                sick_total=Decimal('0.00'),
-                sick_used=Decimal('0.00'),
-                personal_total=Decimal('0.00'),
-                personal_used=Decimal('0.00'),
-                remote_weekly_used=0
-            )
-            self.db.add(balance)
+            # Create new balance with zeros; a concurrent creator wins harmlessly
+            insert_ignore(self.db, PTOBalance, {
+                'user_id': user_id,
+                'year': year,
+                'vacation_total_minutes': 0,
+                'vacation_used_minutes': 0,
+                'vacation_pending_minutes': 0,
+                'sick_total_minutes': 0,
+                'sick_used_minutes': 0,
+                'personal_total_minutes': 0,
+                'personal_used_minutes': 0,
+                'remote_weekly_used': 0
+            }, index_elements=['user_id', 'year'])
             self.db.commit()
-            self.db.refresh(balance)
+            balance = self.db.execute(stmt).scalar_one()
         
         return balance
     
@@ -79,6 +84,7 @@ class BalanceService:
         stmt = select(PTOBalance).where(PTOBalance.id == balance_id)
         return self.db.execute(stmt).scalar_one_or_none()
     
+    @read_only(pin='user_id')
     def get_user_balances(self, user_id: int) -> List[PTOBalance]:
         """
         Get all balances for a user ordered by year descending.
@@ -96,6 +102,26 @@ class BalanceService:
         result = self.db.execute(stmt)
         return list(result.scalars().all())
     
+    @read_only()
+    def list_balances(self, user_ids: List[int], year: int) -> List[BalanceListItem]:
+        """
+        Get the balance counters of many users for a year in one query.
+        
+        Users without a balance for the year are left out; nothing is created.
+        
+        Args:
+            user_ids: IDs of the users
+            year: Balance year
+            
+        Returns:
+            List[BalanceListItem]: Balance rows ordered by user ID
+        """
+        stmt = select(*BALANCE_LIST_COLUMNS).where(
+            PTOBalance.user_id.in_(user_ids),
+            PTOBalance.year == year
+        ).order_by(PTOBalance.user_id)
+        return list(map(BalanceListItem._make, self.db.execute(stmt)))
+    
     def get_current_year_balance(self, user_id: int) -> Optional[PTOBalance]:
         """
         Get balance for current year.
@@ -132,13 +158,17 @@ class BalanceService:
         if balance is None:
             return None
         
-        # Update only provided fields
+        # Update only provided fields; day totals are stored as minutes
         update_data = balance_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
-            setattr(balance, field, value)
+            if field in _DAY_TOTAL_FIELDS:
+                setattr(balance, f"{field}_minutes", days_to_minutes(value))
+            else:
+                setattr(balance, field, value)
         
         self.db.commit()
         self.db.refresh(balance)
+        self.publish_balance_changed(balance)
         return balance
     
     def adjust_vacation_used(
@@ -166,12 +196,13 @@ class BalanceService:
             raise ValueError(f"Balance with ID {balance_id} not found")
         
         if is_pending:
-            balance.vacation_pending += days
+            balance.vacation_pending_minutes += days_to_minutes(days)
         else:
-            balance.vacation_used += days
+            balance.vacation_used_minutes += days_to_minutes(days)
         
         self.db.commit()
         self.db.refresh(balance)
+        self.publish_balance_changed(balance)
         return balance
     
     def adjust_sick_used(self, balance_id: int, days: Decimal) -> PTOBalance:
@@ -192,10 +223,11 @@ class BalanceService:
         if balance is None:
             raise ValueError(f"Balance with ID {balance_id} not found")
         
-        balance.sick_used += days
+        balance.sick_used_minutes += days_to_minutes(days)
         
         self.db.commit()
         self.db.refresh(balance)
+        self.publish_balance_changed(balance)
         return balance
     
     def adjust_personal_used(self, balance_id: int, days: Decimal) -> PTOBalance:
@@ -216,10 +248,11 @@ class BalanceService:
         if balance is None:
             raise ValueError(f"Balance with ID {balance_id} not found")
         
-        balance.personal_used += days
+        balance.personal_used_minutes += days_to_minutes(days)
         
         self.db.commit()
         self.db.refresh(balance)
+        self.publish_balance_changed(balance)
         return balance
     
     def move_pending_to_used(self, balance_id: int, days: Decimal) -> PTOBalance:
@@ -240,11 +273,13 @@ class BalanceService:
         if balance is None:
             raise ValueError(f"Balance with ID {balance_id} not found")
         
-        balance.vacation_pending -= days
-        balance.vacation_used += days
+        minutes = days_to_minutes(days)
+        balance.vacation_pending_minutes -= minutes
+        balance.vacation_used_minutes += minutes
         
         self.db.commit()
         self.db.refresh(balance)
+        self.publish_balance_changed(balance)
         return balance
     
     def remove_pending(self, balance_id: int, days: Decimal) -> PTOBalance:
@@ -265,8 +300,32 @@ class BalanceService:
         if balance is None:
             raise ValueError(f"Balance with ID {balance_id} not found")
         
-        balance.vacation_pending -= days
+        balance.vacation_pending_minutes -= days_to_minutes(days)
         
         self.db.commit()
         self.db.refresh(balance)
+        self.publish_balance_changed(balance)
         return balance
+    
+    def publish_balance_changed(self, balance: PTOBalance) -> None:
+        """
+        Publish a balance_changed event with a snapshot of the balance.
+        
+        Args:
+            balance: The balance that was just committed
+        """
+        event_bus.publish(
+            BALANCE_CHANGED,
+            balance_id=balance.id,
+            user_id=balance.user_id,
+            year=balance.year,
+            vacation_total=float(balance.vacation_total),
+            vacation_available=float(balance.vacation_available),
+            sick_total=float(balance.sick_total),
+            sick_available=float(balance.sick_available),
+            personal_total=float(balance.personal_total),
+            personal_available=float(balance.personal_available),
+            vacation_available_minutes=balance.vacation_available_minutes,
+            sick_available_minutes=balance.sick_available_minutes,
+            personal_available_minutes=balance.personal_available_minutes
+        )
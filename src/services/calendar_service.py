@@ -0,0 +1,207 @@
+"""
+Team calendar service for the PTO and Market Calendar System.
+"""
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from ..config import get_config
+from ..database import read_only
+from ..models.market_holiday import MarketHoliday
+from ..models.pto_request import PTORequest, RequestStatus
+from ..models.user import User
+from ..schemas.read_models import HOLIDAY_LIST_COLUMNS, HolidayListItem
+from ..utils import lazy
+from ..utils.pto_units import DayPart
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class DayStatus:
+    """Cell codes of the team calendar matrix, in increasing precedence."""
+    NONE = 0
+    PENDING = 1
+    PARTIAL = 2     # approved half day or hours
+    APPROVED = 3
+
+    LABELS = {
+        NONE: "",
+        PENDING: "Pending",
+        PARTIAL: "Partial day",
+        APPROVED: "Approved",
+    }
+
+
+@dataclass(frozen=True)
+class TeamCalendar:
+    """
+    A department-month as a compact users x days matrix.
+
+    ``matrix[i, j]`` is the DayStatus code for ``members[i]`` on ``days[j]``;
+    ``closed[j]`` is True for weekends and market holidays.
+    """
+    year: int
+    month: int
+    days: List[date]
+    members: List[Tuple[int, str]]
+    matrix: "np.ndarray"
+    closed: "np.ndarray"
+    holidays: Dict[date, str]
+
+    def out_counts(self) -> "np.ndarray":
+        """Number of members with approved time off on each day."""
+        return (self.matrix >= DayStatus.PARTIAL).sum(axis=0)
+
+
+def month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """Get the first and last day of a month."""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+class CalendarService:
+    """
+    Service class for building team calendars.
+
+    Members and their overlapping requests come back from a single outer
+    join; the matrix is then filled with difference arrays, one per status
+    code, so the work is proportional to the number of requests rather than
+    to the number of request-days.
+    """
+
+    def __init__(self, db: Session) -> None:
+        """
+        Initialize the CalendarService with a database session.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+
+    @read_only()
+    def get_team_calendar(
+        self,
+        year: int,
+        month: int,
+        department_id: Optional[int] = None,
+        market: Optional[str] = None
+    ) -> TeamCalendar:
+        """
+        Build the calendar matrix for a department and month.
+
+        Args:
+            year: Calendar year
+            month: Calendar month (1-12)
+            department_id: Department to show, or None for every active user
+            market: Market whose holidays are overlaid, defaults to the configured primary market
+
+        Returns:
+            TeamCalendar: Members, days and status matrix
+        """
+        np = lazy.numpy()
+        first_day, last_day = month_bounds(year, month)
+        days = [first_day + timedelta(days=i) for i in range(last_day.day)]
+
+        stmt = select(
+            User.id,
+            User.first_name,
+            User.last_name,
+            PTORequest.start_date,
+            PTORequest.end_date,
+            PTORequest.status,
+            PTORequest.day_part
+        ).outerjoin(
+            PTORequest,
+            and_(
+                PTORequest.user_id == User.id,
+                PTORequest.status.in_(RequestStatus.ACTIVE),
+                PTORequest.start_date <= last_day,
+                PTORequest.end_date >= first_day
+            )
+        ).where(User.is_active == True).order_by(User.last_name, User.first_name, User.id)
+        if department_id is not None:
+            stmt = stmt.where(User.department_id == department_id)
+        rows = self.db.execute(stmt).all()
+
+        members: List[Tuple[int, str]] = []
+        member_index: Dict[int, int] = {}
+        intervals: List[Tuple[int, int, int, int]] = []
+        for user_id, first_name, last_name, start, end, status, day_part in rows:
+            if user_id not in member_index:
+                member_index[user_id] = len(members)
+                members.append((user_id, f"{first_name} {last_name}"))
+            if start is None:
+                continue
+            if status == RequestStatus.PENDING:
+                code = DayStatus.PENDING
+            elif day_part != DayPart.FULL:
+                code = DayStatus.PARTIAL
+            else:
+                code = DayStatus.APPROVED
+            lo = max(start, first_day).day - 1
+            hi = min(end, last_day).day
+            intervals.append((member_index[user_id], lo, hi, code))
+
+        matrix = np.zeros((len(members), len(days)), dtype=np.int8)
+        if intervals:
+            data = np.array(intervals, dtype=np.int32)
+            for code in (DayStatus.PENDING, DayStatus.PARTIAL, DayStatus.APPROVED):
+                selected = data[data[:, 3] == code]
+                if not len(selected):
+                    continue
+                diff = np.zeros((len(members), len(days) + 1), dtype=np.int16)
+                np.add.at(diff, (selected[:, 0], selected[:, 1]), 1)
+                np.add.at(diff, (selected[:, 0], selected[:, 2]), -1)
+                covered = np.cumsum(diff, axis=1)[:, :len(days)] > 0
+                # Codes are applied in increasing precedence
+                matrix[covered] = code
+
+        holiday_stmt = select(MarketHoliday.holiday_date, MarketHoliday.name).where(
+            MarketHoliday.market == (market or get_config().PRIMARY_MARKET),
+            MarketHoliday.is_observed == True,
+            MarketHoliday.holiday_date >= first_day,
+            MarketHoliday.holiday_date <= last_day
+        )
+        holidays = {holiday_date: name for holiday_date, name in self.db.execute(holiday_stmt)}
+
+        weekdays = np.array([day.weekday() for day in days])
+        closed = weekdays >= 5
+        for holiday_date in holidays:
+            closed[holiday_date.day - 1] = True
+
+        return TeamCalendar(
+            year=year,
+            month=month,
+            days=days,
+            members=members,
+            matrix=matrix,
+            closed=closed,
+            holidays=holidays
+        )
+
+    @read_only()
+    def list_holidays(self, year: int, market: Optional[str] = None,
+                      observed_only: bool = True) -> List[HolidayListItem]:
+        """
+        List a year's market holidays.
+
+        Args:
+            year: Calendar year
+            market: Market code, defaults to the configured primary market
+            observed_only: If True, only return observed holidays
+
+        Returns:
+            List[HolidayListItem]: Holidays ordered by date
+        """
+        stmt = select(*HOLIDAY_LIST_COLUMNS).where(
+            MarketHoliday.year == year,
+            MarketHoliday.market == (market or get_config().PRIMARY_MARKET)
+        )
+        if observed_only:
+            stmt = stmt.where(MarketHoliday.is_observed == True)
+        stmt = stmt.order_by(MarketHoliday.holiday_date)
+        return list(map(HolidayListItem._make, self.db.execute(stmt)))
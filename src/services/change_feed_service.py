@@ -0,0 +1,163 @@
+"""
+Incremental change feeds for the PTO and Market Calendar System.
+
+Each entity's feed lists its rows in (updated_at, id) order after a
+watermark, so a downstream system stores the last watermark it processed
+and pulls only what changed since. Rows that disappear (deleted requests
+or balances, deactivated users) are reported by a parallel tombstone feed
+in the same order.
+
+Timestamps come from the database clock at statement time, but a row only
+becomes visible when its transaction commits. Feeds therefore stop
+config.CHANGE_FEED_LAG_SECONDS short of the database's current time, so a
+transaction still in flight cannot commit a row behind a watermark that a
+client has already moved past. The lag must exceed the longest write
+transaction.
+"""
+from datetime import datetime, timedelta
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import String, and_, func, literal, or_, select
+from sqlalchemy.orm import Session
+
+from ..config import get_config
+from ..models.pto_balance import PTOBalance
+from ..models.pto_request import PTORequest
+from ..models.tombstone import ENTITIES, Tombstone
+from ..models.user import User
+from ..schemas.read_models import (
+    BALANCE_LIST_COLUMNS,
+    EMPLOYEE_LIST_COLUMNS,
+    REQUEST_LIST_COLUMNS,
+    BalanceListItem,
+    EmployeeListItem,
+    RequestListItem,
+)
+
+
+class Watermark(NamedTuple):
+    """Position in a feed: the last row's timestamp and ID."""
+    at: datetime
+    id: int
+
+
+class TombstoneItem(NamedTuple):
+    """One removed row."""
+    entity_id: int
+    reason: str
+
+
+class ChangePage(NamedTuple):
+    """One page of a feed: rows with their watermarks, and where to continue."""
+    items: List[Any]
+    watermarks: List[Watermark]
+    next_watermark: Optional[Watermark]  # after the last row, or the given one if empty
+    has_more: bool
+
+
+# Feed entity -> (model, row model, row columns)
+FEEDS = {
+    ENTITIES[User]: (User, EmployeeListItem, EMPLOYEE_LIST_COLUMNS),
+    ENTITIES[PTORequest]: (PTORequest, RequestListItem, REQUEST_LIST_COLUMNS),
+    ENTITIES[PTOBalance]: (PTOBalance, BalanceListItem, BALANCE_LIST_COLUMNS),
+}
+
+
+class ChangeFeedService:
+    """
+    Service class reading entity change feeds.
+
+    Feeds read the primary: a replica's clock does not account for its
+    replication delay.
+    """
+
+    def __init__(self, db: Session) -> None:
+        """
+        Initialize the ChangeFeedService with a database session.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+
+    def changes(self, entity: str, after: Optional[Watermark] = None, limit: int = 1000) -> ChangePage:
+        """
+        Get the rows of an entity created or updated after a watermark.
+
+        Args:
+            entity: Feed entity ('users', 'requests' or 'balances')
+            after: Watermark of the last row already processed, None from the start
+            limit: Maximum number of rows
+
+        Returns:
+            ChangePage: Rows in (updated_at, id) order
+
+        Raises:
+            ValueError: If the entity is unknown
+        """
+        if entity not in FEEDS:
+            raise ValueError(f"Unknown change feed '{entity}'")
+        model, row_type, columns = FEEDS[entity]
+        stmt = select(*columns, model.updated_at, model.id)
+        rows = self._page(stmt, model.updated_at, model.id, after, limit)
+        return self._result(
+            [row_type._make(row[:-2]) for row in rows],
+            [Watermark(row[-2], row[-1]) for row in rows],
+            after, limit
+        )
+
+    def tombstones(self, entity: str, after: Optional[Watermark] = None, limit: int = 1000) -> ChangePage:
+        """
+        Get the rows of an entity removed after a watermark.
+
+        Args:
+            entity: Feed entity ('users', 'requests' or 'balances')
+            after: Watermark of the last tombstone already processed, None from the start
+            limit: Maximum number of tombstones
+
+        Returns:
+            ChangePage: Removed rows in (created_at, id) order
+
+        Raises:
+            ValueError: If the entity is unknown
+        """
+        if entity not in FEEDS:
+            raise ValueError(f"Unknown change feed '{entity}'")
+        stmt = select(Tombstone.entity_id, Tombstone.reason, Tombstone.created_at, Tombstone.id).where(
+            Tombstone.entity == entity
+        )
+        rows = self._page(stmt, Tombstone.created_at, Tombstone.id, after, limit)
+        return self._result(
+            [TombstoneItem(entity_id, reason) for entity_id, reason, _, _ in rows],
+            [Watermark(at, tombstone_id) for _, _, at, tombstone_id in rows],
+            after, limit
+        )
+
+    def _page(self, stmt, at_column, id_column, after: Optional[Watermark], limit: int) -> List[Tuple]:
+        """Apply the keyset window (after the watermark, before the horizon) to a feed query."""
+        now = self.db.execute(select(func.now())).scalar()
+        horizon = now - timedelta(seconds=get_config().CHANGE_FEED_LAG_SECONDS)
+        stmt = stmt.where(at_column <= self._timestamp(horizon))
+        if after is not None:
+            at = self._timestamp(after.at)
+            stmt = stmt.where(or_(
+                at_column > at,
+                and_(at_column == at, id_column > after.id)
+            ))
+        return self.db.execute(stmt.order_by(at_column, id_column).limit(limit)).all()
+
+    def _timestamp(self, value: datetime):
+        """
+        Bind a timestamp for comparison with a column.
+
+        SQLite stores timestamps as text and CURRENT_TIMESTAMP writes them
+        without fractional seconds, so the value is bound in that format
+        rather than SQLAlchemy's (which always appends microseconds).
+        """
+        if self.db.get_bind().dialect.name == 'sqlite':
+            return literal(str(value), String)
+        return value
+
+    @staticmethod
+    def _result(items: List[Any], watermarks: List[Watermark], after: Optional[Watermark], limit: int) -> ChangePage:
+        return ChangePage(items, watermarks, watermarks[-1] if watermarks else after, len(items) == limit)
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
 from src.models import Department, User
+from src.services.directory_cache import directory_cache
 
 
 class DepartmentService:
@@ -83,6 +84,7 @@ class DepartmentService:
         
         db.add(department)
         db.commit()
+        directory_cache.invalidate()
         db.refresh(department)
         
         return department
@@ -142,6 +144,7 @@ class DepartmentService:
                 department.manager_id = manager_id
         
         db.commit()
+        directory_cache.invalidate()
         db.refresh(department)
         
         return department
@@ -172,6 +175,7 @@ class DepartmentService:
         
         db.delete(department)
         db.commit()
+        directory_cache.invalidate()
         
         return True
 
@@ -0,0 +1,136 @@
+"""
+In-memory user and department directory for the PTO and Market Calendar System.
+
+Admin pages render manager dropdowns, department dropdowns and department
+labels on every view. The directory keeps those as compact id -> tuple maps
+built from two column-only queries, and rebuilds them only when its version
+changes. UserService and DepartmentService bump the version after every
+committed write; changes made by other processes (scripts, other workers)
+show up once the snapshot is older than ``max_age_seconds``.
+"""
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.department import Department
+from ..models.user import User
+
+
+class DirectoryUser(NamedTuple):
+    """Directory entry for one user."""
+    id: int
+    name: str
+    role: str
+    department_id: Optional[int]
+    is_active: bool
+
+
+class DirectoryDepartment(NamedTuple):
+    """Directory entry for one department."""
+    id: int
+    name: str
+    code: str
+    manager_id: Optional[int]
+    is_active: bool
+
+
+class DirectorySnapshot(NamedTuple):
+    """Immutable view of the directory at one version."""
+    version: int
+    built_at: float
+    users: Dict[int, DirectoryUser]
+    departments: Dict[int, DirectoryDepartment]  # ordered by name
+
+    def user_name(self, user_id: Optional[int], default: str = '') -> str:
+        user = self.users.get(user_id)
+        return user.name if user is not None else default
+
+    def department_name(self, department_id: Optional[int], default: str = '') -> str:
+        department = self.departments.get(department_id)
+        return department.name if department is not None else default
+
+    def users_with_role(self, role: str) -> Dict[int, str]:
+        """Active users with a role as id -> display name, ordered by name."""
+        matches = [user for user in self.users.values() if user.role == role and user.is_active]
+        return {user.id: user.name for user in sorted(matches, key=lambda u: u.name)}
+
+    def department_options(self) -> Dict[int, str]:
+        """Departments as id -> name, ordered by name."""
+        return {department.id: department.name for department in self.departments.values()}
+
+
+class DirectoryCache:
+    """
+    Versioned, process-wide cache of the user and department directory.
+
+    Args:
+        max_age_seconds: Rebuild a snapshot older than this even if the
+            version is unchanged
+    """
+
+    def __init__(self, max_age_seconds: float = 300.0) -> None:
+        self.max_age_seconds = max_age_seconds
+        self._version = 0
+        self._snapshot: Optional[DirectorySnapshot] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        """Bump the version so the next lookup rebuilds the directory."""
+        with self._lock:
+            self._version += 1
+
+    def get(self, db: Session) -> DirectorySnapshot:
+        """
+        Get the current directory, rebuilding it if a write happened since.
+
+        Args:
+            db: Session used only when the directory has to be rebuilt
+
+        Returns:
+            DirectorySnapshot: The current snapshot
+        """
+        snapshot = self._snapshot
+        version = self._version
+        if (snapshot is not None and snapshot.version == version
+                and time.monotonic() - snapshot.built_at < self.max_age_seconds):
+            self.hits += 1
+            return snapshot
+
+        self.misses += 1
+        # Built from the version read before querying: a write that lands
+        # mid-rebuild bumps the version again and forces another rebuild
+        snapshot = self._build(db, version)
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version <= version:
+                self._snapshot = snapshot
+        return snapshot
+
+    @staticmethod
+    def _build(db: Session, version: int) -> DirectorySnapshot:
+        users = {
+            row.id: DirectoryUser(row.id, f'{row.first_name} {row.last_name}', row.role,
+                                  row.department_id, row.is_active)
+            for row in db.execute(select(
+                User.id, User.first_name, User.last_name, User.role, User.department_id, User.is_active
+            ))
+        }
+        departments = {
+            row.id: DirectoryDepartment(row.id, row.name, row.code, row.manager_id, row.is_active)
+            for row in db.execute(select(
+                Department.id, Department.name, Department.code, Department.manager_id, Department.is_active
+            ).order_by(Department.name))
+        }
+        return DirectorySnapshot(version, time.monotonic(), users, departments)
+
+
+# Global directory shared by all sessions
+directory_cache = DirectoryCache()
@@ -0,0 +1,94 @@
+"""
+In-process event bus for the PTO and Market Calendar System.
+
+Services publish domain events after their changes are committed, and UI
+pages subscribe to the events they care about so they can patch only the
+affected rows instead of polling or re-rendering whole pages.
+"""
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Event names
+REQUEST_SUBMITTED = 'request_submitted'
+REQUEST_APPROVED = 'request_approved'
+REQUEST_ESCALATED = 'request_escalated'
+REQUEST_DENIED = 'request_denied'
+REQUEST_CANCELLED = 'request_cancelled'
+BALANCE_CHANGED = 'balance_changed'
+REMOTE_DAYS_CHANGED = 'remote_days_changed'
+PENDING_REMINDER = 'pending_reminder'
+
+EventHandler = Callable[[str, Dict[str, Any]], None]
+
+
+class EventBus:
+    """
+    Minimal thread-safe publish/subscribe dispatcher.
+
+    Handlers are invoked synchronously in the publishing thread, in the order
+    they subscribed. A failing handler is logged and never propagates back
+    into the service that published the event.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty subscriber registry."""
+        self._subscribers: Dict[str, List[EventHandler]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, event: str, handler: EventHandler) -> Callable[[], None]:
+        """
+        Register a handler for an event.
+
+        Args:
+            event: Event name to listen for
+            handler: Callable receiving the event name and payload dict
+
+        Returns:
+            Callable[[], None]: Function that removes this subscription
+        """
+        with self._lock:
+            self._subscribers[event].append(handler)
+        return lambda: self.unsubscribe(event, handler)
+
+    def unsubscribe(self, event: str, handler: EventHandler) -> None:
+        """
+        Remove a previously registered handler. Unknown handlers are ignored.
+
+        Args:
+            event: Event name the handler was registered for
+            handler: Handler to remove
+        """
+        with self._lock:
+            handlers = self._subscribers.get(event)
+            if handlers and handler in handlers:
+                handlers.remove(handler)
+
+    def publish(self, event: str, **payload: Any) -> None:
+        """
+        Deliver an event to every current subscriber.
+
+        Args:
+            event: Event name
+            **payload: Event data passed to each handler as a dict
+        """
+        with self._lock:
+            handlers = list(self._subscribers.get(event, ()))
+
+        for handler in handlers:
+            try:
+                handler(event, payload)
+            except Exception:
+                logger.exception("Event handler for '%s' failed", event)
+
+    def subscriber_count(self, event: str) -> int:
+        """Return the number of handlers registered for an event."""
+        with self._lock:
+            return len(self._subscribers.get(event, ()))
+
+
+# Global instance
+event_bus = EventBus()
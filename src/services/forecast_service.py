@@ -0,0 +1,218 @@
+"""
+Vacation balance forecasting for the PTO and Market Calendar System.
+
+A forecast is a users x months grid of projected vacation balance at each
+month end: carryover from the previous year, plus what has accrued by that
+month (see config.VACATION_ACCRUAL), minus approved and pending vacation
+booked in the year up to that month. Balances reset every January, so the
+grid is computed per calendar year and the year's closing balance (capped at
+config.VACATION_CARRYOVER_DAYS) is carried into the next.
+
+The balance row's used and pending counters stay authoritative for how much
+of a year is booked: the requests only decide when it is booked, and any
+difference (manual adjustments) counts as booked at the start of the window.
+Years without a balance row are assumed to renew the latest known total.
+"""
+import calendar
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..config import get_config
+from ..models.pto_balance import PTOBalance
+from ..models.pto_request import PTORequest, RequestStatus
+from ..utils import lazy
+from ..utils.pto_units import MINUTES_PER_DAY, days_to_minutes
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@dataclass(frozen=True)
+class BalanceForecast:
+    """
+    Projected vacation balances as users x months matrices of minutes.
+
+    Row ``i`` belongs to ``user_ids[i]`` and column ``j`` to the month ending
+    on ``months[j]``. ``booked`` and ``accrued`` are cumulative within each
+    calendar year.
+    """
+    user_ids: List[int]
+    months: List[date]
+    carryover: "np.ndarray"
+    accrued: "np.ndarray"
+    booked: "np.ndarray"
+
+    @property
+    def available(self) -> "np.ndarray":
+        """Projected balance in minutes at each month end."""
+        return self.carryover + self.accrued - self.booked
+
+    def available_days(self) -> "np.ndarray":
+        """Projected balance in days, rounded to hundredths."""
+        return (self.available / MINUTES_PER_DAY).round(2)
+
+    def row(self, user_id: int) -> int:
+        """Index of a user's row."""
+        return self.user_ids.index(user_id)
+
+
+def month_ends(start: date, months: int) -> List[date]:
+    """Last day of each of ``months`` consecutive months from ``start``'s month."""
+    ends = []
+    year, month = start.year, start.month
+    for _ in range(months):
+        ends.append(date(year, month, calendar.monthrange(year, month)[1]))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return ends
+
+
+class ForecastService:
+    """
+    Service class projecting vacation balances into the future.
+
+    One call forecasts any number of users with two column-only queries;
+    the month-by-month arithmetic runs on NumPy matrices.
+    """
+
+    def __init__(self, db: Session) -> None:
+        """
+        Initialize the ForecastService with a database session.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+
+    def forecast(self, user_ids: Sequence[int], start: Optional[date] = None, months: int = 12) -> BalanceForecast:
+        """
+        Project vacation balances for a set of users.
+
+        Args:
+            user_ids: Users to forecast, one matrix row each
+            start: Any day of the first month, defaults to today
+            months: Number of months to project
+
+        Returns:
+            BalanceForecast: Projected balances at each month end
+
+        Raises:
+            ValueError: If months is not positive
+        """
+        if months < 1:
+            raise ValueError("Forecast must cover at least one month")
+        np = lazy.numpy()
+        config = get_config()
+        user_ids = list(user_ids)
+        ends = month_ends(start or date.today(), months)
+        rows = {user_id: i for i, user_id in enumerate(user_ids)}
+        years = sorted({end.year for end in ends})
+
+        balances = self._balances(user_ids, years[0] - 1, years[-1])
+        booked_by_month, booked_by_year = self._bookings(user_ids, rows, ends, years)
+
+        shape = (len(user_ids), months)
+        carryover = np.zeros(shape)
+        accrued = np.zeros(shape)
+        booked = np.zeros(shape)
+        cap = days_to_minutes(config.VACATION_CARRYOVER_DAYS)
+
+        # Closing balance of the year before the window, from its counters
+        closing = np.zeros(len(user_ids))
+        previous_total = np.zeros(len(user_ids))
+        for user_id, i in rows.items():
+            row = balances.get((user_id, years[0] - 1))
+            if row is not None:
+                previous_total[i] = row[0]
+                closing[i] = row[0] - row[1] - row[2]
+
+        month_numbers = np.array([end.month for end in ends])
+        for year in years:
+            columns = np.array([end.year == year for end in ends])
+            total = previous_total.copy()
+            reserved = np.full(len(user_ids), np.nan)
+            for user_id, i in rows.items():
+                row = balances.get((user_id, year))
+                if row is not None:
+                    total[i] = row[0]
+                    reserved[i] = row[1] + row[2]
+
+            if config.VACATION_ACCRUAL == 'monthly':
+                fraction = month_numbers[columns] / 12.0
+            else:
+                fraction = np.ones(columns.sum())
+            accrued[:, columns] = total[:, None] * fraction[None, :]
+
+            last = np.flatnonzero(columns)[-1]
+            segment = np.cumsum(booked_by_month[:, columns], axis=1)
+            if ends[last].month == 12:
+                # Counters win over the request sum; the difference counts
+                # as booked before the first month of the segment. A window
+                # ending mid-year cannot tell when the rest was booked.
+                known = ~np.isnan(reserved)
+                adjustment = np.where(known, reserved - booked_by_year[:, years.index(year)], 0.0)
+                segment += adjustment[:, None]
+            booked[:, columns] = segment
+
+            carryover[:, columns] = np.clip(closing, 0, cap)[:, None]
+            closing = carryover[:, last] + accrued[:, last] - booked[:, last]
+            previous_total = total
+
+        return BalanceForecast(user_ids, ends, carryover, accrued, booked)
+
+    def bookable_minutes(self, user_id: int, start_date: date) -> int:
+        """
+        Vacation minutes a new request starting on a date can still use.
+
+        A request reduces the balance from its month to the end of its
+        year, so it fits only if every month end in that span keeps a
+        non-negative balance.
+
+        Args:
+            user_id: ID of the user
+            start_date: Start date of the prospective request
+
+        Returns:
+            int: The lowest projected balance from start_date to year end
+        """
+        forecast = self.forecast([user_id], start_date, 13 - start_date.month)
+        return int(lazy.numpy().floor(forecast.available[0].min()))
+
+    def _balances(self, user_ids: List[int], first_year: int, last_year: int) -> Dict[Tuple[int, int], Tuple[int, int, int]]:
+        stmt = select(
+            PTOBalance.user_id, PTOBalance.year, PTOBalance.vacation_total_minutes,
+            PTOBalance.vacation_used_minutes, PTOBalance.vacation_pending_minutes
+        ).where(
+            PTOBalance.user_id.in_(user_ids),
+            PTOBalance.year.between(first_year, last_year)
+        )
+        return {(user_id, year): (total, used, pending)
+                for user_id, year, total, used, pending in self.db.execute(stmt)}
+
+    def _bookings(self, user_ids: List[int], rows: Dict[int, int], ends: List[date],
+                  years: List[int]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Vacation minutes booked per user and month, and per user and year."""
+        np = lazy.numpy()
+        stmt = select(PTORequest.user_id, PTORequest.start_date, PTORequest.duration_minutes).where(
+            PTORequest.user_id.in_(user_ids),
+            PTORequest.pto_type == 'vacation',
+            PTORequest.status.in_([RequestStatus.PENDING, RequestStatus.APPROVED]),
+            PTORequest.start_date >= date(years[0], 1, 1),
+            PTORequest.start_date <= ends[-1]
+        )
+        bookings = self.db.execute(stmt).all()
+        by_month = np.zeros((len(user_ids), len(ends)))
+        by_year = np.zeros((len(user_ids), len(years)))
+        if bookings:
+            user_rows = np.array([rows[user_id] for user_id, _, _ in bookings])
+            starts = np.array([start.toordinal() for _, start, _ in bookings])
+            minutes = np.array([duration for _, _, duration in bookings], dtype=float)
+            # Requests before the first month end (earlier in its year) land in month 0
+            columns = np.searchsorted(np.array([end.toordinal() for end in ends]), starts)
+            np.add.at(by_month, (user_rows, columns), minutes)
+            year_columns = np.searchsorted(np.array(years), [start.year for _, start, _ in bookings])
+            np.add.at(by_year, (user_rows, year_columns), minutes)
+        return by_month, by_year
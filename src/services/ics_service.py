@@ -0,0 +1,330 @@
+"""
+iCalendar feed service for the PTO and Market Calendar System.
+
+Feeds are identified by a kind (user, department or market) and a key
+(user id, department id or market code). Each feed has a cheap fingerprint
+(max(updated_at), a row count and a checksum from one aggregate query) that
+doubles as its strong ETag and as the cache key of the rendered body.
+Unchanged feeds therefore cost one indexed aggregate and no rendering.
+"""
+import hashlib
+import hmac
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..config import get_config
+from ..database import read_only
+from ..models.market_holiday import MarketHoliday
+from ..models.pto_request import PTORequest, RequestStatus
+from ..models.user import User
+from ..utils.pto_units import DayPart
+
+FEED_USER = "user"
+FEED_DEPARTMENT = "department"
+FEED_MARKET = "market"
+FEED_KINDS = (FEED_USER, FEED_DEPARTMENT, FEED_MARKET)
+
+PRODID = "-//TJM Time Calendar//PTO Feeds//EN"
+UID_DOMAIN = "timecalendar"
+
+_PART_LABELS = {
+    DayPart.AM: " (half day AM)",
+    DayPart.PM: " (half day PM)",
+    DayPart.HOURS: " (partial day)",
+}
+
+
+def feed_token(kind: str, key: str) -> str:
+    """
+    Compute the secret token that authorizes access to a feed.
+
+    Calendar clients cannot log in, so feed URLs carry an HMAC of the feed
+    identity keyed by SECRET_KEY; rotating the key revokes every URL.
+
+    Args:
+        kind: Feed kind
+        key: Feed key
+
+    Returns:
+        str: Hex token
+    """
+    message = f"{kind}:{key}".encode()
+    return hmac.new(get_config().SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()[:32]
+
+
+def verify_token(kind: str, key: str, token: Optional[str]) -> bool:
+    """Check a feed token in constant time."""
+    return bool(token) and hmac.compare_digest(feed_token(kind, key), token)
+
+
+def feed_path(kind: str, key) -> str:
+    """Build the tokenized URL path of a feed."""
+    key = str(key)
+    return f"/feeds/{kind}/{key}.ics?token={feed_token(kind, key)}"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against a strong ETag.
+
+    Args:
+        if_none_match: Raw header value, possibly a list or '*'
+        etag: Current quoted ETag
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def escape_text(value: str) -> str:
+    """Escape a TEXT property value per RFC 5545."""
+    return (value.replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def fold_line(line: str) -> str:
+    """Fold a content line into 75-octet chunks per RFC 5545."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        # Do not split a multi-byte UTF-8 sequence
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+    return "\r\n ".join(parts)
+
+
+def _utc_stamp(value: Optional[datetime]) -> str:
+    """Format a timestamp as an iCalendar UTC date-time."""
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+class _FeedCache:
+    """Thread-safe LRU of rendered feeds keyed by (kind, key, etag)."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self._maxsize = maxsize
+        self._items: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cache_key: Tuple[str, str, str]) -> Optional[str]:
+        with self._lock:
+            body = self._items.get(cache_key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(cache_key)
+            self.hits += 1
+            return body
+
+    def put(self, cache_key: Tuple[str, str, str], body: str) -> None:
+        with self._lock:
+            # A new fingerprint supersedes older renderings of the same feed
+            for stale in [k for k in self._items if k[:2] == cache_key[:2]]:
+                del self._items[stale]
+            self._items[cache_key] = body
+            while len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+# Global cache shared by all sessions
+feed_cache = _FeedCache()
+
+
+class IcsService:
+    """
+    Service class for generating iCalendar feeds.
+
+    User and department feeds contain approved PTO; market feeds contain
+    observed market holidays.
+    """
+
+    def __init__(self, db: Session) -> None:
+        """
+        Initialize the IcsService with a database session.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+
+    def get_etag(self, kind: str, key: str) -> str:
+        """
+        Compute the strong ETag of a feed from its fingerprint.
+
+        Request fingerprints cover every status, and include the sum of the
+        rows' version counters, so any change to any request in scope changes
+        the tag even within the timestamp's resolution. Fields rendered from
+        rows without a version counter (holiday names and dates, employee
+        names in department feeds) are part of the fingerprint themselves.
+
+        Args:
+            kind: Feed kind
+            key: Feed key
+
+        Returns:
+            str: Quoted ETag
+
+        Raises:
+            ValueError: If the feed kind is unknown
+        """
+        if kind == FEED_MARKET:
+            stmt = select(MarketHoliday.id, MarketHoliday.holiday_date, MarketHoliday.name).where(
+                MarketHoliday.market == key,
+                MarketHoliday.is_observed == True
+            ).order_by(MarketHoliday.id)
+            fingerprint = self.db.execute(stmt).all()
+        elif kind in (FEED_USER, FEED_DEPARTMENT):
+            stmt = select(func.max(PTORequest.updated_at), func.count(), func.sum(PTORequest.version_id))
+            stmt = self._scope(stmt.select_from(PTORequest), kind, key)
+            fingerprint = [self.db.execute(stmt).one()]
+            if kind == FEED_DEPARTMENT:
+                fingerprint += self.db.execute(select(User.id, User.first_name, User.last_name).where(
+                    User.department_id == int(key)
+                ).order_by(User.id)).all()
+        else:
+            raise ValueError(f"Unknown feed kind '{kind}'")
+        rows = "|".join(repr(tuple(row)) for row in fingerprint)
+        digest = hashlib.sha1(f"{kind}:{key}:{rows}".encode()).hexdigest()
+        return f'"{digest}"'
+
+    @read_only()
+    def get_feed(self, kind: str, key: str, if_none_match: Optional[str] = None) -> Tuple[Optional[str], str]:
+        """
+        Get a feed body, honouring a conditional request.
+
+        Args:
+            kind: Feed kind
+            key: Feed key
+            if_none_match: Client's If-None-Match header
+
+        Returns:
+            Tuple[Optional[str], str]: Body (None when not modified) and ETag
+        """
+        etag = self.get_etag(kind, key)
+        if etag_matches(if_none_match, etag):
+            return None, etag
+
+        cache_key = (kind, key, etag)
+        body = feed_cache.get(cache_key)
+        if body is None:
+            body = self.render(kind, key)
+            feed_cache.put(cache_key, body)
+        return body, etag
+
+    def render(self, kind: str, key: str) -> str:
+        """
+        Render a feed as iCalendar text.
+
+        Args:
+            kind: Feed kind
+            key: Feed key
+
+        Returns:
+            str: VCALENDAR document with CRLF line endings
+        """
+        if kind == FEED_MARKET:
+            name = f"{key} Market Holidays"
+            events = self._holiday_events(key)
+        else:
+            name = "My PTO" if kind == FEED_USER else "Team PTO"
+            events = self._pto_events(kind, key)
+
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{PRODID}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{escape_text(name)}",
+            "X-PUBLISHED-TTL:PT15M",
+        ]
+        lines.extend(events)
+        lines.append("END:VCALENDAR")
+        return "\r\n".join(fold_line(line) for line in lines) + "\r\n"
+
+    def _pto_events(self, kind: str, key: str) -> List[str]:
+        """Build VEVENT lines for approved PTO in a user or department feed."""
+        stmt = select(
+            PTORequest.id,
+            PTORequest.pto_type,
+            PTORequest.start_date,
+            PTORequest.end_date,
+            PTORequest.day_part,
+            PTORequest.updated_at,
+            User.first_name,
+            User.last_name
+        ).join(User, User.id == PTORequest.user_id).where(
+            PTORequest.status == RequestStatus.APPROVED
+        ).order_by(PTORequest.start_date, PTORequest.id)
+        stmt = self._scope(stmt, kind, key)
+
+        lines: List[str] = []
+        for request_id, pto_type, start, end, day_part, updated_at, first_name, last_name in self.db.execute(stmt):
+            summary = f"{pto_type.title()}{_PART_LABELS.get(day_part, '')}"
+            if kind == FEED_DEPARTMENT:
+                summary = f"{first_name} {last_name} - {summary}"
+            lines.extend(self._all_day_event(
+                f"pto-{request_id}@{UID_DOMAIN}", summary, start, end, updated_at, "TRANSPARENT"
+            ))
+        return lines
+
+    def _holiday_events(self, market: str) -> List[str]:
+        """Build VEVENT lines for a market's observed holidays."""
+        stmt = select(MarketHoliday.id, MarketHoliday.name, MarketHoliday.holiday_date, MarketHoliday.created_at).where(
+            MarketHoliday.market == market,
+            MarketHoliday.is_observed == True
+        ).order_by(MarketHoliday.holiday_date)
+
+        lines: List[str] = []
+        for holiday_id, name, holiday_date, created_at in self.db.execute(stmt):
+            lines.extend(self._all_day_event(
+                f"holiday-{holiday_id}@{UID_DOMAIN}", f"{market} closed: {name}",
+                holiday_date, holiday_date, created_at, "TRANSPARENT"
+            ))
+        return lines
+
+    @staticmethod
+    def _all_day_event(uid: str, summary: str, start, end, stamp: Optional[datetime], transp: str) -> Iterable[str]:
+        """Build the lines of an all-day VEVENT; DTEND is exclusive."""
+        return [
+            "BEGIN:VEVENT",
+            f"UID:{uid}",
+            f"DTSTAMP:{_utc_stamp(stamp)}",
+            f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}",
+            f"DTEND;VALUE=DATE:{(end + timedelta(days=1)).strftime('%Y%m%d')}",
+            f"SUMMARY:{escape_text(summary)}",
+            f"TRANSP:{transp}",
+            "END:VEVENT",
+        ]
+
+    @staticmethod
+    def _scope(stmt, kind: str, key: str):
+        """Restrict a PTORequest query to a user or department feed."""
+        if kind == FEED_USER:
+            return stmt.where(PTORequest.user_id == int(key))
+        department_users = select(User.id).where(User.department_id == int(key))
+        return stmt.where(PTORequest.user_id.in_(department_users))
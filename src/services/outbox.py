@@ -0,0 +1,150 @@
+"""
+Writing request notifications to the transactional outbox.
+
+PTOService calls ``enqueue_request_notifications`` while it applies a
+transition, before its commit, so the outbox rows commit or roll back with
+the change itself; the stale-request job queues its reminders with
+``enqueue_pending_reminder``. Nothing is sent here: delivery is left to the
+dispatcher (src.notifications), which keeps mail servers and webhooks off
+the request path.
+"""
+from datetime import date, datetime
+from typing import List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from ..config import get_config
+from ..models.outbox_message import OutboxMessage
+from ..models.pto_request import PTORequest
+from .approval_service import ADMIN_ROLE, ApprovalService
+from .directory_cache import directory_cache
+from .event_bus import REQUEST_SUBMITTED, REQUEST_APPROVED, REQUEST_ESCALATED, REQUEST_DENIED, PENDING_REMINDER
+from .rule_service import rule_cache
+
+# Delivery channels
+EMAIL = 'email'
+WEBHOOK = 'webhook'
+
+# Who is emailed about each event: whoever may decide new and escalated
+# requests (the approver and their delegates), the employee about decisions
+_EMPLOYEE = 'employee'
+_MANAGER = 'manager'
+AUDIENCE = {
+    REQUEST_SUBMITTED: _MANAGER,
+    REQUEST_ESCALATED: _MANAGER,
+    REQUEST_APPROVED: _EMPLOYEE,
+    REQUEST_DENIED: _EMPLOYEE,
+}
+
+
+def enqueue_request_notifications(
+    db: Session,
+    kind: str,
+    request: PTORequest,
+    actor_id: Optional[int],
+    note: Optional[str] = None
+) -> List[OutboxMessage]:
+    """
+    Add the outbox rows announcing a request transition (without committing).
+
+    Events without an audience (cancellations) and deployments without a
+    configured channel write nothing. Nobody is emailed about their own
+    action.
+
+    Args:
+        db: Session of the transition's transaction
+        kind: Event name of the transition
+        request: The transitioned request (flushed, so it has an ID)
+        actor_id: ID of the user performing the transition
+        note: Optional note of the transition (the denial reason)
+
+    Returns:
+        List[OutboxMessage]: The added rows
+    """
+    config = get_config()
+    audience = AUDIENCE.get(kind)
+    if audience is None or not (config.SMTP_HOST or config.NOTIFY_WEBHOOK_URL):
+        return []
+
+    directory = directory_cache.get(db)
+    employee = directory.users.get(request.user_id)
+    department_id = employee.department_id if employee is not None else None
+    payload = {
+        'request_id': request.id,
+        'user_id': request.user_id,
+        'employee_name': directory.user_name(request.user_id),
+        'department_id': department_id,
+        'pto_type': request.pto_type,
+        'start_date': request.start_date.isoformat(),
+        'end_date': request.end_date.isoformat(),
+        'total_days': str(request.total_days),
+        'status': request.status,
+        'actor_id': actor_id,
+        'actor_name': directory.user_name(actor_id),
+        'note': note,
+    }
+
+    messages = []
+    if config.SMTP_HOST:
+        if audience == _EMPLOYEE:
+            recipient_ids = [request.user_id]
+        else:
+            recipient_ids = ApprovalService(db).approvers_for(request) or []
+        for recipient_id in recipient_ids:
+            if recipient_id != actor_id:
+                messages.append(OutboxMessage(channel=EMAIL, recipient_id=recipient_id, kind=kind, payload=payload))
+    if config.NOTIFY_WEBHOOK_URL:
+        messages.append(OutboxMessage(channel=WEBHOOK, endpoint=config.NOTIFY_WEBHOOK_URL, kind=kind,
+                                      payload=payload))
+    db.add_all(messages)
+    return messages
+
+
+def enqueue_pending_reminder(
+    db: Session,
+    approver_id: Optional[int],
+    request_ids: Sequence[int],
+    oldest_submitted_at: datetime,
+    on: Optional[date] = None
+) -> List[OutboxMessage]:
+    """
+    Add the outbox rows reminding an approver of requests waiting for them (without committing).
+
+    The approver's delegates of the day are reminded too. Requests without
+    a designated approver are left to the admins, who are reminded of them.
+
+    Args:
+        db: Session of the reminder job
+        approver_id: ID of the approver the requests wait for, or None
+        request_ids: IDs of the waiting requests, oldest first
+        oldest_submitted_at: Submission time of the oldest request
+        on: Day of the reminder, defaults to today
+
+    Returns:
+        List[OutboxMessage]: The added rows
+    """
+    config = get_config()
+    if not (config.SMTP_HOST or config.NOTIFY_WEBHOOK_URL):
+        return []
+
+    payload = {
+        'approver_id': approver_id,
+        'request_ids': list(request_ids),
+        'request_count': len(request_ids),
+        'oldest_submitted_at': oldest_submitted_at.isoformat(),
+    }
+    messages = []
+    if config.SMTP_HOST:
+        if approver_id is None:
+            recipient_ids = [user.id for user in directory_cache.get(db).users.values()
+                             if user.role == ADMIN_ROLE and user.is_active]
+        else:
+            delegates = rule_cache.get(db).delegates_of(approver_id, on or date.today())
+            recipient_ids = [approver_id] + [user_id for user_id in delegates if user_id != approver_id]
+        messages.extend(OutboxMessage(channel=EMAIL, recipient_id=recipient_id, kind=PENDING_REMINDER,
+                                      payload=payload) for recipient_id in recipient_ids)
+    if config.NOTIFY_WEBHOOK_URL:
+        messages.append(OutboxMessage(channel=WEBHOOK, endpoint=config.NOTIFY_WEBHOOK_URL, kind=PENDING_REMINDER,
+                                      payload=payload))
+    db.add_all(messages)
+    return messages
@@ -7,10 +7,41 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 
-from ..models.pto_request import PTORequest
+from ..models.department import Department
+from ..models.pto_balance import PTOBalance
+from ..models.pto_request import PTORequest, RequestStatus
+from ..models.pto_request_event import PTORequestEvent
 from ..models.user import User
+from ..database import read_only
 from ..schemas.pto_schemas import PTORequestCreate
+from ..schemas.read_models import REQUEST_LIST_COLUMNS, RequestListItem
+from ..utils.concurrency import retry_on_conflict
+from ..utils.pto_units import minutes_to_days
+from . import request_workflow
+from .approval_service import ApprovalService
+from .auto_approval_service import AutoApprovalService
 from .balance_service import BalanceService
+from .directory_cache import directory_cache
+from .forecast_service import ForecastService
+from .outbox import enqueue_request_notifications
+from .request_workflow import RequestAction
+from .rule_service import RuleService
+from .event_bus import (
+    event_bus,
+    REQUEST_SUBMITTED,
+    REQUEST_APPROVED,
+    REQUEST_ESCALATED,
+    REQUEST_DENIED,
+    REQUEST_CANCELLED,
+)
+
+_ACTION_EVENTS = {
+    RequestAction.SUBMIT: REQUEST_SUBMITTED,
+    RequestAction.APPROVE: REQUEST_APPROVED,
+    RequestAction.ESCALATE: REQUEST_ESCALATED,
+    RequestAction.DENY: REQUEST_DENIED,
+    RequestAction.CANCEL: REQUEST_CANCELLED,
+}
 
 
 class PTOService:
@@ -30,11 +61,18 @@ class PTOService:
         """
         self.db = db
         self.balance_service = BalanceService(db)
+        self.forecast_service = ForecastService(db)
+        self.rule_service = RuleService(db)
+        self.auto_approval_service = AutoApprovalService(db)
+        self.approval_service = ApprovalService(db)
     
     def create_request(self, request_data: PTORequestCreate) -> PTORequest:
         """
         Create a new PTO request.
         
+        A request meeting an auto-approval rule is approved in the same
+        transaction, with the rule recorded in ``auto_approval_rule_id``.
+        
         Args:
             request_data: PTO request creation data
             
@@ -42,7 +80,8 @@ class PTOService:
             PTORequest: The created request
             
         Raises:
-            ValueError: If user doesn't exist, dates are invalid, or insufficient balance
+            ValueError: If user doesn't exist, dates are invalid, the request breaks
+                department rules, or insufficient balance
         """
         # Verify user exists
         stmt = select(User).where(User.id == request_data.user_id)
@@ -58,41 +97,64 @@ class PTOService:
         if request_data.start_date > request_data.end_date:
             raise ValueError("Start date must be before or equal to end date")
         
-        # Extract year from start_date
-        year = request_data.start_date.year
-        
-        # Get/create balance
-        balance = self.balance_service.get_or_create_balance(request_data.user_id, year)
-        
-        # Check vacation balance if needed
-        if request_data.pto_type == 'vacation':
-            if balance.vacation_available < request_data.total_days:
-                raise ValueError("Insufficient vacation balance")
-        
-        # Create PTORequest
-        request = PTORequest(
-            user_id=request_data.user_id,
-            pto_type=request_data.pto_type,
-            start_date=request_data.start_date,
-            end_date=request_data.end_date,
-            total_days=request_data.total_days,
-            notes=request_data.notes,
-            status='pending',
-            submitted_at=datetime.now()
+        # Blackout periods and coverage rules of the user's department
+        violations = self.rule_service.check_request(
+            user.id, user.department_id, request_data.pto_type, request_data.start_date, request_data.end_date
         )
+        if violations:
+            raise ValueError("; ".join(violation.message for violation in violations))
         
-        self.db.add(request)
-        self.db.commit()
-        self.db.refresh(request)
-        
-        # Adjust vacation pending if needed
-        if request_data.pto_type == 'vacation':
-            self.balance_service.adjust_vacation_used(
-                balance.id, 
-                request_data.total_days, 
-                is_pending=True
+        # Extract year from start_date
+        year = request_data.start_date.year
+        duration_minutes = request_data.duration_minutes
+        
+        def submit() -> tuple:
+            # Check vacation balance if needed: the projected balance must
+            # cover the request at every month end through the end of the year
+            balance = self.balance_service.get_or_create_balance(request_data.user_id, year)
+            if request_data.pto_type == 'vacation':
+                bookable = self.forecast_service.bookable_minutes(request_data.user_id, request_data.start_date)
+                if bookable < duration_minutes:
+                    raise ValueError("Insufficient vacation balance")
+            
+            # Create PTORequest
+            request = PTORequest(
+                user_id=request_data.user_id,
+                pto_type=request_data.pto_type,
+                start_date=request_data.start_date,
+                end_date=request_data.end_date,
+                duration_minutes=duration_minutes,
+                day_part=request_data.day_part,
+                notes=request_data.notes,
+                submitted_at=datetime.now()
             )
+            self.db.add(request)
+            self.approval_service.assign_first_level(request)
+            rule = self.auto_approval_service.match(request, user.department_id, balance)
+            
+            # Reserve the days; the balance version check rejects a
+            # concurrent submission that read the same availability.
+            # Managers are not notified of requests approved right away.
+            changed = self._transition(request, RequestAction.SUBMIT, request_data.user_id, balance=balance,
+                                       notify=rule is None)
+            if rule is not None:
+                changed = self._transition(
+                    request, RequestAction.APPROVE, None, note=f"Auto-approved by rule '{rule.name}'", balance=balance
+                ) or changed
+                request.auto_approval_rule_id = rule.id
+                request.approved_at = datetime.now()
+            
+            self.db.commit()
+            self.db.refresh(request)
+            return request, changed
+        
+        request, balance = retry_on_conflict(self.db, submit)
         
+        if request.auto_approval_rule_id is None:
+            self._publish(RequestAction.SUBMIT, request, balance, user)
+        else:
+            self._publish(RequestAction.SUBMIT, request, None, user)
+            self._publish(RequestAction.APPROVE, request, balance, user)
         return request
     
     def get_request_by_id(self, request_id: int) -> Optional[PTORequest]:
@@ -108,6 +170,7 @@ class PTOService:
         stmt = select(PTORequest).where(PTORequest.id == request_id)
         return self.db.execute(stmt).scalar_one_or_none()
     
+    @read_only(pin='user_id')
     def get_user_requests(self, user_id: int, status: Optional[str] = None) -> List[PTORequest]:
         """
         Get all requests for a user, optionally filtered by status.
@@ -129,20 +192,91 @@ class PTOService:
         result = self.db.execute(stmt)
         return list(result.scalars().all())
     
-    def get_pending_requests(self, department_id: Optional[int] = None) -> List[PTORequest]:
+    @read_only(pin='user_id')
+    def list_user_requests(self, user_id: int, status: Optional[str] = None,
+                           limit: Optional[int] = None) -> List[RequestListItem]:
+        """
+        List a user's requests as lightweight rows for history views.
+        
+        Args:
+            user_id: ID of the user
+            status: Optional status filter
+            limit: Optional maximum number of rows
+            
+        Returns:
+            List[RequestListItem]: Rows ordered by submitted_at descending
+        """
+        stmt = select(*REQUEST_LIST_COLUMNS).where(PTORequest.user_id == user_id)
+        
+        if status is not None:
+            stmt = stmt.where(PTORequest.status == status)
+        
+        stmt = stmt.order_by(PTORequest.submitted_at.desc()).limit(limit)
+        
+        return list(map(RequestListItem._make, self.db.execute(stmt)))
+    
+    @read_only()
+    def page_requests(
+        self,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        start_from: Optional[date] = None,
+        start_to: Optional[date] = None
+    ) -> List[RequestListItem]:
         """
-        Get all pending requests, optionally filtered by department.
+        List requests in ID order, one keyset page at a time.
+        
+        Args:
+            after_id: Return requests with an ID above this (the previous page's last)
+            limit: Maximum number of rows
+            user_id: Optional user filter
+            status: Optional status filter
+            start_from: Optional earliest start date
+            start_to: Optional latest start date
+            
+        Returns:
+            List[RequestListItem]: Rows ordered by ID
+        """
+        stmt = select(*REQUEST_LIST_COLUMNS)
+        if after_id is not None:
+            stmt = stmt.where(PTORequest.id > after_id)
+        if user_id is not None:
+            stmt = stmt.where(PTORequest.user_id == user_id)
+        if status is not None:
+            stmt = stmt.where(PTORequest.status == status)
+        if start_from is not None:
+            stmt = stmt.where(PTORequest.start_date >= start_from)
+        if start_to is not None:
+            stmt = stmt.where(PTORequest.start_date <= start_to)
+        stmt = stmt.order_by(PTORequest.id).limit(limit)
+        return list(map(RequestListItem._make, self.db.execute(stmt)))
+    
+    def get_pending_requests(
+        self, 
+        department_id: Optional[int] = None, 
+        approver_id: Optional[int] = None
+    ) -> List[PTORequest]:
+        """
+        Get all pending requests, optionally filtered by department or approver.
         
         Args:
             department_id: Optional department ID filter
+            approver_id: Optional approver whose queue to return: the requests
+                they may decide today, including as a delegate
             
         Returns:
             List[PTORequest]: List of pending requests ordered by submitted_at ascending
         """
-        stmt = select(PTORequest).where(PTORequest.status == 'pending')
+        stmt = select(PTORequest).where(PTORequest.status == RequestStatus.PENDING)
         
+        if department_id is not None or approver_id is not None:
+            stmt = stmt.join(User, PTORequest.user_id == User.id)
         if department_id is not None:
-            stmt = stmt.join(User).where(User.department_id == department_id)
+            stmt = stmt.where(User.department_id == department_id)
+        if approver_id is not None:
+            stmt = self.approval_service.filter_queue(stmt, approver_id)
         
         stmt = stmt.order_by(PTORequest.submitted_at.asc())
         
@@ -150,35 +284,32 @@ class PTOService:
         return list(result.scalars().all())
     
     @staticmethod
-    def get_pending_requests_with_employee_info(db: Session):
-        """Get all pending PTO requests with employee information"""
+    def get_pending_requests_with_employee_info(db: Session, approver_id: Optional[int] = None):
+        """Get pending PTO requests with employee information, optionally only an approver's queue"""
         from ..models.pto_request import PTORequest
         from ..models.user import User
         
-        results = db.query(
+        stmt = select(
             PTORequest.id.label('request_id'),
             (User.first_name + ' ' + User.last_name).label('employee_name'),
             PTORequest.pto_type,
             PTORequest.start_date,
             PTORequest.end_date,
-            PTORequest.total_days,
+            PTORequest.duration_minutes,
+            PTORequest.day_part,
             PTORequest.submitted_at
         ).join(User, PTORequest.user_id == User.id
-        ).filter(PTORequest.status == 'pending'
-        ).order_by(PTORequest.submitted_at.desc()).all()
-        
-        return [dict(row._mapping) for row in results]
-    
-    @staticmethod
-    def get_user_requests(db: Session, user_id: int):
-        """Get all PTO requests for a specific user"""
-        from ..models.pto_request import PTORequest
-        
-        requests = db.query(PTORequest).filter(
-            PTORequest.user_id == user_id
-        ).order_by(PTORequest.submitted_at.desc()).all()
-        
-        return requests
+        ).where(PTORequest.status == RequestStatus.PENDING
+        ).order_by(PTORequest.submitted_at.desc())
+        if approver_id is not None:
+            stmt = ApprovalService(db).filter_queue(stmt, approver_id)
+        
+        rows = []
+        for row in db.execute(stmt):
+            data = dict(row._mapping)
+            data['total_days'] = minutes_to_days(data['duration_minutes'])
+            rows.append(data)
+        return rows
     
     @staticmethod
     def get_request_detail(db: Session, request_id: int):
@@ -194,7 +325,7 @@ class PTOService:
         user = db.query(User).filter(User.id == request.user_id).first()
         balance = db.query(PTOBalance).filter(
             PTOBalance.user_id == request.user_id,
-            PTOBalance.year == 2025
+            PTOBalance.year == request.start_date.year
         ).first()
         
         return {
@@ -204,110 +335,58 @@ class PTOService:
             'balance': balance
         }
 
-    @staticmethod
-    def approve_request(db: Session, request_id: int, approver_id: int):
-        """Approve a PTO request and deduct from balance"""
-        from ..models.pto_request import PTORequest
-        from ..models.pto_balance import PTOBalance
-        from datetime import datetime
-        
-        request = db.query(PTORequest).filter(PTORequest.id == request_id).first()
-        if not request or request.status != 'pending':
-            return False
-        
-        # Update request status
-        request.status = 'approved'
-        request.approved_by = approver_id
-        request.approved_at = datetime.now()
-        
-        # Deduct from balance
-        balance = db.query(PTOBalance).filter(
-            PTOBalance.user_id == request.user_id,
-            PTOBalance.year == 2025
-        ).first()
-        
-        if request.pto_type == 'vacation':
-            balance.vacation_used += request.total_days
-        elif request.pto_type == 'sick':
-            balance.sick_used += request.total_days
-        elif request.pto_type == 'personal':
-            balance.personal_used += request.total_days
-        
-        db.commit()
-        return True
-
-    @staticmethod
-    def deny_request(db: Session, request_id: int, approver_id: int, reason: str):
-        """Deny a PTO request"""
-        from ..models.pto_request import PTORequest
-        from datetime import datetime
-        
-        request = db.query(PTORequest).filter(PTORequest.id == request_id).first()
-        if not request or request.status != 'pending':
-            return False
-        
-        request.status = 'denied'
-        request.approved_by = approver_id
-        request.approved_at = datetime.now()
-        request.denial_reason = reason
-        
-        db.commit()
-        return True
-    
-    @staticmethod
-    def approve_request(db: Session, request_id: int, approved_by: int) -> PTORequest:
+    def approve_request(self, request_id: int, approved_by: int) -> PTORequest:
         """
-        Approve a PTO request.
+        Approve a PTO request at its current level of the approval chain.
+        
+        Below the last level the request is escalated: it stays pending and
+        waits for the next level's approver. At the last level the status
+        change, balance deduction and audit event are committed together
+        and guarded by the rows' version columns, so two managers approving
+        the same request at once cannot both deduct the balance.
         
         Args:
-            db: SQLAlchemy database session
             request_id: ID of the request to approve
             approved_by: ID of the user approving the request
             
         Returns:
-            PTORequest: The approved request
+            PTORequest: The approved or escalated request
             
         Raises:
-            ValueError: If request not found or not pending
+            ValueError: If request not found, not pending, not waiting for the user,
+                or its approval would break a department rule
         """
-        request = db.query(PTORequest).filter(PTORequest.id == request_id).first()
-        if request is None:
-            raise ValueError(f"Request with ID {request_id} not found")
-        
-        if request.status != 'pending':
-            raise ValueError("Only pending requests can be approved")
-        
-        # Get year from start_date
-        year = request.start_date.year
-        
-        # Get balance
-        balance_service = BalanceService(db)
-        balance = balance_service.get_or_create_balance(request.user_id, year)
-        
-        # Adjust balances based on PTO type
-        if request.pto_type == 'vacation':
-            balance_service.move_pending_to_used(balance.id, request.total_days)
-        elif request.pto_type == 'sick':
-            balance_service.adjust_sick_used(balance.id, request.total_days)
-        elif request.pto_type == 'personal':
-            balance_service.adjust_personal_used(balance.id, request.total_days)
+        def approve() -> tuple:
+            request = self._get_request_or_raise(request_id)
+            self._require_approver(request, approved_by)
+            chain = self.approval_service.chain(request)
+            if request.approval_level + 1 < len(chain):
+                action = RequestAction.ESCALATE
+                request.approval_level += 1
+                request.current_approver_id = chain[request.approval_level]
+                balance = self._transition(request, action, approved_by)
+            else:
+                action = RequestAction.APPROVE
+                if request.is_pending:
+                    self._require_rules(request)
+                balance = self._transition(request, action, approved_by)
+                request.approved_by = approved_by
+                request.approved_at = datetime.now()
+            
+            self.db.commit()
+            self.db.refresh(request)
+            return request, balance, action
         
-        # Update request
-        request.status = 'approved'
-        request.approved_by = approved_by
-        request.approved_at = datetime.now()
+        request, balance, action = retry_on_conflict(self.db, approve)
         
-        db.commit()
-        db.refresh(request)
+        self._publish(action, request, balance)
         return request
     
-    @staticmethod
-    def deny_request(db: Session, request_id: int, approved_by: int, denial_reason: str) -> PTORequest:
+    def deny_request(self, request_id: int, approved_by: int, denial_reason: str) -> PTORequest:
         """
         Deny a PTO request.
         
         Args:
-            db: SQLAlchemy database session
             request_id: ID of the request to deny
             approved_by: ID of the user denying the request
             denial_reason: Reason for denial
@@ -316,32 +395,23 @@ class PTOService:
             PTORequest: The denied request
             
         Raises:
-            ValueError: If request not found or not pending
+            ValueError: If request not found, not pending, or not waiting for the user
         """
-        request = db.query(PTORequest).filter(PTORequest.id == request_id).first()
-        if request is None:
-            raise ValueError(f"Request with ID {request_id} not found")
-        
-        if request.status != 'pending':
-            raise ValueError("Only pending requests can be denied")
-        
-        # Get year from start_date
-        year = request.start_date.year
-        
-        # Remove pending vacation days if needed
-        if request.pto_type == 'vacation':
-            balance_service = BalanceService(db)
-            balance = balance_service.get_or_create_balance(request.user_id, year)
-            balance_service.remove_pending(balance.id, request.total_days)
+        def deny() -> tuple:
+            request = self._get_request_or_raise(request_id)
+            self._require_approver(request, approved_by)
+            balance = self._transition(request, RequestAction.DENY, approved_by, note=denial_reason)
+            request.approved_by = approved_by
+            request.denial_reason = denial_reason
+            request.approved_at = datetime.now()
+            
+            self.db.commit()
+            self.db.refresh(request)
+            return request, balance
         
-        # Update request
-        request.status = 'denied'
-        request.approved_by = approved_by
-        request.denial_reason = denial_reason
-        request.approved_at = datetime.now()
+        request, balance = retry_on_conflict(self.db, deny)
         
-        db.commit()
-        db.refresh(request)
+        self._publish(RequestAction.DENY, request, balance)
         return request
     
     def cancel_request(self, request_id: int, user_id: int) -> PTORequest:
@@ -358,30 +428,38 @@ class PTOService:
         Raises:
             ValueError: If request not found, not owned by user, or not pending
         """
-        request = self.get_request_by_id(request_id)
-        if request is None:
-            raise ValueError(f"Request with ID {request_id} not found")
-        
-        if request.user_id != user_id:
-            raise ValueError("You can only cancel your own requests")
-        
-        if request.status != 'pending':
-            raise ValueError("Only pending requests can be cancelled")
+        def cancel() -> tuple:
+            request = self._get_request_or_raise(request_id)
+            if request.user_id != user_id:
+                raise ValueError("You can only cancel your own requests")
+            
+            balance = self._transition(request, RequestAction.CANCEL, user_id)
+            
+            self.db.commit()
+            self.db.refresh(request)
+            return request, balance
         
-        # Get year from start_date
-        year = request.start_date.year
+        request, balance = retry_on_conflict(self.db, cancel)
         
-        # Remove pending vacation days if needed
-        if request.pto_type == 'vacation':
-            balance = self.balance_service.get_or_create_balance(request.user_id, year)
-            self.balance_service.remove_pending(balance.id, request.total_days)
+        self._publish(RequestAction.CANCEL, request, balance)
+        return request
+    
+    def get_request_history(self, request_id: int) -> List[PTORequestEvent]:
+        """
+        Get the audit trail of a request, oldest first.
         
-        # Update request
-        request.status = 'cancelled'
+        Args:
+            request_id: ID of the request
+            
+        Returns:
+            List[PTORequestEvent]: Transitions recorded for the request
+        """
+        stmt = select(PTORequestEvent).where(
+            PTORequestEvent.request_id == request_id
+        ).order_by(PTORequestEvent.created_at, PTORequestEvent.id)
         
-        self.db.commit()
-        self.db.refresh(request)
-        return request
+        result = self.db.execute(stmt)
+        return list(result.scalars().all())
     
     def get_overlapping_requests(
         self, 
@@ -404,7 +482,7 @@ class PTOService:
         """
         stmt = select(PTORequest).where(
             PTORequest.user_id == user_id,
-            PTORequest.status.in_(['pending', 'approved']),
+            PTORequest.status.in_(RequestStatus.ACTIVE),
             PTORequest.start_date <= end_date,
             PTORequest.end_date >= start_date
         )
@@ -414,3 +492,143 @@ class PTOService:
         
         result = self.db.execute(stmt)
         return list(result.scalars().all())
+    
+    def _get_request_or_raise(self, request_id: int) -> PTORequest:
+        """Load a request or raise ValueError if it does not exist."""
+        request = self.get_request_by_id(request_id)
+        if request is None:
+            raise ValueError(f"Request with ID {request_id} not found")
+        return request
+    
+    def _require_approver(self, request: PTORequest, user_id: int) -> None:
+        """Raise ValueError unless the user may decide the request at its current level."""
+        if request.is_pending and not self.approval_service.can_approve(request, user_id):
+            if user_id == request.user_id:
+                raise ValueError("Users cannot decide their own requests")
+            approver = self.approval_service.current_approver(request)
+            if approver is None:
+                raise ValueError(f"User {user_id} cannot approve requests")
+            raise ValueError(f"This request is waiting for {directory_cache.get(self.db).user_name(approver)}")
+    
+    def _require_rules(self, request: PTORequest) -> None:
+        """
+        Re-check the department's rules before a request's final approval.
+        
+        Coverage rules count approved absences only, so overlapping requests
+        that each passed at submission can break them once approved. The
+        department row is locked first, so concurrent approvals within a
+        department count each other's absences.
+        
+        Raises:
+            ValueError: If approving the request would break a rule
+        """
+        department_id = request.user.department_id
+        if department_id is not None:
+            self.db.execute(select(Department.id).where(Department.id == department_id).with_for_update())
+        violations = self.rule_service.check_request(
+            request.user_id, department_id, request.pto_type, request.start_date, request.end_date
+        )
+        if violations:
+            raise ValueError("; ".join(violation.message for violation in violations))
+    
+    def _transition(
+        self, 
+        request: PTORequest, 
+        action: str, 
+        actor_id: Optional[int], 
+        note: Optional[str] = None,
+        balance: Optional[PTOBalance] = None,
+        notify: bool = True
+    ) -> Optional[PTOBalance]:
+        """
+        Apply an action from the transition table to a request (without committing).
+        
+        Updates the status, applies the balance effect, appends the audit
+        event and queues the notifications, so the caller's single commit
+        persists all of them together.
+        
+        Args:
+            request: Request to transition (new requests are flushed for their ID)
+            action: One of the RequestAction values
+            actor_id: ID of the user performing the action
+            note: Optional note stored on the audit event
+            balance: Balance for the request's year, if already loaded
+            notify: Whether to queue the transition's notifications
+            
+        Returns:
+            Optional[PTOBalance]: The balance if the transition changed it
+            
+        Raises:
+            ValueError: If the action is not allowed from the request's status
+        """
+        from_status = request.status
+        transition = request_workflow.resolve(from_status, action)
+        
+        changed_balance = None
+        if request_workflow.affects_balance(transition.effect, request.pto_type):
+            if balance is None:
+                balance = self.balance_service.get_or_create_balance(request.user_id, request.start_date.year)
+            request_workflow.apply_balance_effect(
+                balance, transition.effect, request.pto_type, request.duration_minutes
+            )
+            changed_balance = balance
+        
+        request.status = transition.target
+        if request.id is None:
+            self.db.flush()
+        self.db.add(PTORequestEvent(
+            request_id=request.id,
+            actor_id=actor_id,
+            action=action,
+            from_status=from_status,
+            to_status=transition.target,
+            note=note,
+            created_at=datetime.now()
+        ))
+        if notify:
+            enqueue_request_notifications(self.db, _ACTION_EVENTS[action], request, actor_id, note)
+        return changed_balance
+    
+    def _publish(
+        self, 
+        action: str, 
+        request: PTORequest, 
+        balance: Optional[PTOBalance], 
+        user: Optional[User] = None
+    ) -> None:
+        """Publish the events for a committed transition."""
+        if balance is not None:
+            self.balance_service.publish_balance_changed(balance)
+        payload = self._event_payload(request, user)
+        if request.is_pending:
+            # Who may decide it now; None when every approver may
+            payload['approver_ids'] = self.approval_service.approvers_for(request)
+        event_bus.publish(_ACTION_EVENTS[action], **payload)
+    
+    @staticmethod
+    def _event_payload(request: PTORequest, user: Optional[User] = None) -> dict:
+        """
+        Build the event payload describing a request after a state change.
+        
+        Args:
+            request: The committed request
+            user: Optional requesting user, used to add employee details
+            
+        Returns:
+            dict: Payload carrying enough data for UIs to patch a single row
+        """
+        user = user or request.user
+        return {
+            'request_id': request.id,
+            'user_id': request.user_id,
+            'department_id': user.department_id,
+            'employee_name': f"{user.first_name} {user.last_name}",
+            'pto_type': request.pto_type,
+            'start_date': request.start_date,
+            'end_date': request.end_date,
+            'total_days': request.total_days,
+            'duration_minutes': request.duration_minutes,
+            'day_part': request.day_part,
+            'status': request.status,
+            'submitted_at': request.submitted_at,
+        }
@@ -0,0 +1,437 @@
+"""
+Remote work service for the PTO and Market Calendar System.
+"""
+import json
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from ..config import get_config
+from ..database import read_only
+from ..models.market_holiday import MarketHoliday
+from ..models.pto_request import PTORequest, RequestStatus
+from ..models.remote_week import RemoteWeek
+from ..models.user import User
+from ..utils import lazy
+from ..utils.concurrency import retry_on_conflict
+from .event_bus import event_bus, REMOTE_DAYS_CHANGED
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Keys used by User.remote_schedule, Monday first (bit 0)
+WEEKDAY_KEYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday')
+
+
+def schedule_mask(remote_schedule: Any) -> int:
+    """
+    Convert a user's recurring remote_schedule into a weekday bitmask.
+
+    The admin pages store the schedule as a JSON string inside the JSON
+    column, so both encoded and decoded forms are accepted.
+
+    Args:
+        remote_schedule: Dict of weekday -> bool, its JSON text, or None
+
+    Returns:
+        int: Bitmask with bit 0 = Monday
+    """
+    if isinstance(remote_schedule, str):
+        try:
+            remote_schedule = json.loads(remote_schedule)
+        except ValueError:
+            return 0
+    if not isinstance(remote_schedule, dict):
+        return 0
+    mask = 0
+    for bit, key in enumerate(WEEKDAY_KEYS):
+        if remote_schedule.get(key):
+            mask |= 1 << bit
+    return mask
+
+
+def popcount(mask: int) -> int:
+    """Count the days set in a weekday bitmask."""
+    return bin(mask).count("1")
+
+
+@dataclass(frozen=True)
+class Occupancy:
+    """Per-day office occupancy over a range of market-open days."""
+    days: List[date]
+    headcount: int
+    remote: "np.ndarray"
+    on_pto: "np.ndarray"
+    in_office: "np.ndarray"
+
+    def as_dict(self) -> Dict[date, Dict[str, int]]:
+        """Map each day to its remote, PTO and in-office counts."""
+        return {
+            day: {
+                'remote': int(self.remote[i]),
+                'on_pto': int(self.on_pto[i]),
+                'in_office': int(self.in_office[i]),
+            }
+            for i, day in enumerate(self.days)
+        }
+
+
+class RemoteWorkService:
+    """
+    Service class for managing remote work days.
+
+    Each employee has at most one RemoteWeek row per ISO week holding a
+    bitmask of remote days. Weeks without a row follow the user's recurring
+    remote_schedule, so the schedule costs nothing to store and the weekly
+    cap check is a single-row read.
+    """
+
+    def __init__(self, db: Session) -> None:
+        """
+        Initialize the RemoteWorkService with a database session.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+
+    def weekly_cap(self, user: User) -> int:
+        """
+        Get the maximum number of remote days per week for a user.
+
+        An explicit ``weekly_cap`` in remote_schedule wins; otherwise a
+        recurring schedule larger than the company default is honoured.
+
+        Args:
+            user: The employee
+
+        Returns:
+            int: Remote days allowed per ISO week
+        """
+        schedule = user.remote_schedule
+        if isinstance(schedule, str):
+            try:
+                schedule = json.loads(schedule)
+            except ValueError:
+                schedule = None
+        if isinstance(schedule, dict) and schedule.get('weekly_cap') is not None:
+            return int(schedule['weekly_cap'])
+        return max(get_config().REMOTE_WEEKLY_CAP, popcount(schedule_mask(schedule)))
+
+    def get_week_mask(self, user: User, iso_year: int, iso_week: int) -> int:
+        """
+        Get the remote days bitmask for one user and ISO week.
+
+        Args:
+            user: The employee
+            iso_year: ISO year
+            iso_week: ISO week number
+
+        Returns:
+            int: Bitmask with bit 0 = Monday
+        """
+        row = self._get_week(user.id, iso_year, iso_week)
+        return row.day_mask if row is not None else schedule_mask(user.remote_schedule)
+
+    @read_only(pin='user_id')
+    def weekly_used(self, user_id: int, on: Optional[date] = None) -> int:
+        """
+        Count a user's remote days in the ISO week containing a day.
+
+        Computed from the week's mask on every read, so it needs no reset
+        when a new week starts and follows the ISO year across New Year.
+
+        Args:
+            user_id: ID of the user
+            on: Any day of the week (defaults to today)
+
+        Returns:
+            int: Remote days booked or scheduled that week
+        """
+        user = self._get_user_or_raise(user_id)
+        iso_year, iso_week, _ = (on or date.today()).isocalendar()
+        return popcount(self.get_week_mask(user, iso_year, iso_week))
+
+    @read_only(pin='user_id')
+    def get_remote_days(self, user_id: int, start_date: date, end_date: date) -> List[date]:
+        """
+        List a user's remote days in a date range.
+
+        Args:
+            user_id: ID of the user
+            start_date: First day of the range
+            end_date: Last day of the range
+
+        Returns:
+            List[date]: Remote days in ascending order
+        """
+        user = self._get_user_or_raise(user_id)
+        default_mask = schedule_mask(user.remote_schedule)
+        weeks = self._iso_weeks(start_date, end_date)
+        stmt = select(RemoteWeek.iso_year, RemoteWeek.iso_week, RemoteWeek.day_mask).where(
+            RemoteWeek.user_id == user_id,
+            tuple_(RemoteWeek.iso_year, RemoteWeek.iso_week).in_(weeks)
+        )
+        masks = {(year, week): mask for year, week, mask in self.db.execute(stmt)}
+
+        days = []
+        day = start_date
+        while day <= end_date:
+            if day.weekday() < 5:
+                year, week, weekday = day.isocalendar()
+                if masks.get((year, week), default_mask) >> (weekday - 1) & 1:
+                    days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def request_remote_day(self, user_id: int, day: date) -> RemoteWeek:
+        """
+        Book a remote day, enforcing the weekly cap.
+
+        Args:
+            user_id: ID of the user
+            day: Day to work remotely
+
+        Returns:
+            RemoteWeek: The updated week
+
+        Raises:
+            ValueError: If the day is not bookable or the weekly cap is reached
+        """
+        user = self._get_user_or_raise(user_id)
+        self._validate_bookable(user_id, day)
+        return self._set_day(user, day, remote=True)
+
+    def cancel_remote_day(self, user_id: int, day: date) -> RemoteWeek:
+        """
+        Return a remote day to the office.
+
+        Args:
+            user_id: ID of the user
+            day: Day previously booked as remote
+
+        Returns:
+            RemoteWeek: The updated week
+
+        Raises:
+            ValueError: If the user is not found or the day is in the past
+        """
+        user = self._get_user_or_raise(user_id)
+        if day < date.today():
+            raise ValueError("Past remote days cannot be changed")
+        return self._set_day(user, day, remote=False)
+
+    def market_open_days(self, start_date: date, end_date: date, market: Optional[str] = None) -> List[date]:
+        """
+        List weekdays in a range that are not holidays of a market.
+
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range
+            market: Market code, defaults to the configured primary market
+
+        Returns:
+            List[date]: Market-open days in ascending order
+        """
+        stmt = select(MarketHoliday.holiday_date).where(
+            MarketHoliday.market == (market or get_config().PRIMARY_MARKET),
+            MarketHoliday.is_observed == True,
+            MarketHoliday.holiday_date >= start_date,
+            MarketHoliday.holiday_date <= end_date
+        )
+        holidays = set(self.db.execute(stmt).scalars())
+
+        days = []
+        day = start_date
+        while day <= end_date:
+            if day.weekday() < 5 and day not in holidays:
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    @read_only()
+    def office_occupancy(
+        self,
+        start_date: date,
+        end_date: date,
+        department_id: Optional[int] = None,
+        market: Optional[str] = None
+    ) -> Occupancy:
+        """
+        Compute in-office headcount for each market-open day in a range.
+
+        Three queries load active users with their schedules, overriding week
+        masks and approved PTO; the rest is array arithmetic over a
+        (users x days) grid, so the cost for the whole company is dominated
+        by the queries rather than by Python loops.
+
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range
+            department_id: Optional department to restrict to
+            market: Market code, defaults to the configured primary market
+
+        Returns:
+            Occupancy: Days with remote, on-PTO and in-office counts
+        """
+        np = lazy.numpy()
+        days = self.market_open_days(start_date, end_date, market)
+
+        user_stmt = select(User.id, User.remote_schedule).where(User.is_active == True).order_by(User.id)
+        if department_id is not None:
+            user_stmt = user_stmt.where(User.department_id == department_id)
+        users = self.db.execute(user_stmt).all()
+
+        empty = np.zeros(len(days), dtype=np.int32)
+        if not days or not users:
+            return Occupancy(days, len(users), empty, empty.copy(), empty.copy())
+
+        user_index = {user_id: i for i, (user_id, _) in enumerate(users)}
+        weeks = sorted({day.isocalendar()[:2] for day in days})
+        week_index = {week: i for i, week in enumerate(weeks)}
+
+        # Week masks: recurring schedule, overridden by explicit weeks
+        masks = np.repeat(
+            np.array([schedule_mask(schedule) for _, schedule in users], dtype=np.int16)[:, None],
+            len(weeks),
+            axis=1
+        )
+        week_stmt = select(RemoteWeek.user_id, RemoteWeek.iso_year, RemoteWeek.iso_week, RemoteWeek.day_mask).join(
+            User, User.id == RemoteWeek.user_id
+        ).where(
+            User.is_active == True,
+            tuple_(RemoteWeek.iso_year, RemoteWeek.iso_week).in_(weeks)
+        )
+        if department_id is not None:
+            week_stmt = week_stmt.where(User.department_id == department_id)
+        overrides = self.db.execute(week_stmt).all()
+        if overrides:
+            rows = np.array([user_index[user_id] for user_id, _, _, _ in overrides])
+            cols = np.array([week_index[(year, week)] for _, year, week, _ in overrides])
+            masks[rows, cols] = [mask for _, _, _, mask in overrides]
+
+        day_weeks = np.array([week_index[day.isocalendar()[:2]] for day in days])
+        day_bits = np.array([day.weekday() for day in days], dtype=np.int16)
+        remote = ((masks[:, day_weeks] >> day_bits) & 1).astype(bool)
+
+        # Approved PTO as per-user day intervals, expanded with a difference array
+        ordinals = np.array([day.toordinal() for day in days])
+        pto_stmt = select(PTORequest.user_id, PTORequest.start_date, PTORequest.end_date).join(
+            User, User.id == PTORequest.user_id
+        ).where(
+            User.is_active == True,
+            PTORequest.status == RequestStatus.APPROVED,
+            PTORequest.start_date <= end_date,
+            PTORequest.end_date >= start_date
+        )
+        if department_id is not None:
+            pto_stmt = pto_stmt.where(User.department_id == department_id)
+        absences = self.db.execute(pto_stmt).all()
+        on_pto = np.zeros((len(users), len(days)), dtype=bool)
+        if absences:
+            rows = np.array([user_index[user_id] for user_id, _, _ in absences])
+            lo = np.searchsorted(ordinals, [start.toordinal() for _, start, _ in absences], side='left')
+            hi = np.searchsorted(ordinals, [end.toordinal() for _, _, end in absences], side='right')
+            diff = np.zeros((len(users), len(days) + 1), dtype=np.int32)
+            np.add.at(diff, (rows, lo), 1)
+            np.add.at(diff, (rows, hi), -1)
+            on_pto = np.cumsum(diff, axis=1)[:, :len(days)] > 0
+
+        # PTO takes precedence over a remote booking on the same day
+        remote &= ~on_pto
+        return Occupancy(
+            days=days,
+            headcount=len(users),
+            remote=remote.sum(axis=0),
+            on_pto=on_pto.sum(axis=0),
+            in_office=(~remote & ~on_pto).sum(axis=0)
+        )
+
+    def _set_day(self, user: User, day: date, remote: bool) -> RemoteWeek:
+        """Set or clear one day's bit, enforcing the cap, and commit."""
+        iso_year, iso_week, weekday = day.isocalendar()
+        bit = 1 << (weekday - 1)
+        cap = self.weekly_cap(user)
+
+        def update() -> RemoteWeek:
+            row = self._get_week(user.id, iso_year, iso_week)
+            current_mask = row.day_mask if row is not None else schedule_mask(user.remote_schedule)
+
+            new_mask = current_mask | bit if remote else current_mask & ~bit
+            if remote and new_mask == current_mask:
+                raise ValueError(f"{day.isoformat()} is already a remote day")
+            if remote and popcount(new_mask) > cap:
+                raise ValueError(
+                    f"Weekly remote limit of {cap} day(s) reached for week {iso_year}-W{iso_week:02d}"
+                )
+
+            if row is None:
+                row = RemoteWeek(user_id=user.id, iso_year=iso_year, iso_week=iso_week)
+                self.db.add(row)
+            row.day_mask = new_mask
+
+            self.db.commit()
+            self.db.refresh(row)
+            return row
+
+        row = retry_on_conflict(self.db, update, conflicts=(StaleDataError, IntegrityError))
+
+        event_bus.publish(
+            REMOTE_DAYS_CHANGED,
+            user_id=user.id,
+            department_id=user.department_id,
+            day=day,
+            remote=remote,
+            iso_year=iso_year,
+            iso_week=iso_week,
+            day_mask=row.day_mask,
+            days_used=row.days_used,
+            weekly_cap=cap
+        )
+        return row
+
+    def _validate_bookable(self, user_id: int, day: date) -> None:
+        """Reject past days, weekends, market holidays and days already on PTO."""
+        if day < date.today():
+            raise ValueError("Remote days cannot be booked in the past")
+        if not self.market_open_days(day, day):
+            raise ValueError(f"{day.isoformat()} is not a market-open day")
+        stmt = select(PTORequest.id).where(
+            PTORequest.user_id == user_id,
+            PTORequest.status.in_(RequestStatus.ACTIVE),
+            PTORequest.start_date <= day,
+            PTORequest.end_date >= day
+        ).limit(1)
+        if self.db.execute(stmt).first() is not None:
+            raise ValueError(f"{day.isoformat()} is already covered by a PTO request")
+
+    def _get_week(self, user_id: int, iso_year: int, iso_week: int) -> Optional[RemoteWeek]:
+        """Get the explicit week row, if any."""
+        stmt = select(RemoteWeek).where(
+            RemoteWeek.user_id == user_id,
+            RemoteWeek.iso_year == iso_year,
+            RemoteWeek.iso_week == iso_week
+        )
+        return self.db.execute(stmt).scalar_one_or_none()
+
+    def _get_user_or_raise(self, user_id: int) -> User:
+        """Load an active user or raise ValueError."""
+        user = self.db.get(User, user_id)
+        if user is None or not user.is_active:
+            raise ValueError(f"User with ID {user_id} not found")
+        return user
+
+    @staticmethod
+    def _iso_weeks(start_date: date, end_date: date) -> List[Tuple[int, int]]:
+        """List the (iso_year, iso_week) pairs touched by a date range."""
+        weeks = []
+        day = start_date - timedelta(days=start_date.weekday())
+        while day <= end_date:
+            weeks.append(day.isocalendar()[:2])
+            day += timedelta(days=7)
+        return weeks
@@ -0,0 +1,148 @@
+"""
+PTO request state machine for the PTO and Market Calendar System.
+
+The transition table below is the single source of truth for which actions
+are allowed in which state, what state they lead to, and how they affect the
+requester's balance. PTOService enforces it; UIs query it to decide which
+buttons to show.
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+from ..models.pto_balance import PTOBalance
+from ..models.pto_request import RequestStatus
+
+
+class RequestAction:
+    """Actions that move a request between states."""
+    SUBMIT = "submit"
+    APPROVE = "approve"
+    ESCALATE = "escalate"  # approve one level of a longer approval chain
+    DENY = "deny"
+    CANCEL = "cancel"
+
+
+class BalanceEffect:
+    """Balance side effects attached to transitions."""
+    RESERVE = "reserve"    # hold days as pending
+    COMMIT = "commit"      # turn held days (or nothing held) into used days
+    RELEASE = "release"    # give held days back
+
+
+@dataclass(frozen=True)
+class Transition:
+    """Target state and balance effect of applying an action."""
+    target: str
+    effect: Optional[str] = None
+
+
+# (current state, action) -> transition. None is the state of an unsaved request.
+TRANSITIONS: Dict[Tuple[Optional[str], str], Transition] = {
+    (None, RequestAction.SUBMIT): Transition(RequestStatus.PENDING, BalanceEffect.RESERVE),
+    (RequestStatus.PENDING, RequestAction.APPROVE): Transition(RequestStatus.APPROVED, BalanceEffect.COMMIT),
+    (RequestStatus.PENDING, RequestAction.ESCALATE): Transition(RequestStatus.PENDING),
+    (RequestStatus.PENDING, RequestAction.DENY): Transition(RequestStatus.DENIED, BalanceEffect.RELEASE),
+    (RequestStatus.PENDING, RequestAction.CANCEL): Transition(RequestStatus.CANCELLED, BalanceEffect.RELEASE),
+}
+
+_PAST_TENSE = {
+    RequestAction.SUBMIT: "submitted",
+    RequestAction.APPROVE: "approved",
+    RequestAction.ESCALATE: "escalated",
+    RequestAction.DENY: "denied",
+    RequestAction.CANCEL: "cancelled",
+}
+
+
+def _compile(table: Dict[Tuple[Optional[str], str], Transition]) -> Mapping[Optional[str], Mapping[str, Transition]]:
+    """Index the flat table by state so lookups are two dict hits."""
+    compiled: Dict[Optional[str], Dict[str, Transition]] = {}
+    for (state, action), transition in table.items():
+        compiled.setdefault(state, {})[action] = transition
+    return MappingProxyType({state: MappingProxyType(actions) for state, actions in compiled.items()})
+
+
+_COMPILED = _compile(TRANSITIONS)
+
+# Vacation days are reserved on submit; sick and personal days are only
+# counted once approved.
+_PTO_TYPE_FIELDS = {
+    'vacation': ('vacation_pending_minutes', 'vacation_used_minutes'),
+    'sick': (None, 'sick_used_minutes'),
+    'personal': (None, 'personal_used_minutes'),
+}
+
+
+def allowed_actions(state: Optional[str]) -> Tuple[str, ...]:
+    """
+    List the actions allowed from a state.
+
+    Args:
+        state: Current request status
+
+    Returns:
+        Tuple[str, ...]: Allowed action names
+    """
+    return tuple(_COMPILED.get(state, {}))
+
+
+def can_transition(state: Optional[str], action: str) -> bool:
+    """Check whether an action is allowed from a state."""
+    return action in _COMPILED.get(state, {})
+
+
+def resolve(state: Optional[str], action: str) -> Transition:
+    """
+    Look up the transition for applying an action in a state.
+
+    Args:
+        state: Current request status
+        action: Action to apply
+
+    Returns:
+        Transition: Target state and balance effect
+
+    Raises:
+        ValueError: If the action is not allowed from the state
+    """
+    transition = _COMPILED.get(state, {}).get(action)
+    if transition is None:
+        sources = [s for (s, a) in TRANSITIONS if a == action and s is not None]
+        verb = _PAST_TENSE.get(action, action)
+        if sources:
+            raise ValueError(f"Only {' or '.join(sources)} requests can be {verb}")
+        raise ValueError(f"Requests cannot be {verb} from status '{state}'")
+    return transition
+
+
+def affects_balance(effect: Optional[str], pto_type: str) -> bool:
+    """Check whether a balance effect changes any balance field for a PTO type."""
+    if effect is None or pto_type not in _PTO_TYPE_FIELDS:
+        return False
+    pending_field, _ = _PTO_TYPE_FIELDS[pto_type]
+    return effect == BalanceEffect.COMMIT or pending_field is not None
+
+
+def apply_balance_effect(balance: PTOBalance, effect: Optional[str], pto_type: str, minutes: int) -> None:
+    """
+    Apply a transition's balance effect to a balance row (without committing).
+
+    Args:
+        balance: Balance for the request's year
+        effect: One of the BalanceEffect values, or None
+        pto_type: Type of the request
+        minutes: Duration requested, in minutes
+    """
+    if not affects_balance(effect, pto_type):
+        return
+
+    pending_field, used_field = _PTO_TYPE_FIELDS[pto_type]
+    if effect == BalanceEffect.RESERVE:
+        setattr(balance, pending_field, getattr(balance, pending_field) + minutes)
+    elif effect == BalanceEffect.RELEASE:
+        setattr(balance, pending_field, getattr(balance, pending_field) - minutes)
+    elif effect == BalanceEffect.COMMIT:
+        if pending_field is not None:
+            setattr(balance, pending_field, getattr(balance, pending_field) - minutes)
+        setattr(balance, used_field, getattr(balance, used_field) + minutes)
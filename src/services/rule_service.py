@@ -0,0 +1,423 @@
+"""
+Department rules engine for the PTO and Market Calendar System.
+
+Blackout periods and coverage rules (see DepartmentRule) are read once and
+compiled into a RuleBook: one IntervalIndex of rule date ranges per
+department, plus one for company-wide rules. Checking a request is then an
+O(log n + k) lookup of the k rules overlapping its dates. Only when a
+coverage rule matches does the check count the colleagues with approved
+time off on each of the request's days, with one range query and a
+difference array.
+
+Rules apply to the market-open days of a request (weekdays that are not
+holidays of the primary market). Sick leave is never blocked.
+
+The rule book also carries the active auto-approval rules (see
+AutoApprovalService), and the approval chain steps and delegations (see
+ApprovalService) with one IntervalIndex of delegation ranges per delegator,
+so all of them are loaded and invalidated together.
+"""
+import threading
+import time
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..config import get_config
+from ..models.department import Department
+from ..models.approval_delegation import ApprovalDelegation
+from ..models.approval_step import ApprovalStep
+from ..models.auto_approval_rule import AutoApprovalRule
+from ..models.department_rule import DepartmentRule, RuleKind
+from ..models.market_holiday import MarketHoliday
+from ..models.pto_request import PTORequest, RequestStatus
+from ..models.user import User
+from ..schemas.rule_schemas import DepartmentRuleCreate
+from ..utils import lazy
+from ..utils.intervals import IntervalIndex
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# PTO types rules never block
+EXEMPT_PTO_TYPES = ('sick',)
+
+# Days listed in a violation message before summarizing the rest
+MAX_LISTED_DAYS = 3
+
+
+class CompiledRule(NamedTuple):
+    """A rule as held by the rule book; open-ended ranges use date.min and date.max."""
+    id: int
+    department_id: Optional[int]
+    kind: str
+    name: str
+    start_date: date
+    end_date: date
+    value: Optional[int]
+
+
+class CompiledAutoApproval(NamedTuple):
+    """An auto-approval rule as held by the rule book."""
+    id: int
+    name: str
+    department_id: Optional[int]
+    pto_type: Optional[str]
+    max_duration_minutes: Optional[int]
+    min_headroom_minutes: Optional[int]
+    max_colleagues_out: Optional[int]
+    allow_blackout: bool
+
+
+class CompiledApprovalStep(NamedTuple):
+    """An approval chain step as held by the rule book."""
+    id: int
+    name: str
+    department_id: Optional[int]
+    level: int
+    over_duration_minutes: int
+    approver_id: int
+
+
+class RuleViolation(NamedTuple):
+    """A rule a request would break, and the days it would break it on."""
+    rule_id: int
+    kind: str
+    message: str
+    days: List[date]
+
+
+class RuleBook(NamedTuple):
+    """Active rules at one version, indexed by department (None: company-wide)."""
+    version: int
+    built_at: float
+    indexes: Dict[Optional[int], IntervalIndex]
+    auto_approvals: Tuple[CompiledAutoApproval, ...]  # in priority order
+    approval_steps: Tuple[CompiledApprovalStep, ...]  # in level order
+    delegations: Dict[int, IntervalIndex]             # delegator -> ranges of delegate IDs
+
+    def rules_for(self, department_id: Optional[int], start_date: date, end_date: date) -> List[CompiledRule]:
+        """
+        Get the rules applying to a department on any day of a date range.
+
+        Args:
+            department_id: Department, or None for company-wide rules only
+            start_date: First day of the range
+            end_date: Last day of the range
+
+        Returns:
+            List[CompiledRule]: Company-wide rules first, then the department's
+        """
+        found: List[CompiledRule] = []
+        for key in (None, department_id) if department_id is not None else (None,):
+            index = self.indexes.get(key)
+            if index is not None:
+                found.extend(index.overlapping(start_date, end_date))
+        return found
+
+    def auto_approvals_for(self, department_id: Optional[int]) -> List[CompiledAutoApproval]:
+        """Get the auto-approval rules applying to a department, in priority order."""
+        return [rule for rule in self.auto_approvals
+                if rule.department_id is None or rule.department_id == department_id]
+
+    def approval_steps_for(self, department_id: Optional[int], duration_minutes: int) -> List[CompiledApprovalStep]:
+        """Get the chain steps a request of a department and duration needs, in level order."""
+        return [step for step in self.approval_steps
+                if (step.department_id is None or step.department_id == department_id)
+                and duration_minutes > step.over_duration_minutes]
+
+    def delegates_of(self, user_id: int, day: date) -> List[int]:
+        """Get the users deciding in an approver's place on a day."""
+        index = self.delegations.get(user_id)
+        return index.overlapping(day, day) if index is not None else []
+
+
+class RuleCache:
+    """
+    Versioned, process-wide cache of the compiled rule book.
+
+    RuleService bumps the version after every rule change; changes made
+    by other processes show up once the book is older than ``max_age_seconds``.
+
+    Args:
+        max_age_seconds: Rebuild a book older than this even if the version
+            is unchanged
+    """
+
+    def __init__(self, max_age_seconds: float = 300.0) -> None:
+        self.max_age_seconds = max_age_seconds
+        self._version = 0
+        self._book: Optional[RuleBook] = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Version of the rules, bumped by every rule change in this process."""
+        return self._version
+
+    def invalidate(self) -> None:
+        """Bump the version so the next lookup recompiles the rules."""
+        with self._lock:
+            self._version += 1
+
+    def get(self, db: Session) -> RuleBook:
+        """
+        Get the current rule book, recompiling it if a rule changed since.
+
+        Args:
+            db: Session used only when the book has to be rebuilt
+
+        Returns:
+            RuleBook: The current book
+        """
+        book = self._book
+        version = self._version
+        if (book is not None and book.version == version
+                and time.monotonic() - book.built_at < self.max_age_seconds):
+            return book
+
+        book = self._build(db, version)
+        with self._lock:
+            if self._book is None or self._book.version <= version:
+                self._book = book
+        return book
+
+    @staticmethod
+    def _build(db: Session, version: int) -> RuleBook:
+        grouped: Dict[Optional[int], list] = {}
+        stmt = select(
+            DepartmentRule.id, DepartmentRule.department_id, DepartmentRule.kind, DepartmentRule.name,
+            DepartmentRule.start_date, DepartmentRule.end_date, DepartmentRule.value
+        ).where(DepartmentRule.is_active == True)
+        for rule_id, department_id, kind, name, start_date, end_date, value in db.execute(stmt):
+            rule = CompiledRule(rule_id, department_id, kind, name,
+                                start_date or date.min, end_date or date.max, value)
+            grouped.setdefault(department_id, []).append((rule.start_date, rule.end_date, rule))
+        indexes = {department_id: IntervalIndex(intervals) for department_id, intervals in grouped.items()}
+        auto_approvals = tuple(CompiledAutoApproval._make(row) for row in db.execute(select(
+            AutoApprovalRule.id, AutoApprovalRule.name, AutoApprovalRule.department_id, AutoApprovalRule.pto_type,
+            AutoApprovalRule.max_duration_minutes, AutoApprovalRule.min_headroom_minutes,
+            AutoApprovalRule.max_colleagues_out, AutoApprovalRule.allow_blackout
+        ).where(AutoApprovalRule.is_active == True).order_by(AutoApprovalRule.priority, AutoApprovalRule.id)))
+        approval_steps = tuple(CompiledApprovalStep._make(row) for row in db.execute(select(
+            ApprovalStep.id, ApprovalStep.name, ApprovalStep.department_id, ApprovalStep.level,
+            ApprovalStep.over_duration_minutes, ApprovalStep.approver_id
+        ).where(ApprovalStep.is_active == True).order_by(ApprovalStep.level, ApprovalStep.id)))
+        delegated: Dict[int, list] = {}
+        for delegator_id, delegate_id, start_date, end_date in db.execute(select(
+            ApprovalDelegation.delegator_id, ApprovalDelegation.delegate_id,
+            ApprovalDelegation.start_date, ApprovalDelegation.end_date
+        ).where(ApprovalDelegation.is_active == True, ApprovalDelegation.end_date >= date.today())):
+            delegated.setdefault(delegator_id, []).append((start_date, end_date, delegate_id))
+        delegations = {user_id: IntervalIndex(intervals) for user_id, intervals in delegated.items()}
+        return RuleBook(version, time.monotonic(), indexes, auto_approvals, approval_steps, delegations)
+
+
+# Global rule book shared by all sessions
+rule_cache = RuleCache()
+
+
+def _describe_days(days: Sequence[date]) -> str:
+    listed = ", ".join(f"{day:%a %b %d}" for day in days[:MAX_LISTED_DAYS])
+    if len(days) > MAX_LISTED_DAYS:
+        listed += f" and {len(days) - MAX_LISTED_DAYS} more"
+    return listed
+
+
+class RuleService:
+    """
+    Service class for department rules and checking requests against them.
+    """
+
+    def __init__(self, db: Session) -> None:
+        """
+        Initialize the RuleService with a database session.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+
+    def create_rule(self, rule_data: DepartmentRuleCreate) -> DepartmentRule:
+        """
+        Create a department rule.
+
+        Args:
+            rule_data: Rule creation data
+
+        Returns:
+            DepartmentRule: The created rule
+
+        Raises:
+            ValueError: If the department does not exist
+        """
+        if rule_data.department_id is not None and self.db.get(Department, rule_data.department_id) is None:
+            raise ValueError(f"Department with ID {rule_data.department_id} not found")
+        rule = DepartmentRule(**rule_data.model_dump())
+        self.db.add(rule)
+        self.db.commit()
+        self.db.refresh(rule)
+        rule_cache.invalidate()
+        return rule
+
+    def deactivate_rule(self, rule_id: int) -> bool:
+        """
+        Stop enforcing a department rule.
+
+        Args:
+            rule_id: ID of the rule
+
+        Returns:
+            bool: True if the rule was found, False otherwise
+        """
+        rule = self.db.get(DepartmentRule, rule_id)
+        if rule is None:
+            return False
+        rule.is_active = False
+        self.db.commit()
+        rule_cache.invalidate()
+        return True
+
+    def list_rules(self, department_id: Optional[int] = None) -> List[DepartmentRule]:
+        """
+        List active rules, company-wide ones included.
+
+        Args:
+            department_id: Optional department filter
+
+        Returns:
+            List[DepartmentRule]: Rules ordered by start date
+        """
+        stmt = select(DepartmentRule).where(DepartmentRule.is_active == True)
+        if department_id is not None:
+            stmt = stmt.where((DepartmentRule.department_id == department_id) | (DepartmentRule.department_id == None))
+        stmt = stmt.order_by(DepartmentRule.start_date, DepartmentRule.id)
+        return list(self.db.execute(stmt).scalars().all())
+
+    def check_request(
+        self,
+        user_id: int,
+        department_id: Optional[int],
+        pto_type: str,
+        start_date: date,
+        end_date: date
+    ) -> List[RuleViolation]:
+        """
+        Check a prospective request against the rules of the user's department.
+
+        Coverage rules count colleagues with approved time off; company-wide
+        coverage rules apply to each department separately and not to users
+        without a department.
+
+        Args:
+            user_id: ID of the requesting user
+            department_id: The user's department
+            pto_type: Type of PTO requested
+            start_date: First day of the request
+            end_date: Last day of the request
+
+        Returns:
+            List[RuleViolation]: Broken rules, empty if the request is allowed
+        """
+        if pto_type in EXEMPT_PTO_TYPES or start_date > end_date:
+            return []
+        rules = rule_cache.get(self.db).rules_for(department_id, start_date, end_date)
+        if department_id is None:
+            rules = [rule for rule in rules if rule.kind == RuleKind.BLACKOUT]
+        if not rules:
+            return []
+        open_days = self.market_open_days(start_date, end_date)
+
+        absent = members = None
+        if any(rule.kind in RuleKind.COUNTS for rule in rules):
+            absent = self.department_absences(department_id, start_date, (end_date - start_date).days + 1, user_id)
+            members = self.db.execute(select(func.count(User.id)).where(
+                User.department_id == department_id, User.is_active == True
+            )).scalar()
+
+        violations = []
+        for rule in rules:
+            days = [day for day in open_days if rule.start_date <= day <= rule.end_date]
+            if rule.kind == RuleKind.BLACKOUT:
+                broken = days
+            elif rule.kind == RuleKind.MAX_ABSENT:
+                broken = [day for day in days if absent[(day - start_date).days] + 1 > rule.value]
+            else:
+                broken = [day for day in days if members - absent[(day - start_date).days] - 1 < rule.value]
+            if broken:
+                violations.append(RuleViolation(rule.id, rule.kind, self._message(rule, broken, department_id), broken))
+        return violations
+
+    def department_absences(
+        self,
+        department_id: Optional[int],
+        first_day: date,
+        days: int,
+        exclude_user_id: Optional[int] = None,
+        statuses: Sequence[str] = (RequestStatus.APPROVED,)
+    ) -> "np.ndarray":
+        """
+        Count a department's active members with time off on each day.
+
+        Args:
+            department_id: Department, or None for no department (all zeros)
+            first_day: First day counted
+            days: Number of days counted
+            exclude_user_id: User left out of the counts (the requester)
+            statuses: Request statuses counted, approved only by default
+
+        Returns:
+            np.ndarray: Absences per day, index 0 being first_day
+        """
+        np = lazy.numpy()
+        diff = np.zeros(days + 1, dtype=np.int32)
+        if department_id is None:
+            return diff[:days]
+        last_day = first_day + timedelta(days=days - 1)
+        stmt = select(PTORequest.start_date, PTORequest.end_date).join(User, User.id == PTORequest.user_id).where(
+            User.department_id == department_id,
+            User.is_active == True,
+            PTORequest.status.in_(statuses),
+            PTORequest.start_date <= last_day,
+            PTORequest.end_date >= first_day
+        )
+        if exclude_user_id is not None:
+            stmt = stmt.where(User.id != exclude_user_id)
+        for start, end in self.db.execute(stmt):
+            diff[max((start - first_day).days, 0)] += 1
+            diff[min((end - first_day).days, days - 1) + 1] -= 1
+        return np.cumsum(diff)[:days]
+
+    def market_open_days(self, start_date: date, end_date: date) -> List[date]:
+        """
+        List the weekdays of a range that are not primary-market holidays.
+
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range
+
+        Returns:
+            List[date]: Market-open days in order
+        """
+        holidays = set(self.db.execute(select(MarketHoliday.holiday_date).where(
+            MarketHoliday.market == get_config().PRIMARY_MARKET,
+            MarketHoliday.is_observed == True,
+            MarketHoliday.holiday_date.between(start_date, end_date)
+        )).scalars())
+        days = (start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1))
+        return [day for day in days if day.weekday() < 5 and day not in holidays]
+
+    def _message(self, rule: CompiledRule, days: List[date], department_id: Optional[int]) -> str:
+        if rule.kind == RuleKind.BLACKOUT:
+            return (f"{rule.name}: no time off from {rule.start_date:%b %d, %Y} to {rule.end_date:%b %d, %Y} "
+                    f"(affects {_describe_days(days)})")
+        department = self.db.execute(
+            select(Department.name).where(Department.id == department_id)
+        ).scalar() or "the department"
+        if rule.kind == RuleKind.MAX_ABSENT:
+            return (f"{rule.name}: at most {rule.value} of {department} may be out at once; "
+                    f"that limit is already reached on {_describe_days(days)}")
+        return (f"{rule.name}: {department} needs at least {rule.value} people in on market-open days; "
+                f"taking {_describe_days(days)} off would leave fewer")
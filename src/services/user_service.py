@@ -1,12 +1,16 @@
 """
 User service for managing user operations.
 """
+import time
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from ..models.user import User
+from ..observability.metrics import BCRYPT_SECONDS, LOGIN_ATTEMPTS, LOGIN_SUCCESSES
+from ..schemas.read_models import EMPLOYEE_LIST_COLUMNS, EmployeeListItem
 from ..schemas.user_schemas import UserCreate, UserUpdate, UserPasswordChange
 from ..utils.password import hash_password, verify_password
+from .directory_cache import directory_cache
 
 
 class UserService:
@@ -65,6 +69,7 @@ class UserService:
         
         self.db.add(user)
         self.db.commit()
+        directory_cache.invalidate()
         self.db.refresh(user)
         return user
     
@@ -127,6 +132,47 @@ class UserService:
         stmt = stmt.offset(skip).limit(limit)
         return list(self.db.execute(stmt).scalars().all())
     
+    def list_users(self, skip: int = 0, limit: int = 100, active_only: bool = False) -> List[EmployeeListItem]:
+        """
+        List users as lightweight rows for admin tables.
+        
+        Args:
+            skip: Number of records to skip (for pagination)
+            limit: Maximum number of records to return
+            active_only: If True, only return active users
+            
+        Returns:
+            List of EmployeeListItem rows ordered by last name, first name
+        """
+        stmt = select(*EMPLOYEE_LIST_COLUMNS)
+        
+        if active_only:
+            stmt = stmt.where(User.is_active == True)
+        
+        stmt = stmt.order_by(User.last_name, User.first_name, User.id).offset(skip).limit(limit)
+        return list(map(EmployeeListItem._make, self.db.execute(stmt)))
+    
+    def page_users(self, after_id: Optional[int] = None, limit: int = 100,
+                   active_only: bool = False) -> List[EmployeeListItem]:
+        """
+        List users in ID order, one keyset page at a time.
+        
+        Args:
+            after_id: Return users with an ID above this (the previous page's last)
+            limit: Maximum number of records to return
+            active_only: If True, only return active users
+            
+        Returns:
+            List of EmployeeListItem rows ordered by ID
+        """
+        stmt = select(*EMPLOYEE_LIST_COLUMNS)
+        if after_id is not None:
+            stmt = stmt.where(User.id > after_id)
+        if active_only:
+            stmt = stmt.where(User.is_active == True)
+        stmt = stmt.order_by(User.id).limit(limit)
+        return list(map(EmployeeListItem._make, self.db.execute(stmt)))
+    
     @staticmethod
     def get_users_by_role(db: Session, role: str) -> List[User]:
         """
@@ -172,6 +218,7 @@ class UserService:
             setattr(user, field, value)
         
         self.db.commit()
+        directory_cache.invalidate()
         self.db.refresh(user)
         return user
     
@@ -191,6 +238,7 @@ class UserService:
         
         user.is_active = False
         self.db.commit()
+        directory_cache.invalidate()
         return True
     
     def authenticate_user(self, username: str, password: str) -> Optional[User]:
@@ -204,11 +252,16 @@ class UserService:
         Returns:
             User instance if authentication successful, None otherwise
         """
+        LOGIN_ATTEMPTS.inc()
         user = self.get_user_by_username(username)
         if not user:
             return None
         
-        if verify_password(password, user.password_hash):
+        started = time.perf_counter()
+        verified = verify_password(password, user.password_hash)
+        BCRYPT_SECONDS.observe(time.perf_counter() - started)
+        if verified:
+            LOGIN_SUCCESSES.inc()
             return user
         
         return None
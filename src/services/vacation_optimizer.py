@@ -0,0 +1,224 @@
+"""
+Holiday-bridging vacation suggestions for the PTO and Market Calendar System.
+
+The optimizer looks for the vacation windows that give the most consecutive
+days off per vacation day spent: a day or two placed next to a weekend and
+a market holiday turns into a long weekend. A year (plus a week on either
+side, so New Year bridges are seen) becomes two boolean arrays over its
+days: ``free`` (weekends and the market's observed holidays) and
+``bookable`` (working days the user could take off). A window of ``k``
+vacation days is ``k`` consecutive non-free days, all bookable; its days off
+run from just after the previous non-free day to just before the next one.
+For each ``k`` the spans of every such window come from one vectorized
+difference over the positions of the non-free days, so a whole year is
+searched in well under a millisecond per ``k``.
+
+A working day is not bookable when it is in the past, outside the year,
+already covered by one of the user's pending or approved requests, inside
+a blackout of the user's department, or when the department's coverage
+rules (see RuleService) or ``max_absent`` leave no room for one more
+person out. Windows must also fit the projected balance at their start
+(see ForecastService).
+"""
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..config import get_config
+from ..database import read_only
+from ..models.department_rule import RuleKind
+from ..models.market_holiday import MarketHoliday
+from ..models.pto_request import PTORequest, RequestStatus
+from ..models.user import User
+from ..utils import lazy
+from ..utils.pto_units import MINUTES_PER_DAY
+from .forecast_service import ForecastService
+from .rule_service import RuleService, rule_cache
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Days beyond the year whose weekends and holidays still extend a window
+MARGIN_DAYS = 7
+
+
+class VacationWindow(NamedTuple):
+    """A suggested stretch of time off and the vacation days it costs."""
+    start: date         # first day off
+    end: date           # last day off
+    pto_start: date     # first vacation day to request
+    pto_end: date       # last vacation day to request
+    pto_days: int       # vacation days spent (working days in pto_start..pto_end)
+
+    @property
+    def days_off(self) -> int:
+        """Consecutive calendar days off."""
+        return (self.end - self.start).days + 1
+
+    @property
+    def efficiency(self) -> float:
+        """Days off per vacation day spent."""
+        return self.days_off / self.pto_days
+
+
+class VacationOptimizer:
+    """
+    Service class suggesting vacation windows that bridge weekends and market holidays.
+    """
+
+    def __init__(self, db: Session) -> None:
+        """
+        Initialize the VacationOptimizer with a database session.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+        self.forecast_service = ForecastService(db)
+        self.rule_service = RuleService(db)
+
+    @read_only(pin='user_id')
+    def suggest(
+        self,
+        user_id: int,
+        year: int,
+        limit: int = 5,
+        max_pto_days: int = 10,
+        min_days_off: int = 1,
+        max_absent: Optional[int] = None,
+        today: Optional[date] = None
+    ) -> List[VacationWindow]:
+        """
+        Find the vacation windows with the most days off per vacation day.
+
+        Windows are ranked by days off per vacation day, then by length,
+        then by date, and do not overlap each other.
+
+        Args:
+            user_id: ID of the user
+            year: Calendar year the vacation days are taken in
+            limit: Maximum number of windows
+            max_pto_days: Longest window to consider, in vacation days
+            min_days_off: Shortest window to suggest, in calendar days off
+            max_absent: Extra cap on department members out on the same day, on top of the rules
+            today: First day that may be booked, defaults to today
+
+        Returns:
+            List[VacationWindow]: Suggested windows, best first
+
+        Raises:
+            ValueError: If the user does not exist
+        """
+        np = lazy.numpy()
+        user = self.db.execute(select(User.id, User.department_id).where(User.id == user_id)).one_or_none()
+        if user is None:
+            raise ValueError(f"User with ID {user_id} not found")
+        today = today or date.today()
+        first_day = max(date(year, 1, 1), today)
+        last_day = date(year, 12, 31)
+        if first_day > last_day:
+            return []
+
+        origin = date(year, 1, 1) - timedelta(days=MARGIN_DAYS)
+        n = (last_day - origin).days + 1 + MARGIN_DAYS
+        # date.fromordinal(1) is a Monday
+        weekdays = (np.arange(origin.toordinal(), origin.toordinal() + n) - 1) % 7
+        free = weekdays >= 5
+        for holiday in self._holidays(origin, origin + timedelta(days=n - 1)):
+            free[(holiday - origin).days] = True
+
+        bookable = ~free
+        bookable[:(first_day - origin).days] = False
+        bookable[(last_day - origin).days + 1:] = False
+        for start, end in self._own_requests(user_id, origin, last_day):
+            bookable[max((start - origin).days, 0):(end - origin).days + 1] = False
+        blackouts, caps = self._rule_days(user.department_id, origin, n)
+        bookable &= ~blackouts
+        if max_absent is not None:
+            caps = np.minimum(caps, max_absent)
+        if (caps < n).any():
+            absent = self.rule_service.department_absences(user.department_id, origin, n, user_id)
+            bookable &= absent < caps
+
+        # Whole vacation days a window starting on each day may use: the
+        # lowest projected balance from its month to the end of the year
+        forecast = self.forecast_service.forecast([user_id], first_day, 13 - first_day.month)
+        lowest = np.minimum.accumulate(forecast.available[0][::-1])[::-1]
+        budget = np.zeros(n, dtype=int)
+        for offset, month_end in enumerate(forecast.months):
+            month_start = max(month_end.replace(day=1), first_day)
+            budget[(month_start - origin).days:(month_end - origin).days + 1] = int(lowest[offset] // MINUTES_PER_DAY)
+
+        # Non-free positions with sentinels at both ends
+        positions = np.concatenate(([-1], np.flatnonzero(~free), [n]))
+        blocked = np.concatenate(([0], np.cumsum(~bookable[positions[1:-1]])))
+        candidates = []
+        for k in range(1, min(max_pto_days, len(positions) - 2) + 1):
+            starts = positions[1:len(positions) - k]                 # first vacation day of each window
+            spans = positions[k + 1:] - positions[:-(k + 1)] - 1      # days off of each window
+            valid = ((blocked[k:] - blocked[:-k]) == 0) & (spans >= min_days_off)
+            valid &= budget[starts] >= k
+            for i in np.flatnonzero(valid):
+                candidates.append((spans[i] / k, int(spans[i]), -int(positions[i + 1]), k, int(i)))
+        candidates.sort(reverse=True)
+
+        windows: List[VacationWindow] = []
+        taken = np.zeros(n, dtype=bool)
+        for _, span, _, k, i in candidates:
+            lo, hi = positions[i] + 1, positions[i + k + 1] - 1
+            if taken[lo:hi + 1].any():
+                continue
+            taken[lo:hi + 1] = True
+            windows.append(VacationWindow(
+                start=origin + timedelta(days=int(lo)),
+                end=origin + timedelta(days=int(hi)),
+                pto_start=origin + timedelta(days=int(positions[i + 1])),
+                pto_end=origin + timedelta(days=int(positions[i + k])),
+                pto_days=k
+            ))
+            if len(windows) == limit:
+                break
+        return windows
+
+    def _holidays(self, first_day: date, last_day: date) -> List[date]:
+        stmt = select(MarketHoliday.holiday_date).where(
+            MarketHoliday.market == get_config().PRIMARY_MARKET,
+            MarketHoliday.is_observed == True,
+            MarketHoliday.holiday_date.between(first_day, last_day)
+        )
+        return list(self.db.execute(stmt).scalars())
+
+    def _own_requests(self, user_id: int, first_day: date, last_day: date) -> List[Tuple[date, date]]:
+        stmt = select(PTORequest.start_date, PTORequest.end_date).where(
+            PTORequest.user_id == user_id,
+            PTORequest.status.in_(RequestStatus.ACTIVE),
+            PTORequest.start_date <= last_day,
+            PTORequest.end_date >= first_day
+        )
+        return [tuple(row) for row in self.db.execute(stmt)]
+
+    def _rule_days(self, department_id: Optional[int], origin: date, n: int) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Days inside blackouts, and the colleagues who may already be out each day (n: no cap)."""
+        np = lazy.numpy()
+        blackouts = np.zeros(n, dtype=bool)
+        caps = np.full(n, n, dtype=np.int64)
+        last_day = origin + timedelta(days=n - 1)
+        members = None
+        for rule in rule_cache.get(self.db).rules_for(department_id, origin, last_day):
+            lo = max((rule.start_date - origin).days, 0)
+            hi = min((rule.end_date - origin).days, n - 1)
+            if rule.kind == RuleKind.BLACKOUT:
+                blackouts[lo:hi + 1] = True
+            elif department_id is not None:
+                if rule.kind == RuleKind.MAX_ABSENT:
+                    cap = rule.value
+                else:
+                    if members is None:
+                        members = self.db.execute(select(func.count(User.id)).where(
+                            User.department_id == department_id, User.is_active == True
+                        )).scalar()
+                    cap = members - rule.value
+                caps[lo:hi + 1] = np.minimum(caps[lo:hi + 1], cap)
+        return blackouts, caps
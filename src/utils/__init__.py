@@ -1,4 +1,7 @@
 """Utility functions for the PTO and Market Calendar System."""
 from .password import hash_password, verify_password
+from .concurrency import ConcurrentUpdateError, retry_on_conflict
+from .pto_units import DayPart, days_to_minutes, minutes_to_days
 
-__all__ = ['hash_password', 'verify_password']
+__all__ = ['hash_password', 'verify_password', 'ConcurrentUpdateError', 'retry_on_conflict',
+           'DayPart', 'days_to_minutes', 'minutes_to_days']
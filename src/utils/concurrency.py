@@ -0,0 +1,55 @@
+"""
+Optimistic concurrency helpers for the PTO and Market Calendar System.
+"""
+import time
+from typing import Callable, Tuple, Type, TypeVar
+
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+T = TypeVar('T')
+
+
+class ConcurrentUpdateError(ValueError):
+    """Raised when a row kept changing underneath us and retries ran out."""
+
+
+def retry_on_conflict(
+    db: Session,
+    operation: Callable[[], T],
+    attempts: int = 3,
+    backoff: float = 0.02,
+    conflicts: Tuple[Type[Exception], ...] = (StaleDataError,)
+) -> T:
+    """
+    Run a unit of work, retrying it when a versioned row was changed concurrently.
+    
+    The operation must re-read whatever it validates (status, balances) on every
+    call. After a conflict the session is rolled back, which expires all loaded
+    state, so the next attempt sees the committed winner's changes and can
+    re-check its preconditions instead of double-applying them.
+    
+    Args:
+        db: Session the operation works in
+        operation: Callable performing the reads, checks, writes and commit
+        attempts: Maximum number of attempts
+        backoff: Base delay in seconds, multiplied by the attempt number
+        conflicts: Exception types that signal a lost race (e.g. IntegrityError
+            for operations that insert a row keyed by a unique constraint)
+        
+    Returns:
+        The operation's return value
+        
+    Raises:
+        ConcurrentUpdateError: If every attempt hit a version conflict
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return operation()
+        except conflicts:
+            db.rollback()
+            if attempt == attempts:
+                raise ConcurrentUpdateError(
+                    "The record was modified by another user, please try again"
+                )
+            time.sleep(backoff * attempt)
@@ -0,0 +1,74 @@
+"""
+Static interval index for the PTO and Market Calendar System.
+
+Rules with date ranges are loaded once and then queried for every request,
+so they are compiled into an augmented interval tree kept implicitly in
+arrays: intervals sorted by start, with the midpoint of each index range as
+that subtree's root, which also records the largest end in its subtree.
+A query skips every subtree ending before the searched range and stops
+descending right once starts pass its end, so it touches O(log n + k)
+nodes for k matches.
+"""
+from typing import Any, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class IntervalIndex(Generic[T]):
+    """
+    Immutable index of closed intervals answering overlap queries.
+
+    Args:
+        intervals: (start, end, value) triples; bounds may be any mutually
+            comparable values, such as dates
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[Any, Any, T]]) -> None:
+        items = sorted(intervals, key=lambda item: (item[0], item[1]))
+        self._starts = [start for start, _, _ in items]
+        self._ends = [end for _, end, _ in items]
+        self._values: List[T] = [value for _, _, value in items]
+        self._max_end = list(self._ends)
+        self._build(0, len(items))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def overlapping(self, start: Any, end: Any) -> List[T]:
+        """
+        Get the values of all intervals overlapping [start, end].
+
+        Args:
+            start: First point of the range
+            end: Last point of the range
+
+        Returns:
+            List[T]: Values in order of interval start
+        """
+        found: List[T] = []
+        self._query(0, len(self._values), start, end, found)
+        return found
+
+    def _build(self, lo: int, hi: int) -> Optional[Any]:
+        """Fill in the largest end of the subtree over [lo, hi) and return it."""
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        largest = self._ends[mid]
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and child > largest:
+                largest = child
+        self._max_end[mid] = largest
+        return largest
+
+    def _query(self, lo: int, hi: int, start: Any, end: Any, found: List[T]) -> None:
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self._max_end[mid] < start:
+            return
+        self._query(lo, mid, start, end, found)
+        if self._starts[mid] <= end:
+            if self._ends[mid] >= start:
+                found.append(self._values[mid])
+            self._query(mid + 1, hi, start, end, found)
@@ -0,0 +1,25 @@
+"""
+Accessors for heavy third-party modules in the PTO and Market Calendar System.
+
+NumPy and pandas each add tens of milliseconds to interpreter start-up.
+Modules that only need them inside a few functions call these accessors at
+the point of use instead of importing at module level, so app start-up and
+test collection do not pay for code paths that are never hit.
+"""
+import importlib
+from types import ModuleType
+
+
+def _load(name: str) -> ModuleType:
+    """Import a module by name (sys.modules makes repeat calls cheap)."""
+    return importlib.import_module(name)
+
+
+def numpy() -> ModuleType:
+    """Get the numpy module, importing it on first use."""
+    return _load('numpy')
+
+
+def pandas() -> ModuleType:
+    """Get the pandas module, importing it on first use."""
+    return _load('pandas')
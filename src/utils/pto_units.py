@@ -0,0 +1,151 @@
+"""
+Fixed-point PTO quantities for the PTO and Market Calendar System.
+
+All request durations and balances are stored and summed as integer minutes
+of an 8-hour workday. Days as Decimal only appear at the edges: parsing user
+input and formatting values for display.
+"""
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional, Union
+
+MINUTES_PER_HOUR = 60
+HOURS_PER_DAY = 8
+MINUTES_PER_DAY = MINUTES_PER_HOUR * HOURS_PER_DAY
+MINUTES_PER_HALF_DAY = MINUTES_PER_DAY // 2
+QUARTER_HOUR = 15
+
+Number = Union[int, float, str, Decimal]
+
+
+class DayPart:
+    """Granularity of a PTO request."""
+    FULL = "full"
+    AM = "am"
+    PM = "pm"
+    HOURS = "hours"
+
+    ALL = (FULL, AM, PM, HOURS)
+    LABELS = {
+        FULL: "Full day(s)",
+        AM: "Half day (AM)",
+        PM: "Half day (PM)",
+        HOURS: "Hours",
+    }
+
+
+def days_to_minutes(days: Number) -> int:
+    """
+    Convert a day quantity to integer workday minutes.
+
+    Args:
+        days: Number of days (may be fractional)
+
+    Returns:
+        int: Minutes, rounded half-up to the nearest minute
+    """
+    minutes = Decimal(str(days)) * MINUTES_PER_DAY
+    return int(minutes.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def minutes_to_days(minutes: int) -> Decimal:
+    """
+    Convert integer workday minutes to days for display.
+
+    Args:
+        minutes: Number of minutes
+
+    Returns:
+        Decimal: Days rounded to two places
+    """
+    return (Decimal(minutes) / MINUTES_PER_DAY).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def hours_to_minutes(hours: Number) -> int:
+    """
+    Convert an hour quantity to minutes, requiring quarter-hour granularity.
+
+    Args:
+        hours: Number of hours
+
+    Returns:
+        int: Minutes
+
+    Raises:
+        ValueError: If the value is not a positive multiple of a quarter hour
+    """
+    minutes = Decimal(str(hours)) * MINUTES_PER_HOUR
+    if minutes <= 0 or minutes != minutes.to_integral_value() or int(minutes) % QUARTER_HOUR:
+        raise ValueError("Hours must be a positive multiple of 0.25")
+    return int(minutes)
+
+
+def business_days(start_date: date, end_date: date) -> int:
+    """
+    Count weekdays between two dates, inclusive.
+
+    Args:
+        start_date: First day
+        end_date: Last day
+
+    Returns:
+        int: Number of Monday-Friday days in the range
+    """
+    if end_date < start_date:
+        return 0
+    total = (end_date - start_date).days + 1
+    full_weeks, remainder = divmod(total, 7)
+    count = full_weeks * 5
+    for offset in range(remainder):
+        if (start_date + timedelta(days=full_weeks * 7 + offset)).weekday() < 5:
+            count += 1
+    return count
+
+
+def request_minutes(
+    start_date: date,
+    end_date: date,
+    day_part: str = DayPart.FULL,
+    hours: Optional[Number] = None,
+    total_days: Optional[Number] = None
+) -> int:
+    """
+    Compute the duration of a request in minutes.
+
+    Full-day requests use an explicit day count when one is given (callers
+    that already excluded holidays) and otherwise count weekdays. Half-day
+    and hourly requests must cover a single date.
+
+    Args:
+        start_date: First day of the request
+        end_date: Last day of the request
+        day_part: One of the DayPart values
+        hours: Hours requested, for hourly requests
+        total_days: Optional explicit day count for full-day requests
+
+    Returns:
+        int: Duration in minutes
+
+    Raises:
+        ValueError: If the combination of fields is invalid
+    """
+    if day_part not in DayPart.ALL:
+        raise ValueError(f"Unknown day part '{day_part}'")
+
+    if day_part == DayPart.FULL:
+        if total_days is not None:
+            return days_to_minutes(total_days)
+        return business_days(start_date, end_date) * MINUTES_PER_DAY
+
+    if start_date != end_date:
+        raise ValueError("Half-day and hourly requests must start and end on the same date")
+
+    if day_part in (DayPart.AM, DayPart.PM):
+        return MINUTES_PER_HALF_DAY
+
+    if hours is None:
+        raise ValueError("Hours are required for hourly requests")
+    minutes = hours_to_minutes(hours)
+    if minutes > MINUTES_PER_DAY:
+        raise ValueError(f"Hourly requests cannot exceed {HOURS_PER_DAY} hours")
+    return minutes
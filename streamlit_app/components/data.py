@@ -0,0 +1,319 @@
+"""
+Cached data access for the Streamlit pages of the PTO and Market Calendar System.
+
+Streamlit reruns the whole page script on every widget change. The session
+factory lives in ``st.cache_resource`` and the read queries below in
+``st.cache_data``, so a rerun that changes nothing in the database costs no
+queries. Cache keys include a data-version token: service writes publish
+events on the event bus, which bump the token of the affected user (and the
+company-wide token), so the next rerun misses and reloads. The TTLs only
+bound staleness from writes made by other processes.
+
+``st.cache_data`` pickles what it stores, so the cached values are plain
+read-model rows (see src.schemas.read_models), never ORM instances whose
+lazy attributes would fail once detached from their session.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import calendar
+import threading
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, Hashable, Iterator, List, Optional
+
+import streamlit as st
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.database import get_sessionmaker
+from src.models.market_holiday import MarketHoliday
+from src.models.pto_request import PTORequest, RequestStatus
+from src.schemas.read_models import (
+    HOLIDAY_LIST_COLUMNS,
+    REQUEST_LIST_COLUMNS,
+    BalanceListItem,
+    HolidayListItem,
+    RequestListItem,
+)
+from src.services.balance_service import BalanceService
+from src.services.event_bus import (
+    event_bus,
+    REQUEST_SUBMITTED,
+    REQUEST_APPROVED,
+    REQUEST_ESCALATED,
+    REQUEST_DENIED,
+    REQUEST_CANCELLED,
+    BALANCE_CHANGED,
+    REMOTE_DAYS_CHANGED,
+)
+from src.services.pto_service import PTOService
+from src.services.remote_work_service import Occupancy, RemoteWorkService
+from src.services.rule_service import RuleService, RuleViolation, rule_cache
+from src.services.vacation_optimizer import VacationOptimizer, VacationWindow
+
+# Holidays only change through the seed scripts
+HOLIDAY_TTL = 24 * 60 * 60
+# Per-user and company-wide data also change in this process's services,
+# which bump the version tokens; the TTL covers other processes
+USER_DATA_TTL = 5 * 60
+MAX_ENTRIES = 1000
+
+# Version key of data spanning all users (office coverage)
+ALL_USERS = 'all'
+
+
+class DataVersions:
+    """Monotonic version tokens per user, bumped by service writes."""
+
+    def __init__(self) -> None:
+        self._versions: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def token(self, key: Hashable) -> int:
+        return self._versions.get(key, 0)
+
+    def bump(self, key: Hashable) -> None:
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+
+@st.cache_resource
+def session_factory() -> sessionmaker:
+    """The application session factory, created once per process."""
+    return get_sessionmaker()
+
+
+@st.cache_resource
+def data_versions() -> DataVersions:
+    """Version tokens, subscribed to the event bus once per process."""
+    versions = DataVersions()
+
+    def on_change(event, payload):
+        versions.bump(('user', payload['user_id']))
+        versions.bump(ALL_USERS)
+
+    for name in (REQUEST_SUBMITTED, REQUEST_APPROVED, REQUEST_ESCALATED, REQUEST_DENIED, REQUEST_CANCELLED,
+                 BALANCE_CHANGED, REMOTE_DAYS_CHANGED):
+        event_bus.subscribe(name, on_change)
+    return versions
+
+
+@contextmanager
+def session() -> Iterator[Session]:
+    """Open a session from the cached factory and close it afterwards."""
+    db = session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _user_token(user_id: int) -> int:
+    return data_versions().token(('user', user_id))
+
+
+def market_holidays(year: int, month: int) -> List[HolidayListItem]:
+    """
+    Get observed market holidays in a month.
+
+    Args:
+        year: Calendar year
+        month: Calendar month (1-12)
+
+    Returns:
+        List[HolidayListItem]: Holidays ordered by date
+    """
+    return _market_holidays(year, month)
+
+
+@st.cache_data(ttl=HOLIDAY_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def _market_holidays(year: int, month: int) -> List[HolidayListItem]:
+    first_day = date(year, month, 1)
+    last_day = date(year, month, calendar.monthrange(year, month)[1])
+    stmt = select(*HOLIDAY_LIST_COLUMNS).where(
+        MarketHoliday.holiday_date.between(first_day, last_day),
+        MarketHoliday.is_observed == True
+    ).order_by(MarketHoliday.holiday_date)
+    with session() as db:
+        return list(map(HolidayListItem._make, db.execute(stmt)))
+
+
+def user_balance(user_id: int, year: int) -> BalanceListItem:
+    """
+    Get a user's balance for a year, creating an empty one if missing.
+
+    Args:
+        user_id: ID of the user
+        year: Balance year
+
+    Returns:
+        BalanceListItem: Balance counters
+    """
+    return _user_balance(user_id, year, _user_token(user_id))
+
+
+@st.cache_data(ttl=USER_DATA_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def _user_balance(user_id: int, year: int, version: int) -> BalanceListItem:
+    with session() as db:
+        balance = BalanceService(db).get_or_create_balance(user_id, year)
+        return BalanceListItem._make(getattr(balance, name) for name in BalanceListItem._fields)
+
+
+def recent_requests(user_id: int, limit: int = 5) -> List[RequestListItem]:
+    """
+    Get a user's most recently submitted requests.
+
+    Args:
+        user_id: ID of the user
+        limit: Maximum number of requests
+
+    Returns:
+        List[RequestListItem]: Requests, newest first
+    """
+    return _recent_requests(user_id, limit, _user_token(user_id))
+
+
+@st.cache_data(ttl=USER_DATA_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def _recent_requests(user_id: int, limit: int, version: int) -> List[RequestListItem]:
+    with session() as db:
+        return PTOService(db).list_user_requests(user_id, limit=limit)
+
+
+def user_pto_for_month(user_id: int, year: int, month: int) -> List[RequestListItem]:
+    """
+    Get a user's pending and approved requests overlapping a month.
+
+    Args:
+        user_id: ID of the user
+        year: Calendar year
+        month: Calendar month (1-12)
+
+    Returns:
+        List[RequestListItem]: Requests ordered by start date
+    """
+    return _user_pto_for_month(user_id, year, month, _user_token(user_id))
+
+
+@st.cache_data(ttl=USER_DATA_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def _user_pto_for_month(user_id: int, year: int, month: int, version: int) -> List[RequestListItem]:
+    first_day = date(year, month, 1)
+    last_day = date(year, month, calendar.monthrange(year, month)[1])
+    stmt = select(*REQUEST_LIST_COLUMNS).where(
+        and_(
+            PTORequest.user_id == user_id,
+            PTORequest.status.in_(RequestStatus.ACTIVE),
+            PTORequest.start_date <= last_day,
+            PTORequest.end_date >= first_day
+        )
+    ).order_by(PTORequest.start_date)
+    with session() as db:
+        return list(map(RequestListItem._make, db.execute(stmt)))
+
+
+def remote_days(user_id: int, start_date: date, end_date: date) -> List[date]:
+    """
+    Get a user's remote days in a date range.
+
+    Args:
+        user_id: ID of the user
+        start_date: First day of the range
+        end_date: Last day of the range
+
+    Returns:
+        List[date]: Remote days in order
+    """
+    return _remote_days(user_id, start_date, end_date, _user_token(user_id))
+
+
+@st.cache_data(ttl=USER_DATA_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def _remote_days(user_id: int, start_date: date, end_date: date, version: int) -> List[date]:
+    with session() as db:
+        return RemoteWorkService(db).get_remote_days(user_id, start_date, end_date)
+
+
+def office_occupancy(start_date: date, end_date: date, department_id: Optional[int] = None) -> Occupancy:
+    """
+    Get in-office headcount for each market-open day in a range.
+
+    Args:
+        start_date: First day of the range
+        end_date: Last day of the range
+        department_id: Optional department filter
+
+    Returns:
+        Occupancy: Headcount per day
+    """
+    return _office_occupancy(start_date, end_date, department_id, data_versions().token(ALL_USERS))
+
+
+@st.cache_data(ttl=USER_DATA_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def _office_occupancy(start_date: date, end_date: date, department_id: Optional[int], version: int) -> Occupancy:
+    with session() as db:
+        return RemoteWorkService(db).office_occupancy(start_date, end_date, department_id)
+
+
+def vacation_suggestions(user_id: int, year: int, min_days_off: int = 4) -> List[VacationWindow]:
+    """
+    Get the vacation windows bridging the most weekends and market holidays.
+
+    Args:
+        user_id: ID of the user
+        year: Calendar year
+        min_days_off: Shortest window to suggest, in calendar days off
+
+    Returns:
+        List[VacationWindow]: Suggested windows, best first
+    """
+    return _vacation_suggestions(user_id, year, min_days_off, _user_token(user_id), date.today())
+
+
+@st.cache_data(ttl=USER_DATA_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def _vacation_suggestions(user_id: int, year: int, min_days_off: int, version: int,
+                          today: date) -> List[VacationWindow]:
+    with session() as db:
+        return VacationOptimizer(db).suggest(user_id, year, min_days_off=min_days_off, today=today)
+
+
+def rule_violations(user_id: int, department_id: Optional[int], pto_type: str,
+                    start_date: date, end_date: date) -> List[RuleViolation]:
+    """
+    Check a prospective request against the department's blackout and coverage rules.
+
+    Args:
+        user_id: ID of the requesting user
+        department_id: The user's department
+        pto_type: Type of PTO requested
+        start_date: First day of the request
+        end_date: Last day of the request
+
+    Returns:
+        List[RuleViolation]: Broken rules, empty if the request is allowed
+    """
+    # Rule changes publish no event; the rule book's version covers them
+    return _rule_violations(user_id, department_id, pto_type, start_date, end_date,
+                            data_versions().token(ALL_USERS), rule_cache.version)
+
+
+@st.cache_data(ttl=USER_DATA_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def _rule_violations(user_id: int, department_id: Optional[int], pto_type: str,
+                     start_date: date, end_date: date, version: int, rules_version: int) -> List[RuleViolation]:
+    with session() as db:
+        return RuleService(db).check_request(user_id, department_id, pto_type, start_date, end_date)
+
+
+def data_token(user_id: int) -> int:
+    """
+    Get the current data-version token of a user.
+
+    Pages caching derived values (such as DataFrames) include it in their
+    cache key so the values are rebuilt after the user's data changes.
+
+    Args:
+        user_id: ID of the user
+
+    Returns:
+        int: Version token, increasing with every change
+    """
+    return _user_token(user_id)
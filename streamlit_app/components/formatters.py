@@ -11,7 +11,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from typing import Optional
 import streamlit as st
 from src.models.pto_balance import PTOBalance
-from src.models.pto_request import PTORequest
+from src.models.pto_request import PTORequest, RequestStatus
 from src.models.market_holiday import MarketHoliday
 
 
@@ -138,11 +138,11 @@ def status_badge(status: str) -> str:
     """
     status_lower = status.lower()
     
-    if status_lower == "pending":
+    if status_lower == RequestStatus.PENDING:
         return '<span style="background-color: #FFA500; color: white; padding: 4px 8px; border-radius: 4px; font-size: 12px; font-weight: bold;">⏳ PENDING</span>'
-    elif status_lower == "approved":
+    elif status_lower == RequestStatus.APPROVED:
         return '<span style="background-color: #28A745; color: white; padding: 4px 8px; border-radius: 4px; font-size: 12px; font-weight: bold;">✅ APPROVED</span>'
-    elif status_lower == "denied":
+    elif status_lower == RequestStatus.DENIED:
         return '<span style="background-color: #DC3545; color: white; padding: 4px 8px; border-radius: 4px; font-size: 12px; font-weight: bold;">❌ DENIED</span>'
     else:
         return f'<span style="background-color: #6C757D; color: white; padding: 4px 8px; border-radius: 4px; font-size: 12px; font-weight: bold;">{status.upper()}</span>'
@@ -10,9 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import streamlit as st
 from datetime import datetime
-from src.database import get_db
-from src.services.balance_service import BalanceService
-from src.services.pto_service import PTOService
+from components import data
 from components.auth import is_authenticated, get_current_user
 from components.sidebar import render_sidebar
 from components.formatters import format_balance, format_pto_request
@@ -53,13 +51,9 @@ st.markdown("---")
 st.subheader("📊 PTO Balance")
 
 try:
-    # Get database session
-    db = next(get_db())
-    balance_service = BalanceService(db)
-    
     # Get current year balance
     current_year = datetime.now().year
-    balance = balance_service.get_or_create_balance(user.id, current_year)
+    balance = data.user_balance(user.id, current_year)
     
     if balance:
         format_balance(balance)
@@ -68,21 +62,14 @@ try:
         
 except Exception as e:
     st.error(f"Error loading PTO balance: {str(e)}")
-finally:
-    if 'db' in locals():
-        db.close()
 
 # Recent Requests section
 st.markdown("---")
 st.subheader("📝 Recent PTO Requests")
 
 try:
-    # Get database session
-    db = next(get_db())
-    pto_service = PTOService(db)
-    
     # Get recent requests (limit to 5)
-    recent_requests = pto_service.get_user_requests(user.id)[:5]
+    recent_requests = data.recent_requests(user.id, limit=5)
     
     if recent_requests:
         for request in recent_requests:
@@ -92,9 +79,6 @@ try:
         
 except Exception as e:
     st.error(f"Error loading PTO requests: {str(e)}")
-finally:
-    if 'db' in locals():
-        db.close()
 
 # Quick Actions section
 st.markdown("---")
@@ -11,49 +11,26 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 import streamlit as st
 from datetime import datetime, date
 from decimal import Decimal
-import pandas as pd
 from typing import Optional
 
 # Import components and services
+from components import data
 from components.auth import get_current_user, is_authenticated
 from components.sidebar import render_sidebar
+from src.schemas.read_models import BalanceListItem
 from src.services.pto_service import PTOService
-from src.services.balance_service import BalanceService
+from src.services.vacation_optimizer import VacationWindow
 from src.schemas.pto_schemas import PTORequestCreate
-from src.database import get_db
+from src.utils.pto_units import DayPart, minutes_to_days, request_minutes
 
 
-def calculate_business_days(start_date: date, end_date: date) -> int:
-    """
-    Calculate business days between two dates (excluding weekends).
-    
-    Args:
-        start_date: Start date
-        end_date: End date
-        
-    Returns:
-        Number of business days
-    """
-    # Create date range
-    date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-    
-    # Filter out weekends (Saturday=5, Sunday=6)
-    business_days = date_range[date_range.weekday < 5]
-    
-    return len(business_days)
-
-
-def display_balance_summary(balance_service: BalanceService, user_id: int) -> None:
+def display_balance_summary(balance: BalanceListItem) -> None:
     """
     Display current PTO balance summary for all types.
     
     Args:
-        balance_service: Balance service instance
-        user_id: Current user ID
+        balance: Current year balance of the user
     """
-    current_year = datetime.now().year
-    balance = balance_service.get_or_create_balance(user_id, current_year)
-    
     st.subheader("📊 Current PTO Balance Summary")
     
     col1, col2, col3 = st.columns(3)
@@ -83,29 +60,57 @@ def display_balance_summary(balance_service: BalanceService, user_id: int) -> No
         st.info(f"⏳ You have {balance.vacation_pending:.1f} vacation days pending approval")
 
 
-def get_available_balance(balance_service: BalanceService, user_id: int, pto_type: str) -> Decimal:
+def get_available_balance(balance: BalanceListItem, pto_type: str) -> int:
     """
     Get available balance for specific PTO type.
     
     Args:
-        balance_service: Balance service instance
-        user_id: Current user ID
+        balance: Current year balance of the user
         pto_type: Type of PTO ('vacation', 'sick', 'personal')
         
     Returns:
-        Available balance as Decimal
+        Available balance in minutes
     """
-    current_year = datetime.now().year
-    balance = balance_service.get_or_create_balance(user_id, current_year)
-    
     if pto_type == 'vacation':
-        return balance.vacation_available
+        return balance.vacation_available_minutes
     elif pto_type == 'sick':
-        return balance.sick_available
+        return balance.sick_available_minutes
     elif pto_type == 'personal':
-        return balance.personal_available
+        return balance.personal_available_minutes
     else:
-        return Decimal('0.00')
+        return 0
+
+
+def display_suggestions(user_id: int) -> Optional[VacationWindow]:
+    """
+    Display suggested vacation windows and let the user apply one to the form.
+    
+    Args:
+        user_id: ID of the current user
+        
+    Returns:
+        The applied suggestion, if any
+    """
+    with st.expander("💡 Suggested vacation windows"):
+        this_year = date.today().year
+        year = st.selectbox("Year", options=[this_year, this_year + 1], key="suggestion_year")
+        windows = data.vacation_suggestions(user_id, year)
+        if not windows:
+            st.info("No windows fit your remaining vacation balance this year")
+        for window in windows:
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                st.write(
+                    f"**{window.start:%a %b %d} – {window.end:%a %b %d}**: "
+                    f"{window.days_off} days off for {window.pto_days} vacation "
+                    f"day{'s' if window.pto_days != 1 else ''} "
+                    f"(book {window.pto_start:%b %d} – {window.pto_end:%b %d})"
+                )
+            with col2:
+                if st.button("Use", key=f"use_{window.pto_start}"):
+                    st.session_state["pto_suggestion"] = window
+                    st.rerun()
+    return st.session_state.get("pto_suggestion")
 
 
 def main():
@@ -135,137 +140,164 @@ def main():
     st.title("📝 Submit New PTO Request")
     st.markdown("---")
     
-    # Get database session and services
-    db = next(get_db())
-    try:
-        balance_service = BalanceService(db)
-        pto_service = PTOService(db)
+    # Widget changes rerun the page; the balance comes from the cache until
+    # a write changes it, and a session is only opened to submit
+    balance = data.user_balance(user.id, datetime.now().year)
+    
+    # Display balance summary
+    display_balance_summary(balance)
+    st.markdown("---")
+    
+    # Applying a suggestion changes the date defaults, which resets the date inputs
+    suggestion = display_suggestions(user.id)
+    default_start = suggestion.pto_start if suggestion else datetime.now().date()
+    
+    # PTO Request Form
+    with st.form("pto_request_form"):
+        st.subheader("📋 Request Details")
         
-        # Display balance summary
-        display_balance_summary(balance_service, user.id)
-        st.markdown("---")
+        col1, col2 = st.columns(2)
         
-        # PTO Request Form
-        with st.form("pto_request_form"):
-            st.subheader("📋 Request Details")
+        with col1:
+            pto_type = st.selectbox(
+                "PTO Type",
+                options=["vacation", "sick", "personal"],
+                format_func=lambda x: {
+                    "vacation": "🏖️ Vacation",
+                    "sick": "🤒 Sick Leave", 
+                    "personal": "🏠 Personal Day"
+                }[x]
+            )
             
-            col1, col2 = st.columns(2)
+            start_date = st.date_input(
+                "Start Date",
+                min_value=datetime.now().date(),
+                value=default_start
+            )
+        
+        with col2:
+            end_date = st.date_input(
+                "End Date",
+                min_value=start_date if start_date else datetime.now().date(),
+                value=suggestion.pto_end if suggestion else (start_date if start_date else datetime.now().date())
+            )
             
-            with col1:
-                pto_type = st.selectbox(
-                    "PTO Type",
-                    options=["vacation", "sick", "personal"],
-                    format_func=lambda x: {
-                        "vacation": "🏖️ Vacation",
-                        "sick": "🤒 Sick Leave", 
-                        "personal": "🏠 Personal Day"
-                    }[x]
-                )
+            # Display current balance for selected PTO type
+            available_minutes = get_available_balance(balance, pto_type)
+            available_balance = minutes_to_days(available_minutes)
+            st.info(f"Available {pto_type.title()} Balance: {available_balance:.2f} days")
+        
+        day_part = st.selectbox(
+            "Duration",
+            options=list(DayPart.ALL),
+            format_func=lambda x: DayPart.LABELS[x]
+        )
+        hours = st.number_input(
+            "Hours (hourly requests only)",
+            min_value=0.25,
+            max_value=8.0,
+            value=1.0,
+            step=0.25
+        )
+        
+        # Notes field
+        notes = st.text_area(
+            "Notes (Optional)",
+            placeholder="Add any additional information about your request...",
+            height=100
+        )
+        
+        # Calculate and display the requested duration
+        requested_minutes = 0
+        if start_date and end_date:
+            if end_date >= start_date:
+                try:
+                    # A suggestion knows which weekdays in its range are market holidays
+                    suggested = suggestion is not None and (start_date, end_date) == (suggestion.pto_start, suggestion.pto_end)
+                    requested_minutes = request_minutes(
+                        start_date, end_date, day_part,
+                        hours=hours if day_part == DayPart.HOURS else None,
+                        total_days=suggestion.pto_days if suggested else None
+                    )
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                st.info(f"📅 Total business days requested: {minutes_to_days(requested_minutes)}")
                 
-                start_date = st.date_input(
-                    "Start Date",
-                    min_value=datetime.now().date(),
-                    value=datetime.now().date()
-                )
-            
-            with col2:
-                end_date = st.date_input(
-                    "End Date",
-                    min_value=start_date if start_date else datetime.now().date(),
-                    value=start_date if start_date else datetime.now().date()
-                )
+                # Blackout periods and coverage rules of the department
+                for violation in data.rule_violations(user.id, user.department_id, pto_type, start_date, end_date):
+                    st.error(f"🚫 {violation.message}")
                 
-                # Display current balance for selected PTO type
-                available_balance = get_available_balance(balance_service, user.id, pto_type)
-                st.info(f"Available {pto_type.title()} Balance: {available_balance:.1f} days")
-            
-            # Notes field
-            notes = st.text_area(
-                "Notes (Optional)",
-                placeholder="Add any additional information about your request...",
-                height=100
-            )
-            
-            # Calculate and display total days
-            if start_date and end_date:
-                if end_date >= start_date:
-                    total_days = calculate_business_days(start_date, end_date)
-                    st.info(f"📅 Total business days requested: {total_days}")
-                    
-                    # Check balance sufficiency
-                    if pto_type == 'vacation' and total_days > available_balance:
-                        st.warning(f"⚠️ Insufficient balance! You need {total_days} days but only have {available_balance:.1f} available.")
-                else:
-                    st.error("❌ End date must be on or after start date")
-                    total_days = 0
+                # Check balance sufficiency
+                if pto_type == 'vacation' and requested_minutes > available_minutes:
+                    st.warning(f"⚠️ Insufficient balance! You need {minutes_to_days(requested_minutes)} days but only have {available_balance:.2f} available.")
             else:
-                total_days = 0
-            
-            # Submit button
-            submitted = st.form_submit_button(
-                "🚀 Submit Request",
-                type="primary",
-                use_container_width=True
-            )
-            
-            # Form validation and submission
-            if submitted:
-                # Validate dates
-                if not start_date or not end_date:
-                    st.error("❌ Please select both start and end dates")
-                elif end_date < start_date:
-                    st.error("❌ End date must be on or after start date")
-                elif total_days <= 0:
-                    st.error("❌ Request must be for at least 1 business day")
+                st.error("❌ End date must be on or after start date")
+        total_days = minutes_to_days(requested_minutes)
+        
+        # Submit button
+        submitted = st.form_submit_button(
+            "🚀 Submit Request",
+            type="primary",
+            use_container_width=True
+        )
+        
+        # Form validation and submission
+        if submitted:
+            # Validate dates
+            if not start_date or not end_date:
+                st.error("❌ Please select both start and end dates")
+            elif end_date < start_date:
+                st.error("❌ End date must be on or after start date")
+            elif requested_minutes <= 0:
+                st.error("❌ Request must cover at least part of a business day")
+            else:
+                # Check balance for vacation requests
+                if pto_type == 'vacation' and requested_minutes > available_minutes:
+                    st.error(f"❌ Insufficient vacation balance! You need {total_days} days but only have {available_balance:.2f} available.")
                 else:
-                    # Check balance for vacation requests
-                    if pto_type == 'vacation' and total_days > available_balance:
-                        st.error(f"❌ Insufficient vacation balance! You need {total_days} days but only have {available_balance:.1f} available.")
-                    else:
-                        try:
-                            # Create request data
-                            request_data = PTORequestCreate(
-                                user_id=user.id,
-                                pto_type=pto_type,
-                                start_date=start_date,
-                                end_date=end_date,
-                                total_days=Decimal(str(total_days)),
-                                notes=notes.strip() if notes else None
-                            )
-                            
-                            # Submit request
-                            new_request = pto_service.create_request(request_data)
-                            
-                            # Success message
-                            st.success(f"✅ PTO request submitted successfully! Request ID: {new_request.id}")
-                            
-                            # Show request details
-                            with st.expander("📋 Request Details", expanded=True):
-                                st.write(f"**Type:** {pto_type.title()}")
-                                st.write(f"**Dates:** {start_date} to {end_date}")
-                                st.write(f"**Total Days:** {total_days}")
-                                st.write(f"**Status:** Pending Approval")
-                                if notes:
-                                    st.write(f"**Notes:** {notes}")
-                            
-                            # Navigation buttons
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                if st.button("📊 View Dashboard", use_container_width=True):
-                                    st.switch_page("pages/1_Employee_Dashboard.py")
-                            
-                            with col2:
-                                if st.button("📝 Submit Another Request", use_container_width=True):
-                                    st.rerun()
-                            
-                        except ValueError as e:
-                            st.error(f"❌ Error submitting request: {str(e)}")
-                        except Exception as e:
-                            st.error(f"❌ Unexpected error: {str(e)}")
-    
-    finally:
-        # Close database session
-        db.close()
+                    try:
+                        # Create request data
+                        request_data = PTORequestCreate(
+                            user_id=user.id,
+                            pto_type=pto_type,
+                            start_date=start_date,
+                            end_date=end_date,
+                            day_part=day_part,
+                            total_days=total_days if day_part == DayPart.FULL else None,
+                            hours=Decimal(str(hours)) if day_part == DayPart.HOURS else None,
+                            notes=notes.strip() if notes else None
+                        )
+                        
+                        # Submit request
+                        with data.session() as db:
+                            new_request = PTOService(db).create_request(request_data)
+                        
+                        # Success message
+                        st.success(f"✅ PTO request submitted successfully! Request ID: {new_request.id}")
+                        
+                        # Show request details
+                        with st.expander("📋 Request Details", expanded=True):
+                            st.write(f"**Type:** {pto_type.title()}")
+                            st.write(f"**Dates:** {start_date} to {end_date}")
+                            st.write(f"**Total Days:** {total_days}")
+                            st.write(f"**Status:** Pending Approval")
+                            if notes:
+                                st.write(f"**Notes:** {notes}")
+                        
+                        # Navigation buttons
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            if st.button("📊 View Dashboard", use_container_width=True):
+                                st.switch_page("pages/1_Employee_Dashboard.py")
+                        
+                        with col2:
+                            if st.button("📝 Submit Another Request", use_container_width=True):
+                                st.rerun()
+                        
+                    except ValueError as e:
+                        st.error(f"❌ Error submitting request: {str(e)}")
+                    except Exception as e:
+                        st.error(f"❌ Unexpected error: {str(e)}")
 
 
 if __name__ == "__main__":
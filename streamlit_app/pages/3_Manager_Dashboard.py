@@ -9,12 +9,15 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import streamlit as st
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import List, Optional
 
 from src.database import get_db
 from src.services.pto_service import PTOService
 from src.services.balance_service import BalanceService
+from src.services.approval_service import ApprovalService
+from src.services.directory_cache import directory_cache
+from src.schemas.approval_schemas import ApprovalDelegationCreate
 from components.auth import require_role, get_current_user
 from components.sidebar import render_sidebar
 from components.formatters import format_pto_request, status_badge
@@ -45,8 +48,8 @@ def main():
         pto_service = PTOService(db)
         balance_service = BalanceService(db)
         
-        # Get pending requests
-        pending_requests = pto_service.get_pending_requests()
+        # Get the requests waiting for this manager, including as a delegate
+        pending_requests = pto_service.get_pending_requests(approver_id=user.id)
         
         # Display pending requests section
         st.header("⏳ Pending Requests")
@@ -107,8 +110,11 @@ def main():
                             use_container_width=True
                         ):
                             try:
-                                pto_service.approve_request(request.id, user.id)
-                                st.success(f"✅ Request approved for {request.user.full_name}!")
+                                decided = pto_service.approve_request(request.id, user.id)
+                                if decided.is_pending:
+                                    st.success(f"⏫ Request for {request.user.full_name} passed to the next approver")
+                                else:
+                                    st.success(f"✅ Request approved for {request.user.full_name}!")
                                 st.rerun()
                             except Exception as e:
                                 st.error(f"Error approving request: {str(e)}")
@@ -139,20 +145,21 @@ def main():
         else:
             st.success("✅ No pending approvals!")
         
+        display_delegations(db, user)
+        
         # Recently processed requests section
         st.markdown("---")
         st.header("📋 Recently Processed Requests")
         
         # Get recently processed requests (approved or denied in last 30 days)
-        from sqlalchemy import select, and_, or_
-        from src.models.pto_request import PTORequest
-        from datetime import timedelta
+        from sqlalchemy import select, and_
+        from src.models.pto_request import PTORequest, RequestStatus
         
         thirty_days_ago = datetime.now() - timedelta(days=30)
         
         stmt = select(PTORequest).where(
             and_(
-                PTORequest.status.in_(['approved', 'denied']),
+                PTORequest.status.in_([RequestStatus.APPROVED, RequestStatus.DENIED]),
                 PTORequest.approved_at >= thirty_days_ago
             )
         ).order_by(PTORequest.approved_at.desc()).limit(10)
@@ -188,5 +195,58 @@ def main():
         db.close()
 
 
+def display_delegations(db, user) -> None:
+    """
+    Show the user's approval delegations and a form to delegate while away.
+    
+    Args:
+        db: Database session
+        user: Current manager
+    """
+    st.markdown("---")
+    st.header("🤝 Approval Delegation")
+    approval_service = ApprovalService(db)
+    directory = directory_cache.get(db)
+    
+    for delegation in approval_service.list_delegations(user.id):
+        if delegation.end_date < date.today():
+            continue
+        col_text, col_revoke = st.columns([4, 1])
+        with col_text:
+            if delegation.delegator_id == user.id:
+                who = f"{directory.user_name(delegation.delegate_id)} decides your requests"
+            else:
+                who = f"You decide {directory.user_name(delegation.delegator_id)}'s requests"
+            st.write(f"{who} from {delegation.start_date.strftime('%m/%d/%Y')} "
+                     f"to {delegation.end_date.strftime('%m/%d/%Y')}")
+        with col_revoke:
+            if delegation.delegator_id == user.id and st.button("Revoke", key=f"revoke_{delegation.id}"):
+                approval_service.revoke_delegation(delegation.id)
+                st.rerun()
+    
+    delegates = {user_id: name for user_id, name in {
+        **directory.users_with_role('manager'), **directory.users_with_role('admin')
+    }.items() if user_id != user.id}
+    if not delegates:
+        return
+    with st.form("delegation_form"):
+        st.write("**Delegate my approvals while I am away:**")
+        delegate_id = st.selectbox("Delegate", options=list(delegates), format_func=delegates.get)
+        col_start, col_end = st.columns(2)
+        with col_start:
+            start_date = st.date_input("From", value=date.today())
+        with col_end:
+            end_date = st.date_input("To", value=date.today() + timedelta(days=7))
+        if st.form_submit_button("Delegate"):
+            try:
+                approval_service.create_delegation(ApprovalDelegationCreate(
+                    delegator_id=user.id, delegate_id=delegate_id, start_date=start_date, end_date=end_date
+                ))
+                st.success(f"✅ {delegates[delegate_id]} will decide your requests")
+                st.rerun()
+            except ValueError as e:
+                st.error(str(e))
+
+
 if __name__ == "__main__":
     main()
@@ -9,23 +9,20 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import streamlit as st
-import pandas as pd
 import calendar
 from datetime import datetime, date
 from typing import List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import select, and_, extract
 
+from components import data
 from components.auth import (
     is_authenticated, 
     get_current_user, 
     show_login_form
 )
 from components.sidebar import render_sidebar
-from src.database import get_db
-from src.models.market_holiday import MarketHoliday
-from src.models.pto_request import PTORequest
-from src.services.pto_service import PTOService
+from src.models.pto_request import RequestStatus
+from src.schemas.read_models import HolidayListItem, RequestListItem
+from src.utils import lazy
 
 
 # Page configuration
@@ -36,51 +33,20 @@ st.set_page_config(
 )
 
 
-def get_market_holidays_for_month(db: Session, year: int, month: int) -> List[MarketHoliday]:
-    """Get market holidays for a specific month and year."""
-    stmt = select(MarketHoliday).where(
-        and_(
-            extract('year', MarketHoliday.holiday_date) == year,
-            extract('month', MarketHoliday.holiday_date) == month,
-            MarketHoliday.is_observed == True
-        )
-    ).order_by(MarketHoliday.holiday_date)
-    
-    result = db.execute(stmt)
-    return list(result.scalars().all())
-
-
-def get_user_pto_for_month(db: Session, user_id: int, year: int, month: int) -> List[PTORequest]:
-    """Get user's PTO requests that overlap with a specific month and year."""
-    # Create date range for the month
-    first_day = date(year, month, 1)
-    if month == 12:
-        last_day = date(year + 1, 1, 1)
-    else:
-        last_day = date(year, month + 1, 1)
-    
-    stmt = select(PTORequest).where(
-        and_(
-            PTORequest.user_id == user_id,
-            PTORequest.status.in_(['approved', 'pending']),
-            PTORequest.start_date < last_day,
-            PTORequest.end_date >= first_day
-        )
-    ).order_by(PTORequest.start_date)
-    
-    result = db.execute(stmt)
-    return list(result.scalars().all())
-
-
-def create_calendar_dataframe(year: int, month: int, holidays: List[MarketHoliday], 
-                            pto_requests: List[PTORequest]) -> pd.DataFrame:
+def create_calendar_dataframe(year: int, month: int, holidays: List[HolidayListItem], 
+                            pto_requests: List[RequestListItem],
+                            remote_days: List[date] = ()):
     """Create a calendar DataFrame with holidays and PTO marked."""
+    pd = lazy.pandas()
     # Get calendar for the month
     cal = calendar.monthcalendar(year, month)
     
     # Create holiday lookup
     holiday_dates = {h.holiday_date.day for h in holidays if h.holiday_date.month == month}
     
+    # Create remote day lookup
+    remote_dates = {d.day for d in remote_days if d.month == month}
+    
     # Create PTO lookup
     approved_pto_dates = set()
     pending_pto_dates = set()
@@ -92,9 +58,9 @@ def create_calendar_dataframe(year: int, month: int, holidays: List[MarketHolida
         
         while current_date <= end_date:
             if current_date.month == month:
-                if pto.status == 'approved':
+                if pto.status == RequestStatus.APPROVED:
                     approved_pto_dates.add(current_date.day)
-                elif pto.status == 'pending':
+                elif pto.status == RequestStatus.PENDING:
                     pending_pto_dates.add(current_date.day)
             current_date = date(current_date.year, current_date.month, current_date.day + 1)
     
@@ -115,6 +81,8 @@ def create_calendar_dataframe(year: int, month: int, holidays: List[MarketHolida
                     cell_content += " ✅"
                 if day in pending_pto_dates:
                     cell_content += " ⏳"
+                if day in remote_dates:
+                    cell_content += " 🏠"
                 
                 # Check if weekend
                 day_of_week = date(year, month, day).weekday()
@@ -129,10 +97,21 @@ def create_calendar_dataframe(year: int, month: int, holidays: List[MarketHolida
     return df
 
 
+@st.cache_data(ttl=data.USER_DATA_TTL, max_entries=data.MAX_ENTRIES, show_spinner=False)
+def calendar_dataframe(user_id: int, year: int, month: int, version: int):
+    """Build the month grid for a user; ``version`` is the user's data token."""
+    return create_calendar_dataframe(
+        year, month,
+        data.market_holidays(year, month),
+        data.user_pto_for_month(user_id, year, month),
+        data.remote_days(user_id, date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1]))
+    )
+
+
 def display_legend():
     """Display the calendar legend."""
     st.markdown("### 📋 Legend")
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.markdown("🏦 **Market Holidays**")
@@ -140,12 +119,14 @@ def display_legend():
         st.markdown("✅ **Your Approved PTO**")
     with col3:
         st.markdown("⏳ **Your Pending PTO**")
+    with col4:
+        st.markdown("🏠 **Your Remote Days**")
     
     st.markdown("*Weekends are shown in italics*")
     st.markdown("---")
 
 
-def display_market_holidays_list(holidays: List[MarketHoliday]):
+def display_market_holidays_list(holidays: List[HolidayListItem]):
     """Display list of market holidays for the month."""
     st.markdown("### 🏦 Market Holidays This Month")
     
@@ -163,7 +144,29 @@ def display_market_holidays_list(holidays: List[MarketHoliday]):
             st.write(holiday.market)
 
 
-def display_pto_list(pto_requests: List[PTORequest]):
+def display_office_coverage(year: int, month: int):
+    """Display company-wide in-office headcount for each market-open day."""
+    st.markdown("### 🏢 Office Coverage")
+    
+    first_day = date(year, month, 1)
+    last_day = date(year, month, calendar.monthrange(year, month)[1])
+    occupancy = data.office_occupancy(first_day, last_day)
+    
+    if not occupancy.days:
+        st.info("No market-open days this month.")
+        return
+    
+    pd = lazy.pandas()
+    coverage_df = pd.DataFrame({
+        'In Office': occupancy.in_office,
+        'Remote': occupancy.remote,
+        'On PTO': occupancy.on_pto,
+    }, index=[d.strftime('%m/%d') for d in occupancy.days])
+    st.caption(f"Market-open days only, {occupancy.headcount} active employees")
+    st.bar_chart(coverage_df, stack=True)
+
+
+def display_pto_list(pto_requests: List[RequestListItem]):
     """Display list of user's PTO requests for the month."""
     st.markdown("### 📝 Your PTO This Month")
     
@@ -172,8 +175,8 @@ def display_pto_list(pto_requests: List[PTORequest]):
         return
     
     # Group by status
-    approved_requests = [r for r in pto_requests if r.status == 'approved']
-    pending_requests = [r for r in pto_requests if r.status == 'pending']
+    approved_requests = [r for r in pto_requests if r.status == RequestStatus.APPROVED]
+    pending_requests = [r for r in pto_requests if r.status == RequestStatus.PENDING]
     
     if approved_requests:
         with st.expander(f"✅ Approved PTO ({len(approved_requests)} requests)", expanded=True):
@@ -260,20 +263,16 @@ def main():
     # Display legend
     display_legend()
     
-    # Get database session and fetch data
+    # Fetch data; unchanged months are served from the cache without queries
     try:
-        db = next(get_db())
-        
-        # Get market holidays for the month
-        holidays = get_market_holidays_for_month(db, selected_year, selected_month)
-        
-        # Get user's PTO for the month
-        pto_requests = get_user_pto_for_month(db, user.id, selected_year, selected_month)
+        selected_year = int(selected_year)
+        holidays = data.market_holidays(selected_year, selected_month)
+        pto_requests = data.user_pto_for_month(user.id, selected_year, selected_month)
         
         # Create and display calendar
         st.markdown(f"### 📅 {calendar.month_name[selected_month]} {selected_year}")
         
-        calendar_df = create_calendar_dataframe(selected_year, selected_month, holidays, pto_requests)
+        calendar_df = calendar_dataframe(user.id, selected_year, selected_month, data.data_token(user.id))
         
         # Display calendar using st.dataframe with styling
         st.dataframe(
@@ -299,13 +298,12 @@ def main():
         
         with col2:
             display_pto_list(pto_requests)
+        
+        st.markdown("---")
+        display_office_coverage(selected_year, selected_month)
     
     except Exception as e:
         st.error(f"Error loading calendar data: {str(e)}")
-    
-    finally:
-        if 'db' in locals():
-            db.close()
 
 
 if __name__ == "__main__":
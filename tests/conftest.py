@@ -0,0 +1,137 @@
+"""
+Shared pytest configuration for the PTO and Market Calendar System.
+"""
+import os
+from datetime import date, timedelta
+from decimal import Decimal
+from dotenv import load_dotenv
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+import src.config
+from src.config import Config
+from src.database import Base, create_db_engine
+from src.models import Department, PTOBalance, User
+from src.schemas.pto_schemas import PTORequestCreate
+from src.services.directory_cache import directory_cache
+from src.services.pto_service import PTOService
+from src.services.rule_service import rule_cache
+
+# Year of the requests tests submit, so their dates are never in the past
+YEAR = date.today().year + 1
+
+
+@pytest.fixture(scope='session', autouse=True)
+def config():
+    """
+    Settings for the suite: the .env values, on an in-memory SQLite database.
+
+    The variables are only set while the Config is built, so the process
+    environment (and tests checking the real .env) never sees them.
+    """
+    load_dotenv()
+    with pytest.MonkeyPatch.context() as env:
+        env.setenv('DATABASE_URL', 'sqlite://')
+        env.setenv('SECRET_KEY', os.getenv('SECRET_KEY') or 'test-secret-key')
+        env.setenv('ENVIRONMENT', 'test')
+        settings = Config()
+    previous, src.config._config = src.config._config, settings
+    yield settings
+    src.config._config = previous
+
+
+@pytest.fixture(scope='session')
+def engine():
+    """In-memory SQLite engine with the schema created once per test run."""
+    engine = create_db_engine('sqlite://', echo=False)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """
+    Session factory on a file-backed WAL SQLite database.
+
+    Unlike ``db``, sessions really commit, so other sessions and threads
+    see each other's committed changes.
+    """
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'shared.db'}", echo=False)
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """
+    Session whose changes are rolled back after the test.
+
+    The session runs inside an outer transaction and turns its own commits
+    into savepoints, so services can commit and roll back freely while the
+    schema is never rebuilt between tests. The process-wide caches are
+    reset on both sides, so none outlives the rows it was built from.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode='create_savepoint')
+    directory_cache.invalidate()
+    rule_cache.invalidate()
+    yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
+    directory_cache.invalidate()
+    rule_cache.invalidate()
+
+
+@pytest.fixture
+def make_user(db):
+    """
+    Factory creating committed employees, optionally with a department and balance.
+
+    ``department`` is a department code, created on first use; ``balance``
+    maps balance columns (e.g. ``vacation_total_minutes``) for the given year.
+    """
+    def make(username, department=None, balance=None, year=None, **fields):
+        if department is not None:
+            dept = db.execute(select(Department).where(Department.code == department)).scalar_one_or_none()
+            if dept is None:
+                dept = Department(name=department.title(), code=department)
+                db.add(dept)
+                db.flush()
+            fields['department_id'] = dept.id
+        fields.setdefault('first_name', username.title())
+        fields.setdefault('last_name', 'User')
+        fields.setdefault('hire_date', date(2020, 1, 1))
+        user = User(username=username, email=f'{username}@example.com', password_hash='x', **fields)
+        db.add(user)
+        db.flush()
+        if balance is not None:
+            db.add(PTOBalance(user_id=user.id, year=year or date.today().year, **balance))
+        db.commit()
+        directory_cache.invalidate()
+        return user
+    return make
+
+
+@pytest.fixture
+def submit_request(db):
+    """
+    Factory submitting requests through PTOService.
+
+    A request covers ``days`` calendar days from ``start``, all counted as
+    working days, or runs through ``end`` (default ``start``) with the
+    working days counted by the service.
+    """
+    def submit(user_id, start, days=None, end=None, pto_type='vacation'):
+        total_days = None
+        if days is not None:
+            end, total_days = start + timedelta(days=days - 1), Decimal(days)
+        return PTOService(db).create_request(PTORequestCreate(
+            user_id=user_id, pto_type=pto_type, start_date=start, end_date=end or start, total_days=total_days
+        ))
+    return submit
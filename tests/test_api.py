@@ -0,0 +1,73 @@
+"""
+Tests for the /api/v1 JSON API.
+"""
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config import get_config
+from src.database import get_db
+from src.services.directory_cache import directory_cache
+from src.utils.pto_units import MINUTES_PER_DAY
+from nicegui_app.routes.api import api
+
+AUTH = {'Authorization': 'Bearer test-token'}
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    """API client reading and writing through the test session."""
+    monkeypatch.setattr(get_config(), 'API_TOKENS', ['test-token'])
+    api.dependency_overrides[get_db] = lambda: db
+    directory_cache.invalidate()
+    yield TestClient(api)
+    api.dependency_overrides.clear()
+    directory_cache.invalidate()
+
+
+def test_lists_page_by_cursor_with_field_selection(client, make_user):
+    """Pages follow the cursor, rows carry only the requested fields, and tokens are required."""
+    users = [make_user(name, balance={'vacation_total_minutes': 10 * MINUTES_PER_DAY})
+             for name in ('ann', 'bob', 'cy')]
+
+    assert client.get('/users').status_code == 401
+    first = client.get('/users', params={'limit': 2, 'fields': 'id,username'}, headers=AUTH).json()
+    assert first['data'] == [{'id': users[0].id, 'username': 'ann'}, {'id': users[1].id, 'username': 'bob'}]
+    second = client.get('/users', params={'limit': 2, 'fields': 'username', 'cursor': first['next_cursor']},
+                        headers=AUTH).json()
+    assert second == {'data': [{'username': 'cy'}], 'next_cursor': None}
+    assert client.get('/users', params={'fields': 'password_hash'}, headers=AUTH).status_code == 400
+
+    balances = client.get('/balances', params={'user_ids': f'{users[2].id},{users[0].id}',
+                                               'fields': 'user_id,vacation_available_minutes'},
+                          headers={**AUTH, 'Accept-Encoding': 'gzip'})
+    assert balances.json()['data'] == [
+        {'user_id': users[0].id, 'vacation_available_minutes': 4800},
+        {'user_id': users[2].id, 'vacation_available_minutes': 4800},
+    ]
+
+
+def test_batch_submit_and_approve_report_per_item_results(client, make_user):
+    """Each batch item succeeds or fails on its own."""
+    ann = make_user('ann', balance={'vacation_total_minutes': 2 * MINUTES_PER_DAY},
+                    year=(date.today() + timedelta(days=30)).year)
+    mia = make_user('mia', role='manager')
+    start = (date.today() + timedelta(days=30)).isoformat()
+    item = {'user_id': ann.id, 'pto_type': 'vacation', 'start_date': start, 'end_date': start, 'total_days': '2'}
+
+    submitted = client.post('/requests/batch', json={'requests': [item, item]}, headers=AUTH).json()['results']
+    assert [result['ok'] for result in submitted] == [True, False]
+    assert submitted[1]['error'] == "Insufficient vacation balance"
+    request_id = submitted[0]['data']['id']
+
+    assert client.post('/requests/approve', json={'request_ids': [request_id], 'approved_by': ann.id},
+                       headers=AUTH).status_code == 400
+    approved = client.post('/requests/approve', json={'request_ids': [request_id, request_id],
+                                                      'approved_by': mia.id}, headers=AUTH).json()['results']
+    assert [(result['ok'], result.get('data', {}).get('status')) for result in approved] == [
+        (True, 'approved'), (False, None)
+    ]
+    listed = client.get('/requests', params={'user_id': ann.id, 'status': 'approved', 'fields': 'id,total_days'},
+                        headers=AUTH).json()
+    assert listed['data'] == [{'id': request_id, 'total_days': 2.0}]
@@ -0,0 +1,157 @@
+"""
+Tests for multi-level approval chains and date-ranged delegation.
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from src.config import get_config
+from src.models import OutboxMessage, PTOBalance, RequestStatus
+from src.scheduler.jobs import remind_stale_pending
+from src.schemas.approval_schemas import ApprovalDelegationCreate, ApprovalStepCreate
+from src.services.approval_service import ApprovalService
+from src.services.directory_cache import directory_cache
+from src.services.event_bus import PENDING_REMINDER
+from src.services.pto_service import PTOService
+from src.utils.pto_units import MINUTES_PER_DAY
+from tests.conftest import YEAR
+
+START = date(YEAR, 3, 2)
+
+
+@pytest.fixture
+def team(db, make_user):
+    """Ann in ops under Mia, with Hal as department head for requests over five days."""
+    balance = {'vacation_total_minutes': 20 * MINUTES_PER_DAY}
+    mia = make_user('mia', department='ops', role='manager', year=YEAR, balance=balance)
+    hal = make_user('hal', department='ops', role='manager', year=YEAR, balance=balance)
+    pat = make_user('pat', department='risk', role='manager')
+    ann = make_user('ann', department='ops', year=YEAR, balance=balance)
+    mia.department.manager_id = mia.id
+    db.commit()
+    directory_cache.invalidate()
+    ApprovalService(db).create_step(ApprovalStepCreate(
+        name='Department head', department_id=mia.department_id, over_days=Decimal('5'), approver_id=hal.id
+    ))
+    return mia, hal, pat, ann
+
+
+def test_long_requests_escalate_to_the_department_head(db, team, submit_request):
+    """The manager's approval of a long request passes it up; short requests are approved at once."""
+    mia, hal, _, ann = team
+    long = submit_request(ann.id, START, days=6)
+    short = submit_request(ann.id, START + timedelta(days=14), days=2)
+    service = PTOService(db)
+
+    escalated = service.approve_request(long.id, mia.id)
+    assert (escalated.status, escalated.approval_level, escalated.current_approver_id) == (
+        RequestStatus.PENDING, 1, hal.id
+    )
+    with pytest.raises(ValueError, match="waiting for Hal User"):
+        service.approve_request(long.id, mia.id)
+    assert [r.id for r in service.get_pending_requests(approver_id=hal.id)] == [long.id]
+    assert [r.id for r in service.get_pending_requests(approver_id=mia.id)] == [short.id]
+
+    assert service.approve_request(long.id, hal.id).status == RequestStatus.APPROVED
+    assert service.approve_request(short.id, mia.id).status == RequestStatus.APPROVED
+    assert [e.action for e in service.get_request_history(long.id)] == ['submit', 'escalate', 'approve']
+    balance = db.query(PTOBalance).filter_by(user_id=ann.id).one()
+    assert balance.vacation_used_minutes == 8 * MINUTES_PER_DAY
+
+
+def test_delegates_act_for_the_approver_only_within_their_dates(db, team, submit_request):
+    """A delegation puts the request in the delegate's queue while it is valid, and not after revocation."""
+    mia, hal, pat, ann = team
+    request = submit_request(ann.id, START, days=2)
+    service = PTOService(db)
+    approvals = ApprovalService(db)
+    today = date.today()
+    approvals.create_delegation(ApprovalDelegationCreate(
+        delegator_id=mia.id, delegate_id=pat.id, start_date=today + timedelta(days=5),
+        end_date=today + timedelta(days=10)
+    ))
+    assert service.get_pending_requests(approver_id=pat.id) == []
+    with pytest.raises(ValueError, match="waiting for Mia User"):
+        service.deny_request(request.id, pat.id, 'Coverage')
+    assert approvals.approvers_for(request, on=today + timedelta(days=7)) == [mia.id, pat.id]
+    with pytest.raises(ValueError, match=f"User {ann.id} cannot approve requests"):
+        approvals.create_delegation(ApprovalDelegationCreate(
+            delegator_id=mia.id, delegate_id=ann.id, start_date=today, end_date=today
+        ))
+
+    current = approvals.create_delegation(ApprovalDelegationCreate(
+        delegator_id=mia.id, delegate_id=pat.id, start_date=today, end_date=today + timedelta(days=2)
+    ))
+    assert approvals.approvers_for(request) == [mia.id, pat.id]
+    assert [r.id for r in service.get_pending_requests(approver_id=pat.id)] == [request.id]
+    assert service.get_pending_requests(approver_id=hal.id) == []
+
+    approvals.revoke_delegation(current.id)
+    assert approvals.approvers_for(request) == [mia.id]
+    assert service.get_pending_requests(approver_id=pat.id) == []
+    assert service.approve_request(request.id, mia.id).status == RequestStatus.APPROVED
+
+
+def test_stale_reminders_go_to_the_approver_each_request_waits_for(db, team, submit_request, monkeypatch):
+    """Escalated requests are chased with their current approver, who shares the reminder with delegates."""
+    monkeypatch.setattr(get_config(), 'SMTP_HOST', 'localhost')
+    mia, hal, pat, ann = team
+    long = submit_request(ann.id, START, days=6)
+    short = submit_request(ann.id, START + timedelta(days=14), days=2)
+    PTOService(db).approve_request(long.id, mia.id)
+    ApprovalService(db).create_delegation(ApprovalDelegationCreate(
+        delegator_id=hal.id, delegate_id=pat.id, start_date=date.today(), end_date=date.today() + timedelta(days=10)
+    ))
+    remind_stale_pending(db, now=datetime.now() + timedelta(days=7))
+
+    reminders = db.execute(select(OutboxMessage).where(OutboxMessage.kind == PENDING_REMINDER)).scalars()
+    assert sorted((m.recipient_id, m.payload['approver_id'], tuple(m.payload['request_ids'])) for m in reminders) == [
+        (mia.id, mia.id, (short.id,)), (hal.id, hal.id, (long.id,)), (pat.id, hal.id, (long.id,))
+    ]
+
+
+def test_nobody_decides_their_own_request(db, team, make_user, submit_request):
+    """A manager's own request skips to the next level or to the admins; delegates cannot self-approve."""
+    mia, hal, pat, ann = team
+    ada = make_user('ada', role='admin')
+    service = PTOService(db)
+    approvals = ApprovalService(db)
+
+    long = submit_request(mia.id, START, days=6)
+    assert (long.approval_level, long.current_approver_id) == (0, hal.id)
+    with pytest.raises(ValueError, match="Users cannot decide their own requests"):
+        service.approve_request(long.id, mia.id)
+    assert service.get_pending_requests(approver_id=mia.id) == []
+    assert service.approve_request(long.id, hal.id).status == RequestStatus.APPROVED
+
+    short = submit_request(mia.id, START + timedelta(days=14), days=2)
+    assert approvals.approvers_for(short) == [ada.id]
+    with pytest.raises(ValueError, match=f"User {pat.id} cannot approve requests"):
+        service.approve_request(short.id, pat.id)
+    assert service.get_pending_requests(approver_id=pat.id) == []
+    assert [r.id for r in service.get_pending_requests(approver_id=ada.id)] == [short.id]
+    assert service.approve_request(short.id, ada.id).status == RequestStatus.APPROVED
+
+    approvals.create_delegation(ApprovalDelegationCreate(
+        delegator_id=mia.id, delegate_id=hal.id, start_date=date.today(), end_date=date.today()
+    ))
+    own = submit_request(hal.id, START + timedelta(days=28), days=2)
+    assert not approvals.can_approve(own, hal.id)
+    with pytest.raises(ValueError, match="Users cannot decide their own requests"):
+        service.deny_request(own.id, hal.id, 'Changed my mind')
+
+
+def test_requests_without_a_designated_approver_need_an_approver_role(db, make_user, submit_request):
+    """With nobody managing the department, any approver may decide, but not an employee."""
+    ann = make_user('ann', department='desk', year=YEAR, balance={'vacation_total_minutes': 5 * MINUTES_PER_DAY})
+    bob = make_user('bob', department='desk')
+    mia = make_user('mia', role='manager')
+    request = submit_request(ann.id, START, days=1)
+
+    with pytest.raises(ValueError, match=f"User {bob.id} cannot approve requests"):
+        PTOService(db).approve_request(request.id, bob.id)
+    assert PTOService(db).get_pending_requests(approver_id=bob.id) == []
+    assert [r.id for r in PTOService(db).get_pending_requests(approver_id=mia.id)] == [request.id]
+    assert PTOService(db).approve_request(request.id, mia.id).status == RequestStatus.APPROVED
@@ -0,0 +1,72 @@
+"""
+Tests for auto-approval of routine requests at submission.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from src.config import get_config
+from src.models import Department, PTOBalance, RequestStatus, RuleKind
+from src.schemas.rule_schemas import AutoApprovalRuleCreate, DepartmentRuleCreate
+from src.services.auto_approval_service import AutoApprovalService
+from src.services.pto_service import PTOService
+from src.services.rule_service import RuleService
+from src.utils.pto_units import MINUTES_PER_DAY
+from tests.conftest import YEAR
+
+
+def _weekday(month: int, day: int) -> date:
+    """The given day, or the Monday after if it falls on a weekend."""
+    start = date(YEAR, month, day)
+    if start.weekday() >= 5:
+        start += timedelta(days=7 - start.weekday())
+    return start
+
+
+def test_single_sick_days_are_approved_in_the_submit_transaction(db, make_user, submit_request, monkeypatch):
+    """A matching request is approved with the rule recorded; longer ones wait for a manager."""
+    ann = make_user('ann', balance={'sick_total_minutes': 5 * MINUTES_PER_DAY}, year=YEAR)
+    rule = AutoApprovalService(db).create_rule(AutoApprovalRuleCreate(
+        name='Single sick day', pto_type='sick', max_days=Decimal('1')
+    ))
+
+    approved = submit_request(ann.id, _weekday(2, 10), pto_type='sick')
+    assert (approved.status, approved.auto_approval_rule_id, approved.approved_by) == (
+        RequestStatus.APPROVED, rule.id, None)
+    history = PTOService(db).get_request_history(approved.id)
+    assert [(event.action, event.note) for event in history] == [
+        ('submit', None), ('approve', "Auto-approved by rule 'Single sick day'")]
+    balance = db.execute(select(PTOBalance).where(PTOBalance.user_id == ann.id)).scalar_one()
+    assert balance.sick_used_minutes == MINUTES_PER_DAY
+
+    assert submit_request(ann.id, _weekday(3, 10), days=3, pto_type='sick').status == RequestStatus.PENDING
+    monkeypatch.setattr(get_config(), 'AUTO_APPROVAL_ENABLED', False)
+    assert submit_request(ann.id, _weekday(4, 10), pto_type='sick').status == RequestStatus.PENDING
+
+
+def test_headroom_coverage_and_blackouts_keep_requests_manual(db, make_user, submit_request):
+    """Requests leaving too little balance, with colleagues out, or in a blackout are not auto-approved."""
+    balance = {'personal_total_minutes': 2 * MINUTES_PER_DAY, 'sick_total_minutes': 5 * MINUTES_PER_DAY,
+               'vacation_total_minutes': 5 * MINUTES_PER_DAY}
+    ann = make_user('ann', department='rates', balance=balance, year=YEAR)
+    bob = make_user('bob', department='rates', balance=balance, year=YEAR)
+    desk = db.execute(select(Department).where(Department.code == 'rates')).scalar_one()
+    service = AutoApprovalService(db)
+    service.create_rule(AutoApprovalRuleCreate(name='Personal day', department_id=desk.id, pto_type='personal',
+                                               max_days=Decimal('1'), min_headroom_days=Decimal('1')))
+    service.create_rule(AutoApprovalRuleCreate(name='Sick day', pto_type='sick', max_days=Decimal('1'),
+                                               max_colleagues_out=0))
+    close = _weekday(3, 25)
+    RuleService(db).create_rule(DepartmentRuleCreate(kind=RuleKind.BLACKOUT, name='Quarter-end close',
+                                                     start_date=close, end_date=close))
+
+    first = _weekday(5, 4)
+    assert submit_request(ann.id, first, pto_type='personal').status == RequestStatus.APPROVED
+    # One personal day left: approving another would leave no headroom
+    assert submit_request(ann.id, first + timedelta(days=7), pto_type='personal').status == RequestStatus.PENDING
+
+    submit_request(bob.id, first + timedelta(days=14))
+    assert submit_request(ann.id, first + timedelta(days=14), pto_type='sick').status == RequestStatus.PENDING
+    assert submit_request(ann.id, first + timedelta(days=21), pto_type='sick').status == RequestStatus.APPROVED
+    assert submit_request(ann.id, close, pto_type='sick').status == RequestStatus.PENDING
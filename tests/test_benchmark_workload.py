@@ -0,0 +1,49 @@
+"""
+Tests for the synthetic benchmark workload.
+"""
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from benchmarks.generator import WorkloadSpec, generate, nyse_holidays
+from src.database import Base, create_db_engine
+from src.models import PTOBalance, PTORequest, RequestStatus
+
+SPEC = WorkloadSpec(departments=2, users=20, years=1)
+TODAY = date(2025, 6, 2)
+
+
+def _history(db):
+    return db.execute(select(
+        PTORequest.user_id, PTORequest.pto_type, PTORequest.start_date, PTORequest.end_date,
+        PTORequest.duration_minutes, PTORequest.status
+    ).order_by(PTORequest.id)).all()
+
+
+def test_nyse_holiday_rules_match_published_calendar():
+    """The rule-based calendar reproduces the exchange's 2025 closures."""
+    assert [day for day, _ in nyse_holidays(2025)] == [
+        date(2025, 1, 1), date(2025, 1, 20), date(2025, 2, 17), date(2025, 4, 18), date(2025, 5, 26),
+        date(2025, 6, 19), date(2025, 7, 4), date(2025, 9, 1), date(2025, 11, 27), date(2025, 12, 25),
+    ]
+
+
+def test_workload_is_deterministic_and_consistent(db):
+    """A fixed seed yields a fixed history whose balances match its approved vacation."""
+    workload = generate(db, SPEC, today=TODAY)
+    assert len(workload.manager_ids) == 2
+
+    engine = create_db_engine('sqlite://', echo=False)
+    Base.metadata.create_all(engine)
+    with Session(engine) as other:
+        generate(other, SPEC, today=TODAY)
+        assert _history(other) == _history(db)
+    engine.dispose()
+
+    approved = db.execute(select(func.sum(PTORequest.duration_minutes)).where(
+        PTORequest.pto_type == 'vacation', PTORequest.status == RequestStatus.APPROVED,
+        PTORequest.start_date >= date(2025, 1, 1)
+    )).scalar()
+    used = db.execute(select(func.sum(PTOBalance.vacation_used_minutes)).where(PTOBalance.year == 2025)).scalar()
+    assert approved == used
@@ -0,0 +1,48 @@
+"""
+Tests for the team calendar matrix.
+"""
+from datetime import date
+
+import pytest
+
+from src.models import MarketHoliday, PTORequest, RequestStatus
+from src.services.calendar_service import CalendarService, DayStatus
+
+
+@pytest.fixture
+def db(db, make_user):
+    """A two-person department and one outsider."""
+    for username, last_name, department in [('ann', 'Adams', 'TRD'), ('bob', 'Brown', 'TRD'), ('cat', 'Cole', 'OPS')]:
+        make_user(username, department=department, last_name=last_name)
+    return db
+
+
+def _request(user_id, start, end, status, day_part='full'):
+    return PTORequest(user_id=user_id, pto_type='vacation', start_date=start, end_date=end,
+                      duration_minutes=480, day_part=day_part, status=status)
+
+
+def test_team_calendar_matrix(db):
+    """Requests are clipped to the month, denied ones ignored, and approval wins over pending."""
+    db.add_all([
+        _request(1, date(2025, 5, 29), date(2025, 6, 3), RequestStatus.APPROVED),
+        _request(1, date(2025, 6, 3), date(2025, 6, 4), RequestStatus.PENDING),
+        _request(1, date(2025, 6, 10), date(2025, 6, 10), RequestStatus.APPROVED, day_part='am'),
+        _request(1, date(2025, 6, 20), date(2025, 6, 20), RequestStatus.DENIED),
+        _request(3, date(2025, 6, 2), date(2025, 6, 2), RequestStatus.APPROVED),
+    ])
+    db.add(MarketHoliday(holiday_date=date(2025, 6, 19), name='Juneteenth', market='NYSE', year=2025))
+    db.commit()
+
+    cal = CalendarService(db).get_team_calendar(2025, 6, department_id=1)
+
+    assert [name for _, name in cal.members] == ['Ann Adams', 'Bob Brown']
+    assert cal.matrix.shape == (2, 30)
+    ann = cal.matrix[0].tolist()
+    assert ann[:5] == [DayStatus.APPROVED] * 3 + [DayStatus.PENDING, DayStatus.NONE]
+    assert ann[9] == DayStatus.PARTIAL
+    assert ann[19] == DayStatus.NONE
+    assert not cal.matrix[1].any()
+    assert cal.out_counts()[:3].tolist() == [1, 1, 1]
+    assert cal.closed[18] and cal.closed[0] and not cal.closed[1]
+    assert cal.holidays == {date(2025, 6, 19): 'Juneteenth'}
@@ -0,0 +1,57 @@
+"""
+Tests for the incremental change feeds and their tombstones.
+"""
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from src.config import get_config
+from src.database import get_db
+from src.models import PTOBalance
+from src.services.change_feed_service import ChangeFeedService
+from src.services.user_service import UserService
+from src.utils.pto_units import MINUTES_PER_DAY
+from nicegui_app.routes.api import api
+
+
+def test_feed_pages_by_watermark_and_holds_back_recent_changes(db, make_user, monkeypatch):
+    """Rows newer than the lag stay hidden; pages resume after the last watermark."""
+    users = [make_user(name) for name in ('ann', 'bob', 'cy')]
+    feed = ChangeFeedService(db)
+    assert feed.changes('users').items == []
+
+    monkeypatch.setattr(get_config(), 'CHANGE_FEED_LAG_SECONDS', 0)
+    first = feed.changes('users', limit=2)
+    assert [row.username for row in first.items] == ['ann', 'bob'] and first.has_more
+    rest = feed.changes('users', first.next_watermark, limit=2)
+    assert [row.id for row in rest.items] == [users[2].id] and not rest.has_more
+    assert feed.changes('users', rest.next_watermark).next_watermark == rest.next_watermark
+
+
+def test_deactivations_and_deletes_leave_tombstones(db, make_user, monkeypatch):
+    """Deactivating a user and deleting a balance each record a tombstone."""
+    monkeypatch.setattr(get_config(), 'CHANGE_FEED_LAG_SECONDS', 0)
+    make_user('ann', balance={'vacation_total_minutes': 10 * MINUTES_PER_DAY})
+    bob = make_user('bob')
+    balance = db.execute(select(PTOBalance)).scalar_one()
+    balance_id = balance.id
+    db.delete(balance)
+    UserService(db).delete_user(bob.id)
+    db.flush()
+
+    monkeypatch.setattr(get_config(), 'API_TOKENS', ['test-token'])
+    api.dependency_overrides[get_db] = lambda: db
+    try:
+        client = TestClient(api)
+        headers = {'Authorization': 'Bearer test-token'}
+        users = client.get('/changes/users/tombstones', headers=headers).json()
+        balances = client.get('/changes/balances/tombstones', headers=headers).json()
+        again = client.get('/changes/users/tombstones', params={'cursor': users['next_cursor']},
+                           headers=headers).json()
+        unknown = client.get('/changes/departments', headers=headers)
+    finally:
+        api.dependency_overrides.clear()
+
+    assert [(row['id'], row['reason']) for row in users['data']] == [(bob.id, 'deactivated')]
+    assert [(row['id'], row['reason']) for row in balances['data']] == [(balance_id, 'deleted')]
+    assert again == {'data': [], 'next_cursor': users['next_cursor'], 'has_more': False}
+    assert unknown.status_code == 404
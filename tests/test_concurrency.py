@@ -0,0 +1,136 @@
+"""
+Stress tests for optimistic concurrency control on PTO requests and balances.
+"""
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import event, func, select
+
+from src.models import User, PTOBalance, PTORequest
+from src.scheduler.jobs import reconcile_balances
+from src.schemas.pto_schemas import PTORequestCreate
+from src.services.pto_service import PTOService
+from src.utils.pto_units import days_to_minutes
+
+THREADS = 8
+
+
+def _seed_user(factory, vacation_total: Decimal) -> tuple:
+    """Create an employee and a manager, and give the employee a balance."""
+    start = date.today() + timedelta(days=30)
+    with factory() as db:
+        employee = User(username='employee', email='employee@example.com', password_hash='x',
+                        first_name='Test', last_name='Employee', hire_date=date(2020, 1, 1))
+        manager = User(username='manager', email='manager@example.com', password_hash='x',
+                       first_name='Test', last_name='Manager', role='manager', hire_date=date(2020, 1, 1))
+        db.add_all([employee, manager])
+        db.flush()
+        db.add(PTOBalance(user_id=employee.id, year=start.year,
+                          vacation_total_minutes=days_to_minutes(vacation_total)))
+        db.commit()
+        return employee.id, manager.id, start
+
+
+def _run_concurrently(target, count: int) -> list:
+    """Start `count` threads on a barrier and collect each one's outcome."""
+    barrier = threading.Barrier(count)
+    outcomes = [None] * count
+
+    def worker(index):
+        barrier.wait()
+        try:
+            outcomes[index] = target(index)
+        except ValueError as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def test_concurrent_approvals_deduct_balance_once(session_factory):
+    """Only one of many simultaneous approvals of the same request succeeds."""
+    employee_id, manager_id, start = _seed_user(session_factory, Decimal('20.00'))
+    with session_factory() as db:
+        request = PTOService(db).create_request(PTORequestCreate(
+            user_id=employee_id, pto_type='vacation', start_date=start,
+            end_date=start + timedelta(days=2), total_days=Decimal('3.00')
+        ))
+        request_id = request.id
+
+    def approve(_):
+        with session_factory() as db:
+            return PTOService(db).approve_request(request_id, manager_id)
+
+    outcomes = _run_concurrently(approve, THREADS)
+
+    assert sum(isinstance(o, PTORequest) for o in outcomes) == 1
+    with session_factory() as db:
+        balance = db.execute(select(PTOBalance).where(PTOBalance.user_id == employee_id)).scalar_one()
+        assert balance.vacation_used == Decimal('3.00')
+        assert balance.vacation_pending == Decimal('0.00')
+
+
+def test_concurrent_submissions_never_overspend(session_factory):
+    """Simultaneous submissions cannot reserve more vacation than is available."""
+    employee_id, _, start = _seed_user(session_factory, Decimal('3.00'))
+
+    def submit(index):
+        day = start + timedelta(days=index)
+        with session_factory() as db:
+            return PTOService(db).create_request(PTORequestCreate(
+                user_id=employee_id, pto_type='vacation', start_date=day,
+                end_date=day, total_days=Decimal('1.00')
+            ))
+
+    outcomes = _run_concurrently(submit, THREADS)
+
+    created = sum(isinstance(o, PTORequest) for o in outcomes)
+    with session_factory() as db:
+        balance = db.execute(select(PTOBalance).where(PTOBalance.user_id == employee_id)).scalar_one()
+        stored = db.execute(select(func.count(PTORequest.id))).scalar_one()
+        assert balance.vacation_pending == Decimal(created)
+        assert stored == created
+        assert balance.vacation_available >= 0
+
+
+def test_reconciliation_keeps_a_submission_committed_while_it_runs(session_factory):
+    """A request submitted between reconciliation's reads is neither lost nor double-counted."""
+    employee_id, _, start = _seed_user(session_factory, Decimal('10.00'))
+
+    def submit(day):
+        with session_factory() as db:
+            PTOService(db).create_request(PTORequestCreate(
+                user_id=employee_id, pto_type='vacation', start_date=day, end_date=day, total_days=Decimal('1.00')
+            ))
+
+    submit(start)
+    with session_factory() as db:
+        balance = db.execute(select(PTOBalance).where(PTOBalance.user_id == employee_id)).scalar_one()
+        balance.vacation_pending_minutes = days_to_minutes(Decimal('3.00'))  # drifted
+        db.commit()
+
+    # Commit a second submission right after reconciliation's first query
+    engine = session_factory.kw['bind']
+    interleaved = []
+
+    def after_first_query(conn, cursor, statement, parameters, context, executemany):
+        if not interleaved:
+            interleaved.append(statement)
+            submit(start + timedelta(days=1))
+
+    event.listen(engine, 'after_cursor_execute', after_first_query)
+    try:
+        with session_factory() as db:
+            reconcile_balances(db)
+    finally:
+        event.remove(engine, 'after_cursor_execute', after_first_query)
+
+    assert interleaved
+    with session_factory() as db:
+        balance = db.execute(select(PTOBalance).where(PTOBalance.user_id == employee_id)).scalar_one()
+        assert balance.vacation_pending == Decimal('2.00')
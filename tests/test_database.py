@@ -0,0 +1,37 @@
+"""
+Tests for the SQLite engine profiles and dialect fallbacks.
+"""
+from sqlalchemy import func, select
+
+from src.database import Base, create_db_engine, insert_ignore
+from src.models import PTOBalance, User
+from src.services.balance_service import BalanceService
+
+
+def test_file_profile_uses_wal_and_pragmas(tmp_path):
+    """File-based SQLite engines run in WAL mode with foreign keys enforced."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}", echo=False)
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql('PRAGMA journal_mode').scalar() == 'wal'
+        assert connection.exec_driver_sql('PRAGMA foreign_keys').scalar() == 1
+        assert connection.exec_driver_sql('PRAGMA busy_timeout').scalar() == 30000
+    engine.dispose()
+
+
+def test_get_or_create_balance_is_idempotent(db, make_user):
+    """A second creator finds the first row instead of violating uq_user_year."""
+    user = make_user('ann')
+    first = BalanceService(db).get_or_create_balance(user.id, 2030)
+    insert_ignore(db, PTOBalance, {'user_id': user.id, 'year': 2030}, index_elements=['user_id', 'year'])
+    second = BalanceService(db).get_or_create_balance(user.id, 2030)
+
+    assert first.id == second.id
+    assert db.execute(select(func.count()).select_from(PTOBalance)).scalar() == 1
+
+
+def test_db_fixture_rolls_back_committed_rows(db):
+    """Rows committed by an earlier test are gone; the partial index exists on SQLite."""
+    assert db.execute(select(func.count()).select_from(User)).scalar() == 0
+    partial = [index.name for index in Base.metadata.tables['pto_requests'].indexes
+               if index.dialect_options['sqlite']['where'] is not None]
+    assert partial == ['ix_pto_requests_active_dates']
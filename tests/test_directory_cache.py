@@ -0,0 +1,41 @@
+"""
+Tests for the cached user and department directory.
+"""
+from src.schemas.user_schemas import UserUpdate
+from src.services.department_service import DepartmentService
+from src.services.directory_cache import DirectoryCache, directory_cache
+from src.services.user_service import UserService
+
+
+def test_snapshot_is_reused_until_invalidated(db, make_user):
+    """Lookups hit memory until the version changes, then rebuild once."""
+    cache = DirectoryCache()
+    boss = make_user('boss', department='ops', role='manager')
+    make_user('ann', department='ops')
+
+    first = cache.get(db)
+    assert cache.get(db) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert first.users_with_role('manager') == {boss.id: 'Boss User'}
+    assert first.department_name(boss.department_id) == 'Ops'
+
+    cache.invalidate()
+    assert cache.get(db) is not first
+    assert cache.misses == 2
+
+
+def test_service_writes_bump_the_version(db, make_user):
+    """Department and user changes are visible on the next lookup."""
+    boss = make_user('boss', role='manager')
+    version = directory_cache.version
+
+    department = DepartmentService.create_department(db, 'Trading', 'TRD', boss.id)
+    assert directory_cache.version > version
+    assert directory_cache.get(db).user_name(department.manager_id) == 'Boss User'
+
+    UserService(db).update_user(boss.id, UserUpdate(first_name='Chief'))
+    directory = directory_cache.get(db)
+    assert directory.user_name(boss.id) == 'Chief User'
+    assert directory.department_options() == {department.id: 'Trading'}
+    # The rows are rolled back with the test; do not leave them cached
+    directory_cache.invalidate()
@@ -0,0 +1,99 @@
+"""
+Tests for the in-process event bus and the events services publish on it.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.models import PTOBalance, PTORequest, RequestStatus, User
+from src.schemas.pto_schemas import PTORequestCreate
+from src.services.event_bus import (
+    EventBus, REQUEST_APPROVED, REQUEST_DENIED, REQUEST_SUBMITTED, event_bus
+)
+from src.services.pto_service import PTOService
+from src.utils.pto_units import MINUTES_PER_DAY
+
+
+def test_handlers_receive_events_until_they_unsubscribe():
+    """Handlers get the event name and payload, in subscription order, until removed."""
+    bus = EventBus()
+    received = []
+    first = bus.subscribe('ping', lambda event, payload: received.append(('first', event, payload)))
+    bus.subscribe('ping', lambda event, payload: received.append(('second', event, payload)))
+    bus.subscribe('other', lambda event, payload: received.append(('other', event, payload)))
+
+    bus.publish('ping', n=1)
+    assert received == [('first', 'ping', {'n': 1}), ('second', 'ping', {'n': 1})]
+
+    first()
+    first()
+    bus.unsubscribe('unknown', print)
+    received.clear()
+    bus.publish('ping', n=2)
+    assert received == [('second', 'ping', {'n': 2})]
+    assert (bus.subscriber_count('ping'), bus.subscriber_count('other'), bus.subscriber_count('unknown')) == (1, 1, 0)
+
+
+def test_a_failing_handler_does_not_stop_the_others(caplog):
+    """The error is logged; later handlers still run and the publisher never sees it."""
+    bus = EventBus()
+    received = []
+
+    def failing(event, payload):
+        raise RuntimeError("page closed")
+
+    bus.subscribe('ping', failing)
+    bus.subscribe('ping', lambda event, payload: received.append(payload))
+    bus.publish('ping', n=1)
+
+    assert received == [{'n': 1}]
+    assert "Event handler for 'ping' failed" in caplog.text
+
+
+def test_request_events_are_published_after_the_commit(session_factory):
+    """
+    Handlers such as the NiceGUI row patches read the committed state.
+
+    Each handler opens its own session, as a page would; it must already see
+    the status the event carries. Failed transitions publish nothing.
+    """
+    start = date.today() + timedelta(days=30)
+    with session_factory() as db:
+        employee = User(username='ann', email='ann@example.com', password_hash='x',
+                        first_name='Ann', last_name='Lee', hire_date=date(2020, 1, 1))
+        manager = User(username='mia', email='mia@example.com', password_hash='x',
+                       first_name='Mia', last_name='Park', role='manager', hire_date=date(2020, 1, 1))
+        db.add_all([employee, manager])
+        db.flush()
+        db.add(PTOBalance(user_id=employee.id, year=start.year, vacation_total_minutes=5 * MINUTES_PER_DAY))
+        db.commit()
+        employee_id, manager_id = employee.id, manager.id
+
+    seen = []
+
+    def on_request_event(event, payload):
+        with session_factory() as db:
+            committed = db.get(PTORequest, payload['request_id'])
+            seen.append((event, payload['status'], committed.status if committed is not None else None))
+
+    events = [REQUEST_SUBMITTED, REQUEST_APPROVED, REQUEST_DENIED]
+    unsubscribers = [event_bus.subscribe(event, on_request_event) for event in events]
+    try:
+        with session_factory() as db:
+            service = PTOService(db)
+            request = service.create_request(PTORequestCreate(
+                user_id=employee_id, pto_type='vacation', start_date=start, end_date=start,
+                total_days=Decimal('1')
+            ))
+            service.approve_request(request.id, manager_id)
+            with pytest.raises(ValueError):
+                service.deny_request(request.id, manager_id, 'Too late')
+    finally:
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+
+    assert seen == [
+        (REQUEST_SUBMITTED, RequestStatus.PENDING, RequestStatus.PENDING),
+        (REQUEST_APPROVED, RequestStatus.APPROVED, RequestStatus.APPROVED),
+    ]
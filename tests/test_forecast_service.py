@@ -0,0 +1,41 @@
+"""
+Tests for vacation balance forecasting and forecast-based submission checks.
+"""
+from datetime import date
+
+import pytest
+
+from src.config import get_config
+from src.services.forecast_service import ForecastService
+from src.utils.pto_units import MINUTES_PER_DAY
+from tests.conftest import YEAR
+
+
+def test_forecast_books_requests_in_their_month_and_caps_carryover(db, make_user, submit_request, monkeypatch):
+    """Annual accrual: the balance drops from the request's month; carryover is capped."""
+    monkeypatch.setattr(get_config(), 'VACATION_CARRYOVER_DAYS', 3)
+    ann = make_user('ann', balance={'vacation_total_minutes': 10 * MINUTES_PER_DAY}, year=YEAR)
+    bob = make_user('bob', balance={'vacation_total_minutes': 5 * MINUTES_PER_DAY,
+                                    'vacation_used_minutes': MINUTES_PER_DAY}, year=YEAR - 1)
+    submit_request(ann.id, date(YEAR, 5, 11), days=2)
+
+    forecast = ForecastService(db).forecast([ann.id, bob.id], date(YEAR, 1, 1))
+    days = forecast.available_days()
+
+    assert forecast.months[4] == date(YEAR, 5, 31)
+    assert days[forecast.row(ann.id)].tolist() == [10.0] * 4 + [8.0] * 8
+    # Bob has no row for the year: his 5 days renew, plus 3 of the 4 unused
+    assert days[forecast.row(bob.id)].tolist() == [8.0] * 12
+
+
+def test_monthly_accrual_limits_early_requests(db, make_user, submit_request, monkeypatch):
+    """With monthly accrual a request may only use what has accrued by its month."""
+    monkeypatch.setattr(get_config(), 'VACATION_ACCRUAL', 'monthly')
+    ann = make_user('ann', balance={'vacation_total_minutes': 12 * MINUTES_PER_DAY}, year=YEAR)
+
+    submit_request(ann.id, date(YEAR, 3, 9), days=2)
+    with pytest.raises(ValueError, match="Insufficient vacation balance"):
+        submit_request(ann.id, date(YEAR, 3, 16), days=2)
+    submit_request(ann.id, date(YEAR, 12, 7), days=2)
+
+    assert ForecastService(db).bookable_minutes(ann.id, date(YEAR, 1, 5)) == 1 * MINUTES_PER_DAY
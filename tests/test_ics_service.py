@@ -0,0 +1,76 @@
+"""
+Tests for iCalendar feed generation and conditional responses.
+"""
+from datetime import date
+
+import pytest
+
+from src.models import MarketHoliday, PTORequest, RequestStatus, User
+from src.services.ics_service import (
+    FEED_DEPARTMENT, FEED_MARKET, FEED_USER, IcsService, feed_cache, feed_token, fold_line, verify_token
+)
+
+
+@pytest.fixture
+def db(db, make_user):
+    """One employee with one approved request."""
+    make_user('ann', department='ops', first_name='Ann', last_name='Lee')
+    db.add(PTORequest(user_id=1, pto_type='vacation', start_date=date(2025, 6, 2),
+                      end_date=date(2025, 6, 4), duration_minutes=1440, status=RequestStatus.APPROVED))
+    db.commit()
+    feed_cache.clear()
+    return db
+
+
+def test_user_feed_renders_all_day_events(db):
+    """Events are all-day with an exclusive end date and CRLF line endings."""
+    body, _ = IcsService(db).get_feed(FEED_USER, '1')
+    assert body.startswith('BEGIN:VCALENDAR\r\n') and body.endswith('END:VCALENDAR\r\n')
+    assert 'DTSTART;VALUE=DATE:20250602\r\n' in body
+    assert 'DTEND;VALUE=DATE:20250605\r\n' in body
+
+
+def test_unchanged_feed_is_not_modified_until_a_request_changes(db):
+    """A matching If-None-Match skips rendering; any request change moves the ETag."""
+    service = IcsService(db)
+    _, etag = service.get_feed(FEED_USER, '1')
+
+    body, same_etag = service.get_feed(FEED_USER, '1', if_none_match=f'W/{etag}, "other"')
+    assert body is None and same_etag == etag
+
+    db.get(PTORequest, 1).status = RequestStatus.CANCELLED
+    db.commit()
+    body, new_etag = service.get_feed(FEED_USER, '1', if_none_match=etag)
+    assert new_etag != etag
+    assert 'BEGIN:VEVENT' not in body
+
+
+def test_renamed_holidays_and_employees_move_the_etag(db):
+    """Edits to rendered fields without a version counter still change the ETag."""
+    service = IcsService(db)
+    db.add(MarketHoliday(market='NYSE', holiday_date=date(2025, 7, 4), year=2025,
+                         name='Independence Day'))
+    db.commit()
+    _, market_etag = service.get_feed(FEED_MARKET, 'NYSE')
+    department = str(db.get(User, 1).department_id)
+    _, department_etag = service.get_feed(FEED_DEPARTMENT, department)
+
+    db.query(MarketHoliday).one().name = 'Independence Day (observed)'
+    db.get(User, 1).last_name = 'Park'
+    db.commit()
+    body, new_market_etag = service.get_feed(FEED_MARKET, 'NYSE', if_none_match=market_etag)
+    assert new_market_etag != market_etag and 'Independence Day (observed)' in body
+    body, new_department_etag = service.get_feed(FEED_DEPARTMENT, department, if_none_match=department_etag)
+    assert new_department_etag != department_etag and 'Ann Park' in body
+
+
+def test_feed_tokens_and_line_folding():
+    """Tokens are bound to the feed identity and long lines fold at 75 octets."""
+    token = feed_token(FEED_USER, '1')
+    assert verify_token(FEED_USER, '1', token)
+    assert not verify_token(FEED_USER, '2', token)
+    assert not verify_token(FEED_USER, '1', None)
+
+    folded = fold_line('SUMMARY:' + 'é' * 80)
+    assert all(len(part.encode()) <= 75 for part in folded.split('\r\n'))
+    assert folded.replace('\r\n ', '') == 'SUMMARY:' + 'é' * 80
@@ -0,0 +1,44 @@
+"""
+Tests for the in-process Prometheus metrics.
+"""
+import threading
+
+from src.observability.metrics import Counter, Histogram, MetricsRegistry
+
+
+def test_counter_merges_per_thread_shards():
+    """Increments from many threads are all counted without a shared lock."""
+    counter = Counter('test_events_total', 'Events.', ('kind',))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(labels=('a',))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(2, labels=('b"q',))
+
+    assert counter.value(('a',)) == 4000
+    registry = MetricsRegistry()
+    registry.register(counter)
+    assert 'test_events_total{kind="a"} 4000\n' in registry.render()
+    assert 'test_events_total{kind="b\\"q"} 2\n' in registry.render()
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Bucket counts are cumulative and end with +Inf, _sum and _count."""
+    histogram = Histogram('test_seconds', 'Latency.', buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value)
+
+    lines = histogram.render()[2:]
+    assert lines == [
+        'test_seconds_bucket{le="0.1"} 1',
+        'test_seconds_bucket{le="1"} 3',
+        'test_seconds_bucket{le="+Inf"} 4',
+        'test_seconds_sum 4.05',
+        'test_seconds_count 4',
+    ]
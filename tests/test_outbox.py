@@ -0,0 +1,117 @@
+"""
+Tests for the transactional notification outbox and its dispatcher.
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from src.config import get_config
+from src.models import OutboxMessage, OutboxStatus
+from src.notifications import OutboxDispatcher, render_email, retry_delay
+from src.scheduler.jobs import remind_stale_pending
+from src.services.directory_cache import directory_cache
+from src.services.event_bus import PENDING_REMINDER, REQUEST_APPROVED, REQUEST_DENIED, REQUEST_SUBMITTED
+from src.services.outbox import EMAIL, WEBHOOK
+from src.services.pto_service import PTOService
+
+
+class RecordingTransport:
+    """Transport keeping the digests it is given, failing while ``fail`` is set."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.digests = []
+
+    def send(self, digest):
+        if self.fail:
+            raise OSError("connection refused")
+        self.digests.append(digest)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def team(db, make_user, monkeypatch):
+    """An employee in a department managed by mia, with email notifications on."""
+    monkeypatch.setattr(get_config(), 'SMTP_HOST', 'localhost')
+    mia = make_user('mia', department='ops', role='manager')
+    ann = make_user('ann', department='ops', balance={'vacation_total_minutes': 4800})
+    mia.department.manager_id = mia.id
+    db.commit()
+    directory_cache.invalidate()
+    yield mia, ann
+    directory_cache.invalidate()
+
+
+def _outbox(db):
+    return db.execute(select(OutboxMessage).order_by(OutboxMessage.id)).scalars().all()
+
+
+def test_transitions_write_notifications_in_their_transaction(db, team, submit_request):
+    """Submissions notify the manager, decisions the employee; failed transitions write nothing."""
+    mia, ann = team
+    start = date.today() + timedelta(days=30)
+    service = PTOService(db)
+    request = submit_request(ann.id, start, days=1)
+    service.deny_request(request.id, mia.id, 'Quarter close')
+    with pytest.raises(ValueError):
+        service.approve_request(request.id, mia.id)
+
+    messages = _outbox(db)
+    assert [(m.channel, m.recipient_id, m.kind) for m in messages] == [
+        (EMAIL, mia.id, REQUEST_SUBMITTED), (EMAIL, ann.id, REQUEST_DENIED)
+    ]
+    assert messages[1].payload['note'] == 'Quarter close'
+    assert messages[1].payload['actor_name'] == 'Mia User'
+
+
+def test_dispatcher_sends_digests_and_retries_with_backoff(db, team):
+    """Messages of one recipient go out as one digest; a failed digest is retried later."""
+    mia, ann = team
+    payload = {'employee_name': 'Ann User', 'pto_type': 'vacation', 'start_date': '2030-06-03',
+               'end_date': '2030-06-03', 'total_days': '1.00', 'status': 'approved', 'actor_name': 'Mia User'}
+    db.add_all([
+        OutboxMessage(channel=EMAIL, recipient_id=ann.id, kind=REQUEST_APPROVED, payload=payload),
+        OutboxMessage(channel=EMAIL, recipient_id=ann.id, kind=REQUEST_APPROVED, payload=payload),
+        OutboxMessage(channel=WEBHOOK, endpoint='http://hooks.test/pto', kind=REQUEST_APPROVED, payload=payload),
+    ])
+    db.commit()
+    email, webhook = RecordingTransport(fail=True), RecordingTransport()
+    dispatcher = OutboxDispatcher({EMAIL: email, WEBHOOK: webhook})
+    now = datetime.now()
+
+    assert tuple(dispatcher.dispatch(db, now)) == (1, 2, 0)
+    assert tuple(dispatcher.dispatch(db, now)) == (0, 0, 0)
+
+    email.fail = False
+    assert tuple(dispatcher.dispatch(db, now + retry_delay(1))) == (2, 0, 0)
+    [digest] = email.digests
+    assert (digest.address, len(digest.notifications)) == ('ann@example.com', 2)
+    assert render_email(digest)[0] == "2 PTO request updates"
+    assert [(m.status, m.attempts) for m in _outbox(db)] == [(OutboxStatus.SENT, 2)] * 2 + [(OutboxStatus.SENT, 1)]
+
+
+def test_stale_requests_are_reminded_through_the_outbox(db, team, make_user, submit_request):
+    """The reminder job queues emails for the approver, or the admins when nobody is designated, and they go out."""
+    mia, ann = team
+    ada = make_user('ada', role='admin')
+    cy = make_user('cy', department='desk', balance={'vacation_total_minutes': 4800})
+    start = date.today() + timedelta(days=30)
+    submit_request(ann.id, start, days=1)
+    submit_request(cy.id, start, days=1)
+    for message in _outbox(db):
+        message.status = OutboxStatus.SENT
+    db.commit()
+
+    assert remind_stale_pending(db, now=datetime.now() + timedelta(days=7)).endswith("2 notifications queued")
+    assert [(m.recipient_id, m.kind, m.payload['request_count']) for m in _outbox(db)[-2:]] == [
+        (mia.id, PENDING_REMINDER, 1), (ada.id, PENDING_REMINDER, 1)
+    ]
+
+    email = RecordingTransport()
+    OutboxDispatcher({EMAIL: email}).dispatch(db, datetime.now())
+    subject, body = render_email(next(d for d in email.digests if d.address == 'mia@example.com'))
+    assert subject == "PTO requests awaiting your approval"
+    assert "1 PTO request submitted since" in body and "is still awaiting approval" in body
@@ -0,0 +1,59 @@
+"""
+Tests for SQL query instrumentation.
+"""
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.database import Base, create_db_engine
+from src.models import User
+from src.observability.asgi import UNMATCHED, route_label
+from src.observability.query_stats import fingerprint, instrument_engine, query_registry, track
+
+
+def test_fingerprint_ignores_values():
+    """Statements differing only in literals, parameters or IN-list length share a fingerprint."""
+    assert fingerprint("SELECT * FROM users WHERE id = 7 AND name = 'x'") == \
+        fingerprint("SELECT *  FROM users\n WHERE id = 12 AND name = 'it''s'")
+    assert fingerprint("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == "SELECT ? FROM t WHERE id IN (...)"
+    assert fingerprint("SELECT users_1.id FROM users AS users_1 WHERE id = %(id_1)s") == \
+        "SELECT users_1.id FROM users AS users_1 WHERE id = ?"
+
+
+def test_route_labels_are_route_templates():
+    """Requests are labelled by the route they match, inside mounts too; anything else shares one label."""
+    from fastapi import FastAPI
+
+    api = FastAPI()
+    api.get('/requests/{request_id}/approvers')(lambda request_id: None)
+    app = FastAPI()
+    app.get('/manager/request/{request_id}')(lambda request_id: None)
+    app.mount('/api/v1', api)
+
+    def label(path):
+        return route_label({'type': 'http', 'app': app, 'path': path, 'method': 'GET', 'root_path': ''})
+
+    assert label('/manager/request/42') == '/manager/request/{request_id}'
+    assert label('/api/v1/requests/7/approvers') == '/api/v1/requests/{request_id}/approvers'
+    assert label('/feeds/user/0f3a9c.ics') == label('/api/v1/nope') == UNMATCHED
+
+
+def test_scope_counts_queries_and_flags_repeats(caplog):
+    """A loop of per-row lookups is counted, flagged as N+1 and logged as slow above the threshold."""
+    engine = create_db_engine('sqlite://', echo=False)
+    Base.metadata.create_all(engine)
+    instrument_engine(engine, slow_query_ms=0)
+    query_registry.reset()
+
+    with caplog.at_level(logging.WARNING), Session(engine) as db, track('/admin/departments') as stats:
+        for user_id in range(12):
+            db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
+
+    assert stats.count == 13  # BEGIN plus the twelve lookups
+    assert list(stats.repeated().values()) == [12]
+    summary = query_registry.labels()[0]
+    assert (summary.label, summary.max_queries) == ('/admin/departments', 13)
+    assert query_registry.slow_queries()[0]['scope'] == '/admin/departments'
+    assert any('Possible N+1 in /admin/departments' in r.getMessage() for r in caplog.records)
+    engine.dispose()
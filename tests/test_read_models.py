@@ -0,0 +1,58 @@
+"""
+Tests for the column-only list queries and their table row converters.
+"""
+import pickle
+from datetime import date, timedelta
+from decimal import Decimal
+
+from src.models import RequestStatus
+from src.schemas.pto_schemas import PTORequestCreate
+from src.schemas.read_models import BalanceListItem, EmployeeListItem, RequestListItem, table_rows
+from src.services.balance_service import BalanceService
+from src.services.pto_service import PTOService
+from src.services.user_service import UserService
+from src.utils.pto_units import MINUTES_PER_DAY
+
+
+def test_list_user_requests_returns_plain_rows(db, make_user):
+    """History rows are tuples in submission order, limited on request, with display helpers."""
+    ann = make_user('ann', balance={'vacation_total_minutes': 10 * MINUTES_PER_DAY},
+                    year=(date.today() + timedelta(days=30)).year)
+    service = PTOService(db)
+    for offset in (30, 31):
+        start = date.today() + timedelta(days=offset)
+        service.create_request(PTORequestCreate(
+            user_id=ann.id, pto_type='vacation', start_date=start, end_date=start, total_days=Decimal('1'),
+            notes=f'Trip {offset}'
+        ))
+
+    rows = service.list_user_requests(ann.id)
+    assert [type(row) for row in rows] == [RequestListItem, RequestListItem]
+    assert [row.id for row in service.list_user_requests(ann.id, limit=1)] == [rows[0].id]
+    assert rows[0].status == RequestStatus.PENDING
+    assert (rows[0].total_days, rows[0].duration_days) == (Decimal('1.00'), 1)
+    assert service.list_user_requests(ann.id, status=RequestStatus.APPROVED) == []
+    assert (rows[0].notes, rows[0].approved_at, rows[0].is_approved) == ('Trip 31', None, False)
+    assert pickle.loads(pickle.dumps(rows)) == rows
+
+    [balance] = BalanceService(db).list_balances([ann.id], rows[0].start_date.year)
+    assert isinstance(balance, BalanceListItem)
+    assert (balance.vacation_total, balance.vacation_pending, balance.vacation_available) == (
+        Decimal('10.00'), Decimal('2.00'), Decimal('8.00'))
+
+
+def test_list_users_omits_credentials_and_converts_to_table_rows(db, make_user):
+    """Employee rows carry no password hash and convert with a prebuilt converter."""
+    make_user('zed', last_name='Zulu')
+    make_user('amy', last_name='Alpha', is_active=False)
+
+    users = UserService(db).list_users()
+    assert [user.username for user in users] == ['amy', 'zed']
+    assert 'password_hash' not in EmployeeListItem._fields
+
+    convert = table_rows(id=lambda u: u.id, name=lambda u: u.full_name, active=lambda u: u.is_active)
+    assert convert(users) == [
+        {'id': users[0].id, 'name': 'Amy Alpha', 'active': False},
+        {'id': users[1].id, 'name': 'Zed Zulu', 'active': True},
+    ]
+    assert [user.username for user in UserService(db).list_users(active_only=True)] == ['zed']
@@ -0,0 +1,80 @@
+"""
+Tests for read-replica routing, using two SQLite files as primary and replica.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from src import database
+from src.database import Base, ReadYourWrites, RoutingSession, create_db_engine, track_writes
+from src.models import PTORequest, User
+from src.services.event_bus import event_bus, REQUEST_SUBMITTED
+from src.services.pto_service import PTOService
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """
+    Primary and replica databases holding the same user.
+
+    The primary also has a request the replica has not received yet, so
+    each read shows which engine served it.
+    """
+    primary = create_db_engine(f"sqlite:///{tmp_path / 'primary.db'}", echo=False)
+    replica = create_db_engine(f"sqlite:///{tmp_path / 'replica.db'}", echo=False)
+    for engine in (primary, replica):
+        Base.metadata.create_all(engine)
+        with RoutingSession(bind=engine) as db:
+            db.add(User(username='ann', email='ann@example.com', password_hash='x',
+                        first_name='Ann', last_name='User', hire_date=date(2020, 1, 1)))
+            db.commit()
+    with RoutingSession(bind=primary) as db:
+        db.add(PTORequest(user_id=1, pto_type='vacation', start_date=date(2030, 6, 3),
+                          end_date=date(2030, 6, 3), duration_minutes=480))
+        db.commit()
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def pins(monkeypatch):
+    """A fresh read-your-writes registry with a one-minute window."""
+    registry = ReadYourWrites(window_seconds=60)
+    monkeypatch.setattr(database, 'read_your_writes', registry)
+    return registry
+
+
+def test_read_only_methods_use_the_replica(engines, pins):
+    """Marked methods and marked statements read the replica; the rest read the primary."""
+    primary, replica = engines
+    with RoutingSession(bind=primary, replica=replica) as db:
+        assert PTOService(db).get_user_requests(1) == []
+        assert PTOService(db).get_request_by_id(1) is not None
+        assert db.execute(
+            select(PTORequest).execution_options(replica=True)
+        ).scalars().all() == []
+
+
+def test_user_is_pinned_to_primary_after_own_write(engines, pins):
+    """A change published for a user sends their reads to the primary until the window ends."""
+    primary, replica = engines
+    track_writes()
+    event_bus.publish(REQUEST_SUBMITTED, request_id=1, user_id=1)
+    with RoutingSession(bind=primary, replica=replica) as db:
+        assert len(PTOService(db).get_user_requests(1)) == 1
+
+    expired = ReadYourWrites(window_seconds=0)
+    expired.mark(1)
+    assert not expired.is_pinned(1)
+
+
+def test_session_reads_primary_after_writing(engines, pins):
+    """Once a session has flushed, even marked reads go to the primary."""
+    primary, replica = engines
+    with RoutingSession(bind=primary, replica=replica) as db:
+        db.get(User, 1).first_name = 'Anne'
+        db.flush()
+        assert len(PTOService(db).get_user_requests(1)) == 1
+        db.rollback()
@@ -0,0 +1,95 @@
+"""
+Tests for remote day booking and office occupancy.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from src.models import PTORequest, MarketHoliday, RemoteWeek, RequestStatus, User
+from src.services.remote_work_service import RemoteWorkService, schedule_mask
+
+
+@pytest.fixture
+def db(db, make_user):
+    """Two employees, one remote on Mondays."""
+    make_user('remote', first_name='Re', last_name='Mote', remote_schedule='{"monday": true}')
+    make_user('office', first_name='Of', last_name='Fice')
+    return db
+
+
+@pytest.fixture
+def monday():
+    """A Monday at least a week ahead."""
+    today = date.today()
+    return today + timedelta(days=14 - today.weekday())
+
+
+def test_schedule_mask_accepts_encoded_json():
+    """The admin pages store remote_schedule as JSON text."""
+    assert schedule_mask('{"monday": true, "friday": true}') == 0b10001
+    assert schedule_mask({'tuesday': True, 'wednesday': False}) == 0b00010
+    assert schedule_mask(None) == 0
+
+
+def test_weekly_cap_counts_recurring_days(db, monday):
+    """The recurring Monday counts towards the default cap of two days."""
+    service = RemoteWorkService(db)
+    week = service.request_remote_day(1, monday + timedelta(days=2))
+    assert week.day_mask == 0b00101
+
+    with pytest.raises(ValueError, match="Weekly remote limit"):
+        service.request_remote_day(1, monday + timedelta(days=3))
+
+    service.cancel_remote_day(1, monday)
+    service.request_remote_day(1, monday + timedelta(days=3))
+    assert service.get_remote_days(1, monday, monday + timedelta(days=4)) == [
+        monday + timedelta(days=2), monday + timedelta(days=3)
+    ]
+
+
+def test_closed_and_pto_days_are_not_bookable(db, monday):
+    """Weekends, market holidays and PTO days cannot be booked as remote."""
+    db.add(MarketHoliday(holiday_date=monday + timedelta(days=1), name='Holiday', market='NYSE',
+                         year=monday.year))
+    db.add(PTORequest(user_id=2, pto_type='vacation', start_date=monday, end_date=monday,
+                      duration_minutes=480, status=RequestStatus.PENDING))
+    db.commit()
+    service = RemoteWorkService(db)
+
+    for user_id, day in [(2, monday + timedelta(days=5)), (2, monday + timedelta(days=1)), (2, monday)]:
+        with pytest.raises(ValueError):
+            service.request_remote_day(user_id, day)
+
+
+def test_weekly_used_is_read_from_the_iso_week(db, monday):
+    """Each week counts its own mask, falling back to the schedule, keyed on the ISO year."""
+    service = RemoteWorkService(db)
+    remote, office = (db.query(User).filter_by(username=name).one() for name in ('remote', 'office'))
+    service.request_remote_day(remote.id, monday + timedelta(days=2))
+
+    assert service.weekly_used(remote.id, monday) == 2
+    assert service.weekly_used(remote.id, monday + timedelta(days=7)) == 1
+    assert service.weekly_used(office.id, monday) == 0
+
+    # 1 January 2027 falls in ISO week 2026-W53
+    db.add(RemoteWeek(user_id=office.id, iso_year=2026, iso_week=53, day_mask=0b00011))
+    db.commit()
+    assert service.weekly_used(office.id, date(2027, 1, 1)) == 2
+    assert service.weekly_used(office.id, date(2027, 1, 4)) == 0
+
+
+def test_office_occupancy(db, monday):
+    """Occupancy subtracts remote days and approved PTO without double counting."""
+    db.add(PTORequest(user_id=1, pto_type='vacation', start_date=monday, end_date=monday + timedelta(days=1),
+                      duration_minutes=960, status=RequestStatus.APPROVED))
+    db.add(MarketHoliday(holiday_date=monday + timedelta(days=4), name='Holiday', market='NYSE',
+                         year=monday.year))
+    db.commit()
+
+    occupancy = RemoteWorkService(db).office_occupancy(monday, monday + timedelta(days=6))
+
+    assert occupancy.days == [monday + timedelta(days=i) for i in range(4)]
+    assert occupancy.headcount == 2
+    assert occupancy.remote.tolist() == [0, 0, 0, 0]
+    assert occupancy.on_pto.tolist() == [1, 1, 0, 0]
+    assert occupancy.in_office.tolist() == [1, 1, 2, 2]
@@ -0,0 +1,128 @@
+"""
+Tests for the PTO request state machine and its audit trail.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.models import PTOBalance, RequestStatus
+from src.schemas.pto_schemas import PTORequestCreate
+from src.services import request_workflow
+from src.services.pto_service import PTOService
+from src.services.request_workflow import RequestAction
+from src.utils.pto_units import MINUTES_PER_DAY, DayPart
+from tests.conftest import YEAR
+
+# First Monday of June: a working day clear of market holidays
+START = date(YEAR, 6, 7) - timedelta(days=date(YEAR, 6, 7).weekday())
+
+
+@pytest.fixture
+def manager(make_user):
+    """A manager deciding the employee's requests."""
+    return make_user('manager', role='manager')
+
+
+@pytest.fixture
+def employee(make_user):
+    """One employee holding a balance."""
+    return make_user('employee', first_name='Test', last_name='Employee', year=YEAR,
+                     balance={'vacation_total_minutes': 10 * MINUTES_PER_DAY, 'sick_total_minutes': 5 * MINUTES_PER_DAY,
+                              'personal_total_minutes': 2 * MINUTES_PER_DAY})
+
+
+def _balance(db, user) -> PTOBalance:
+    return db.query(PTOBalance).filter_by(user_id=user.id, year=YEAR).one()
+
+
+def test_transition_table_rejects_actions_from_final_states():
+    """Decided requests cannot be approved, denied or cancelled again."""
+    assert request_workflow.allowed_actions(RequestStatus.PENDING) == (
+        RequestAction.APPROVE, RequestAction.ESCALATE, RequestAction.DENY, RequestAction.CANCEL
+    )
+    for state in (RequestStatus.APPROVED, RequestStatus.DENIED, RequestStatus.CANCELLED):
+        assert request_workflow.allowed_actions(state) == ()
+        with pytest.raises(ValueError, match="Only pending requests can be approved"):
+            request_workflow.resolve(state, RequestAction.APPROVE)
+
+
+def test_vacation_lifecycle_moves_pending_to_used(db, employee, manager, submit_request):
+    """Vacation days are reserved on submit and moved to used on approval."""
+    request = submit_request(employee.id, START, days=2)
+    balance = _balance(db, employee)
+    assert balance.vacation_pending == Decimal('2.00')
+
+    PTOService(db).approve_request(request.id, approved_by=manager.id)
+    db.refresh(balance)
+    assert (balance.vacation_pending, balance.vacation_used) == (Decimal('0.00'), Decimal('2.00'))
+
+
+def test_deny_and_cancel_release_reserved_days(db, employee, manager, submit_request):
+    """Denied and cancelled vacation requests give their pending days back."""
+    service = PTOService(db)
+    service.deny_request(submit_request(employee.id, START, days=2).id, approved_by=manager.id, denial_reason='Coverage')
+    service.cancel_request(submit_request(employee.id, START, days=2).id, user_id=employee.id)
+
+    balance = _balance(db, employee)
+    assert (balance.vacation_pending, balance.vacation_used) == (Decimal('0.00'), Decimal('0.00'))
+
+
+def test_sick_and_personal_are_counted_on_approval(db, employee, manager, submit_request):
+    """Sick and personal days are not reserved but are used once approved."""
+    service = PTOService(db)
+    sick = submit_request(employee.id, START, days=2, pto_type='sick')
+    personal = submit_request(employee.id, START, days=1, pto_type='personal')
+    balance = _balance(db, employee)
+    assert balance.sick_used == Decimal('0.00')
+
+    service.approve_request(sick.id, approved_by=manager.id)
+    service.approve_request(personal.id, approved_by=manager.id)
+    db.refresh(balance)
+    assert (balance.sick_used, balance.personal_used) == (Decimal('2.00'), Decimal('1.00'))
+
+
+def test_history_records_every_transition(db, employee, manager, submit_request):
+    """Each transition appends one audit event in order."""
+    service = PTOService(db)
+    request = submit_request(employee.id, START, days=2)
+    service.deny_request(request.id, approved_by=manager.id, denial_reason='Quarter end')
+    with pytest.raises(ValueError):
+        service.cancel_request(request.id, user_id=employee.id)
+
+    history = service.get_request_history(request.id)
+    assert [(e.action, e.from_status, e.to_status) for e in history] == [
+        (RequestAction.SUBMIT, None, RequestStatus.PENDING),
+        (RequestAction.DENY, RequestStatus.PENDING, RequestStatus.DENIED),
+    ]
+    assert history[1].note == 'Quarter end'
+
+
+def test_partial_days_are_stored_as_minutes(db, employee):
+    """Half days and hours reserve exact minute quantities."""
+    service = PTOService(db)
+    half = service.create_request(PTORequestCreate(
+        user_id=employee.id, pto_type='vacation', start_date=START, end_date=START, day_part=DayPart.PM
+    ))
+    hourly = service.create_request(PTORequestCreate(
+        user_id=employee.id, pto_type='vacation', start_date=START, end_date=START,
+        day_part=DayPart.HOURS, hours=Decimal('1.75')
+    ))
+    assert (half.duration_minutes, half.total_days) == (240, Decimal('0.50'))
+    assert hourly.duration_minutes == 105
+    balance = _balance(db, employee)
+    assert balance.vacation_pending_minutes == 345
+    assert balance.vacation_available_minutes == 10 * MINUTES_PER_DAY - 345
+
+
+@pytest.mark.parametrize('day_part, days, hours', [
+    (DayPart.AM, 1, None),
+    (DayPart.HOURS, 0, None),
+    (DayPart.HOURS, 0, Decimal('1.1')),
+    (DayPart.HOURS, 0, Decimal('9')),
+])
+def test_invalid_partial_day_requests_are_rejected(day_part, days, hours):
+    """Partial days cover a single date and whole quarter hours up to a workday."""
+    with pytest.raises(ValueError):
+        PTORequestCreate(user_id=1, pto_type='vacation', start_date=START,
+                         end_date=START + timedelta(days=days), day_part=day_part, hours=hours)
@@ -0,0 +1,108 @@
+"""
+Tests for department blackout and coverage rules.
+"""
+import random
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from src.models import Department, PTORequest, RequestStatus, RuleKind
+from src.schemas.rule_schemas import DepartmentRuleCreate
+from src.services.pto_service import PTOService
+from src.services.rule_service import RuleService
+from src.services.vacation_optimizer import VacationOptimizer
+from src.utils.intervals import IntervalIndex
+from src.utils.pto_units import MINUTES_PER_DAY
+from tests.conftest import YEAR
+
+
+def _monday(month: int) -> date:
+    day = date(YEAR, month, 1)
+    return day + timedelta(days=-day.weekday() % 7)
+
+
+def test_interval_index_matches_a_linear_scan():
+    """Overlap queries return exactly the overlapping intervals, in start order."""
+    rng = random.Random(7)
+    intervals = [(start, start + rng.randint(0, 30), i)
+                 for i, start in enumerate(rng.randint(0, 365) for _ in range(300))]
+    index = IntervalIndex(intervals)
+    for _ in range(200):
+        lo = rng.randint(-10, 380)
+        hi = lo + rng.randint(0, 20)
+        expected = sorted((start, end, value) for start, end, value in intervals if start <= hi and end >= lo)
+        assert index.overlapping(lo, hi) == [value for _, _, value in expected]
+    assert IntervalIndex([]).overlapping(0, 10) == []
+
+
+def test_submit_enforces_blackouts_and_headcount(db, make_user, submit_request):
+    """Vacation inside a blackout or below minimum headcount is rejected with the rule's name; sick leave is not."""
+    balance = {'vacation_total_minutes': 20 * MINUTES_PER_DAY}
+    ann = make_user('ann', department='rates', balance=balance, year=YEAR)
+    bob = make_user('bob', department='rates', balance=balance, year=YEAR)
+    make_user('cy', department='rates')
+    mia = make_user('mia', role='manager')
+    desk = db.execute(select(Department).where(Department.code == 'rates')).scalar_one()
+    service = RuleService(db)
+    quarter_end = _monday(3) + timedelta(days=21)
+    service.create_rule(DepartmentRuleCreate(
+        kind=RuleKind.BLACKOUT, name='Quarter-end close', start_date=quarter_end, end_date=quarter_end + timedelta(days=4)
+    ))
+    service.create_rule(DepartmentRuleCreate(department_id=desk.id, kind=RuleKind.MIN_HEADCOUNT,
+                                             name='Desk coverage', value=2))
+
+    with pytest.raises(ValueError, match="Quarter-end close: no time off"):
+        submit_request(ann.id, quarter_end + timedelta(days=1))
+    submit_request(ann.id, quarter_end, pto_type='sick')
+
+    june = _monday(6)
+    first = submit_request(bob.id, june, end=june + timedelta(days=1))
+    PTOService(db).approve_request(first.id, mia.id)
+    submit_request(ann.id, june + timedelta(days=2))
+    with pytest.raises(ValueError, match="Desk coverage: Rates needs at least 2 people in"):
+        submit_request(ann.id, june + timedelta(days=1), end=june + timedelta(days=3))
+
+
+def test_approval_rechecks_headcount_against_requests_approved_since(db, make_user, submit_request):
+    """Overlapping requests both pass while pending; approving the second would leave the desk short."""
+    balance = {'vacation_total_minutes': 20 * MINUTES_PER_DAY}
+    ann = make_user('ann', department='rates', balance=balance, year=YEAR)
+    bob = make_user('bob', department='rates', balance=balance, year=YEAR)
+    make_user('cy', department='rates')
+    mia = make_user('mia', role='manager')
+    desk = db.execute(select(Department).where(Department.code == 'rates')).scalar_one()
+    RuleService(db).create_rule(DepartmentRuleCreate(department_id=desk.id, kind=RuleKind.MIN_HEADCOUNT,
+                                                     name='Desk coverage', value=2))
+    june = _monday(6)
+    first = submit_request(ann.id, june, end=june + timedelta(days=1))
+    second = submit_request(bob.id, june + timedelta(days=1), end=june + timedelta(days=2))
+
+    service = PTOService(db)
+    assert service.approve_request(first.id, mia.id).status == RequestStatus.APPROVED
+    with pytest.raises(ValueError, match="Desk coverage: Rates needs at least 2 people in"):
+        service.approve_request(second.id, mia.id)
+    assert db.get(PTORequest, second.id).status == RequestStatus.PENDING
+
+
+def test_optimizer_avoids_blackouts_and_full_desks(db, make_user):
+    """Suggestions never book days inside a blackout or when the desk is at its absence cap."""
+    ann = make_user('ann', department='rates', balance={'vacation_total_minutes': 20 * MINUTES_PER_DAY}, year=YEAR)
+    bob = make_user('bob', department='rates')
+    desk = db.execute(select(Department).where(Department.code == 'rates')).scalar_one()
+    blackout = (date(YEAR, 7, 1), date(YEAR, 9, 30))
+    busy = _monday(11)
+    db.add(PTORequest(user_id=bob.id, pto_type='vacation', start_date=busy, end_date=busy + timedelta(days=4),
+                      duration_minutes=5 * MINUTES_PER_DAY, status=RequestStatus.APPROVED))
+    db.flush()
+    service = RuleService(db)
+    service.create_rule(DepartmentRuleCreate(department_id=desk.id, kind=RuleKind.BLACKOUT, name='Summer',
+                                             start_date=blackout[0], end_date=blackout[1]))
+    service.create_rule(DepartmentRuleCreate(department_id=desk.id, kind=RuleKind.MAX_ABSENT,
+                                             name='One out at a time', value=1))
+
+    windows = VacationOptimizer(db).suggest(ann.id, YEAR, limit=100, max_pto_days=3)
+    assert windows
+    for window in windows:
+        assert window.pto_end < blackout[0] or window.pto_start > blackout[1]
+        assert window.pto_end < busy or window.pto_start > busy + timedelta(days=4)
@@ -0,0 +1,72 @@
+"""
+Tests for cron schedules, scheduler leader election and the background jobs.
+"""
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from src.database import Base, create_db_engine
+from src.models import JobRun, PTOBalance
+from src.scheduler import CronSchedule, LeaderLock, Scheduler
+from src.scheduler.jobs import reconcile_balances, year_rollover
+from src.utils.pto_units import MINUTES_PER_DAY
+
+
+def test_cron_schedule_finds_previous_and_next_occurrences():
+    """Ranges, steps and weekdays resolve to the right minutes; bad fields are rejected."""
+    weekdays = CronSchedule('0 8 * * 1-5')
+    sunday = datetime(2027, 3, 7, 12, 0)
+    assert weekdays.latest(sunday) == datetime(2027, 3, 5, 8, 0)
+    assert weekdays.next_after(sunday) == datetime(2027, 3, 8, 8, 0)
+    assert CronSchedule('@yearly').latest(datetime(2027, 3, 7)) == datetime(2027, 1, 1, 0, 0)
+    assert CronSchedule('*/15 * * * *').next_after(datetime(2027, 3, 7, 9, 15)) == datetime(2027, 3, 7, 9, 30)
+    # Both day fields restricted: either one matches
+    assert CronSchedule('0 0 13 * 5').matches(datetime(2027, 3, 12))
+    with pytest.raises(ValueError):
+        CronSchedule('61 * * * *')
+
+
+def test_only_the_leader_runs_each_occurrence_once(tmp_path):
+    """A second process waits for the lease, and never repeats an occurrence already run."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'jobs.db'}", echo=False)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    calls = []
+    schedulers = [Scheduler(factory, LeaderLock(engine, holder=name), workers=1) for name in ('a', 'b')]
+    for scheduler in schedulers:
+        scheduler.register('tally', '0 2 * * *', lambda db: calls.append(1) or 'tallied')
+    first, second = schedulers
+    now = datetime(2027, 3, 7, 9, 0)
+
+    assert [future.result() for future in first.run_pending(now)] == ['tallied']
+    assert second.run_pending(now) == []
+    first.stop()
+    # The lease is released, but the 02:00 run is already recorded
+    assert second.run_pending(now) == []
+    second.stop()
+
+    with factory() as db:
+        run = db.execute(select(JobRun)).scalar_one()
+    assert (run.node, run.status, run.summary, run.scheduled_for) == ('a', 'succeeded', 'tallied',
+                                                                      datetime(2027, 3, 7, 2, 0))
+    assert calls == [1]
+    engine.dispose()
+
+
+def test_rollover_and_reconciliation_repair_balances(db, make_user):
+    """Rollover renews last year's totals once; reconciliation clears orphaned pending minutes."""
+    ann = make_user('ann', balance={'vacation_total_minutes': 15 * MINUTES_PER_DAY,
+                                    'sick_total_minutes': 5 * MINUTES_PER_DAY,
+                                    'vacation_pending_minutes': MINUTES_PER_DAY}, year=2026)
+
+    assert year_rollover(db, today=date(2027, 1, 1)) == "renewed 1 of 1 balances for 2027"
+    assert year_rollover(db, today=date(2027, 1, 1)) == "renewed 0 of 1 balances for 2027"
+    renewed = db.execute(select(PTOBalance).where(PTOBalance.user_id == ann.id, PTOBalance.year == 2027)).scalar_one()
+    assert (renewed.vacation_total_minutes, renewed.sick_total_minutes, renewed.vacation_used_minutes) == (
+        15 * MINUTES_PER_DAY, 5 * MINUTES_PER_DAY, 0)
+
+    assert reconcile_balances(db).startswith("corrected pending minutes on 1 balances")
+    old = db.execute(select(PTOBalance).where(PTOBalance.user_id == ann.id, PTOBalance.year == 2026)).scalar_one()
+    assert old.vacation_pending_minutes == 0
@@ -0,0 +1,56 @@
+"""
+Tests for holiday-bridging vacation suggestions.
+"""
+from datetime import date
+
+from src.config import get_config
+from src.models import MarketHoliday, PTORequest, RequestStatus
+from src.services.vacation_optimizer import VacationOptimizer
+from src.utils.pto_units import MINUTES_PER_DAY
+from tests.conftest import YEAR
+
+
+def _holiday(db, day: date, name: str) -> None:
+    db.add(MarketHoliday(holiday_date=day, name=name, market=get_config().PRIMARY_MARKET,
+                         year=day.year, is_observed=True))
+    db.flush()
+
+
+def _thursday_in_november() -> date:
+    day = date(YEAR, 11, 22)
+    while day.weekday() != 3:
+        day = day.replace(day=day.day + 1)
+    return day
+
+
+def test_suggestions_bridge_holidays_within_balance(db, make_user):
+    """A Thursday holiday plus one vacation day gives four days off; windows fit the balance."""
+    thanksgiving = _thursday_in_november()
+    _holiday(db, thanksgiving, 'Thanksgiving Day')
+    ann = make_user('ann', balance={'vacation_total_minutes': 2 * MINUTES_PER_DAY}, year=YEAR)
+
+    windows = VacationOptimizer(db).suggest(ann.id, YEAR, limit=3, min_days_off=4)
+    best = windows[0]
+    assert (best.start, best.pto_start, best.pto_days, best.days_off) == (
+        thanksgiving, thanksgiving.replace(day=thanksgiving.day + 1), 1, 4)
+    assert all(window.pto_days <= 2 for window in windows)
+    assert VacationOptimizer(db).suggest(ann.id, YEAR - 2) == []
+
+
+def test_suggestions_skip_booked_days_and_full_coverage(db, make_user):
+    """Days the user already booked, or when the department is at its cap, are never suggested."""
+    thanksgiving = _thursday_in_november()
+    friday = thanksgiving.replace(day=thanksgiving.day + 1)
+    _holiday(db, thanksgiving, 'Thanksgiving Day')
+    ann = make_user('ann', department='rates', balance={'vacation_total_minutes': 10 * MINUTES_PER_DAY}, year=YEAR)
+    bob = make_user('bob', department='rates')
+    db.add(PTORequest(user_id=bob.id, pto_type='vacation', start_date=friday, end_date=friday,
+                      duration_minutes=MINUTES_PER_DAY, status=RequestStatus.APPROVED))
+    db.flush()
+
+    def bridges(**kwargs):
+        return [window for window in VacationOptimizer(db).suggest(ann.id, YEAR, limit=50, min_days_off=4, **kwargs)
+                if window.start <= friday <= window.end]
+
+    assert bridges()[0].pto_start == friday
+    assert all(window.pto_start > friday or window.pto_end < friday for window in bridges(max_absent=1))